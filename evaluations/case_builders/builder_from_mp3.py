@@ -61,7 +61,7 @@ class BuilderFromMp3(BuilderBase):
 
             previous, _, transcript_tail = Commander.audio2commands(
                 recorder,
-                CycleData(audio=combined, transcript=[], source=CycleDataSource.AUDIO),
+                [CycleData(audio=combined, transcript=[], source=CycleDataSource.AUDIO)],
                 chatter,
                 previous,
                 transcript_tail,
@@ -62,7 +62,7 @@ class BuilderFromTuning(BuilderBase):
             with file.open("rb") as f:
                 previous, _, transcript_tail = Commander.audio2commands(
                     recorder,
-                    CycleData(audio=f.read(), transcript=[], source=CycleDataSource.AUDIO),
+                    [CycleData(audio=f.read(), transcript=[], source=CycleDataSource.AUDIO)],
                     chatter,
                     previous,
                     transcript_tail,
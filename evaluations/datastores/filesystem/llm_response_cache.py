@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+
+from hyperscribe.libraries.llm_response_cache import LlmResponseCache
+from hyperscribe.structures.http_response import HttpResponse
+
+
+class LlmResponseCacheDisk(LlmResponseCache):
+    def __init__(self, folder: Path, max_entries: int) -> None:
+        self.folder = folder
+        self.max_entries = max_entries
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> HttpResponse | None:
+        file_path = self.folder / f"{key}.json"
+        if not file_path.exists():
+            return None
+        # touched to be the most recently used
+        file_path.touch()
+        return self.from_json(json.loads(file_path.read_text()))
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        file_path = self.folder / f"{key}.json"
+        file_path.write_text(json.dumps(self.to_json(response)))
+        files = sorted(self.folder.glob("*.json"), key=lambda f: f.stat().st_mtime)
+        for file in files[: max(0, len(files) - self.max_entries)]:
+            file.unlink()
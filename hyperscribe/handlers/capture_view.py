@@ -1,5 +1,8 @@
+import json
 from datetime import datetime, UTC
 from http import HTTPStatus
+from time import time
+from typing import Any
 
 from canvas_sdk.caching.plugins import get_cache
 from canvas_sdk.effects import Effect
@@ -16,6 +19,7 @@ from requests import post as requests_post
 from hyperscribe.handlers.progress_display import ProgressDisplay
 from hyperscribe.libraries.authenticator import Authenticator
 from hyperscribe.libraries.aws_s3 import AwsS3
+from hyperscribe.libraries.cached_sdk import CachedSdk
 from hyperscribe.libraries.commander import Commander
 from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.customization import Customization
@@ -24,10 +28,15 @@ from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.libraries.llm_decisions_reviewer import LlmDecisionsReviewer
 from hyperscribe.libraries.llm_turns_store import LlmTurnsStore
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.rate_limiter import RateLimiter
+from hyperscribe.libraries.science_cache import ScienceCache
 from hyperscribe.libraries.stop_and_go import StopAndGo
+from hyperscribe.libraries.tracer import Tracer
+from hyperscribe.libraries.upload_queue import UploadQueue
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.cycle_data import CycleData
 from hyperscribe.structures.identification_parameters import IdentificationParameters
+from hyperscribe.structures.line import Line
 from hyperscribe.structures.notion_feedback_record import NotionFeedbackRecord
 from hyperscribe.structures.progress_message import ProgressMessage
 from hyperscribe.structures.settings import Settings
@@ -242,6 +251,7 @@ class CaptureView(SimpleAPI):
             if not response.status_code:
                 return [Response(b"Failed to save transcript (AWS S3 failure)", HTTPStatus.SERVICE_UNAVAILABLE)]
             return [Response(response.content, HTTPStatus(response.status_code))]
+        CycleData.hand_off(identification, cycle, transcript.encode(), CycleData.content_type_text())
 
         user_id = self.request.headers.get("canvas-logged-in-user-id")
         executor.submit(Helper.with_cleanup(self.run_commander), identification, user_id)
@@ -283,6 +293,7 @@ class CaptureView(SimpleAPI):
             if not response.status_code:
                 return [Response(b"Failed to save chunk (AWS S3 failure)", HTTPStatus.SERVICE_UNAVAILABLE)]
             return [Response(response.content, HTTPStatus(response.status_code))]
+        CycleData.hand_off(identification, cycle, content, content_type)
         if not stop_and_go.is_running():
             user_id = self.request.headers.get("canvas-logged-in-user-id")
             executor.submit(Helper.with_cleanup(self.run_commander), identification, user_id)
@@ -368,6 +379,26 @@ class CaptureView(SimpleAPI):
             Constants.PROGRESS_END_OF_MESSAGES,
         )
 
+    def store_trace(
+        self,
+        identification: IdentificationParameters,
+        aws_s3: AwsS3Credentials,
+        trace: Tracer,
+        cycle: int,
+    ) -> None:
+        # the counters of the Canvas Science cache and of the rate limiters are cumulated since the start of the plugin
+        trace.set({"scienceCache": ScienceCache.statistics(), "rateLimiter": RateLimiter.statistics()})
+        document = Tracer.end_cycle(trace, cycle)
+        client_s3 = AwsS3(aws_s3)
+        if client_s3.is_ready():
+            creation_day = CachedSdk.get_discussion(identification.note_uuid).creation_day()
+            UploadQueue.enqueue(
+                identification.note_uuid,
+                aws_s3,
+                Tracer.store_path(identification, creation_day, cycle),
+                json.dumps(document, separators=(",", ":")),
+            )
+
     def run_commander(self, identification: IdentificationParameters, user_id: str) -> None:
         # add the running flag
         stop_and_go = StopAndGo.get(identification.note_uuid)
@@ -392,31 +423,86 @@ class CaptureView(SimpleAPI):
                 f"Workers: {settings.max_workers}"
             )
 
-            while True:
-                stop_and_go = StopAndGo.get(identification.note_uuid)
-                if not stop_and_go.consume_next_waiting_cycles(True):
-                    break
-                # stop_and_go.consume_delay()
-                # from canvas_sdk.clients.waiter import Waiter
-                # Waiter.sleep_for(40)
-                # effects = []
-                had_audio, effects = Commander.compute_cycle(identification, settings, aws_s3, stop_and_go.cycle())
-
-                # store the effects to be rendered
-                if effects:
+            # the transcription of the next waiting cycles runs while the commands of the current ones are computed
+            # the chart of the cycles is loaded while they are transcribed, or their transcription is completed
+            # cycles, start of their transcription and its future
+            prefetched: tuple[list[int], float, Any] | None = None
+            with (
+                ThreadPoolExecutor(max_workers=1) as transcriber,
+                ThreadPoolExecutor(max_workers=Constants.CHART_WARM_UP_MAX_WORKERS) as warmer,
+            ):
+                while True:
+                    started_at = time()
+                    trace = Tracer.begin_cycle(identification.note_uuid, {})
                     stop_and_go = StopAndGo.get(identification.note_uuid)
-                    stop_and_go.add_paused_effects(effects).save()
-                    # request the rendering
-                    self.trigger_render(identification.patient_uuid, identification.note_uuid, user_id)
-                # clean up and messages
-                MemoryLog.end_session(identification.note_uuid)
-                LlmTurnsStore.end_session(identification.note_uuid)
+                    transcription: Any = None
+                    if prefetched and stop_and_go.consume_waiting_cycles(prefetched[0], True):
+                        cycles, started_at, transcription = prefetched
+                    elif not stop_and_go.consume_waiting_cycles(cycles := stop_and_go.next_waiting_cycles(), True):
+                        break
+                    cache = Commander.chart_cache(identification, settings)
+                    cache.warm_up(warmer)
+                    if transcription is not None:
+                        cycle_parts = transcription.result()
+                    else:
+                        cycle_parts = Commander.transcribe_cycles(
+                            identification,
+                            settings,
+                            aws_s3,
+                            cycles,
+                            CachedSdk.get_discussion(identification.note_uuid).previous_transcript,
+                        )
+                    # coalesced cycles are computed as the last one,
+                    # which adopts the logs and spans of their transcription
+                    cycle = stop_and_go.cycle()
+                    Tracer.adopt(trace, cycle)
+                    MemoryLog.adopt(identification.note_uuid, cycle)
+                    trace.set({"cycles": cycles})
+                    if len(cycles) > 1:
+                        MemoryLog.instance(identification, Constants.MEMORY_LOG_LABEL, aws_s3).output(
+                            f"--> coalesced cycles: {cycles}"
+                        )
+                    prefetched = None
+                    if (waiting := stop_and_go.next_waiting_cycles()) and cycle_parts[-1].transcript:
+                        prefetched = (
+                            waiting,
+                            time(),
+                            transcriber.submit(
+                                Helper.with_cleanup(Commander.transcribe_cycles),
+                                identification,
+                                settings,
+                                aws_s3,
+                                waiting,
+                                Line.tail_of(cycle_parts[-1].transcript, settings.cycle_transcript_overlap),
+                            ),
+                        )
+
+                    had_audio, effects = Commander.compute_cycle_from(
+                        identification, settings, aws_s3, cycle, cycle_parts, cache, started_at
+                    )
+
+                    # store the effects to be rendered
+                    if effects:
+                        stop_and_go = StopAndGo.get(identification.note_uuid)
+                        stop_and_go.add_paused_effects(effects).save()
+                        # request the rendering
+                        span = Tracer.begin(identification.note_uuid, "trigger_render", trace)
+                        self.trigger_render(identification.patient_uuid, identification.note_uuid, user_id)
+                        span.end({"effects": len(effects)})
+                    self.store_trace(identification, aws_s3, trace, cycle)
+                    # clean up and messages
+                    MemoryLog.end_session(identification.note_uuid)
+                    LlmTurnsStore.end_session(identification.note_uuid)
+                    UploadQueue.prune(identification.note_uuid)
 
         except Exception as e:
             log.info("************************")
             log.error(f"Error while running commander: {e}", exc_info=True)
             log.info("************************")
         finally:
+            # the cycle begun but not computed is not traced, nor logged if transcribed ahead
+            Tracer.discard(identification.note_uuid)
+            MemoryLog.discard(identification.note_uuid)
             stop_and_go = StopAndGo.get(identification.note_uuid)
             # remove the running flag
             stop_and_go.set_running(False).save()
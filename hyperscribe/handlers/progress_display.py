@@ -10,6 +10,7 @@ from requests import post as requests_post
 from hyperscribe.libraries.authenticator import Authenticator
 from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.helper import Helper
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.progress_message import ProgressMessage
 from hyperscribe.structures.settings import Settings
@@ -59,6 +60,7 @@ class ProgressDisplay(SimpleAPIRoute):
         messages: list[ProgressMessage],
     ) -> None:
         if settings.send_progress:
+            span = Tracer.begin(identification.note_uuid, "ProgressDisplay.send_to_user")
             now = datetime.now(UTC).isoformat()
             requests_post(
                 Authenticator.presigned_url(
@@ -78,6 +80,7 @@ class ProgressDisplay(SimpleAPIRoute):
                 verify=True,
                 timeout=None,
             )
+            span.end({"messages": len(messages)})
 
     @classmethod
     def websocket_channel(cls, note_id: str) -> str:
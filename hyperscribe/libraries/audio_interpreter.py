@@ -7,11 +7,13 @@ from hyperscribe.commands.base_questionnaire import BaseQuestionnaire
 from hyperscribe.libraries.template_permissions import TemplatePermissions
 from hyperscribe.handlers.progress_display import ProgressDisplay
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.cycle_deadline import CycleDeadline
 from hyperscribe.libraries.helper import Helper
 from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.libraries.json_schema import JsonSchema
 from hyperscribe.libraries.limited_cache import LimitedCache
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.identification_parameters import IdentificationParameters
@@ -33,12 +35,17 @@ class AudioInterpreter:
         s3_credentials: AwsS3Credentials,
         cache: LimitedCache,
         identification: IdentificationParameters,
+        started_at: float | None = None,
     ) -> None:
         self.is_local_data = cache.is_local_data
         self.settings = settings
         self.s3_credentials = s3_credentials
         self.identification = identification
         self.cache = cache
+        self.deadline = CycleDeadline(
+            settings.audio_interval_seconds * Constants.CYCLE_DEADLINE_BUDGET_RATIO,
+            started_at,
+        )
         permissions = TemplatePermissions(identification.note_uuid)
         self._command_context = {
             class_name: instance
@@ -78,18 +85,34 @@ class AudioInterpreter:
             raise ValueError(f"{class_name} is not a known command")
         return self._command_context[class_name].command_parameters_schemas()
 
-    def combine_and_speaker_detection(self, audio_bytes: bytes, transcript_tail: list[Line]) -> JsonExtract:
-        memory_log = MemoryLog.instance(self.identification, "audio2transcript", self.s3_credentials)
+    def combine_and_speaker_detection(
+        self,
+        audio_bytes: bytes,
+        transcript_tail: list[Line],
+        cycle: int | None = None,
+    ) -> JsonExtract:
+        # without explicit cycle, the transcription is part of the cycle being computed
+        span = Tracer.begin(Tracer.cycle_key(self.identification.note_uuid, cycle), "combine_and_speaker_detection")
+        memory_log = MemoryLog.instance(self.identification, "audio2transcript", self.s3_credentials, cycle, span)
         transcriber = Helper.audio2texter(self.settings, memory_log)
         extension = "mp3"
         transcriber.add_audio(audio_bytes, extension)
 
         if transcriber.support_speaker_identification():
-            return self.combine_and_speaker_detection_single_step(transcriber, transcript_tail)
+            result = self.combine_and_speaker_detection_single_step(transcriber, transcript_tail)
         else:
-            memory_log = MemoryLog.instance(self.identification, "speakerDetection", self.s3_credentials)
+            memory_log = MemoryLog.instance(self.identification, "speakerDetection", self.s3_credentials, cycle, span)
             detector = Helper.chatter(self.settings, memory_log, ModelSpec.COMPLEX)
-            return self.combine_and_speaker_detection_double_step(transcriber, detector, transcript_tail)
+            result = self.combine_and_speaker_detection_double_step(transcriber, detector, transcript_tail)
+        span.end(
+            {
+                "vendor": self.settings.llm_audio.vendor,
+                "bytes": len(audio_bytes),
+                "lines": len(result.content),
+                "error": result.has_error,
+            }
+        )
+        return result
 
     @classmethod
     def combine_and_speaker_detection_double_step(
@@ -237,13 +260,27 @@ class AudioInterpreter:
         )
 
     def detect_instructions(self, discussion: list[Line], known_instructions: list[Instruction]) -> list:
+        span = Tracer.begin(self.identification.note_uuid, "detect_instructions")
         common_instructions = self.common_instructions()
         if len(known_instructions) < self.settings.hierarchical_detection_threshold:
-            return self.detect_instructions_flat(discussion, known_instructions, common_instructions, "allAtOnce")
+            result = self.detect_instructions_flat(
+                discussion,
+                known_instructions,
+                common_instructions,
+                "allAtOnce",
+                span,
+            )
         else:
-            return self.detect_instructions_per_section(discussion, known_instructions, common_instructions)
+            result = self.detect_instructions_per_section(discussion, known_instructions, common_instructions, span)
+        span.end({"vendor": self.settings.llm_text.vendor, "lines": len(discussion), "instructions": len(result)})
+        return result
 
-    def detect_sections(self, discussion: list[Line], common_instructions: list[Base]) -> list[SectionWithTranscript]:
+    def detect_sections(
+        self,
+        discussion: list[Line],
+        common_instructions: list[Base],
+        span: Tracer | None = None,
+    ) -> list[SectionWithTranscript]:
         schema = self.json_schema_sections(Constants.NOTE_SECTIONS)
         linked_command = defaultdict(list)
         for instruction in common_instructions:
@@ -288,8 +325,12 @@ class AudioInterpreter:
             "```",
             "",
         ]
-        memory_log = MemoryLog.instance(self.identification, "transcript2sections", self.s3_credentials)
-        chatter = Helper.chatter(self.settings, memory_log, ModelSpec.COMPLEX)
+        memory_log = MemoryLog.instance(self.identification, "transcript2sections", self.s3_credentials, None, span)
+        chatter = Helper.chatter(
+            self.settings,
+            memory_log,
+            self.deadline.model_spec(ModelSpec.COMPLEX, "transcript2sections"),
+        )
         return SectionWithTranscript.load_from(
             chatter.single_conversation(
                 system_prompt,
@@ -304,9 +345,10 @@ class AudioInterpreter:
         discussion: list[Line],
         known_instructions: list[Instruction],
         common_instructions: list[Base],
+        span: Tracer | None = None,
     ) -> list:
         result: list = []
-        detected_sections = self.detect_sections(discussion, common_instructions)
+        detected_sections = self.detect_sections(discussion, common_instructions, span)
 
         # keep the instructions which are not part of the detected sections
         section_names = [detected.section for detected in detected_sections]
@@ -342,6 +384,7 @@ class AudioInterpreter:
                 section_known_instructions,
                 section_instructions,
                 detected.section,
+                span,
             )
             # prevent uuid or index collisions
             count = len(result)
@@ -363,6 +406,7 @@ class AudioInterpreter:
         known_instructions: list[Instruction],
         common_instructions: list[Base],
         section: str,
+        span: Tracer | None = None,
     ) -> list:
         schema = self.json_schema_instructions([item.class_name() for item in common_instructions])
         definitions = [
@@ -431,10 +475,11 @@ class AudioInterpreter:
                     "But, in all cases, you must provide each and every new, updated and unchanged instructions.",
                 ],
             )
+        log_label = f"transcript2instructions:{section}"
         chatter = Helper.chatter(
             self.settings,
-            MemoryLog.instance(self.identification, f"transcript2instructions:{section}", self.s3_credentials),
-            ModelSpec.COMPLEX,
+            MemoryLog.instance(self.identification, log_label, self.s3_credentials, None, span),
+            self.deadline.model_spec(ModelSpec.COMPLEX, log_label),
         )
         result = chatter.single_conversation(system_prompt, user_prompt, [schema], None)
 
@@ -464,6 +509,7 @@ class AudioInterpreter:
         return result
 
     def create_sdk_command_parameters(self, instruction: Instruction) -> InstructionWithParameters | None:
+        span = Tracer.begin(self.identification.note_uuid, "create_sdk_command_parameters")
         result: InstructionWithParameters | None = None
 
         structures = [self.command_structures(instruction.instruction)]
@@ -511,7 +557,7 @@ class AudioInterpreter:
             "",
         ]
         log_label = f"{instruction.instruction}_{instruction.uuid}_instruction2parameters"
-        memory_log = MemoryLog.instance(self.identification, log_label, self.s3_credentials)
+        memory_log = MemoryLog.instance(self.identification, log_label, self.s3_credentials, None, span)
         chatter = Helper.chatter(self.settings, memory_log, ModelSpec.SIMPLER)
         response = chatter.single_conversation(system_prompt, user_prompt, schemas, instruction)
         if response:
@@ -524,13 +570,107 @@ class AudioInterpreter:
                 )
             ]
             ProgressDisplay.send_to_user(self.identification, self.settings, messages)
+        span.end({"vendor": self.settings.llm_text.vendor, "command": instruction.instruction, "found": bool(result)})
+        return result
+
+    def create_sdk_command_parameters_batch(
+        self,
+        instructions: list[Instruction],
+    ) -> list[InstructionWithParameters | None]:
+        # the instructions are expected to be of the same command,
+        # those not computed by the batch are returned as None, to be computed on their own by the caller
+        span = Tracer.begin(self.identification.note_uuid, "create_sdk_command_parameters_batch")
+        class_name = instructions[0].instruction
+        structure = self.command_structures(class_name)
+        schemas = self.command_schema(class_name)
+        if not schemas:
+            schemas = JsonSchema.get(["generic_parameters"])
+        batch_schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "array",
+            "minItems": len(instructions),
+            "maxItems": len(instructions),
+            "items": {"type": "object"},
+        }
+
+        system_prompt = [
+            f"The conversation is in the context of a clinical encounter between "
+            f"patient ({self.cache.demographic__str__(False)}) and licensed healthcare provider.",
+            "During the encounter, the user has identified instructions with key information to record "
+            "in its software.",
+            "The user will submit several instructions of the same kind and, for each of them, the linked "
+            "information grounded in the transcript, as well as the structure of the associated command.",
+            "Your task is to help the user by writing correctly detailed data for each structured command.",
+            "Unless explicitly instructed otherwise by the user for a specific command, "
+            "you must restrict your response to information explicitly present in the transcript "
+            "or prior instructions.",
+            "",
+            "Your response has to be a JSON Markdown block encapsulating the list of the filled structures, "
+            "one per instruction, in the order of the instructions.",
+            "",
+            f"Please, note that now is {datetime.now().isoformat()}.",
+        ]
+        user_prompt = []
+        for idx, instruction in enumerate(instructions, start=1):
+            user_prompt.extend([f"Instruction #{idx:02d}:", "```text", instruction.information, "```", ""])
+        user_prompt.extend(
+            [
+                "For each instruction, your task is to replace the values of the JSON object with "
+                "the relevant information:",
+                "```json",
+                json.dumps(structure, indent=1),
+                "```",
+                "",
+                "The explanations and constraints about the fields of each object are defined in this JSON Schema:",
+                "```json",
+                json.dumps(schemas[0].get("items", schemas[0]), indent=1),
+                "```",
+                "",
+                f"Your response must be a JSON list of exactly {len(instructions)} objects, the first object for "
+                "the instruction #01, the second object for the instruction #02, and so on.",
+                "Be sure each object validates the JSON Schema.",
+                "",
+                "Before finalizing, verify completeness by checking that patient concerns are accurately captured "
+                "and any provider recommendations, follow-up plans, and instructions are complete, specific "
+                "and are accurate given the conversation.",
+                "",
+            ]
+        )
+        log_label = f"{class_name}_{instructions[0].uuid}_instructions2parameters"
+        memory_log = MemoryLog.instance(self.identification, log_label, self.s3_credentials, None, span)
+        chatter = Helper.chatter(self.settings, memory_log, ModelSpec.SIMPLER)
+        # as single_conversation, but the turns are stored for each instruction computed by the batch
+        chatter.set_system_prompt(system_prompt)
+        chatter.set_user_prompt(user_prompt)
+        chat = chatter.chat([batch_schema])
+        response = chat.content[0] if chat.has_error is False and chat.content else []
+
+        result: list[InstructionWithParameters | None] = []
+        for idx, instruction in enumerate(instructions):
+            parameters = response[idx] if len(response) == len(instructions) else None
+            # each object is checked against the command schema, any failure is computed on its own
+            if parameters is None or LlmBase.json_validator([parameters], schemas[0]):
+                memory_log.log(f"--> instruction #{idx + 1:02d} computed on its own")
+                result.append(None)
+                continue
+            chatter.store_llm_turns(response, instruction)
+            result.append(InstructionWithParameters.add_parameters(instruction, parameters))
+            messages = [
+                ProgressMessage(
+                    message=f"parameters identified for {class_name}",
+                    section=Constants.PROGRESS_SECTION_TECHNICAL,
+                )
+            ]
+            ProgressDisplay.send_to_user(self.identification, self.settings, messages)
+        span.end({"vendor": self.settings.llm_text.vendor, "command": class_name, "instructions": len(instructions)})
         return result
 
     def create_sdk_command_from(self, direction: InstructionWithParameters) -> InstructionWithCommand | None:
         for class_name, instance in self._command_context.items():
             if direction.instruction == class_name:
+                span = Tracer.begin(self.identification.note_uuid, "create_sdk_command_from")
                 log_label = f"{direction.instruction}_{direction.uuid}_parameters2command"
-                memory_log = MemoryLog.instance(self.identification, log_label, self.s3_credentials)
+                memory_log = MemoryLog.instance(self.identification, log_label, self.s3_credentials, None, span)
                 chatter = Helper.chatter(self.settings, memory_log, ModelSpec.SIMPLER)
                 result = instance.command_from_json_with_summary(direction, chatter)
                 if result:
@@ -547,6 +687,7 @@ class AudioInterpreter:
                         messages.append(ProgressMessage(message=summary, section=section))
 
                     ProgressDisplay.send_to_user(self.identification, self.settings, messages)
+                span.end({"vendor": self.settings.llm_text.vendor, "command": class_name, "found": bool(result)})
                 return result
         return None
 
@@ -554,13 +695,16 @@ class AudioInterpreter:
         for class_name, instance in self._command_context.items():
             if direction.instruction == class_name:
                 assert isinstance(instance, BaseQuestionnaire)
+                span = Tracer.begin(self.identification.note_uuid, "update_questionnaire")
                 log_label = f"{direction.instruction}_{direction.uuid}_questionnaire_update"
                 chatter = Helper.chatter(
                     self.settings,
-                    MemoryLog.instance(self.identification, log_label, self.s3_credentials),
-                    ModelSpec.COMPLEX,
+                    MemoryLog.instance(self.identification, log_label, self.s3_credentials, None, span),
+                    self.deadline.model_spec(ModelSpec.COMPLEX, log_label),
                 )
-                if questionnaire := instance.update_from_transcript(discussion, direction, chatter):
+                questionnaire = instance.update_from_transcript(discussion, direction, chatter)
+                span.end({"vendor": self.settings.llm_text.vendor, "command": class_name, "found": bool(questionnaire)})
+                if questionnaire:
                     command = instance.command_from_questionnaire(direction.uuid, questionnaire)
                     return InstructionWithCommand(
                         uuid=direction.uuid,
@@ -33,7 +33,11 @@ class AuditorLive(AuditorBase):
                 f"{self.identification.note_uuid}/"
                 f"transcript_{self.cycle:02d}.log"
             )
-            client_s3.upload_text_to_s3(store_path, json.dumps([line.to_json() for line in transcript], indent=2))
+            client_s3.upload_text_to_s3(
+                store_path,
+                json.dumps([line.to_json() for line in transcript], separators=(",", ":")),
+                self.identification.note_uuid,
+            )
         return True
 
     def found_instructions(
@@ -5,11 +5,17 @@ from http import HTTPStatus
 from re import compile as re_compile, DOTALL, search as re_search
 from urllib.parse import quote
 
-from requests import get as requests_get, put as requests_put, Response
+from canvas_sdk.utils.http import ThreadPoolExecutor
+from requests import Response, Session
 
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.aws_s3_object import AwsS3Object
 
+SIGNING_KEYS: dict[str, tuple[str, bytes]] = {}  # derived signing key and its day, per access key and region
+
 
 class AwsS3:
     ALGORITHM = "AWS4-HMAC-SHA256"
@@ -39,14 +45,28 @@ class AwsS3:
     def get_host(self) -> str:
         return f"{self.bucket}.s3.{self.region}.amazonaws.com"
 
-    def get_signature_key(self, amz_date: str, canonical_request: str) -> tuple[str, str]:
-        date_stamp = amz_date[:8]
-        credential_scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+    def session(self) -> Session:
+        # keep-alive connections, one session per bucket shared by all the clients and threads
+        return HttpPool.session(self.get_host())
 
+    def signing_key(self, date_stamp: str) -> bytes:
+        # the derived key only changes with the day, the previous day's key is replaced
+        cache_key = f"{self.aws_key}/{self.region}"
+        cached = SIGNING_KEYS.get(cache_key)
+        if cached and cached[0] == date_stamp:
+            return cached[1]
         k_date = hmac_new(("AWS4" + self.aws_secret).encode("utf-8"), date_stamp.encode("utf-8"), sha256).digest()
         k_region = hmac_new(k_date, self.region.encode("utf-8"), sha256).digest()
         k_service = hmac_new(k_region, b"s3", sha256).digest()
-        k_signing = hmac_new(k_service, b"aws4_request", sha256).digest()
+        result = hmac_new(k_service, b"aws4_request", sha256).digest()
+        SIGNING_KEYS[cache_key] = (date_stamp, result)
+        return result
+
+    def get_signature_key(self, amz_date: str, canonical_request: str) -> tuple[str, str]:
+        date_stamp = amz_date[:8]
+        credential_scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+
+        k_signing = self.signing_key(date_stamp)
         string_to_sign = (
             f"{self.ALGORITHM}\n{amz_date}\n{credential_scope}\n{sha256(canonical_request.encode('utf-8')).hexdigest()}"
         )
@@ -93,28 +113,63 @@ class AwsS3:
             return Response()
         headers = self.headers(object_key)
         endpoint = f"https://{headers['Host']}/{object_key}"
-        return requests_get(endpoint, headers=headers)
+        return self.session().get(endpoint, headers=headers)
 
-    def upload_text_to_s3(self, object_key: str, data: str) -> Response:
+    def upload_text_to_s3(self, object_key: str, data: str, note_uuid: str = "") -> Response:
+        # the upload is traced as part of the cycle of the note, if provided
         if not self.is_ready():
             return Response()
+        span = Tracer.begin(note_uuid, "AwsS3.upload")
         content_type = "text/plain"
         headers = self.headers(object_key, (data.encode(), content_type)) | {
             "Content-Type": content_type,
             "Content-Length": str(len(data)),
         }
         endpoint = f"https://{headers['Host']}/{object_key}"
-        return requests_put(endpoint, headers=headers, data=data)
+        result = self.session().put(endpoint, headers=headers, data=data)
+        span.end({"bytes": len(data), "status": result.status_code})
+        return result
 
-    def upload_binary_to_s3(self, object_key: str, binary_data: bytes, content_type: str) -> Response:
+    def upload_binary_to_s3(
+        self,
+        object_key: str,
+        binary_data: bytes,
+        content_type: str,
+        note_uuid: str = "",
+    ) -> Response:
         if not self.is_ready():
             return Response()
+        span = Tracer.begin(note_uuid, "AwsS3.upload")
         headers = self.headers(object_key, (binary_data, content_type)) | {
             "Content-Type": content_type,
             "Content-Length": str(len(binary_data)),
         }
         endpoint = f"https://{headers['Host']}/{object_key}"
-        return requests_put(endpoint, headers=headers, data=binary_data)
+        result = self.session().put(endpoint, headers=headers, data=binary_data)
+        span.end({"bytes": len(binary_data), "status": result.status_code})
+        return result
+
+    def get_many(self, object_keys: list[str]) -> list[Response]:
+        # the responses are in the same order as the keys
+        if not object_keys:
+            return []
+        max_workers = min(len(object_keys), Constants.AWS_S3_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as fetcher:
+            return list(fetcher.map(self.access_s3_object, object_keys))
+
+    def put_many(self, objects: list[tuple[str, str]]) -> list[Response]:
+        # the responses are in the same order as the (key, text) pairs
+        if not objects:
+            return []
+        max_workers = min(len(objects), Constants.AWS_S3_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as uploader:
+            return list(
+                uploader.map(
+                    self.upload_text_to_s3,
+                    [object_key for object_key, _ in objects],
+                    [data for _, data in objects],
+                )
+            )
 
     def list_s3_objects(self, prefix: str) -> list[AwsS3Object]:
         result: list[AwsS3Object] = []
@@ -136,7 +191,7 @@ class AwsS3:
 
             headers = self.headers("", params=params)
             endpoint = f"https://{headers['Host']}"
-            response = requests_get(endpoint, params=params, headers=headers)
+            response = self.session().get(endpoint, params=params, headers=headers)
             response_text = response.content.decode("utf-8")
 
             if response.status_code != HTTPStatus.OK.value:
@@ -19,6 +19,7 @@ class CachedSdk:
         self.note_uuid = note_uuid
         self.previous_instructions: list[Instruction] = []
         self.previous_transcript: list[Line] = []
+        self.deferred_instructions: list[Instruction] = []  # updates left to the next cycle by the deadline
 
     def set_cycle(self, cycle: int) -> None:
         self.updated = datetime.now(UTC)
@@ -47,6 +48,7 @@ class CachedSdk:
             "note_uuid": self.note_uuid,
             "previous_instructions": [instruction.to_json(False) for instruction in self.previous_instructions],
             "previous_transcript": [line.to_json() for line in self.previous_transcript],
+            "deferred_instructions": [instruction.to_json(True) for instruction in self.deferred_instructions],
         }
 
     @classmethod
@@ -71,4 +73,6 @@ class CachedSdk:
         result.cycle = dictionary["cycle"]
         result.previous_instructions = Instruction.load_from_json(dictionary["previous_instructions"])
         result.previous_transcript = Line.load_from_json(dictionary["previous_transcript"])
+        # the discussions cached before the deadline have no deferred instructions
+        result.deferred_instructions = Instruction.load_from_json(dictionary.get("deferred_instructions", []))
         return result
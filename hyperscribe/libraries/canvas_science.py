@@ -1,13 +1,15 @@
 from http import HTTPStatus
-from typing import Type
+from typing import Any, Type
 from urllib.parse import urlencode
 
 from canvas_sdk.commands.commands.allergy import AllergenType
 from canvas_sdk.commands.constants import ServiceProvider
-from canvas_sdk.utils.http import science_http, ontologies_http
+from canvas_sdk.utils.http import ThreadPoolExecutor, science_http, ontologies_http
 from logger import log
 
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.rate_limiter import RateLimiter
+from hyperscribe.libraries.science_cache import ScienceCache
 from hyperscribe.structures.allergy_detail import AllergyDetail
 from hyperscribe.structures.icd10_condition import Icd10Condition
 from hyperscribe.structures.imaging_report import ImagingReport
@@ -16,6 +18,9 @@ from hyperscribe.structures.medical_concept import MedicalConcept
 from hyperscribe.structures.medication_detail import MedicationDetail
 from hyperscribe.structures.medication_detail_quantity import MedicationDetailQuantity
 
+IN_FLIGHT: dict[str, Any] = {}  # futures of the lookups being sent, by cache key
+searcher = ThreadPoolExecutor(max_workers=Constants.CANVAS_SCIENCE_LOOKUP_WORKERS)
+
 
 # note that the "# type: ignore" could be removed if "from typing import TypeVar" was allowed
 class CanvasScience:
@@ -55,24 +60,14 @@ class CanvasScience:
         returned_class: Type[MedicalConcept | Icd10Condition | MedicationDetail | ImagingReport],
     ) -> list[MedicalConcept | Icd10Condition | MedicationDetail | ImagingReport]:
         result: list[MedicalConcept | Icd10Condition | MedicationDetail | ImagingReport] = []
-
-        # from canvas_sdk.utils.http import ThreadPoolExecutor
-        # with ThreadPoolExecutor(max_workers=10) as get_runner:
-        #     all_concepts_thread = list(get_runner.map(lambda expression: cls.get_attempts(
-        #         url,
-        #         headers=headers,
-        #         params={
-        #             "query": expression,
-        #             "format": "json",
-        #             "limit": 10,
-        #         }), expressions))
+        codes: list = []
 
         params = {"format": "json", "limit": 10}
-        all_concepts: list = [
-            cls.get_attempts(url, params | {"query": expression}, False)
-            for expression in expressions
-            if expression.strip()
-        ]
+        all_concepts = cls.fan_out(
+            url,
+            [params | {"query": expression} for expression in cls.distinct_expressions(expressions)],
+            False,
+        )
         for concepts in all_concepts:
             for concept in concepts:
                 if returned_class == MedicationDetail:
@@ -95,13 +90,17 @@ class CanvasScience:
                             quantities=quantities,
                         ),
                     )
+                    codes.append(concept["med_medication_id"])
                 elif returned_class == Icd10Condition:
                     result.append(Icd10Condition(code=concept["icd10_code"], label=concept["icd10_text"]))
+                    codes.append(concept["icd10_code"])
                 elif returned_class == ImagingReport:
                     result.append(ImagingReport(code=concept["code"], name=concept["name"]))
+                    codes.append(concept["code"])
                 else:
                     result.append(MedicalConcept(concept_id=concept["concept_id"], term=concept["term"]))
-        return result
+                    codes.append(concept["concept_id"])
+        return cls.distinct_concepts(result, codes)
 
     @classmethod
     def search_allergy(
@@ -110,11 +109,18 @@ class CanvasScience:
         concept_types: list[AllergenType],
     ) -> list[AllergyDetail]:
         result: list = []
+        codes: list = []
         url = "/fdb/allergy/"
         type_values = [t.value for t in concept_types]
-        for expression in expressions:
-            params = {"dam_allergen_concept_id_description__fts": expression}
-            concepts = cls.get_attempts(url, params, True)
+        all_concepts = cls.fan_out(
+            url,
+            [
+                {"dam_allergen_concept_id_description__fts": expression}
+                for expression in cls.distinct_expressions(expressions)
+            ],
+            True,
+        )
+        for concepts in all_concepts:
             for concept in concepts:
                 if concept["dam_allergen_concept_id_type"] in type_values:
                     result.append(
@@ -125,15 +131,20 @@ class CanvasScience:
                             concept_id_type=concept["dam_allergen_concept_id_type"],
                         ),
                     )
-        return result
+                    codes.append((concept["dam_allergen_concept_id_type"], int(concept["dam_allergen_concept_id"])))
+        return cls.distinct_concepts(result, codes)
 
     @classmethod
     def search_immunization(cls, expressions: list[str]) -> list[ImmunizationDetail]:
         result: list = []
+        codes: list = []
         url = "/cpt/immunization/"
-        for expression in expressions:
-            params = {"name_or_code": expression}
-            concepts = cls.get_attempts(url, params, True)
+        all_concepts = cls.fan_out(
+            url,
+            [{"name_or_code": expression} for expression in cls.distinct_expressions(expressions)],
+            True,
+        )
+        for concepts in all_concepts:
             for concept in concepts:
                 result.append(
                     ImmunizationDetail(
@@ -143,7 +154,8 @@ class CanvasScience:
                         cvx_description=concept["cvx_description"],
                     ),
                 )
-        return result
+                codes.append((concept["cpt_code"], concept["cvx_code"]))
+        return cls.distinct_concepts(result, codes)
 
     @classmethod
     def search_contacts(cls, free_text_information: str, zip_codes: list[str]) -> list[ServiceProvider]:
@@ -169,14 +181,82 @@ class CanvasScience:
 
         return result
 
+    @classmethod
+    def distinct_expressions(cls, expressions: list[str]) -> list[str]:
+        # the empty expressions are skipped, and the same expression (case and spaces aside) is searched once
+        result: list[str] = []
+        normalized: set[str] = set()
+        for expression in expressions:
+            cleaned = " ".join(expression.split())
+            if cleaned and cleaned.lower() not in normalized:
+                normalized.add(cleaned.lower())
+                result.append(cleaned)
+        return result
+
+    @classmethod
+    def distinct_concepts(cls, concepts: list, codes: list) -> list:
+        # the concepts found by several expressions are kept once, at their first position
+        result: list = []
+        found: set = set()
+        for concept, code in zip(concepts, codes):
+            if code not in found:
+                found.add(code)
+                result.append(concept)
+        return result
+
+    @classmethod
+    def fan_out(cls, url: str, queries: list[dict], is_ontologies: bool) -> list[list]:
+        # the queries not in the cache are sent concurrently, through a pool shared by all the notes,
+        # the results are returned in the order of the queries
+        keys = [ScienceCache.key(url, query, is_ontologies) for query in queries]
+        lookups: list = []
+        for key, query in zip(keys, queries):
+            if (cached := ScienceCache.get(key)) is None:
+                cached = cls.flight(key, url, query, is_ontologies)
+            lookups.append(cached)
+
+        result: list[list] = []
+        for key, lookup in zip(keys, lookups):
+            if isinstance(lookup, list):
+                result.append(lookup)
+                continue
+            result.append(lookup.result() or [])
+            if IN_FLIGHT.get(key) is lookup:
+                IN_FLIGHT.pop(key, None)
+        return result
+
+    @classmethod
+    def flight(cls, key: str, url: str, params: dict, is_ontologies: bool) -> Any:
+        # identical lookups are coalesced: the first one is sent, the next ones wait for its response
+        if (future := IN_FLIGHT.get(key)) is not None and not future.done():
+            ScienceCache.count("coalesced")
+            return future
+        IN_FLIGHT[key] = searcher.submit(cls.request_and_store, key, url, params, is_ontologies)
+        return IN_FLIGHT[key]
+
+    @classmethod
+    def request_and_store(cls, key: str, url: str, params: dict, is_ontologies: bool) -> list | None:
+        result = cls.request_attempts(url, params, is_ontologies)
+        if result is not None:
+            ScienceCache.set(key, result)
+        return result
+
     @classmethod
     def get_attempts(cls, url: str, params: dict, is_ontologies: bool) -> list:
+        return cls.fan_out(url, [params], is_ontologies)[0]
+
+    @classmethod
+    def request_attempts(cls, url: str, params: dict, is_ontologies: bool) -> list | None:
+        # None when the service could not be reached, so the failure is not cached
         headers = {"Content-Type": "application/json"}
 
         if params:
             url = f"{url}?{urlencode(params)}"
 
-        for _ in range(Constants.MAX_ATTEMPTS_CANVAS_SERVICES):
+        limiter = RateLimiter.for_key(Constants.HTTP_POOL_CANVAS_SERVICES)
+        for attempt in range(Constants.MAX_ATTEMPTS_CANVAS_SERVICES):
+            status_code = 0
+            ticket = limiter.acquire()
             try:
                 if is_ontologies:
                     response = ontologies_http.get_json(url, headers)
@@ -184,11 +264,16 @@ class CanvasScience:
                 else:
                     response = science_http.get_json(url, headers)
                     source = "science"
+                status_code = response.status_code
+                limiter.release(ticket, status_code, response.headers)
 
                 if response.status_code == HTTPStatus.OK.value:
                     return response.json().get("results") or []
 
                 log.info(f"get response code: {response.status_code} - {source}: {url}")
             except Exception as e:
+                limiter.release(ticket, 0, {})
                 log.info(f"error raised by Canvas Service: {e}")
-        return []
+            if attempt + 1 < Constants.MAX_ATTEMPTS_CANVAS_SERVICES and RateLimiter.is_retryable(status_code):
+                limiter.backoff(attempt)
+        return None
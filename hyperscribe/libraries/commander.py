@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from time import time
-from typing import Iterable
+from typing import Any, Iterable
 
 from canvas_sdk.effects import Effect, EffectType
 from canvas_sdk.protocols import BaseProtocol
@@ -15,11 +15,15 @@ from hyperscribe.libraries.auditor_base import AuditorBase
 from hyperscribe.libraries.auditor_live import AuditorLive
 from hyperscribe.libraries.aws_s3 import AwsS3
 from hyperscribe.libraries.cached_sdk import CachedSdk
+from hyperscribe.libraries.completion_signal import CompletionSignal
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.cycle_deadline import CycleDeadline
 from hyperscribe.libraries.helper import Helper
 from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.libraries.limited_cache import LimitedCache
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.tracer import Tracer
+from hyperscribe.libraries.upload_queue import UploadQueue
 from hyperscribe.structures.access_policy import AccessPolicy
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.coded_item import CodedItem
@@ -27,6 +31,7 @@ from hyperscribe.structures.cycle_data import CycleData
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.instruction import Instruction
 from hyperscribe.structures.instruction_with_command import InstructionWithCommand
+from hyperscribe.structures.instruction_with_parameters import InstructionWithParameters
 from hyperscribe.structures.line import Line
 from hyperscribe.structures.progress_message import ProgressMessage
 from hyperscribe.structures.settings import Settings
@@ -41,10 +46,115 @@ class Commander(BaseProtocol):
         aws_s3: AwsS3Credentials,
         chunk_index: int,
     ) -> tuple[bool, list[Effect]]:
-        cycle_data = CycleData.from_s3(aws_s3, identification, chunk_index)
+        started_at = time()
+        with ThreadPoolExecutor(max_workers=Constants.CHART_WARM_UP_MAX_WORKERS) as warmer:
+            # the chart is loaded while the cycle is retrieved and computed
+            cache = cls.chart_cache(identification, settings)
+            cache.warm_up(warmer)
+            cycle_data = CycleData.retrieve(aws_s3, identification, chunk_index)
+            return cls.compute_cycle_from(
+                identification,
+                settings,
+                aws_s3,
+                chunk_index,
+                [cycle_data],
+                cache,
+                started_at,
+            )
+
+    @classmethod
+    def chart_cache(cls, identification: IdentificationParameters, settings: Settings) -> LimitedCache:
+        # the chart sections retrieved during the previous cycles are reused if still up to date
+        current_commands = Command.objects.filter(
+            patient__id=identification.patient_uuid,
+            note__id=identification.note_uuid,
+            state="staged",  # <--- TODO use an Enum when provided
+        ).order_by("dbid")
+        return LimitedCache.from_snapshot(
+            identification.note_uuid,
+            identification.patient_uuid,
+            identification.provider_uuid,
+            cls.existing_commands_to_coded_items(current_commands, settings.commands_policy, True),
+        )
+
+    @classmethod
+    def transcribe_cycles(
+        cls,
+        identification: IdentificationParameters,
+        settings: Settings,
+        aws_s3: AwsS3Credentials,
+        chunk_indexes: list[int],
+        previous_transcript: list[Line],
+    ) -> list[CycleData]:
+        # first stage of the cycles: retrieve the data and transcribe the audio, if any,
+        # when several cycles are coalesced, the consecutive chunks of the same source are transcribed at once
+        # and each source stays a separate part, so an audio not transcribed yet is not mixed with a text
+        # the cycles are computed as the last one, which may be transcribed while the previous one is computed,
+        # so its logs and spans are kept apart until its computation adopts them
+        computed_cycle = chunk_indexes[-1]
+        root = Tracer.begin_cycle(Tracer.cycle_key(identification.note_uuid, computed_cycle), {})
+        same_sources: list[list[CycleData]] = []
+        for chunk_index in chunk_indexes:
+            cycle = CycleData.retrieve(aws_s3, identification, chunk_index, root)
+            if same_sources and same_sources[-1][-1].source == cycle.source:
+                same_sources[-1].append(cycle)
+            else:
+                same_sources.append([cycle])
+
+        transcribed: list[CycleData] = []
+        for same_source in same_sources:
+            if transcribed and transcribed[-1].transcript:
+                previous_transcript = Line.tail_of(transcribed[-1].transcript, settings.cycle_transcript_overlap)
+            cycle_data = CycleData.coalesce(same_source)
+            transcribed.append(
+                cls.transcribe_cycle(identification, settings, aws_s3, computed_cycle, cycle_data, previous_transcript)
+            )
+        return transcribed
+
+    @classmethod
+    def transcribe_cycle(
+        cls,
+        identification: IdentificationParameters,
+        settings: Settings,
+        aws_s3: AwsS3Credentials,
+        chunk_index: int,
+        cycle_data: CycleData,
+        previous_transcript: list[Line],
+    ) -> CycleData:
+        # in case of error, the audio is returned as is and the transcription is attempted again in the second stage
+        if not (cycle_data.is_audio() and cycle_data.length()):
+            return cycle_data
+
+        cache = LimitedCache(identification.patient_uuid, identification.provider_uuid, {})
+        chatter = AudioInterpreter(settings, aws_s3, cache, identification)
+        response = chatter.combine_and_speaker_detection(cycle_data.audio, previous_transcript, chunk_index)
+        if response.has_error is True:
+            memory_log = MemoryLog.instance(identification, Constants.MEMORY_LOG_LABEL, aws_s3, chunk_index)
+            memory_log.output(f"--> transcript of the cycle {chunk_index} encountered: {response.error}")
+            return cycle_data
+        return CycleData(
+            audio=cycle_data.audio,
+            transcript=Line.load_from_json(response.content),
+            source=cycle_data.source,
+        )
+
+    @classmethod
+    def compute_cycle_from(
+        cls,
+        identification: IdentificationParameters,
+        settings: Settings,
+        aws_s3: AwsS3Credentials,
+        chunk_index: int,
+        cycle_parts: list[CycleData],
+        cache: LimitedCache,
+        started_at: float,
+    ) -> tuple[bool, list[Effect]]:
+        # the chart is expected to be loading since the transcription, the cache waits for the sections it needs
+        # the deadline of the cycle runs since its retrieval and transcription started
         memory_log = MemoryLog.instance(identification, Constants.MEMORY_LOG_LABEL, aws_s3)
-        memory_log.output(f"--> cycle length: {cycle_data.length()}")
-        if not cycle_data.length():
+        length = sum([part.length() for part in cycle_parts])
+        memory_log.output(f"--> cycle length: {length}")
+        if not length:
             return False, []
 
         messages = [
@@ -63,13 +173,8 @@ class Commander(BaseProtocol):
             note__id=identification.note_uuid,
             state="staged",  # <--- TODO use an Enum when provided
         ).order_by("dbid")
-
-        cache = LimitedCache(
-            identification.patient_uuid,
-            identification.provider_uuid,
-            cls.existing_commands_to_coded_items(current_commands, settings.commands_policy, True),
-        )
-        chatter = AudioInterpreter(settings, aws_s3, cache, identification)
+        chatter = AudioInterpreter(settings, aws_s3, cache, identification, started_at)
+        chatter.deadline.carried = discussion.deferred_instructions
         previous_instructions = cls.existing_commands_to_instructions(
             current_commands,
             discussion.previous_instructions,
@@ -77,12 +182,14 @@ class Commander(BaseProtocol):
         auditor = AuditorLive(chunk_index, settings, aws_s3, identification)
         discussion.previous_instructions, results, discussion.previous_transcript = cls.audio2commands(
             auditor,
-            cycle_data,
+            cycle_parts,
             chatter,
             previous_instructions,
             discussion.previous_transcript,
         )
+        discussion.deferred_instructions = chatter.deadline.pending()
         discussion.save()
+        cache.store_snapshot(identification.note_uuid)
 
         # summary
         memory_log.output(f"<===  note: {identification.note_uuid} ===>")
@@ -91,6 +198,9 @@ class Commander(BaseProtocol):
         memory_log.output("instructions:")
         for instruction in discussion.previous_instructions:
             memory_log.output(f"- {instruction.limited_str()}")
+        memory_log.output(f"degraded decisions: {len(chatter.deadline.degraded)}")
+        for decision in chatter.deadline.degraded:
+            memory_log.output(f"- {decision}")
         memory_log.output("<-------->")
         for result in results:
             memory_log.output(f"command: {EffectType.Name(result.type)}")
@@ -106,30 +216,45 @@ class Commander(BaseProtocol):
                 f"{discussion.cycle:02}.log"
             )
             memory_log.output(f"--> log path: {remote_path}")
-            client_s3.upload_text_to_s3(remote_path, MemoryLog.end_session(identification.note_uuid))
+            UploadQueue.enqueue(
+                identification.note_uuid,
+                aws_s3,
+                remote_path,
+                MemoryLog.end_session(identification.note_uuid),
+            )
         return True, results
 
     @classmethod
     def audio2commands(
         cls,
         auditor: AuditorBase,
-        cycle_data: CycleData,
+        cycle_parts: list[CycleData],
         chatter: AudioInterpreter,
         previous_instructions: list[Instruction],
         previous_transcript: list[Line],
     ) -> tuple[list[Instruction], list[Effect], list[Line]]:
         memory_log = MemoryLog.instance(chatter.identification, Constants.MEMORY_LOG_LABEL, chatter.s3_credentials)
-        if cycle_data.is_audio():
-            response = chatter.combine_and_speaker_detection(cycle_data.audio, previous_transcript)
-            if response.has_error is True:
-                memory_log.output(f"--> transcript encountered: {response.error}")
-                return previous_instructions, [], []  # <--- let's continue even if we were not able to get a transcript
-
-            transcript = Line.load_from_json(response.content)
-        else:
-            transcript = cycle_data.transcript
-
-        auditor.identified_transcript(cycle_data.audio, transcript)
+        transcript: list[Line] = []
+        failed = False
+        for part in cycle_parts:
+            if part.is_audio() and not part.transcript:
+                if transcript:
+                    previous_transcript = Line.tail_of(transcript, chatter.settings.cycle_transcript_overlap)
+                response = chatter.combine_and_speaker_detection(part.audio, previous_transcript)
+                if response.has_error is True:
+                    # <--- let's continue with the other parts even if we were not able to get this transcript
+                    memory_log.output(f"--> transcript encountered: {response.error}")
+                    failed = True
+                    continue
+                transcript = transcript + Line.load_from_json(response.content)
+            else:
+                transcript = transcript + part.transcript
+        if failed and not transcript:
+            return previous_instructions, [], []
+
+        audio_parts = [part for part in cycle_parts if part.is_audio()]
+        audio = CycleData.coalesce(audio_parts).audio if audio_parts else b""
+        auditor.identified_transcript(audio, transcript)
         memory_log.output(f"--> transcript back and forth: {len(transcript)}")
         messages = [
             ProgressMessage(
@@ -218,6 +343,9 @@ class Commander(BaseProtocol):
                 if label not in detected_updated:
                     detected_updated[label] = 0
                 detected_updated[label] = detected_updated[label] + 1
+        computed_instructions.extend(
+            chatter.deadline.carried_over(cumulated_instructions, past_uuids, computed_instructions)
+        )
 
         memory_log.output(f"--> computed instructions: {len(computed_instructions)}")
 
@@ -235,36 +363,7 @@ class Commander(BaseProtocol):
         ]
         ProgressDisplay.send_to_user(chatter.identification, chatter.settings, messages)
 
-        max_workers = max(1, chatter.settings.max_workers)
-        with ThreadPoolExecutor(max_workers=max_workers) as builder:
-            instructions_with_parameter = [
-                instruction
-                for instruction in builder.map(
-                    Helper.with_cleanup(chatter.create_sdk_command_parameters),
-                    computed_instructions,
-                )
-                if instruction is not None
-            ]
-        memory_log.output(f"--> computed commands: {len(instructions_with_parameter)}")
-        messages = [
-            ProgressMessage(
-                message=f"parameters computation done ({len(instructions_with_parameter)})",
-                section=Constants.PROGRESS_SECTION_TECHNICAL,
-            )
-        ]
-        ProgressDisplay.send_to_user(chatter.identification, chatter.settings, messages)
-        auditor.computed_parameters(instructions_with_parameter)
-
-        instructions_with_command: list[InstructionWithCommand] = []
-        with ThreadPoolExecutor(max_workers=max_workers) as builder:
-            for instruction_w_cmd in builder.map(
-                Helper.with_cleanup(chatter.create_sdk_command_from),
-                instructions_with_parameter,
-            ):
-                if instruction_w_cmd is not None:
-                    if instruction_w_cmd.uuid in past_uuids:
-                        instruction_w_cmd.command.command_uuid = instruction_w_cmd.uuid
-                    instructions_with_command.append(instruction_w_cmd)
+        instructions_with_command = cls.instructions2commands(auditor, chatter, computed_instructions, past_uuids)
 
         memory_log.output(f"DURATION COMMONS: {int((time() - start) * 1000)}")
         messages = [
@@ -274,7 +373,6 @@ class Commander(BaseProtocol):
             )
         ]
         ProgressDisplay.send_to_user(chatter.identification, chatter.settings, messages)
-        auditor.computed_commands(instructions_with_command)
 
         if chatter.is_local_data:
             # this is the case when running an evaluation against a recorded 'limited cache',
@@ -285,6 +383,131 @@ class Commander(BaseProtocol):
             i.command.edit() if i.uuid in past_uuids else i.command.originate() for i in instructions_with_command
         ]
 
+    @classmethod
+    def instructions2commands(
+        cls,
+        auditor: AuditorBase,
+        chatter: AudioInterpreter,
+        instructions: list[Instruction],
+        past_uuids: dict[str, Instruction],
+    ) -> list[InstructionWithCommand]:
+        # each instruction goes from parameters to command as soon as its own previous step is done,
+        # so a slow instruction does not hold back the others
+        # the instructions of the same command share the parameters computation,
+        # those the batch could not compute are submitted to the same pool to be computed on their own
+        # the auditor is called from this thread only, as it is not safe to call it concurrently
+        memory_log = MemoryLog.instance(chatter.identification, Constants.MEMORY_LOG_LABEL, chatter.s3_credentials)
+        max_workers = max(1, chatter.settings.max_workers)
+        signal = CompletionSignal()
+        with ThreadPoolExecutor(max_workers=max_workers) as builder:
+            pending: list[tuple[list[int], Any]] = []
+            for batch in cls.parameters_batches(instructions):
+                if len(batch) > 1:
+                    # the batched instructions are checked against the deadline when submitted, the others when started
+                    batch = [idx for idx in batch if not chatter.deadline.defers(instructions[idx])]
+                if not batch:
+                    continue
+                if len(batch) == 1:
+                    future = builder.submit(
+                        Helper.with_cleanup(cls.instruction2parameters),
+                        chatter,
+                        instructions[batch[0]],
+                    )
+                else:
+                    future = builder.submit(
+                        Helper.with_cleanup(chatter.create_sdk_command_parameters_batch),
+                        [instructions[idx] for idx in batch],
+                    )
+                pending.append((batch, signal.watch(future)))
+
+            # the parameters and the commands are handled in their completion order
+            parameters: dict[int, InstructionWithParameters] = {}
+            building: dict[int, Any] = {}
+            commands: dict[int, InstructionWithCommand] = {}
+            while pending or building:
+                signal.arm()
+                done = [(batch, future) for batch, future in pending if future.done()]
+                built = [idx for idx, future in building.items() if future.done()]
+                if not done and not built:
+                    signal.wait()
+                for batch, future in done:
+                    pending.remove((batch, future))
+                    if len(batch) == 1:
+                        results = [future.result()]
+                    else:
+                        memory_log.output(f"--> batched parameters: {len(batch)}")
+                        results = future.result()
+                    for idx, instruction_w_param in zip(batch, results):
+                        if instruction_w_param is None and len(batch) > 1:
+                            retry = builder.submit(
+                                Helper.with_cleanup(cls.instruction2parameters),
+                                chatter,
+                                instructions[idx],
+                            )
+                            pending.append(([idx], signal.watch(retry)))
+                        elif instruction_w_param is not None:
+                            parameters[idx] = instruction_w_param
+                            building[idx] = signal.watch(
+                                builder.submit(
+                                    Helper.with_cleanup(cls.parameters2command),
+                                    chatter,
+                                    instruction_w_param,
+                                    past_uuids,
+                                )
+                            )
+                            auditor.computed_parameters([instruction_w_param])
+                            messages = [
+                                ProgressMessage(
+                                    message=f"parameters computation done ({len(parameters)})",
+                                    section=Constants.PROGRESS_SECTION_TECHNICAL,
+                                )
+                            ]
+                            ProgressDisplay.send_to_user(chatter.identification, chatter.settings, messages)
+                for idx in built:
+                    if (command := building.pop(idx).result()) is not None:
+                        commands[idx] = command
+                        auditor.computed_commands([command])
+
+        # keep the order of the instructions, regardless of the completion order
+        computed_commands = [commands[idx] for idx in sorted(commands.keys())]
+        memory_log.output(f"--> computed commands: {len(computed_commands)}")
+        return computed_commands
+
+    @classmethod
+    def parameters_batches(cls, instructions: list[Instruction]) -> list[list[int]]:
+        # indexes of the instructions, grouped per command in the order of their first appearance
+        # once sorted by priority, so the work most likely to fit in the cycle is submitted first
+        groups: dict[str, list[int]] = {}
+        for idx in sorted(range(len(instructions)), key=lambda i: CycleDeadline.priority(instructions[i])):
+            instruction = instructions[idx]
+            groups.setdefault(instruction.instruction, []).append(idx)
+        size = Constants.MAX_INSTRUCTIONS_PER_PARAMETERS_BATCH
+        return [indexes[start : start + size] for indexes in groups.values() for start in range(0, len(indexes), size)]
+
+    @classmethod
+    def instruction2parameters(
+        cls,
+        chatter: AudioInterpreter,
+        instruction: Instruction,
+    ) -> InstructionWithParameters | None:
+        if chatter.deadline.defers(instruction):
+            return None
+        return chatter.create_sdk_command_parameters(instruction)
+
+    @classmethod
+    def parameters2command(
+        cls,
+        chatter: AudioInterpreter,
+        instruction_w_param: InstructionWithParameters,
+        past_uuids: dict[str, Instruction],
+    ) -> InstructionWithCommand | None:
+        instruction_w_cmd = chatter.create_sdk_command_from(instruction_w_param)
+        if instruction_w_cmd is None:
+            return None
+        if instruction_w_cmd.uuid in past_uuids:
+            instruction_w_cmd.command.command_uuid = instruction_w_cmd.uuid
+        return instruction_w_cmd
+
     @classmethod
     def transcript2commands_questionnaires(
         cls,
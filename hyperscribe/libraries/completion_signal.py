@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from time import sleep
+from typing import Any
+
+from canvas_sdk.utils.http import ThreadPoolExecutor
+
+from hyperscribe.libraries.constants import Constants
+
+# neither threading nor concurrent.futures are allowed in the plugin context: a thread waiting for a completion
+# waits on a task queued behind a sleeping one, the completion cancels the task and wakes the thread up at once
+parking = ThreadPoolExecutor(max_workers=1)
+PARKING: dict[str, Any] = {}  # the sleeping task, the waiting tasks run, and wake up their thread, once it is done
+
+
+class CompletionSignal:
+    def __init__(self) -> None:
+        self.waiter: Any = None
+
+    def watch(self, future: Any) -> Any:
+        future.add_done_callback(self.notify)
+        return future
+
+    def arm(self) -> None:
+        # to be called before checking the futures, so a completion in between is not missed
+        if (sleeping := PARKING.get("sleeping")) is None or sleeping.done():
+            PARKING["sleeping"] = parking.submit(sleep, Constants.COMPLETION_WAIT_MAX_SECONDS)
+        self.waiter = parking.submit(int)
+
+    def wait(self) -> None:
+        try:
+            self.waiter.result()
+        except Exception:
+            pass  # <-- cancelled by a completion
+
+    def notify(self, future: Any) -> None:
+        if self.waiter is not None:
+            self.waiter.cancel()
@@ -2,10 +2,34 @@ class Constants:
     ANTHROPIC_CHAT_TEXT = "claude-sonnet-4-5-20250929"  # LLM model used for text completion
     ANTHROPIC_REASONING_TEXT = "claude-opus-4-1-20250805"
     AWS3_LINK_EXPIRATION_SECONDS = 1200  # duration of an AWS S3 link
+    AWS_S3_MAX_WORKERS = 8  # concurrent requests of a batch of S3 objects
     API_SIGNED_EXPIRATION_SECONDS = 3600
     CYCLE_TRANSCRIPT_OVERLAP_MIN = 5
     CYCLE_TRANSCRIPT_OVERLAP_MAX = 250
     CYCLE_TRANSCRIPT_OVERLAP_DEFAULT = 100
+    # share of the audio interval a cycle can use, from its retrieval to its commands, before the next one arrives:
+    # the rest is left to the rendering of the effects and the storage of the cycle, done after the commands
+    CYCLE_DEADLINE_BUDGET_RATIO = 0.9
+    CYCLE_DEADLINE_DOWNGRADE_RATIO = 0.6  # share of the budget after which the complex LLM calls use the simpler model
+    CYCLE_DEADLINE_DEFER_RATIO = 0.85  # share of the budget after which the updates of commands wait the next cycle
+    CYCLE_DEADLINE_INTERVAL_MAX = 3600
+    CYCLE_DEADLINE_EXPENSIVE_COMMANDS = [  # commands looking up codes or chart items, with an extra LLM call
+        "AdjustPrescription",
+        "Allergy",
+        "Diagnose",
+        "FamilyHistory",
+        "ImagingOrder",
+        "ImmunizationStatement",
+        "Instruct",
+        "LabOrder",
+        "MedicalHistory",
+        "Medication",
+        "Prescription",
+        "Refer",
+        "Refill",
+        "SurgeryHistory",
+        "UpdateDiagnose",
+    ]
     DISCUSSION_CACHED_DURATION = 90  # minutes before a discussion is cleared
     ELEVEN_LABS_AUDIO = "scribe_v1"  # model used for speech to text
     GOOGLE_CHAT_ALL = "models/gemini-2.5-flash"  # LLM model used for speech to text and text completion
@@ -21,13 +45,55 @@ class Constants:
     MAX_ATTEMPTS_LLM_HTTP = 3
     MAX_ATTEMPTS_LLM_JSON = 3
     MAX_ATTEMPTS_CANVAS_SERVICES = 2
+    HTTP_POOL_CONNECT_TIMEOUT_SECONDS = 10
+    HTTP_POOL_READ_TIMEOUT_SECONDS = 300
+    HTTP_POOL_CANVAS_SERVICES = "CanvasServices"  # rate limiter shared by the searches of Science and Ontologies
+    CANVAS_SCIENCE_LOOKUP_WORKERS = 32  # concurrent searches of Science and Ontologies, all notes together
+    HEDGING_LATENCY_PERCENTILE = 0.95  # LLM requests slower than this percentile of their stage are duplicated
+    HEDGING_LATENCY_SAMPLES = 50  # latencies kept per stage
+    HEDGING_MIN_SAMPLES = 10  # no duplication before the stage latencies are known
+    HEDGING_POLL_SECONDS = 0.05
+    HEDGING_MAX_WORKERS = 64  # the original requests and their duplicates, all notes together
+    HEDGING_INSTRUCTION_STAGES = [  # stages logged as "<instruction>_<uuid>_<stage>", measured without the uuid
+        "instruction2parameters",
+        "instructions2parameters",
+        "parameters2command",
+        "questionnaire_update",
+    ]
+    RATE_LIMITER_REQUESTS_PER_SECOND = 20.0  # per vendor, across all the notes
+    RATE_LIMITER_BURST = 40
+    RATE_LIMITER_WAIT_MAX_SECONDS = 1.0  # a thread waiting for a free slot checks again, if its wake up was missed
+    RATE_LIMITER_DEFAULT_CONCURRENCY = (16, 64)  # initial and maximal concurrent requests, all notes together
+    RATE_LIMITER_THROTTLED_CODES = [429, 503, 529]
+    RATE_LIMITER_DECREASE_FACTOR = 0.5
+    RATE_LIMITER_DECREASE_INTERVAL_SECONDS = 1.0
+    RATE_LIMITER_RETRY_AFTER_MAX_SECONDS = 60.0
+    RATE_LIMITER_BACKOFF_BASE_SECONDS = 0.5
+    RATE_LIMITER_BACKOFF_MAX_SECONDS = 20.0
+    LLM_RESPONSE_CACHE_DISK_MAX_ENTRIES = 5000
+    LLM_RESPONSE_CACHE_KEY_PREFIX = "llm_response:"
+    LLM_RESPONSE_CACHE_MEMORY = "memory"
+    LLM_RESPONSE_CACHE_MEMORY_MAX_ENTRIES = 256
+    LLM_RESPONSE_CACHE_PLUGIN = "plugin"
+    LLM_RESPONSE_CACHE_TTL_SECONDS = 86400
+    SCHEMA_REGISTRY_MAX_VALIDATORS = 128
+    SCIENCE_CACHE_KEY_PREFIX = "science:"
+    SCIENCE_CACHE_MEMORY_MAX_ENTRIES = 2000
+    SCIENCE_CACHE_TTL_SECONDS = 86400
+    SCIENCE_CACHE_NEGATIVE_TTL_SECONDS = 3600  # searches without results
     MAX_TIME_OUT_CANVAS_SERVICES = 7
     MAX_CHARGE_DESCRIPTIONS = (
         500  # limit to the charge descriptions submitted to the LLM to retrieve the CPT code of a Perform command
     )
     CYCLE_DATA_MAX_ATTEMPTS = 3
     CYCLE_DATA_PAUSE_SECONDS = 3
+    CYCLE_DATA_HAND_OFF_MAX = 32  # cycles kept in memory for the commander of the same process
     STUCK_SESSION_WAITING_CYCLES_THRESHOLD = 5
+    COALESCING_WAITING_CYCLES_THRESHOLD = 1  # above this backlog, the waiting cycles are processed at once
+    COALESCING_WAITING_CYCLES_MAX = 4
+    MAX_INSTRUCTIONS_PER_PARAMETERS_BATCH = 8  # instructions of the same command computed in one LLM call
+    COMPLETION_WAIT_MAX_SECONDS = 1.0  # a thread waiting for a completion checks again, if its wake up was missed
+    CHART_WARM_UP_MAX_WORKERS = 4  # database connections opened to load the chart during the transcription
     # max parallel executions
     MAX_WORKERS_MIN = 1
     MAX_WORKERS_MAX = 10
@@ -38,6 +104,14 @@ class Constants:
     TEXT_MODEL_CHAT = "chat"
 
     MEMORY_LOG_LABEL = "main"
+    MEMORY_LOG_MAX_LINES = 20000  # lines kept per note, the debug lines beyond are dropped
+    MEMORY_LOG_SHIP_INTERVAL_SECONDS = 5.0  # minimal delay between two uploads of the same partial log
+    MEMORY_LOG_SHIP_BYTES = 65536  # growth of a partial log uploaded without waiting for the delay
+    MEMORY_LOG_SHIP_WORKERS = 4  # concurrent uploads of the partial logs, all notes together
+    UPLOAD_QUEUE_LANES = 4  # concurrent uploads of the audit and log artifacts, all notes together
+    UPLOAD_QUEUE_MAX_SIZE = 500  # uploads waiting in the queue before the callers upload by themselves
+    UPLOAD_QUEUE_MAX_ATTEMPTS = 4
+    UPLOAD_QUEUE_BACKOFF_SECONDS = 0.5  # first pause before retrying an upload, doubled at each attempt
     OPENAI_CHAT_AUDIO = "gpt-4o-audio-preview"  # LLM model used for speech to text
     OPENAI_CHAT_TEXT = "gpt-4.1"  # LLM model used for text completion
     OPENAI_CHAT_TEXT_O3 = "o3"
@@ -50,11 +124,19 @@ class Constants:
     VENDOR_OPENAI = "OpenAI"
     VENDOR_NOTION_API_VERSION = "2022-06-28"
     VENDOR_NOTION_API_BASE_URL = "https://api.notion.com/v1/pages"
+    RATE_LIMITER_CONCURRENCY = {  # initial and maximal concurrent requests per vendor or service, all notes together
+        VENDOR_ANTHROPIC: (32, 256),
+        VENDOR_GOOGLE: (32, 256),
+        VENDOR_OPENAI: (32, 256),
+        HTTP_POOL_CANVAS_SERVICES: (16, 32),
+    }
     #
     FAUX_NOTE_UUID = "_NoteUuid"
     FAUX_PATIENT_UUID = "_PatientUuid"
     FAUX_PROVIDER_UUID = "_ProviderUuid"
     SQLITE_LAB_TESTS_DATABASE = "generic_lab_tests.db"
+    LAB_TEST_INDEX_TTL_SECONDS = 86400
+    LAB_TEST_MAX_CANDIDATES = 30  # lab tests submitted to the LLM per expression
     # schema_key field values of the Command view (canvas_sdk.v1.data.command.Command)
     SCHEMA_KEY_ADJUST_PRESCRIPTION = "adjustPrescription"
     SCHEMA_KEY_ALLERGY = "allergy"
@@ -115,8 +197,10 @@ class Constants:
     SECRET_COMMANDS_POLICY = "CommandsPolicy"
     SECRET_CUSTOM_PROMPTS = "CustomPrompts"
     SECRET_CYCLE_TRANSCRIPT_OVERLAP = "CycleTranscriptOverlap"
+    SECRET_HEDGED_MODEL_SPECS = "HedgedModelSpecs"
     SECRET_HIERARCHICAL_DETECTION_THRESHOLD = "HierarchicalDetectionThreshold"
     SECRET_IS_TUNING = "IsTuning"
+    SECRET_LLM_RESPONSE_CACHE = "LlmResponseCache"
     SECRET_MAX_WORKERS = "MaxWorkers"
     SECRET_STAFFERS_LIST = "StaffersList"
     SECRET_STAFFERS_POLICY = "StaffersPolicy"
@@ -0,0 +1,83 @@
+from time import time
+
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.structures.instruction import Instruction
+from hyperscribe.structures.model_spec import ModelSpec
+
+
+class CycleDeadline:
+    def __init__(self, budget_seconds: float, started_at: float | None = None) -> None:
+        self.budget_seconds = budget_seconds  # 0 when the cycle has no deadline
+        # the cycle starts with the retrieval and the transcription of its audio, before its computation
+        self.started_at = time() if started_at is None else started_at
+        self.carried: list[Instruction] = []  # updates deferred by the previous cycle
+        self.deferred: list[Instruction] = []  # updates deferred to the next cycle, with the staged information
+        self.degraded: list[str] = []  # decisions altered by the deadline, reported with the cycle
+
+    @classmethod
+    def priority(cls, instruction: Instruction) -> tuple[bool, bool, int]:
+        # the new instructions before the updated ones, then the cheap commands before the expensive ones
+        return (
+            not instruction.is_new,
+            instruction.instruction in Constants.CYCLE_DEADLINE_EXPENSIVE_COMMANDS,
+            instruction.index,
+        )
+
+    def is_past(self, ratio: float) -> bool:
+        return bool(self.budget_seconds > 0 and time() - self.started_at >= self.budget_seconds * ratio)
+
+    def model_spec(self, model_spec: ModelSpec, task: str) -> ModelSpec:
+        if model_spec.value == ModelSpec.COMPLEX.value and self.is_past(Constants.CYCLE_DEADLINE_DOWNGRADE_RATIO):
+            self.degrade(f"{task}: simpler model instead of the complex one")
+            return ModelSpec.SIMPLER
+        return model_spec
+
+    def defers(self, instruction: Instruction) -> bool:
+        # only the updates are deferred, the staged command is still there for the next cycle,
+        # while a new instruction without command would be forgotten
+        if instruction.is_updated and self.is_past(Constants.CYCLE_DEADLINE_DEFER_RATIO):
+            self.deferred.append(
+                Instruction(
+                    uuid=instruction.uuid,
+                    index=instruction.index,
+                    instruction=instruction.instruction,
+                    information=instruction.previous_information,
+                    is_new=False,
+                    is_updated=False,
+                    previous_information="",
+                )
+            )
+            self.degrade(f"{instruction.instruction} #{instruction.index:02d}: update deferred to the next cycle")
+            return True
+        return False
+
+    def carried_over(
+        self,
+        instructions: list[Instruction],
+        past_uuids: dict[str, Instruction],
+        computed: list[Instruction],
+    ) -> list[Instruction]:
+        # the updates deferred by the previous cycle, if the command is still staged and not computed already
+        staged = {instruction.uuid: instruction.information for instruction in self.carried}
+        computed_uuids = {instruction.uuid for instruction in computed}
+        result: list[Instruction] = []
+        for instruction in instructions:
+            if (
+                instruction.uuid in staged
+                and instruction.uuid in past_uuids
+                and instruction.uuid not in computed_uuids
+                and instruction.information != staged[instruction.uuid]
+            ):
+                instruction.is_updated = True
+                instruction.previous_information = staged[instruction.uuid]
+                result.append(instruction)
+        self.carried = []
+        return result
+
+    def pending(self) -> list[Instruction]:
+        # the carried updates are still pending when the cycle did not reach the instructions
+        return self.carried + self.deferred
+
+    def degrade(self, decision: str) -> None:
+        elapsed = time() - self.started_at
+        self.degraded.append(f"{decision} ({elapsed:.1f}s of {self.budget_seconds:.1f}s)")
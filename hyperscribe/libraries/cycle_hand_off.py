@@ -0,0 +1,17 @@
+from hyperscribe.libraries.constants import Constants
+
+# content and content type of the cycles received by this process and not retrieved yet, the oldest first, per S3 key
+HAND_OFFS: dict[str, tuple[bytes, str]] = {}
+
+
+class CycleHandOff:
+    @classmethod
+    def put(cls, key: str, content: bytes, content_type: str) -> None:
+        # the cycles retrieved by another process are never taken, the oldest are forgotten
+        HAND_OFFS[key] = (content, content_type)
+        for oldest in list(HAND_OFFS.keys())[: -Constants.CYCLE_DATA_HAND_OFF_MAX]:
+            HAND_OFFS.pop(oldest, None)
+
+    @classmethod
+    def take(cls, key: str) -> tuple[bytes, str] | None:
+        return HAND_OFFS.pop(key, None)
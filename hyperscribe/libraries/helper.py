@@ -7,6 +7,7 @@ from canvas_sdk.utils.db import thread_cleanup
 from canvas_sdk.v1.data.note import NoteStateChangeEvent, NoteStates
 
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.llm_response_cache import LlmResponseCache
 from hyperscribe.libraries.memory_log import MemoryLog
 from hyperscribe.llms.llm_anthropic import LlmAnthropic
 from hyperscribe.llms.llm_base import LlmBase
@@ -64,15 +65,25 @@ class Helper:
 
     @classmethod
     def chatter(cls, settings: Settings, memory_log: MemoryLog, model_spec: ModelSpec) -> LlmBase:
+        LlmResponseCache.select(settings.llm_response_cache)
+        result = cls.text_chatter(settings, memory_log, model_spec)
+        if settings.is_hedged(model_spec):
+            # the duplicate goes to the same vendor and model, and is not duplicated itself
+            result.hedging = lambda: cls.text_chatter(settings, memory_log, model_spec)
+        return result
+
+    @classmethod
+    def text_chatter(cls, settings: Settings, memory_log: MemoryLog, model_spec: ModelSpec) -> LlmBase:
+        result: LlmBase
         if settings.llm_text.vendor.upper() == Constants.VENDOR_GOOGLE.upper():
-            return LlmGoogle(
+            result = LlmGoogle(
                 memory_log,
                 settings.llm_text.api_key,
                 settings.llm_text_model(model_spec),
                 settings.audit_llm,
             )
         elif settings.llm_text.vendor.upper() == Constants.VENDOR_ANTHROPIC.upper():
-            return LlmAnthropic(
+            result = LlmAnthropic(
                 memory_log,
                 settings.llm_text.api_key,
                 settings.llm_text_model(model_spec),
@@ -81,17 +92,19 @@ class Helper:
         else:
             model = settings.llm_text_model(model_spec)
             if model == Constants.OPENAI_CHAT_TEXT_O3:
-                return LlmOpenaiO3(
+                result = LlmOpenaiO3(
                     memory_log,
                     settings.llm_text.api_key,
                     with_audit=settings.audit_llm,
                     temperature=settings.llm_text_temperature(),
                 )
             else:
-                return LlmOpenai(memory_log, settings.llm_text.api_key, model, settings.audit_llm)
+                result = LlmOpenai(memory_log, settings.llm_text.api_key, model, settings.audit_llm)
+        return result
 
     @classmethod
     def audio2texter(cls, settings: Settings, memory_log: MemoryLog) -> LlmBase:
+        LlmResponseCache.select(settings.llm_response_cache)
         result: Type[LlmBase] = LlmOpenai
         if settings.llm_audio.vendor.upper() == Constants.VENDOR_GOOGLE.upper():
             result = LlmGoogle
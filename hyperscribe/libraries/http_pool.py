@@ -0,0 +1,52 @@
+from typing import Any, Callable
+
+from requests import Response, Session
+
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.rate_limiter import RateLimiter
+
+SESSIONS: dict[str, Session] = {}  # keep-alive connections, one session per vendor shared by all the threads
+
+
+class HttpPool:
+    @classmethod
+    def session(cls, vendor: str) -> Session:
+        if vendor not in SESSIONS:
+            SESSIONS[vendor] = Session()
+        return SESSIONS[vendor]
+
+    @classmethod
+    def send(cls, vendor: str, url: str, consume: Callable[[Response], Any] | None = None, **kwargs: Any) -> Any:
+        # a streamed response is consumed, and its connection closed, before the ticket is released
+        limiter = RateLimiter.for_key(vendor)
+        ticket = limiter.acquire()
+        status_code = 0
+        headers: Any = {}
+        try:
+            result = cls.session(vendor).post(
+                url,
+                verify=True,
+                timeout=(Constants.HTTP_POOL_CONNECT_TIMEOUT_SECONDS, Constants.HTTP_POOL_READ_TIMEOUT_SECONDS),
+                **kwargs,
+            )
+            status_code = result.status_code
+            headers = result.headers
+            if consume is None:
+                return result
+            try:
+                return consume(result)
+            finally:
+                result.close()
+        finally:
+            limiter.release(ticket, status_code, headers)
+
+    @classmethod
+    def post(cls, vendor: str, url: str, **kwargs: Any) -> Response:
+        # the request is sent from the thread of the caller, the rate limiter of the vendor bounds the concurrency
+        result: Response = cls.send(vendor, url, **kwargs)
+        return result
+
+    @classmethod
+    def stream(cls, vendor: str, url: str, consume: Callable[[Response], Any], **kwargs: Any) -> Any:
+        # the ticket of the rate limiter is held until the streamed response is consumed
+        return cls.send(vendor, url, consume, stream=True, **kwargs)
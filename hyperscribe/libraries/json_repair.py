@@ -0,0 +1,113 @@
+import json
+import re
+from typing import Any, Callable, Iterable
+
+
+class JsonRepair:
+    PATTERN_FENCED = re.compile(r"```(?:json)?[ \t]*\n(.*?)(?:\n\s*```|$)", re.DOTALL | re.IGNORECASE)
+    PATTERN_TRAILING_COMMA = re.compile(r",(\s*[\]}])")
+    PATTERN_SINGLE_QUOTED = re.compile(r"(?<=[\[{,:\s])'((?:[^'\\\n]|\\.)*)'(?=\s*[\]},:])")
+
+    @classmethod
+    def blocks(cls, content: str) -> list[str]:
+        # the fences may be missing (raw JSON) or the last one may be truncated
+        result = [embedded.group(1) for embedded in cls.PATTERN_FENCED.finditer(content)]
+        if not result:
+            starts = [idx for idx in (content.find("{"), content.find("[")) if idx >= 0]
+            if starts:
+                result = [content[min(starts) :]]
+        return result
+
+    @classmethod
+    def loads(cls, text: str) -> tuple[bool, Any]:
+        for candidate in cls.candidates(text.strip()):
+            try:
+                return True, json.loads(candidate)
+            except Exception:
+                continue
+        return False, None
+
+    @classmethod
+    def candidates(cls, text: str) -> Iterable[str]:
+        # from the less to the more intrusive changes, stopped at the first loadable one
+        ends = max(text.rfind("}"), text.rfind("]"))
+        for base in [text, text[: ends + 1]]:  # with or without the text after the JSON
+            yield base
+            base = cls.PATTERN_TRAILING_COMMA.sub(r"\1", base)
+            yield base
+            yield cls.single_to_double_quotes(base)
+        for closed in cls.closings(cls.single_to_double_quotes(cls.PATTERN_TRAILING_COMMA.sub(r"\1", text))):
+            yield cls.PATTERN_TRAILING_COMMA.sub(r"\1", closed)
+
+    @classmethod
+    def single_to_double_quotes(cls, text: str) -> str:
+        return cls.PATTERN_SINGLE_QUOTED.sub(lambda m: json.dumps(m.group(1).replace("\\'", "'")), text)
+
+    @classmethod
+    def closings(cls, text: str) -> Iterable[str]:
+        # a truncated text is closed at its end, then at each previous comma, the last one first
+        closers: list[str] = []
+        cuts: list[tuple[int, str]] = []
+        in_string = False
+        escaped = False
+        for idx, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                closers.append("]" if char == "[" else "}")
+            elif char in "]}":
+                if closers:
+                    closers.pop()
+            elif char == ",":
+                cuts.append((idx, "".join(reversed(closers))))
+        if not closers:
+            return
+        yield text + ('"' if in_string else "") + "".join(reversed(closers))
+        for idx, closing in reversed(cuts):
+            if closing:
+                yield text[:idx] + closing
+
+    @classmethod
+    def fit(cls, content: Any, schema: dict) -> Any:
+        if schema.get("type") != "array":
+            return content
+        if isinstance(content, dict):
+            content = [content]
+        if isinstance(content, list) and "maxItems" in schema:
+            content = content[: schema["maxItems"]]
+        return content
+
+    @classmethod
+    def contents(cls, content: str, schemas: list) -> list:
+        result: list = []
+        for idx, block in enumerate(cls.blocks(content)):
+            loaded, value = cls.loads(block)
+            if not loaded:
+                return []
+            if idx < len(schemas):
+                value = cls.fit(value, schemas[idx])
+            result.append(value)
+        return result
+
+    @classmethod
+    def invalid_items(cls, content: Any, schema: dict, validator: Callable[[Any, dict], str]) -> list[tuple[int, str]]:
+        # the incorrect or missing items of an array, empty if re-asking them does not help
+        if not isinstance(content, list) or not isinstance(schema.get("items"), dict):
+            return []
+        result = [(idx, problems) for idx, item in enumerate(content) if (problems := validator(item, schema["items"]))]
+        expected = max(len(content), schema.get("minItems", 0))
+        result.extend([(idx, "missing item") for idx in range(len(content), expected)])
+        if len(result) >= expected:
+            return []
+        return result
+
+    @classmethod
+    def to_markdown(cls, contents: list) -> str:
+        return "\n".join([f"```json\n{json.dumps(content, indent=1)}\n```" for content in contents])
@@ -0,0 +1,42 @@
+import json
+import re
+from typing import Any, Callable, Iterable
+
+from requests import Response
+
+
+class JsonStream:
+    PATTERN_JSON = re.compile(r"```json\s*\n(.*?)\n\s*```", re.DOTALL | re.IGNORECASE)
+
+    def __init__(self, schemas: list, validator: Callable[[Any, dict], str]) -> None:
+        self.schemas = schemas
+        self.validator = validator
+        self.text = ""
+        self.position = 0  # end of the last complete JSON block
+        self.blocks = 0
+        self.has_error = False
+
+    @classmethod
+    def server_sent_events(cls, response: Response) -> Iterable[dict]:
+        for line in response.iter_lines():
+            text = line.decode("utf-8")
+            if text.startswith("data:") and (data := text[5:].strip()) and data != "[DONE]":
+                yield json.loads(data)
+
+    def add(self, text: str) -> None:
+        self.text = self.text + text
+        # each block is validated as soon as its closing fence is received,
+        # an invalid block does not stop the stream, the full response is then repaired
+        while not self.is_done() and (embedded := self.PATTERN_JSON.search(self.text, self.position)):
+            self.position = embedded.end()
+            self.blocks = self.blocks + 1
+            try:
+                content = json.loads(embedded.group(1))
+            except Exception:
+                self.has_error = True
+                continue
+            if self.validator(content, self.schemas[self.blocks - 1]):
+                self.has_error = True
+
+    def is_done(self) -> bool:
+        return self.blocks >= len(self.schemas)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from time import time
+
+from canvas_sdk.v1.data.lab import LabPartnerTest
+
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.structures.coded_item import CodedItem
+
+INDEXES: dict[str, tuple[float, LabTestIndex]] = {}  # expiration and index by lab partner
+
+
+class LabTestIndex:
+    def __init__(self, tests: list[CodedItem], keywords: list[str]):
+        self.tests = tests
+        self.keywords = [text.lower() for text in keywords]
+        self.trigrams: dict[str, set[int]] = {}
+        for idx, text in enumerate(self.keywords):
+            for trigram in self.trigrams_of(text):
+                self.trigrams.setdefault(trigram, set()).add(idx)
+
+    @classmethod
+    def trigrams_of(cls, text: str) -> set[str]:
+        return {text[idx : idx + 3] for idx in range(len(text) - 2)}
+
+    @classmethod
+    def for_lab_partner(cls, lab_partner: str) -> LabTestIndex:
+        # built once per lab partner, the catalog of the tests barely changes
+        entry = INDEXES.get(lab_partner)
+        if entry is None or entry[0] <= time():
+            tests: list[CodedItem] = []
+            keywords: list[str] = []
+            for test in LabPartnerTest.objects.filter(lab_partner__name=lab_partner).order_by("dbid"):
+                tests.append(CodedItem(uuid="", label=test.order_name, code=test.order_code))
+                keywords.append(test.keywords or "")
+            entry = (time() + Constants.LAB_TEST_INDEX_TTL_SECONDS, cls(tests, keywords))
+            INDEXES[lab_partner] = entry
+        return entry[1]
+
+    @classmethod
+    def ranked(cls, terms: list[str], labels: list[str]) -> list[int]:
+        # the whole words of the label first, then the beginning of its words, the shortest label breaking the ties
+        scores: list[tuple[int, int, int]] = []
+        for idx, label in enumerate(labels):
+            words = "".join(char if char.isalnum() else " " for char in label.lower()).split()
+            score = sum(
+                2 if term in words else 1 if any(word.startswith(term) for word in words) else 0 for term in terms
+            )
+            scores.append((-score, len(label), idx))
+        return [idx for _, _, idx in sorted(scores)]
+
+    def search(self, keywords: list[str]) -> list[CodedItem]:
+        # the trigrams narrow the candidates, the records must still contain all the keywords
+        terms = [kw.lower() for kw in keywords if kw]
+        candidates: set[int] | None = None
+        for term in terms:
+            for trigram in self.trigrams_of(term):
+                postings = self.trigrams.get(trigram, set())
+                candidates = postings if candidates is None else candidates & postings
+        if candidates is None:
+            candidates = set(range(len(self.tests)))
+        matches = sorted(idx for idx in candidates if all(term in self.keywords[idx] for term in terms))
+        ranks = self.ranked(terms, [self.tests[idx].label for idx in matches])
+        return [self.tests[matches[rank]] for rank in ranks[: Constants.LAB_TEST_MAX_CANDIDATES]]
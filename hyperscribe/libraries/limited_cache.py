@@ -3,18 +3,23 @@ from __future__ import annotations
 from datetime import date
 from typing import Any
 
+from canvas_sdk.caching.plugins import get_cache
 from canvas_sdk.commands.constants import CodeSystems
+from canvas_sdk.utils.http import ThreadPoolExecutor
 from canvas_sdk.v1.data import (
     AllergyIntolerance,
     CareTeamRole,
     ChargeDescriptionMaster,
+    AllergyIntoleranceCoding,
     Condition,
+    ConditionCoding,
     Goal,
     Immunization,
     ImmunizationCoding,
     ImmunizationStatement,
     ImmunizationStatementCoding,
     Medication,
+    MedicationCoding,
     NoteType,
     Observation,
     Patient,
@@ -28,20 +33,23 @@ from canvas_sdk.v1.data import (
 from canvas_sdk.v1.data.condition import ClinicalStatus
 from canvas_sdk.v1.data.goal import GoalLifecycleStatus
 from canvas_sdk.v1.data.lab import LabPartner
-from canvas_sdk.v1.data.lab import LabPartnerTest
 from canvas_sdk.v1.data.medication import Status
 from canvas_sdk.v1.data.patient import SexAtBirth
-from django.db.models import Q
-from django.db.models.expressions import When, Value, Case
+from django.db.models import Count, Max, Q
+from django.db.models.query import QuerySet
 
 from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.helper import Helper
+from hyperscribe.libraries.lab_test_index import LabTestIndex
 from hyperscribe.structures.charge_description import ChargeDescription
 from hyperscribe.structures.coded_item import CodedItem
 from hyperscribe.structures.immunization_cached import ImmunizationCached
 from hyperscribe.structures.instruction import Instruction
 from hyperscribe.structures.medication_cached import MedicationCached
 
+# ATTENTION the SDK cache is limited to the plugin environment
+SNAPSHOTS: dict[str, dict] = {}
+
 
 class LimitedCache:
     def __init__(
@@ -73,11 +81,34 @@ class LimitedCache:
         self._charge_descriptions: list[ChargeDescription] | None = None
         self._lab_tests: dict[str, list[CodedItem]] = {}
         self._local_data = False
+        self._versions: dict[str, str] = {}
+        self._warm_ups: dict[str, Any] = {}  # futures of the sections loaded in the background
 
     @property
     def is_local_data(self) -> bool:
         return self._local_data
 
+    def warm_up(self, executor: ThreadPoolExecutor) -> None:
+        # the sections not yet retrieved are loaded in the background, once,
+        # the accessors wait for the loading instead of querying the same data
+        sections = [
+            ("allergies", self._allergies, self.retrieve_allergies, []),
+            ("conditions", self._conditions, self.retrieve_conditions, []),
+            ("demographic", self._demographic, self.retrieve_demographic, [False]),
+            ("goals", self._goals, self.retrieve_goals, []),
+            ("immunizations", self._immunizations, self.retrieve_immunizations, []),
+            ("medications", self._medications, self.retrieve_medications, []),
+            ("preferredLabPartner", self._preferred_lab_partner, self.retrieve_preferred_lab_partner, []),
+        ]
+        for section, value, retrieve, arguments in sections:
+            if value is None and section not in self._warm_ups:
+                self._warm_ups[section] = executor.submit(Helper.with_cleanup(retrieve), *arguments)
+
+    def wait_warm_up(self, section: str) -> None:
+        # an error of the loading is raised to the caller, as if the section were queried directly
+        if (future := self._warm_ups.get(section)) is not None:
+            future.result()
+
     def lab_tests(self, lab_partner: str, keywords: list[str]) -> list[CodedItem]:
         key = " ".join(sorted(keywords))
         if key not in self._lab_tests:
@@ -90,22 +121,22 @@ class LimitedCache:
                     conn.row_factory = sqlite3.Row
                     cursor = conn.cursor()
                     parameters: dict = {}
-                    sql = "SELECT `dbid`, `order_code`, `order_name` FROM `generic_lab_test` WHERE 1=1 "
+                    # the LIKE conditions are resolved by the trigram index of the full-text table
+                    sql = "SELECT `rowid`, `order_code`, `order_name` FROM `generic_lab_test_fts` WHERE 1=1 "
                     for idx, kw in enumerate(keywords):
                         param = f"kw_{idx:02d}"
                         sql += f" AND `keywords` LIKE :{param}"
                         parameters[param] = f"%{kw}%"
-                    sql += " ORDER BY `dbid`"
+                    sql += " ORDER BY `rowid`"
                     cursor.execute(sql, parameters)
-                    for row in cursor.fetchall():
+                    rows = cursor.fetchall()
+                    terms = [kw.lower() for kw in keywords if kw]
+                    ranks = LabTestIndex.ranked(terms, [row["order_name"] for row in rows])
+                    for rank in ranks[: Constants.LAB_TEST_MAX_CANDIDATES]:
+                        row = rows[rank]
                         self._lab_tests[key].append(CodedItem(uuid="", label=row["order_name"], code=row["order_code"]))
             else:
-                keyword_q = Q()
-                for kw in keywords:
-                    keyword_q &= Q(keywords__icontains=kw)
-                query = LabPartnerTest.objects.filter(lab_partner__name=lab_partner).filter(keyword_q)
-                for test in query:
-                    self._lab_tests[key].append(CodedItem(uuid="", label=test.order_name, code=test.order_code))
+                self._lab_tests[key] = LabTestIndex.for_lab_partner(lab_partner).search(keywords)
         return self._lab_tests[key]
 
     def charge_descriptions(self) -> list[ChargeDescription]:
@@ -125,29 +156,41 @@ class LimitedCache:
         return self._charge_descriptions
 
     def retrieve_conditions(self) -> None:
-        self._conditions = []
-        self._condition_history = []
-        self._surgery_history = []
+        current: list[CodedItem] = []
+        history: list[CodedItem] = []
+        surgeries: list[CodedItem] = []
         statuses = [ClinicalStatus.ACTIVE, ClinicalStatus.RESOLVED]
         systems = [CodeSystems.ICD10, CodeSystems.SNOMED]
         conditions = Condition.objects.committed().for_patient(self.patient_uuid).filter(clinical_status__in=statuses)
+        codings = self.codings_by_record(
+            ConditionCoding.objects.filter(condition__in=conditions, system__in=systems),
+            "condition_id",
+        )
         for condition in conditions.order_by("-dbid"):
-            case = Case(When(system=CodeSystems.ICD10, then=Value(1)), When(system=CodeSystems.SNOMED, then=Value(2)))
-            coding = (
-                condition.codings.filter(system__in=systems)
-                .annotate(system_order=case)
-                .order_by("system_order")
-                .first()
+            # the ICD-10 coding first, then the SNOMED one
+            coding = next(
+                (c for system in systems for c in codings.get(condition.dbid, []) if c.system == system),
+                None,
             )
-
             if coding:
                 item = CodedItem(uuid=str(condition.id), label=coding.display, code=Helper.icd10_add_dot(coding.code))
                 if condition.clinical_status == ClinicalStatus.ACTIVE:
-                    self._conditions.append(item)
+                    current.append(item)
                 elif condition.clinical_status == ClinicalStatus.RESOLVED and condition.surgical is False:
-                    self._condition_history.append(item)
+                    history.append(item)
                 elif condition.clinical_status == ClinicalStatus.RESOLVED and condition.surgical is True:
-                    self._surgery_history.append(item)
+                    surgeries.append(item)
+        self._condition_history = history
+        self._surgery_history = surgeries
+        self._conditions = current
+
+    @classmethod
+    def codings_by_record(cls, codings: QuerySet, record_key: str) -> dict[int, list]:
+        # the codings of all the records in one query, grouped by record
+        result: dict[int, list] = {}
+        for coding in codings.order_by("dbid"):
+            result.setdefault(getattr(coding, record_key), []).append(coding)
+        return result
 
     def add_instructions_as_staged_commands(
         self,
@@ -200,67 +243,82 @@ class LimitedCache:
         return result
 
     def current_goals(self) -> list[CodedItem]:
+        self.wait_warm_up("goals")
         if self._goals is None:
-            self._goals = []
-            # ATTENTION below code should not be used since there is no way to know if a goal is already closed
-            # TODO should use the `committed` method
-            #  waiting for https://github.com/canvas-medical/canvas-plugins/discussions/1066
-            goals = Goal.objects.filter(
-                patient__id=self.patient_uuid,
-                lifecycle_status__in=[
-                    GoalLifecycleStatus.PROPOSED,
-                    GoalLifecycleStatus.PLANNED,
-                    GoalLifecycleStatus.ACCEPTED,
-                    GoalLifecycleStatus.ACTIVE,
-                    GoalLifecycleStatus.ON_HOLD,
-                ],
-                committer_id__isnull=False,
-                entered_in_error_id__isnull=True,
-            ).order_by("-dbid")
-            for goal in goals:
-                self._goals.append(
-                    CodedItem(
-                        uuid=str(goal.id),
-                        label=goal.goal_statement,
-                        # TODO code should be "",
-                        #  waiting for https://github.com/canvas-medical/canvas-plugins/issues/338
-                        code=str(goal.dbid),
-                    ),
-                )
-        return self._goals
+            self.retrieve_goals()
+        return self._goals or []
+
+    def retrieve_goals(self) -> None:
+        result: list[CodedItem] = []
+        # ATTENTION below code should not be used since there is no way to know if a goal is already closed
+        # TODO should use the `committed` method
+        #  waiting for https://github.com/canvas-medical/canvas-plugins/discussions/1066
+        goals = Goal.objects.filter(
+            patient__id=self.patient_uuid,
+            lifecycle_status__in=[
+                GoalLifecycleStatus.PROPOSED,
+                GoalLifecycleStatus.PLANNED,
+                GoalLifecycleStatus.ACCEPTED,
+                GoalLifecycleStatus.ACTIVE,
+                GoalLifecycleStatus.ON_HOLD,
+            ],
+            committer_id__isnull=False,
+            entered_in_error_id__isnull=True,
+        ).order_by("-dbid")
+        for goal in goals:
+            result.append(
+                CodedItem(
+                    uuid=str(goal.id),
+                    label=goal.goal_statement,
+                    # TODO code should be "",
+                    #  waiting for https://github.com/canvas-medical/canvas-plugins/issues/338
+                    code=str(goal.dbid),
+                ),
+            )
+        self._goals = result
 
     def current_conditions(self) -> list[CodedItem]:
+        self.wait_warm_up("conditions")
         if self._conditions is None:
             self.retrieve_conditions()
         return self._conditions or []
 
     def current_medications(self) -> list[MedicationCached]:
+        self.wait_warm_up("medications")
         if self._medications is None:
-            self._medications = []
-            medications = Medication.objects.committed().for_patient(self.patient_uuid).filter(status=Status.ACTIVE)
-            for medication in medications.order_by("-dbid"):
-                label = ""
-                code_rx_norm = ""
-                code_fdb = ""
-                for coding in medication.codings.all():
-                    if coding.system == CodeSystems.RXNORM:
-                        label = coding.display
-                        code_rx_norm = coding.code
-                    if coding.system == CodeSystems.FDB:
-                        label = coding.display
-                        code_fdb = coding.code
-
-                self._medications.append(
-                    MedicationCached(
-                        uuid=str(medication.id),
-                        label=label,
-                        code_rx_norm=code_rx_norm,
-                        code_fdb=code_fdb,
-                        national_drug_code=medication.national_drug_code,
-                        potency_unit_code=medication.potency_unit_code,
-                    ),
-                )
-        return self._medications
+            self.retrieve_medications()
+        return self._medications or []
+
+    def retrieve_medications(self) -> None:
+        result: list[MedicationCached] = []
+        medications = Medication.objects.committed().for_patient(self.patient_uuid).filter(status=Status.ACTIVE)
+        codings = self.codings_by_record(
+            MedicationCoding.objects.filter(medication__in=medications),
+            "medication_id",
+        )
+        for medication in medications.order_by("-dbid"):
+            label = ""
+            code_rx_norm = ""
+            code_fdb = ""
+            for coding in codings.get(medication.dbid, []):
+                if coding.system == CodeSystems.RXNORM:
+                    label = coding.display
+                    code_rx_norm = coding.code
+                if coding.system == CodeSystems.FDB:
+                    label = coding.display
+                    code_fdb = coding.code
+
+            result.append(
+                MedicationCached(
+                    uuid=str(medication.id),
+                    label=label,
+                    code_rx_norm=code_rx_norm,
+                    code_fdb=code_fdb,
+                    national_drug_code=medication.national_drug_code,
+                    potency_unit_code=medication.potency_unit_code,
+                ),
+            )
+        self._medications = result
 
     @classmethod
     def immunization_from(
@@ -288,49 +346,65 @@ class LimitedCache:
         )
 
     def current_immunizations(self) -> list[ImmunizationCached]:
+        self.wait_warm_up("immunizations")
         if self._immunizations is None:
-            self._immunizations = []
-            # TODO waiting for https://github.com/canvas-medical/canvas-plugins/issues/1067
-            immunizations = Immunization.objects.for_patient(self.patient_uuid).filter(deleted=False)
-            # immunizations = Immunization.objects.committed().for_patient(self.patient_uuid)
-            for immunization in immunizations.order_by("-dbid"):
-                print("--->", immunization.note.datetime_of_service.date())
-                self._immunizations.append(
-                    self.immunization_from(
-                        str(immunization.id),
-                        immunization.sig_original,
-                        immunization.note.datetime_of_service.date(),
-                        immunization.codings.all(),
-                    )
+            self.retrieve_immunizations()
+        return self._immunizations or []
+
+    def retrieve_immunizations(self) -> None:
+        result: list[ImmunizationCached] = []
+        # TODO waiting for https://github.com/canvas-medical/canvas-plugins/issues/1067
+        immunizations = Immunization.objects.for_patient(self.patient_uuid).filter(deleted=False)
+        # immunizations = Immunization.objects.committed().for_patient(self.patient_uuid)
+        codings = self.codings_by_record(
+            ImmunizationCoding.objects.filter(immunization__in=immunizations),
+            "immunization_id",
+        )
+        for immunization in immunizations.select_related("note").order_by("-dbid"):
+            result.append(
+                self.immunization_from(
+                    str(immunization.id),
+                    immunization.sig_original,
+                    immunization.note.datetime_of_service.date(),
+                    codings.get(immunization.dbid, []),
                 )
-            # TODO waiting for https://github.com/canvas-medical/canvas-plugins/issues/1067
-            statements = ImmunizationStatement.objects.for_patient(self.patient_uuid).filter(deleted=False)
-            # statements = ImmunizationStatement.objects.committed().for_patient(self.patient_uuid)
-            for statement in statements.order_by("-dbid"):
-                self._immunizations.append(
-                    self.immunization_from(
-                        str(statement.id),
-                        statement.comment,
-                        statement.date,
-                        # TODO should be `codings`,
-                        #  waiting for https://github.com/canvas-medical/canvas-plugins/issues/1068
-                        statement.coding.all(),
-                    )
+            )
+        # TODO waiting for https://github.com/canvas-medical/canvas-plugins/issues/1067
+        statements = ImmunizationStatement.objects.for_patient(self.patient_uuid).filter(deleted=False)
+        # statements = ImmunizationStatement.objects.committed().for_patient(self.patient_uuid)
+        codings = self.codings_by_record(
+            ImmunizationStatementCoding.objects.filter(immunization_statement__in=statements),
+            "immunization_statement_id",
+        )
+        for statement in statements.order_by("-dbid"):
+            result.append(
+                self.immunization_from(
+                    str(statement.id),
+                    statement.comment,
+                    statement.date,
+                    codings.get(statement.dbid, []),
                 )
-
-        return self._immunizations
+            )
+        self._immunizations = result
 
     def current_allergies(self) -> list[CodedItem]:
+        self.wait_warm_up("allergies")
         if self._allergies is None:
-            self._allergies = []
-            allergies = (
-                AllergyIntolerance.objects.committed().for_patient(self.patient_uuid).filter(status=Status.ACTIVE)
-            )
-            for allergy in allergies.order_by("-dbid"):
-                for coding in allergy.codings.all():
-                    if coding.system == CodeSystems.FDB:
-                        self._allergies.append(CodedItem(uuid=str(allergy.id), label=coding.display, code=coding.code))
-        return self._allergies
+            self.retrieve_allergies()
+        return self._allergies or []
+
+    def retrieve_allergies(self) -> None:
+        result: list[CodedItem] = []
+        allergies = AllergyIntolerance.objects.committed().for_patient(self.patient_uuid).filter(status=Status.ACTIVE)
+        codings = self.codings_by_record(
+            AllergyIntoleranceCoding.objects.filter(allergy_intolerance__in=allergies),
+            "allergy_intolerance_id",
+        )
+        for allergy in allergies.order_by("-dbid"):
+            for coding in codings.get(allergy.dbid, []):
+                if coding.system == CodeSystems.FDB:
+                    result.append(CodedItem(uuid=str(allergy.id), label=coding.display, code=coding.code))
+        self._allergies = result
 
     def family_history(self) -> list[CodedItem]:
         if self._family_history is None:
@@ -338,11 +412,13 @@ class LimitedCache:
         return self._family_history
 
     def condition_history(self) -> list[CodedItem]:
+        self.wait_warm_up("conditions")
         if self._condition_history is None:
             self.retrieve_conditions()
         return self._condition_history or []
 
     def surgery_history(self) -> list[CodedItem]:
+        self.wait_warm_up("conditions")
         if self._surgery_history is None:
             self.retrieve_conditions()
         return self._surgery_history or []
@@ -398,71 +474,77 @@ class LimitedCache:
         return self._teams
 
     def demographic__str__(self, obfuscate: bool) -> str:
+        self.wait_warm_up("demographic")
         if self._demographic is None:
-            patient = Patient.objects.get(id=self.patient_uuid)
-
-            is_female = bool(patient.sex_at_birth == SexAtBirth.FEMALE)
-            dob = patient.birth_date.strftime("%B %d, %Y")
-            if obfuscate:
-                dob = "<DOB REDACTED>"  # principal of minimum disclosure
-            today = date.today()
-            age = (
-                today.year
-                - patient.birth_date.year
-                - ((today.month, today.day) < (patient.birth_date.month, patient.birth_date.day))
-            )
-            age_str = str(age)
-            if age < 2:
-                age_str = (
-                    f"{(today.year - patient.birth_date.year) * 12 + today.month - patient.birth_date.month} months"
-                )
-                sex_at_birth = "baby girl" if is_female else "baby boy"
-            elif age < 20:
-                sex_at_birth = "girl" if is_female else "boy"
-            elif age > 65:
-                sex_at_birth = "elderly woman" if is_female else "elderly man"
-            else:
-                sex_at_birth = "woman" if is_female else "man"
-
-            self._demographic = f"the patient is a {sex_at_birth}, born on {dob} (age {age_str})"
-
-            weight = (
-                Observation.objects.for_patient(self.patient_uuid)
-                .filter(name="weight", category="vital-signs")
-                .order_by("-effective_datetime")
-                .first()
-            )
-            if weight and weight.value:
-                ratio = 1 / 1
-                if weight.units == "oz":
-                    ratio = 1 / 16
-
-                self._demographic = f"{self._demographic} and weight {int(weight.value) * ratio:1.2f} pounds"
+            self.retrieve_demographic(obfuscate)
+        return self._demographic or ""
+
+    def retrieve_demographic(self, obfuscate: bool) -> None:
+        patient = Patient.objects.get(id=self.patient_uuid)
+
+        is_female = bool(patient.sex_at_birth == SexAtBirth.FEMALE)
+        dob = patient.birth_date.strftime("%B %d, %Y")
+        if obfuscate:
+            dob = "<DOB REDACTED>"  # principal of minimum disclosure
+        today = date.today()
+        age = (
+            today.year
+            - patient.birth_date.year
+            - ((today.month, today.day) < (patient.birth_date.month, patient.birth_date.day))
+        )
+        age_str = str(age)
+        if age < 2:
+            age_str = f"{(today.year - patient.birth_date.year) * 12 + today.month - patient.birth_date.month} months"
+            sex_at_birth = "baby girl" if is_female else "baby boy"
+        elif age < 20:
+            sex_at_birth = "girl" if is_female else "boy"
+        elif age > 65:
+            sex_at_birth = "elderly woman" if is_female else "elderly man"
+        else:
+            sex_at_birth = "woman" if is_female else "man"
+
+        result = f"the patient is a {sex_at_birth}, born on {dob} (age {age_str})"
+
+        weight = (
+            Observation.objects.for_patient(self.patient_uuid)
+            .filter(name="weight", category="vital-signs")
+            .order_by("-effective_datetime")
+            .first()
+        )
+        if weight and weight.value:
+            ratio = 1 / 1
+            if weight.units == "oz":
+                ratio = 1 / 16
 
-        return self._demographic
+            result = f"{result} and weight {int(weight.value) * ratio:1.2f} pounds"
+        self._demographic = result
 
     def practice_setting(self, setting: str) -> Any:
         if setting not in self._settings:
-            self._settings[setting] = None
-
+            result = None
             practice = None
             if staff := Staff.objects.filter(id=self.provider_uuid).first():
                 practice = staff.primary_practice_location
             if practice is None:
                 practice = PracticeLocation.objects.order_by("dbid").first()
             if practice and (value := practice.settings.filter(name=setting).order_by("dbid").first()):
-                self._settings[setting] = value.value
+                result = value.value
+            self._settings[setting] = result
         return self._settings[setting]
 
     def preferred_lab_partner(self) -> CodedItem:
+        self.wait_warm_up("preferredLabPartner")
         if self._preferred_lab_partner is None:
-            lab_partner_uuid = ""
-            preferred_lab = self.practice_setting("preferredLabPartner")
-            lab_partner = LabPartner.objects.filter(name=preferred_lab).first()
-            if lab_partner is not None:
-                lab_partner_uuid = str(lab_partner.id)
-            self._preferred_lab_partner = CodedItem(uuid=lab_partner_uuid, label=preferred_lab, code="")
-        return self._preferred_lab_partner
+            self.retrieve_preferred_lab_partner()
+        return self._preferred_lab_partner or CodedItem(uuid="", label="", code="")
+
+    def retrieve_preferred_lab_partner(self) -> None:
+        lab_partner_uuid = ""
+        preferred_lab = self.practice_setting("preferredLabPartner")
+        lab_partner = LabPartner.objects.filter(name=preferred_lab).first()
+        if lab_partner is not None:
+            lab_partner_uuid = str(lab_partner.id)
+        self._preferred_lab_partner = CodedItem(uuid=lab_partner_uuid, label=preferred_lab, code="")
 
     def to_json(self, obfuscate: bool) -> dict:
         return {
@@ -495,6 +577,118 @@ class LimitedCache:
             "labTests": {},
         }
 
+    @classmethod
+    def version_of(cls, records: QuerySet) -> str:
+        aggregated = records.aggregate(count=Count("dbid"), modified=Max("modified"))
+        modified = aggregated["modified"].isoformat() if aggregated["modified"] else ""
+        return f"{aggregated['count']}@{modified}"
+
+    def section_versions(self) -> dict[str, str]:
+        # cheap markers of the patient sections: the count and the last modification of their records
+        of_patient = Q(patient__id=self.patient_uuid)
+        immunizations = [
+            Immunization.objects.filter(of_patient),
+            ImmunizationStatement.objects.filter(of_patient),
+        ]
+        demographic = [
+            Patient.objects.filter(id=self.patient_uuid),
+            Observation.objects.filter(of_patient, name="weight", category="vital-signs"),
+        ]
+        return {
+            "allergies": self.version_of(AllergyIntolerance.objects.filter(of_patient)),
+            "conditions": self.version_of(Condition.objects.filter(of_patient)),
+            # the age changes with the day
+            "demographic": "|".join([date.today().isoformat()] + [self.version_of(q) for q in demographic]),
+            "goals": self.version_of(Goal.objects.filter(of_patient)),
+            "immunizations": "|".join([self.version_of(q) for q in immunizations]),
+            "medications": self.version_of(Medication.objects.filter(of_patient)),
+        }
+
+    def snapshot(self) -> dict:
+        # the patient sections retrieved so far, in the format of `to_json`, with their version
+        sections: dict[str, dict] = {}
+        if self._allergies is not None:
+            sections["allergies"] = {"currentAllergies": [i.to_dict() for i in self._allergies]}
+        if self._conditions is not None:
+            sections["conditions"] = {
+                "conditionHistory": [i.to_dict() for i in self._condition_history or []],
+                "currentConditions": [i.to_dict() for i in self._conditions],
+                "surgeryHistory": [i.to_dict() for i in self._surgery_history or []],
+            }
+        if self._demographic is not None:
+            sections["demographic"] = {"demographicStr": self._demographic}
+        if self._goals is not None:
+            sections["goals"] = {"currentGoals": [i.to_dict() for i in self._goals]}
+        if self._immunizations is not None:
+            sections["immunizations"] = {"currentImmunization": [i.to_dict() for i in self._immunizations]}
+        if self._medications is not None:
+            sections["medications"] = {"currentMedications": [i.to_dict() for i in self._medications]}
+        return {
+            section: {"version": self._versions[section], "values": values}
+            for section, values in sections.items()
+            if section in self._versions
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        # only the sections still up to date are restored, the others are retrieved when needed
+        chart: dict = {}
+        for section, content in snapshot.items():
+            if section in self._versions and content["version"] == self._versions[section]:
+                chart = chart | content["values"]
+        loaded = self.load_from_json(chart)
+        if "currentAllergies" in chart:
+            self._allergies = loaded._allergies
+        if "currentConditions" in chart:
+            self._condition_history = loaded._condition_history
+            self._conditions = loaded._conditions
+            self._surgery_history = loaded._surgery_history
+        if "demographicStr" in chart:
+            self._demographic = loaded._demographic
+        if "currentGoals" in chart:
+            self._goals = loaded._goals
+        if "currentImmunization" in chart:
+            self._immunizations = loaded._immunizations
+        if "currentMedications" in chart:
+            self._medications = loaded._medications
+
+    @classmethod
+    def snapshot_key(cls, note_uuid: str) -> str:
+        return f"chartSnapshot:{note_uuid}"
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        note_uuid: str,
+        patient_uuid: str,
+        provider_uuid: str,
+        staged_commands_to_coded_items: dict[str, list[CodedItem]],
+    ) -> LimitedCache:
+        try:
+            sdk_cache = get_cache()
+        except RuntimeError:
+            sdk_cache = None
+
+        if sdk_cache is None:
+            sdk_cache = SNAPSHOTS
+
+        result = cls(patient_uuid, provider_uuid, staged_commands_to_coded_items)
+        result._versions = result.section_versions()
+        result.restore(sdk_cache.get(cls.snapshot_key(note_uuid)) or {})
+        return result
+
+    def store_snapshot(self, note_uuid: str) -> None:
+        if not self._versions:
+            return
+        try:
+            sdk_cache = get_cache()
+        except RuntimeError:
+            sdk_cache = None
+
+        if sdk_cache is None:
+            SNAPSHOTS[self.snapshot_key(note_uuid)] = self.snapshot()
+        else:
+            sdk_cache.set(self.snapshot_key(note_uuid), self.snapshot())
+
     @classmethod
     def load_from_json(cls, cache: dict) -> LimitedCache:
         staged_commands = {
@@ -9,6 +9,7 @@ from hyperscribe.libraries.helper import Helper
 from hyperscribe.libraries.json_schema import JsonSchema
 from hyperscribe.libraries.llm_turns_store import LlmTurnsStore
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.upload_queue import UploadQueue
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.identification_parameters import IdentificationParameters
@@ -36,6 +37,8 @@ class LlmDecisionsReviewer:
         client_s3 = AwsS3(credentials)
         if client_s3.is_ready() is False:
             return
+        # the audit artifacts still in the upload queue are stored before being read
+        UploadQueue.flush(identification.note_uuid)
         # audit already performed
         store_path = f"hyperscribe-{identification.canvas_instance}/audits/{identification.note_uuid}/"
         if client_s3.list_s3_objects(store_path):
@@ -123,7 +126,7 @@ class LlmDecisionsReviewer:
                 f"{identification.note_uuid}/"
                 f"final_audit_{cycle:02d}.log"
             )
-            client_s3.upload_text_to_s3(store_path, json.dumps(result, indent=2))
+            client_s3.upload_text_to_s3(store_path, json.dumps(result, separators=(",", ":")))
         messages = [
             ProgressMessage(
                 message="audits done",
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+
+from canvas_sdk.caching.plugins import get_cache
+
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.structures.http_response import HttpResponse
+from hyperscribe.structures.llm_turn import LlmTurn
+from hyperscribe.structures.token_counts import TokenCounts
+
+# the response cache shared by all the LLM clients, none by default
+BACKEND: dict[str, LlmResponseCache] = {}
+
+
+class LlmResponseCache:
+    @classmethod
+    def use(cls, backend: LlmResponseCache | None) -> None:
+        BACKEND.clear()
+        if backend is not None:
+            BACKEND["current"] = backend
+
+    @classmethod
+    def select(cls, name: str) -> None:
+        # the backend is kept across the notes, and left untouched when no backend is named (e.g. evaluation runs)
+        if name == Constants.LLM_RESPONSE_CACHE_MEMORY:
+            if not isinstance(cls.current(), LlmResponseCacheMemory):
+                cls.use(LlmResponseCacheMemory(Constants.LLM_RESPONSE_CACHE_MEMORY_MAX_ENTRIES))
+        elif name == Constants.LLM_RESPONSE_CACHE_PLUGIN:
+            if not isinstance(cls.current(), LlmResponseCachePlugin):
+                cls.use(LlmResponseCachePlugin(Constants.LLM_RESPONSE_CACHE_TTL_SECONDS))
+
+    @classmethod
+    def current(cls) -> LlmResponseCache | None:
+        return BACKEND.get("current")
+
+    @classmethod
+    def key(
+        cls,
+        vendor: str,
+        model: str,
+        temperature: float,
+        prompts: list[LlmTurn],
+        audios: list[dict],
+        schemas: list,
+    ) -> str:
+        audio_digests: list[str] = []
+        for audio in audios:
+            data = audio.get("data", b"")
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            audio_digests.append(f"{audio.get('format', '')}:{sha256(data).hexdigest()}")
+
+        content = json.dumps(
+            {
+                "vendor": vendor,
+                "model": model,
+                "temperature": temperature,
+                "prompts": [prompt.to_dict() for prompt in prompts],
+                "audios": audio_digests,
+                "schemas": schemas,
+            },
+            sort_keys=True,
+        )
+        return sha256(content.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def to_json(cls, response: HttpResponse) -> dict:
+        return {"code": response.code, "response": response.response}
+
+    @classmethod
+    def from_json(cls, data: dict) -> HttpResponse:
+        # the tokens are consumed only once, when the response was actually generated
+        return HttpResponse(code=data["code"], response=data["response"], tokens=TokenCounts(prompt=0, generated=0))
+
+    def get(self, key: str) -> HttpResponse | None:
+        raise NotImplementedError()
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        raise NotImplementedError()
+
+
+class LlmResponseCacheMemory(LlmResponseCache):
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: dict[str, dict] = {}
+
+    def get(self, key: str) -> HttpResponse | None:
+        if (data := self.entries.pop(key, None)) is None:
+            return None
+        # re-inserted as the most recently used
+        self.entries[key] = data
+        return self.from_json(data)
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        self.entries.pop(key, None)
+        self.entries[key] = self.to_json(response)
+        while len(self.entries) > self.max_entries:
+            self.entries.pop(next(iter(self.entries)))
+
+
+class LlmResponseCachePlugin(LlmResponseCache):
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> HttpResponse | None:
+        if (data := get_cache().get(f"{Constants.LLM_RESPONSE_CACHE_KEY_PREFIX}{key}")) is None:
+            return None
+        return self.from_json(data)
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        get_cache().set(
+            f"{Constants.LLM_RESPONSE_CACHE_KEY_PREFIX}{key}",
+            self.to_json(response),
+            timeout_seconds=self.ttl_seconds,
+        )
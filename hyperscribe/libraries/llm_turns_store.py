@@ -7,6 +7,7 @@ from typing import Iterable, Tuple
 
 from hyperscribe.libraries.aws_s3 import AwsS3
 from hyperscribe.libraries.cached_sdk import CachedSdk
+from hyperscribe.libraries.upload_queue import UploadQueue
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.llm_turn import LlmTurn
@@ -21,9 +22,20 @@ class LlmTurnsStore:
             del DISCUSSIONS[note_uuid]
 
     @classmethod
-    def instance(cls, s3_credentials: AwsS3Credentials, identification: IdentificationParameters) -> LlmTurnsStore:
+    def instance(
+        cls,
+        s3_credentials: AwsS3Credentials,
+        identification: IdentificationParameters,
+        cycle: int | None = None,
+    ) -> LlmTurnsStore:
+        # without explicit cycle, the turns are stored with the cycle being computed
         cached = CachedSdk.get_discussion(identification.note_uuid)
-        return LlmTurnsStore(s3_credentials, identification, cached.creation_day(), cached.cycle)
+        return LlmTurnsStore(
+            s3_credentials,
+            identification,
+            cached.creation_day(),
+            cached.cycle if cycle is None else cycle,
+        )
 
     def __init__(
         self,
@@ -59,7 +71,12 @@ class LlmTurnsStore:
     def store_document(self, name: str, document: dict | list) -> None:
         client_s3 = AwsS3(self.s3_credentials)
         if client_s3.is_ready():
-            client_s3.upload_text_to_s3(f"{self.store_path()}/{name}", json.dumps(document, indent=2))
+            UploadQueue.enqueue(
+                self.identification.note_uuid,
+                self.s3_credentials,
+                f"{self.store_path()}/{name}",
+                json.dumps(document, separators=(",", ":")),
+            )
 
     def stored_document(self, name: str) -> list:
         client_s3 = AwsS3(self.s3_credentials)
@@ -72,9 +89,11 @@ class LlmTurnsStore:
     def stored_documents(self) -> Iterable[tuple[str, list]]:
         client_s3 = AwsS3(self.s3_credentials)
         if client_s3.is_ready():
-            urls = [document.key for document in client_s3.list_s3_objects(self.store_path())]
-            for url in sorted(urls, key=self.s3_path_sort):
-                response = client_s3.access_s3_object(url)
+            urls = sorted(
+                [document.key for document in client_s3.list_s3_objects(self.store_path())],
+                key=self.s3_path_sort,
+            )
+            for url, response in zip(urls, client_s3.get_many(urls)):
                 if response.status_code == HTTPStatus.OK.value:
                     step = url.split("/")[-1].removesuffix(".json")
                     yield step, response.json() or []
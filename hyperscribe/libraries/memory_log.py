@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime, UTC
+from time import time
+from typing import Any
 
+from canvas_sdk.utils.http import ThreadPoolExecutor
 from logger import log
 
 from hyperscribe.libraries.aws_s3 import AwsS3
 from hyperscribe.libraries.cached_sdk import CachedSdk
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.token_counts import TokenCounts
 
 ENTRIES: dict[str, dict[str, list[str]]] = {}  # store the logs sent to AWS S3
 PROMPTS: dict[str, TokenCounts] = {}  # store the token consumptions
+CACHE_LOOKUPS: dict[str, Counter] = {}  # store the hits and misses of the LLM response cache
+JSON_OUTCOMES: dict[str, Counter] = {}  # store how the JSON of the LLM responses were obtained
+LINES: dict[str, int] = {}  # number of lines in the logs of each note
+DROPPED: dict[str, int] = {}  # number of debug lines not logged because the logs of the note were full
+PENDING: dict[str, dict[str, tuple[AwsS3Credentials, str]]] = {}  # latest partial logs not uploaded, per note and path
+SHIPPED: dict[str, dict[str, tuple[float, int]]] = {}  # time and size of the last upload, per note and path
+UPLOADS: dict[str, list[Any]] = {}  # uploads in progress, per note
+
+shipper = ThreadPoolExecutor(max_workers=Constants.MEMORY_LOG_SHIP_WORKERS)
 
 
 class MemoryLog:
@@ -21,10 +36,30 @@ class MemoryLog:
 
     @classmethod
     def end_session(cls, note_uuid: str) -> str:
+        # the partial logs still pending are uploaded in the background, the cycle does not wait for them
+        uploads = UPLOADS.pop(note_uuid, [])
+        pending = PENDING.pop(note_uuid, {})
+        SHIPPED.pop(note_uuid, None)
+        if pending:
+            shipper.submit(cls.flush, note_uuid, uploads, pending)
+        LINES.pop(note_uuid, None)
+        dropped = DROPPED.pop(note_uuid, 0)
+        lookups = CACHE_LOOKUPS.pop(note_uuid, None)
+        outcomes = JSON_OUTCOMES.pop(note_uuid, None)
         if note_uuid not in ENTRIES:
             return ""
 
-        ENTRIES[note_uuid]["TOKENS"] = [f"TOTAL Tokens: {PROMPTS[note_uuid].prompt} / {PROMPTS[note_uuid].generated}"]
+        counts = cls.token_counts(note_uuid)
+        ENTRIES[note_uuid]["TOKENS"] = [f"TOTAL Tokens: {counts.prompt} / {counts.generated}"]
+        if dropped:
+            ENTRIES[note_uuid]["DROPPED"] = [f"Log lines dropped: {dropped}"]
+        if lookups:
+            ENTRIES[note_uuid]["CACHE"] = [f"LLM cache: {lookups['hits']} hits / {lookups['misses']} misses"]
+        if outcomes:
+            ENTRIES[note_uuid]["JSON"] = [
+                f"LLM JSON: {outcomes['valid']} valid / {outcomes['repaired']} repaired / "
+                f"{outcomes['re-asked']} re-asked / {outcomes['retried']} retried"
+            ]
         return "\n\n\n\n".join(
             [
                 "\n".join(l)
@@ -35,6 +70,47 @@ class MemoryLog:
             ]
         )
 
+    @classmethod
+    def adopt(cls, note_uuid: str, cycle: int) -> None:
+        # the logs of the cycle transcribed ahead become part of the session of the cycle being computed
+        key = Tracer.cycle_key(note_uuid, cycle)
+        if key not in ENTRIES:
+            return
+        entries = ENTRIES.setdefault(note_uuid, {})
+        for label, lines in ENTRIES.pop(key).items():
+            entries.setdefault(label, []).extend(lines)
+        PROMPTS.setdefault(note_uuid, TokenCounts(prompt=0, generated=0)).add(
+            PROMPTS.pop(key, TokenCounts(prompt=0, generated=0))
+        )
+        for counters in [CACHE_LOOKUPS, JSON_OUTCOMES]:
+            if counter := counters.pop(key, None):
+                counters.setdefault(note_uuid, Counter()).update(counter)
+        LINES[note_uuid] = LINES.get(note_uuid, 0) + LINES.pop(key, 0)
+        if dropped := DROPPED.pop(key, 0):
+            DROPPED[note_uuid] = DROPPED.get(note_uuid, 0) + dropped
+
+    @classmethod
+    def discard(cls, note_uuid: str) -> None:
+        # the logs of the cycles transcribed ahead and never computed are discarded
+        for key in [key for key in list(ENTRIES.keys()) if key.startswith(f"{note_uuid}/")]:
+            stores: list[dict] = [ENTRIES, PROMPTS, CACHE_LOOKUPS, JSON_OUTCOMES, LINES, DROPPED]
+            for store in stores:
+                store.pop(key, None)
+
+    @classmethod
+    def flush(cls, note_uuid: str, uploads: list, pending: dict[str, tuple[AwsS3Credentials, str]]) -> None:
+        # the uploads in progress are awaited, so the partial logs still pending are uploaded last
+        for upload in uploads:
+            upload.exception()  # <-- waits without raising, a failed upload does not prevent the others
+        for log_path, (s3_credentials, content) in pending.items():
+            AwsS3(s3_credentials).upload_text_to_s3(log_path, content, note_uuid)
+
+    @classmethod
+    def ship(cls, note_uuid: str, log_path: str) -> None:
+        # the latest content is uploaded, the versions stored while the upload was waiting are skipped
+        if pending := PENDING.get(note_uuid, {}).pop(log_path, None):
+            AwsS3(pending[0]).upload_text_to_s3(log_path, pending[1], note_uuid)
+
     @classmethod
     def dev_null_instance(cls) -> MemoryLog:
         identification = IdentificationParameters(
@@ -52,51 +128,90 @@ class MemoryLog:
         identification: IdentificationParameters,
         label: str,
         s3_credentials: AwsS3Credentials,
+        cycle: int | None = None,
+        span: Tracer | None = None,
     ) -> MemoryLog:
-        instance = cls(identification, label)
+        instance = cls(identification, label, cycle)
         instance.s3_credentials = s3_credentials
+        instance.span = span
         return instance
 
-    def __init__(self, identification: IdentificationParameters, label: str) -> None:
+    def __init__(self, identification: IdentificationParameters, label: str, cycle: int | None = None) -> None:
+        # without explicit cycle, the logs are part of the cycle being computed
         self.identification = identification
         self.label = label
+        self.cycle = cycle
+        self.key = Tracer.cycle_key(identification.note_uuid, cycle)
         self.counts = TokenCounts(prompt=0, generated=0)
         self.s3_credentials = AwsS3Credentials(aws_key="", aws_secret="", region="", bucket="")
-        if self.identification.note_uuid not in ENTRIES:
-            ENTRIES[self.identification.note_uuid] = {}
-            PROMPTS[self.identification.note_uuid] = TokenCounts(prompt=0, generated=0)
-        if label not in ENTRIES[self.identification.note_uuid]:
-            ENTRIES[self.identification.note_uuid][self.label] = []
-        self.current_idx = len(ENTRIES[self.identification.note_uuid][self.label])
+        self.span: Tracer | None = None  # the span of the stage logged, the LLM calls are nested in it
+        if self.key not in ENTRIES:
+            ENTRIES[self.key] = {}
+            PROMPTS[self.key] = TokenCounts(prompt=0, generated=0)
+        if label not in ENTRIES[self.key]:
+            ENTRIES[self.key][self.label] = []
+        self.session = ENTRIES[self.key]  # the entries of each session are a new dictionary
+        self.current_idx = len(ENTRIES[self.key][self.label])
+
+    def is_session_open(self) -> bool:
+        # once the session is ended, its entries are gone, or replaced by those of the next session of the note
+        return ENTRIES.get(self.key) is self.session
 
     def log(self, message: str) -> None:
-        ENTRIES[self.identification.note_uuid][self.label].append(f"{datetime.now(UTC).isoformat()}: {message}")
+        # the debug lines are dropped when the logs of the note are full, the caller never waits
+        if LINES.get(self.key, 0) >= Constants.MEMORY_LOG_MAX_LINES:
+            DROPPED[self.key] = DROPPED.get(self.key, 0) + 1
+            return
+        self.append(message)
 
     def output(self, message: str) -> None:
-        self.log(message)
+        self.append(message)
         log.info(message)
 
+    def append(self, message: str) -> None:
+        ENTRIES[self.key][self.label].append(f"{datetime.now(UTC).isoformat()}: {message}")
+        LINES[self.key] = LINES.get(self.key, 0) + 1
+
     def logs(self, from_index: int, to_index: int) -> str:
-        return "\n".join(ENTRIES[self.identification.note_uuid][self.label][from_index:to_index])
+        return "\n".join(ENTRIES[self.key][self.label][from_index:to_index])
 
     def store_so_far(self) -> None:
         client_s3 = AwsS3(self.s3_credentials)
         if client_s3.is_ready():
             cached = CachedSdk.get_discussion(self.identification.note_uuid)
+            cycle = cached.cycle if self.cycle is None else self.cycle
             log_path = (
                 f"hyperscribe-{self.identification.canvas_instance}/"
                 "partials/"
                 f"{cached.creation_day()}/"
                 f"{self.identification.note_uuid}/"
-                f"{cached.cycle:02d}/"
+                f"{cycle:02d}/"
                 f"{self.label}.log"
             )
             self.log(f"---> tokens: {self.counts.prompt} / {self.counts.generated}")
             from_index = self.current_idx
-            to_index = len(ENTRIES[self.identification.note_uuid][self.label])
+            to_index = len(ENTRIES[self.key][self.label])
             # self.current_idx = to_index # <-- ensure a full log is stored
-            client_s3.upload_text_to_s3(log_path, self.logs(from_index, to_index))
+            content = self.logs(from_index, to_index)
+            note_uuid = self.identification.note_uuid
+            PENDING.setdefault(note_uuid, {})[log_path] = (self.s3_credentials, content)
+            # the upload happens in the background, once the log is old enough or has grown enough,
+            # otherwise the latest content is uploaded by the next one or when the session ends
+            shipped_at, shipped_size = SHIPPED.get(note_uuid, {}).get(log_path, (0.0, 0))
+            now = time()
+            if (
+                now - shipped_at >= Constants.MEMORY_LOG_SHIP_INTERVAL_SECONDS
+                or len(content) - shipped_size >= Constants.MEMORY_LOG_SHIP_BYTES
+            ):
+                SHIPPED.setdefault(note_uuid, {})[log_path] = (now, len(content))
+                UPLOADS.setdefault(note_uuid, []).append(shipper.submit(self.ship, note_uuid, log_path))
+
+    def add_cache_lookup(self, hit: bool) -> None:
+        CACHE_LOOKUPS.setdefault(self.key, Counter()).update(["hits" if hit else "misses"])
+
+    def add_json_outcome(self, outcome: str) -> None:
+        JSON_OUTCOMES.setdefault(self.key, Counter()).update([outcome])
 
     def add_consumption(self, counts: TokenCounts) -> None:
         self.counts.add(counts)
-        PROMPTS[self.identification.note_uuid].add(counts)
+        PROMPTS.setdefault(self.key, TokenCounts(prompt=0, generated=0)).add(counts)
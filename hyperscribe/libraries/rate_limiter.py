@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from random import uniform
+from time import sleep, time
+from typing import Any
+from uuid import uuid4
+
+from canvas_sdk.utils.http import ThreadPoolExecutor
+
+from hyperscribe.libraries.constants import Constants
+
+LIMITERS: dict[str, RateLimiter] = {}  # shared by all the threads, one limiter per vendor or service
+# neither threading nor concurrent.futures are allowed in the plugin context: a thread waiting for a slot
+# waits on a task queued behind a sleeping one, cancelling the task wakes the thread up at once
+parking = ThreadPoolExecutor(max_workers=1)
+PARKING: dict[str, Any] = {}  # the sleeping task, the waiting tasks run, and wake up their thread, once it is done
+
+
+class RateLimiter:
+    def __init__(self, key: str):
+        self.key = key
+        initial, ceiling = Constants.RATE_LIMITER_CONCURRENCY.get(key, Constants.RATE_LIMITER_DEFAULT_CONCURRENCY)
+        self.limit = float(initial)  # concurrent requests allowed, AIMD
+        self.ceiling = float(ceiling)
+        self.active: set[str] = set()
+        self.waiters: list[Any] = []  # futures of the threads waiting for a free slot, the oldest first
+        self.tokens = float(Constants.RATE_LIMITER_BURST)
+        self.refilled_at = time()
+        self.blocked_until = 0.0  # set by the Retry-After of the vendor
+        self.decreased_at = 0.0
+        self.counters: dict[str, float] = {"requests": 0, "throttled": 0, "waitSeconds": 0.0, "backoffSeconds": 0.0}
+
+    @classmethod
+    def for_key(cls, key: str) -> RateLimiter:
+        if key not in LIMITERS:
+            LIMITERS[key] = cls(key)
+        return LIMITERS[key]
+
+    @classmethod
+    def statistics(cls) -> dict:
+        return {
+            key: {name: round(value, 3) for name, value in limiter.counters.items()} | {"limit": int(limiter.limit)}
+            for key, limiter in LIMITERS.items()
+        }
+
+    @classmethod
+    def is_retryable(cls, status_code: int) -> bool:
+        # 0 stands for a request that did not get any response (timeout, dropped connection...)
+        return status_code == 0 or status_code in Constants.RATE_LIMITER_THROTTLED_CODES or status_code >= 500
+
+    @classmethod
+    def retry_after(cls, headers: Any) -> float:
+        values = {str(name).lower(): value for name, value in dict(headers or {}).items()}
+        result = 0.0
+        for name, factor in [("retry-after-ms", 0.001), ("retry-after", 1.0)]:
+            try:
+                result = float(values[name]) * factor
+                break
+            except (KeyError, TypeError, ValueError):
+                # the HTTP-date format is ignored, the backoff applies instead
+                continue
+        return min(max(result, 0.0), Constants.RATE_LIMITER_RETRY_AFTER_MAX_SECONDS)
+
+    def has_free_slot(self) -> bool:
+        return len(self.active) < int(self.limit)
+
+    def acquire(self) -> str:
+        # no lock in the plugin context: the limits are best-effort
+        ticket = uuid4().hex
+        start = time()
+        while True:
+            now = time()
+            self.tokens = min(
+                float(Constants.RATE_LIMITER_BURST),
+                self.tokens + (now - self.refilled_at) * Constants.RATE_LIMITER_REQUESTS_PER_SECOND,
+            )
+            self.refilled_at = now
+            if now < self.blocked_until:
+                sleep(self.blocked_until - now)
+            elif self.tokens < 1.0:
+                # the time of the next token is known
+                sleep((1.0 - self.tokens) / Constants.RATE_LIMITER_REQUESTS_PER_SECOND)
+            elif len(self.active) >= int(self.limit):
+                self.wait_release()
+            else:
+                self.tokens = self.tokens - 1.0
+                self.active.add(ticket)
+                break
+        self.count("requests", 1)
+        self.count("waitSeconds", now - start)
+        return ticket
+
+    def wait_release(self) -> None:
+        if (sleeping := PARKING.get("sleeping")) is None or sleeping.done():
+            PARKING["sleeping"] = parking.submit(sleep, Constants.RATE_LIMITER_WAIT_MAX_SECONDS)
+        # the waiter is registered before checking the slots again, so a release in between is not missed
+        waiter = parking.submit(int)
+        self.waiters.append(waiter)
+        if len(self.active) >= int(self.limit):
+            try:
+                waiter.result()
+            except Exception:
+                pass  # <-- cancelled by a release
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass  # <-- already removed by the release that woke it up
+
+    def wake_up(self) -> None:
+        # as many waiters as free slots are woken up, the oldest first
+        free = int(self.limit) - len(self.active)
+        while free > 0:
+            try:
+                waiter = self.waiters.pop(0)
+            except IndexError:
+                break
+            # the waiters already run are already awake
+            if waiter.cancel():
+                free = free - 1
+
+    def release(self, ticket: str, status_code: int, headers: Any) -> None:
+        self.active.discard(ticket)
+        now = time()
+        if status_code in Constants.RATE_LIMITER_THROTTLED_CODES:
+            self.count("throttled", 1)
+            self.blocked_until = max(self.blocked_until, now + self.retry_after(headers))
+            # multiplicative decrease, once for the responses throttled together
+            if now - self.decreased_at >= Constants.RATE_LIMITER_DECREASE_INTERVAL_SECONDS:
+                self.limit = max(1.0, self.limit * Constants.RATE_LIMITER_DECREASE_FACTOR)
+                self.decreased_at = now
+        elif 0 < status_code < 500:
+            # additive increase, about one more slot once all the slots have succeeded
+            self.limit = min(self.ceiling, self.limit + 1.0 / self.limit)
+        self.wake_up()
+
+    def backoff(self, attempt: int) -> None:
+        # exponential with jitter, so the threads throttled together do not retry together
+        delay = min(
+            Constants.RATE_LIMITER_BACKOFF_MAX_SECONDS,
+            Constants.RATE_LIMITER_BACKOFF_BASE_SECONDS * 2**attempt,
+        )
+        delay = uniform(delay / 2, delay)
+        self.count("backoffSeconds", delay)
+        sleep(delay)
+
+    def count(self, counter: str, value: float) -> None:
+        self.counters[counter] = self.counters[counter] + value
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from typing import Any
+
+from canvas_sdk.questionnaires.utils import Draft7Validator
+
+from hyperscribe.libraries.constants import Constants
+
+VALIDATORS: dict[str, Draft7Validator] = {}  # compiled validators by schema content, the least recently used first
+INTERNED: dict[
+    int, tuple[dict, str]
+] = {}  # content keys by schema identity, the schema is kept so its id is not reused
+
+
+class SchemaRegistry:
+    @classmethod
+    def key(cls, schema: dict) -> str:
+        return sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def intern(cls, schema: dict) -> str:
+        # the static schemas are found by identity, the dynamic ones (rebuilt per call) by content
+        interned = INTERNED.get(id(schema))
+        if interned is not None and interned[0] is schema:
+            return interned[1]
+        result = cls.key(schema)
+        INTERNED[id(schema)] = (schema, result)
+        cls.evict(INTERNED)
+        return result
+
+    @classmethod
+    def validator(cls, schema: dict) -> Draft7Validator:
+        key = cls.intern(schema)
+        result = VALIDATORS.pop(key, None)
+        if result is None:
+            result = Draft7Validator(schema)
+        VALIDATORS[key] = result
+        cls.evict(VALIDATORS)
+        return result
+
+    @classmethod
+    def evict(cls, entries: dict) -> None:
+        if len(entries) > Constants.SCHEMA_REGISTRY_MAX_VALIDATORS:
+            for key in list(entries)[: len(entries) - Constants.SCHEMA_REGISTRY_MAX_VALIDATORS]:
+                entries.pop(key, None)
+
+    @classmethod
+    def validate(cls, content: Any, schema: dict) -> str:
+        result: list = []
+        for error in cls.validator(schema).iter_errors(content):
+            message = error.message
+            if error.path:
+                message = f"{error.message}, in path {list(error.path)}"
+            result.append(message)
+        return "\n".join(result)
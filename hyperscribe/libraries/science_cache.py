@@ -0,0 +1,66 @@
+import json
+from hashlib import sha256
+from time import time
+
+from canvas_sdk.caching.plugins import get_cache
+
+from hyperscribe.libraries.constants import Constants
+
+ENTRIES: dict[str, tuple[float, list]] = {}  # expiration and results by key, the least recently used first
+COUNTERS: dict[str, int] = {"hits": 0, "misses": 0, "coalesced": 0}
+
+
+class ScienceCache:
+    @classmethod
+    def key(cls, url: str, params: dict, is_ontologies: bool) -> str:
+        # the same search, case and spaces aside, shares the same key
+        source = "ontologies" if is_ontologies else "science"
+        normalized = {name: " ".join(str(value).split()).lower() for name, value in params.items()}
+        content = json.dumps({"source": source, "url": url, "params": normalized}, sort_keys=True)
+        return f"{Constants.SCIENCE_CACHE_KEY_PREFIX}{sha256(content.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def get(cls, key: str) -> list | None:
+        result: list | None = None
+        if (entry := ENTRIES.pop(key, None)) is not None and entry[0] > time():
+            # re-inserted as the most recently used
+            ENTRIES[key] = entry
+            result = entry[1]
+        else:
+            try:
+                result = get_cache().get(key)
+            except RuntimeError:
+                result = None
+            if result is not None:
+                # the remaining time in the plugin cache is unknown, the shortest duration is assumed
+                cls.remember(key, result, Constants.SCIENCE_CACHE_NEGATIVE_TTL_SECONDS)
+        cls.count("misses" if result is None else "hits")
+        return result
+
+    @classmethod
+    def set(cls, key: str, results: list) -> None:
+        # the searches without results are kept for a shorter time
+        ttl_seconds = Constants.SCIENCE_CACHE_TTL_SECONDS
+        if not results:
+            ttl_seconds = Constants.SCIENCE_CACHE_NEGATIVE_TTL_SECONDS
+        cls.remember(key, results, ttl_seconds)
+        try:
+            get_cache().set(key, results, timeout_seconds=ttl_seconds)
+        except RuntimeError:
+            pass
+
+    @classmethod
+    def remember(cls, key: str, results: list, ttl_seconds: int) -> None:
+        ENTRIES.pop(key, None)
+        ENTRIES[key] = (time() + ttl_seconds, results)
+        while len(ENTRIES) > Constants.SCIENCE_CACHE_MEMORY_MAX_ENTRIES:
+            ENTRIES.pop(next(iter(ENTRIES)))
+
+    @classmethod
+    def count(cls, counter: str) -> None:
+        COUNTERS[counter] = COUNTERS[counter] + 1
+
+    @classmethod
+    def statistics(cls) -> dict:
+        lookups = COUNTERS["hits"] + COUNTERS["misses"]
+        return COUNTERS | {"hitRate": round(COUNTERS["hits"] / lookups, 3) if lookups else 0.0}
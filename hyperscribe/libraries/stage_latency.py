@@ -0,0 +1,30 @@
+from hyperscribe.libraries.constants import Constants
+
+LATENCIES: dict[str, list[float]] = {}  # durations of the last successful LLM requests, the oldest first, per stage
+
+
+class StageLatency:
+    @classmethod
+    def stage(cls, label: str) -> str:
+        # the requests made for different instructions of the same type belong to the same stage
+        for stage in Constants.HEDGING_INSTRUCTION_STAGES:
+            suffix = f"_{stage}"
+            if label.endswith(suffix) and "_" in label[: -len(suffix)]:
+                return f"{label.split('_')[0]}{suffix}"
+        return label
+
+    @classmethod
+    def record(cls, label: str, seconds: float) -> None:
+        latencies = LATENCIES.setdefault(cls.stage(label), [])
+        latencies.append(seconds)
+        if len(latencies) > Constants.HEDGING_LATENCY_SAMPLES:
+            latencies.pop(0)
+
+    @classmethod
+    def threshold(cls, label: str) -> float | None:
+        # None as long as too few requests have been observed to know what is slow
+        latencies = sorted(LATENCIES.get(cls.stage(label), []))
+        if len(latencies) < Constants.HEDGING_MIN_SAMPLES:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * Constants.HEDGING_LATENCY_PERCENTILE))
+        return latencies[index]
@@ -82,9 +82,16 @@ class StopAndGo:
             )
         return self
 
-    def consume_next_waiting_cycles(self, save: bool) -> bool:
-        if self._waiting_cycles:
-            self._cycle = self._waiting_cycles.pop(0)
+    def next_waiting_cycles(self) -> list[int]:
+        # when the runner fell behind, the waiting cycles are coalesced to be processed at once
+        if len(self._waiting_cycles) > Constants.COALESCING_WAITING_CYCLES_THRESHOLD:
+            return self._waiting_cycles[: Constants.COALESCING_WAITING_CYCLES_MAX]
+        return self._waiting_cycles[:1]
+
+    def consume_waiting_cycles(self, cycles: list[int], save: bool) -> bool:
+        if cycles and self._waiting_cycles[: len(cycles)] == cycles:
+            self._waiting_cycles = self._waiting_cycles[len(cycles) :]
+            self._cycle = cycles[-1]
             if save:
                 self.save()
             return True
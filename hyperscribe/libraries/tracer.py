@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from time import time
+from uuid import uuid4
+
+from hyperscribe.structures.identification_parameters import IdentificationParameters
+from hyperscribe.structures.trace_span import TraceSpan
+
+ROOTS: dict[str, str] = {}  # the span of the cycle being traced, per note
+SPANS: dict[str, list[TraceSpan]] = {}  # the spans ended during the cycle being traced, per note
+
+
+class Tracer:
+    @classmethod
+    def begin(cls, note_uuid: str, name: str, parent: Tracer | None = None) -> Tracer:
+        # without explicit parent, the span is attached to the cycle of the note
+        if parent is not None:
+            return cls(parent.note_uuid, name, parent.span_id)
+        return cls(note_uuid, name, ROOTS.get(note_uuid, ""))
+
+    @classmethod
+    def begin_cycle(cls, note_uuid: str, attributes: dict) -> Tracer:
+        result = cls(note_uuid, "cycle", "")
+        result.set(attributes)
+        ROOTS[note_uuid] = result.span_id
+        SPANS[note_uuid] = []
+        return result
+
+    @classmethod
+    def end_cycle(cls, root: Tracer, cycle: int) -> dict:
+        root.end()
+        ROOTS.pop(root.note_uuid, None)
+        return {
+            "note": root.note_uuid,
+            "cycle": cycle,
+            "spans": [span.to_json() for span in SPANS.pop(root.note_uuid, [])],
+        }
+
+    @classmethod
+    def cycle_key(cls, note_uuid: str, cycle: int | None) -> str:
+        # the cycle transcribed ahead is kept apart from the cycle being computed, until adopted by its computation
+        if cycle is None:
+            return note_uuid
+        return f"{note_uuid}/{cycle:02d}"
+
+    @classmethod
+    def adopt(cls, root: Tracer, cycle: int) -> None:
+        # the spans of the cycle transcribed ahead are attached to the cycle being traced
+        key = cls.cycle_key(root.note_uuid, cycle)
+        ahead_id = ROOTS.pop(key, "")
+        spans = SPANS.pop(key, [])
+        if root.note_uuid in ROOTS:
+            SPANS.setdefault(root.note_uuid, []).extend(
+                [
+                    TraceSpan(
+                        span_id=span.span_id,
+                        parent_id=root.span_id if span.parent_id == ahead_id else span.parent_id,
+                        name=span.name,
+                        start=span.start,
+                        duration=span.duration,
+                        attributes=span.attributes,
+                    )
+                    for span in spans
+                ]
+            )
+
+    @classmethod
+    def discard(cls, note_uuid: str) -> None:
+        # the cycles transcribed ahead and never computed are discarded too
+        for key in [key for key in list(ROOTS.keys()) + list(SPANS.keys()) if key.startswith(f"{note_uuid}/")]:
+            ROOTS.pop(key, None)
+            SPANS.pop(key, None)
+        ROOTS.pop(note_uuid, None)
+        SPANS.pop(note_uuid, None)
+
+    @classmethod
+    def store_path(cls, identification: IdentificationParameters, creation_day: str, cycle: int) -> str:
+        return (
+            f"hyperscribe-{identification.canvas_instance}/"
+            "traces/"
+            f"{creation_day}/"
+            f"{identification.note_uuid}/"
+            f"{cycle:02d}.json"
+        )
+
+    def __init__(self, note_uuid: str, name: str, parent_id: str) -> None:
+        self.note_uuid = note_uuid
+        self.name = name
+        self.parent_id = parent_id
+        self.span_id = uuid4().hex[:12]
+        self.start = time()
+        self.attributes: dict = {}
+
+    def set(self, attributes: dict) -> None:
+        self.attributes = self.attributes | attributes
+
+    def end(self, attributes: dict | None = None) -> None:
+        if attributes:
+            self.set(attributes)
+        # only the spans of a traced cycle are kept
+        if self.note_uuid in ROOTS:
+            SPANS.setdefault(self.note_uuid, []).append(
+                TraceSpan(
+                    span_id=self.span_id,
+                    parent_id=self.parent_id,
+                    name=self.name,
+                    start=self.start,
+                    duration=time() - self.start,
+                    attributes=self.attributes,
+                )
+            )
@@ -0,0 +1,58 @@
+from time import sleep
+from typing import Any
+
+from canvas_sdk.utils.http import ThreadPoolExecutor
+from logger import log
+
+from hyperscribe.libraries.aws_s3 import AwsS3
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.rate_limiter import RateLimiter
+from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
+
+# the uploads of the same key always go to the same single worker lane, so they are written in the order received
+LANES: list[ThreadPoolExecutor] = [ThreadPoolExecutor(max_workers=1) for _ in range(Constants.UPLOAD_QUEUE_LANES)]
+UPLOADS: dict[str, list[Any]] = {}  # queued or in progress uploads, per note
+
+
+class UploadQueue:
+    @classmethod
+    def queued(cls) -> int:
+        return sum([1 for uploads in UPLOADS.values() for upload in uploads if not upload.done()])
+
+    @classmethod
+    def enqueue(cls, note_uuid: str, s3_credentials: AwsS3Credentials, object_key: str, data: str) -> None:
+        # when the queue is full, the caller uploads by itself instead of waiting for a free spot
+        if cls.queued() >= Constants.UPLOAD_QUEUE_MAX_SIZE:
+            cls.upload(note_uuid, s3_credentials, object_key, data)
+            return
+        lane = LANES[hash(object_key) % len(LANES)]
+        UPLOADS.setdefault(note_uuid, []).append(lane.submit(cls.upload, note_uuid, s3_credentials, object_key, data))
+
+    @classmethod
+    def upload(cls, note_uuid: str, s3_credentials: AwsS3Credentials, object_key: str, data: str) -> None:
+        status_code = 0
+        for attempt in range(Constants.UPLOAD_QUEUE_MAX_ATTEMPTS):
+            if attempt:
+                sleep(Constants.UPLOAD_QUEUE_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+            try:
+                status_code = AwsS3(s3_credentials).upload_text_to_s3(object_key, data, note_uuid).status_code or 0
+            except Exception:
+                status_code = 0
+            if 200 <= status_code < 300 or not RateLimiter.is_retryable(status_code):
+                break
+        if not 200 <= status_code < 300:
+            log.info(f"upload of {object_key} failed with status {status_code}")
+
+    @classmethod
+    def flush(cls, note_uuid: str) -> None:
+        # barrier: the uploads of the note queued so far are all done when returning
+        for upload in UPLOADS.pop(note_uuid, []):
+            upload.exception()  # <-- waits without raising, a failed upload does not prevent the others
+
+    @classmethod
+    def prune(cls, note_uuid: str) -> None:
+        # forget the uploads already done, to be called once the note has nothing more to queue for the cycle
+        if note_uuid in UPLOADS:
+            UPLOADS[note_uuid] = [upload for upload in UPLOADS[note_uuid] if not upload.done()]
+            if not UPLOADS[note_uuid]:
+                del UPLOADS[note_uuid]
@@ -1,8 +1,8 @@
 import json
 from http import HTTPStatus
 
-from requests import post as requests_post
-
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.token_counts import TokenCounts
@@ -12,6 +12,12 @@ class LlmAnthropic(LlmBase):
     def support_speaker_identification(self) -> bool:
         return True
 
+    def vendor(self) -> str:
+        return Constants.VENDOR_ANTHROPIC
+
+    def support_streaming(self) -> bool:
+        return True
+
     def to_dict(self) -> dict:
         messages: list[dict] = []
 
@@ -40,7 +46,10 @@ class LlmAnthropic(LlmBase):
         data = json.dumps(self.to_dict())
         self.memory_log.log("--- request begins:")
         self.memory_log.log(json.dumps(self.to_dict(), indent=2))
-        request = requests_post(url, headers=headers, params={}, data=data, verify=True, timeout=None)
+        if self.is_streaming():
+            data = json.dumps(self.to_dict() | {"stream": True})
+            return self.stream_request(url, headers, data, self.stream_event)
+        request = HttpPool.post(Constants.VENDOR_ANTHROPIC, url, headers=headers, params={}, data=data)
         self.memory_log.log(f"status code: {request.status_code}")
         self.memory_log.log(request.text)
         self.memory_log.log("--- request ends ---")
@@ -63,3 +72,18 @@ class LlmAnthropic(LlmBase):
             )
 
         return result
+
+    @classmethod
+    def stream_event(cls, event: dict) -> tuple[str, TokenCounts]:
+        text = ""
+        usage = event.get("usage") or {}
+        if event.get("type") == "message_start":
+            usage = event.get("message", {}).get("usage") or {}
+        elif event.get("type") == "content_block_delta":
+            text = event.get("delta", {}).get("text", "")
+        return text, TokenCounts(prompt=usage.get("input_tokens") or 0, generated=usage.get("output_tokens") or 0)
+
+    @classmethod
+    def stream_ended(cls, event: dict) -> bool:
+        # the generated tokens are sent with the message_delta, just before the message_stop
+        return bool(event.get("type") == "message_stop")
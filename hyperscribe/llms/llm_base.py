@@ -1,21 +1,34 @@
 from __future__ import annotations
-from time import time
+from time import sleep, time
 import json
 import re
 from http import HTTPStatus
+from typing import Any, Callable
 
-from canvas_sdk.questionnaires.utils import Draft7Validator
+from canvas_sdk.utils.http import ThreadPoolExecutor
 from logger import log
+from requests import RequestException, Response
 
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
+from hyperscribe.libraries.json_repair import JsonRepair
+from hyperscribe.libraries.json_stream import JsonStream
+from hyperscribe.libraries.llm_response_cache import LlmResponseCache
 from hyperscribe.libraries.llm_turns_store import LlmTurnsStore
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.rate_limiter import RateLimiter
+from hyperscribe.libraries.schema_registry import SchemaRegistry
+from hyperscribe.libraries.stage_latency import StageLatency
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.instruction import Instruction
 from hyperscribe.structures.json_extract import JsonExtract
 from hyperscribe.structures.llm_turn import LlmTurn
 from hyperscribe.structures.token_counts import TokenCounts
 
+# shared by all the hedged requests, of all the notes: the original request and its duplicate race on it
+hedger = ThreadPoolExecutor(max_workers=Constants.HEDGING_MAX_WORKERS)
+
 
 class LlmBase:
     ROLE_SYSTEM = "system"
@@ -30,10 +43,27 @@ class LlmBase:
         self.temperature = 0.0
         self.prompts: list[LlmTurn] = []
         self.audios: list[dict] = []
+        self.expected_schemas: list = []
+        self.hedging: Callable[[], LlmBase] | None = None  # builds the duplicate of the too slow requests
 
     def support_speaker_identification(self) -> bool:
         raise NotImplementedError()
 
+    def vendor(self) -> str:
+        raise NotImplementedError()
+
+    def support_streaming(self) -> bool:
+        return False
+
+    @classmethod
+    def stream_ended(cls, event: dict) -> bool:
+        # without a known terminal event, the stream is read until the vendor closes it
+        return False
+
+    def is_streaming(self) -> bool:
+        # streaming only helps when the response has JSON blocks to check as they arrive
+        return bool(self.expected_schemas) and self.support_streaming()
+
     def reset_prompts(self) -> None:
         self.prompts = []
 
@@ -65,10 +95,19 @@ class LlmBase:
         raise NotImplementedError()
 
     def attempt_requests(self, attempts: int) -> HttpResponse:
-        for _ in range(attempts):
-            result = self.request()
-            if result.code == HTTPStatus.OK.value:
+        for attempt in range(attempts):
+            status_code = 0
+            try:
+                result = self.request()
+                status_code = result.code
+            except RequestException as error:
+                # timeouts and dropped connections are retried as any other http error
+                self.memory_log.log(f"error: {error}")
+            if status_code == HTTPStatus.OK.value:
                 break
+            # the throttled and failing vendors are given time before the next attempt
+            if attempt + 1 < attempts and RateLimiter.is_retryable(status_code):
+                RateLimiter.for_key(self.vendor()).backoff(attempt)
         else:
             result = HttpResponse(
                 code=HTTPStatus.TOO_MANY_REQUESTS,
@@ -78,13 +117,145 @@ class LlmBase:
             self.memory_log.log(f"error: {result.response}")
         return result
 
+    def timed_requests(self, attempts: int) -> HttpResponse:
+        start = time()
+        result = self.attempt_requests(attempts)
+        if result.code == HTTPStatus.OK.value:
+            StageLatency.record(self.memory_log.label, time() - start)
+        return result
+
+    def hedged_requests(self, attempts: int, schemas: list) -> HttpResponse:
+        threshold = StageLatency.threshold(self.memory_log.label)
+        if self.hedging is None or threshold is None:
+            return self.timed_requests(attempts)
+
+        contenders = [hedger.submit(self.timed_requests, attempts)]
+        deadline = time() + threshold
+        while not contenders[0].done() and time() < deadline:
+            sleep(Constants.HEDGING_POLL_SECONDS)
+        if contenders[0].done():
+            result: HttpResponse = contenders[0].result()
+        elif not RateLimiter.for_key(self.vendor()).has_free_slot():
+            # the duplicate would wait for a slot, or take it from the requests of the other stages
+            self.memory_log.log(f"--- no hedged request after {threshold:.3f}s, no free slot ---")
+            result = contenders[0].result()
+        else:
+            # the request is slower than most of the requests of the same stage: a duplicate races it
+            self.memory_log.log(f"--- hedged request after {threshold:.3f}s ---")
+            hedge = self.hedging()
+            hedge.temperature = self.temperature
+            hedge.prompts = list(self.prompts)
+            hedge.audios = list(self.audios)
+            hedge.expected_schemas = self.expected_schemas
+            contenders.append(hedger.submit(hedge.timed_requests, attempts))
+            result = self.first_valid(contenders, schemas)
+        return result
+
+    def first_valid(self, contenders: list, schemas: list) -> HttpResponse:
+        # the first valid response wins, the first request otherwise
+        winner = contenders[0]
+        pending = list(contenders)
+        while pending:
+            done = [future for future in pending if future.done()]
+            for future in done:
+                pending.remove(future)
+                response: HttpResponse = future.result()
+                if response.code == HTTPStatus.OK.value and (
+                    not schemas or self.extract_json_from(response.response, schemas).has_error is False
+                ):
+                    winner = future
+                    pending = []
+                    break
+            if pending and not done:
+                sleep(Constants.HEDGING_POLL_SECONDS)
+        # the losers are cancelled, or ignored if already sent, but their tokens are still consumed
+        for future in contenders:
+            if future is not winner:
+                future.cancel()
+                future.add_done_callback(self.consume_loser)
+        result: HttpResponse = winner.result()
+        return result
+
+    def consume_loser(self, future: Any) -> None:
+        # the tokens are counted in the session that sent the request, they are discarded once it is ended
+        if not future.cancelled() and future.exception() is None and self.memory_log.is_session_open():
+            self.memory_log.add_consumption(future.result().tokens)
+
+    def stream_request(
+        self,
+        url: str,
+        headers: dict,
+        data: str,
+        stream_event: Callable[[dict], tuple[str, TokenCounts]],
+    ) -> HttpResponse:
+        result: HttpResponse = HttpPool.stream(
+            self.vendor(),
+            url,
+            lambda request: self.consume_stream(request, stream_event),
+            headers=headers,
+            params={},
+            data=data,
+        )
+        return result
+
+    def consume_stream(
+        self,
+        request: Response,
+        stream_event: Callable[[dict], tuple[str, TokenCounts]],
+    ) -> HttpResponse:
+        self.memory_log.log(f"status code: {request.status_code}")
+        if request.status_code != HTTPStatus.OK.value:
+            self.memory_log.log(request.text)
+            self.memory_log.log("--- request ends ---")
+            return HttpResponse(
+                code=request.status_code,
+                response=request.text,
+                tokens=TokenCounts(prompt=0, generated=0),
+            )
+
+        stream = JsonStream(self.expected_schemas, self.json_validator)
+        tokens = TokenCounts(prompt=0, generated=0)
+        for event in stream.server_sent_events(request):
+            text, counts = stream_event(event)
+            # once the expected blocks are received, the response is settled and
+            # the rest of the stream is only read for the usage the vendors send last
+            if not stream.is_done():
+                stream.add(text)
+            # the vendors report cumulative counts
+            tokens = TokenCounts(
+                prompt=max(tokens.prompt, counts.prompt), generated=max(tokens.generated, counts.generated)
+            )
+            if self.stream_ended(event):
+                break
+        self.memory_log.log(stream.text)
+        self.memory_log.log(f"--- request ends ({stream.blocks} JSON blocks) ---")
+        return HttpResponse(code=request.status_code, response=stream.text, tokens=tokens)
+
     def chat(self, schemas: list) -> JsonExtract:
+        span = Tracer.begin(self.memory_log.key, "LlmBase.chat", self.memory_log.span)
         self.memory_log.log("-- CHAT BEGINS --")
+        self.expected_schemas = schemas
         attempts = 0
+        tokens = TokenCounts(prompt=0, generated=0)
         start = time()
+        # only the deterministic requests are cached, a response sampled at a higher temperature is never replayed
+        response_cache = LlmResponseCache.current() if self.temperature == 0.0 else None
         for _ in range(Constants.MAX_ATTEMPTS_LLM_JSON):
             attempts += 1
-            response = self.attempt_requests(Constants.MAX_ATTEMPTS_LLM_HTTP)
+            cache_key = ""
+            cached: HttpResponse | None = None
+            if response_cache is not None:
+                cache_key = LlmResponseCache.key(
+                    self.vendor(),
+                    self.model,
+                    self.temperature,
+                    self.prompts,
+                    self.audios,
+                    schemas,
+                )
+                cached = response_cache.get(cache_key)
+                self.memory_log.add_cache_lookup(cached is not None)
+            response = cached or self.hedged_requests(Constants.MAX_ATTEMPTS_LLM_HTTP, schemas)
             # http error
             if response.code != HTTPStatus.OK.value:
                 result = JsonExtract(has_error=True, error=response.response, content=[])
@@ -92,7 +263,21 @@ class LlmBase:
 
             result = self.extract_json_from(response.response, schemas)
             self.memory_log.add_consumption(response.tokens)
+            tokens.add(response.tokens)
+            outcome = "valid"
+            if result.has_error is True:
+                outcome, result = self.repair_json(response.response, schemas, result)
+            self.memory_log.add_json_outcome(outcome)
             if result.has_error is False:
+                # only the valid responses are cached, as repaired if needed
+                if response_cache is not None and cached is None:
+                    if outcome != "valid":
+                        response = HttpResponse(
+                            code=response.code,
+                            response=JsonRepair.to_markdown(result.content),
+                            tokens=response.tokens,
+                        )
+                    response_cache.set(cache_key, response)
                 self.memory_log.log("result->>")
                 self.memory_log.log(json.dumps(result.content, indent=2))
                 self.memory_log.log("<<-")
@@ -121,8 +306,82 @@ class LlmBase:
 
         self.memory_log.log(f"--- CHAT ENDS - {attempts} attempts - {int((time() - start) * 1000)}ms ---")
         self.memory_log.store_so_far()
+        span.end(
+            {
+                "model": self.model,
+                "label": self.memory_log.label,
+                "attempts": attempts,
+                "tokens": tokens.to_dict(),
+                "error": result.has_error,
+            }
+        )
         return result
 
+    def repair_json(self, content: str, schemas: list, error: JsonExtract) -> tuple[str, JsonExtract]:
+        # fix the response locally, and only re-ask for the incorrect items, before retrying the whole conversation
+        repaired = JsonRepair.contents(content, schemas)
+        if not repaired or len(repaired) < len(schemas):
+            return "retried", error
+
+        outcome = "repaired"
+        for idx, (returned, schema) in enumerate(zip(repaired, schemas)):
+            if not self.json_validator(returned, schema):
+                continue
+            invalid_items = JsonRepair.invalid_items(returned, schema, self.json_validator)
+            if not invalid_items:
+                return "retried", error
+            items = self.reask_items(content, idx, schema["items"], invalid_items)
+            if not items:
+                return "retried", error
+            fixed = [item for item in returned]
+            for (item_idx, _), item in zip(invalid_items, items):
+                if item_idx < len(fixed):
+                    fixed[item_idx] = item
+                else:
+                    fixed.append(item)
+            if self.json_validator(fixed, schema):
+                return "retried", error
+            repaired[idx] = fixed
+            outcome = "re-asked"
+
+        self.memory_log.log(f"JSON {outcome}")
+        return outcome, JsonExtract(error="", has_error=False, content=repaired)
+
+    def reask_items(self, content: str, block: int, item_schema: dict, invalid_items: list[tuple[int, str]]) -> list:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "array",
+            "minItems": len(invalid_items),
+            "maxItems": len(invalid_items),
+            "items": item_schema,
+        }
+        self.set_model_prompt(content.splitlines())
+        self.set_user_prompt(
+            [
+                f"In your previous response, some items of the JSON #{block + 1} are incorrect or missing:",
+                "```text",
+                "\n".join([f"item #{idx + 1}: {problems}" for idx, problems in invalid_items]),
+                "```",
+                "",
+                f"Please, provide only these {len(invalid_items)} items, corrected and in the same order, "
+                "as a JSON list enclosed within a JSON Markdown block.",
+                "The other items are kept as they are.",
+            ],
+        )
+        expected_schemas = self.expected_schemas
+        self.expected_schemas = [schema]
+        response = self.attempt_requests(Constants.MAX_ATTEMPTS_LLM_HTTP)
+        self.expected_schemas = expected_schemas
+        if response.code == HTTPStatus.OK.value:
+            self.memory_log.add_consumption(response.tokens)
+            result = self.extract_json_from(response.response, [schema])
+            if result.has_error is False:
+                items: list = result.content[0]
+                return items
+        # the conversation goes on as if the items were not re-asked
+        self.prompts = self.prompts[:-2]
+        return []
+
     def single_conversation(
         self,
         system_prompt: list[str],
@@ -157,7 +416,11 @@ class LlmBase:
         turns = [turn for turn in self.prompts]
         turns.append(LlmTurn(role=self.ROLE_MODEL, text=["```json", json.dumps(model_prompt), "```"]))
 
-        LlmTurnsStore.instance(self.memory_log.s3_credentials, self.memory_log.identification).store(
+        LlmTurnsStore.instance(
+            self.memory_log.s3_credentials,
+            self.memory_log.identification,
+            self.memory_log.cycle,
+        ).store(
             label,
             index,
             turns,
@@ -165,15 +428,7 @@ class LlmBase:
 
     @classmethod
     def json_validator(cls, response: list, json_schema: dict) -> str:
-        result: list = []
-        for error in Draft7Validator(json_schema).iter_errors(response):
-            # assert isinstance(error, ValidationError)
-            message = error.message
-            if error.path:
-                message = f"{error.message}, in path {list(error.path)}"
-            result.append(message)
-
-        return "\n".join(result)
+        return SchemaRegistry.validate(response, json_schema)
 
     @classmethod
     def extract_json_from(cls, content: str, schemas: list) -> JsonExtract:
@@ -1,8 +1,8 @@
 import json
 from http import HTTPStatus
 
-from requests import post as requests_post
-
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.token_counts import TokenCounts
@@ -12,6 +12,9 @@ class LlmElevenLabs(LlmBase):
     def support_speaker_identification(self) -> bool:
         return False
 
+    def vendor(self) -> str:
+        return Constants.VENDOR_ELEVEN_LABS
+
     def add_audio(self, audio: bytes, audio_format: str) -> None:
         if audio:
             self.audios.append({"data": audio})
@@ -33,14 +36,13 @@ class LlmElevenLabs(LlmBase):
             "temperature": 0,
         }
         self.memory_log.log("--- request begins:")
-        request = requests_post(
+        request = HttpPool.post(
+            Constants.VENDOR_ELEVEN_LABS,
             url,
             headers=headers,
             params={},
             data=data,
             files={"file": self.audios[0]["data"]},
-            verify=True,
-            timeout=None,
         )
         self.memory_log.log(f"status code: {request.status_code}")
         self.memory_log.log(request.json())
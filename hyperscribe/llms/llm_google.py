@@ -1,8 +1,8 @@
 import json
 from http import HTTPStatus
 
-from requests import post as requests_post
-
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.token_counts import TokenCounts
@@ -12,6 +12,12 @@ class LlmGoogle(LlmBase):
     def support_speaker_identification(self) -> bool:
         return True
 
+    def vendor(self) -> str:
+        return Constants.VENDOR_GOOGLE
+
+    def support_streaming(self) -> bool:
+        return True
+
     def add_audio(self, audio: bytes, audio_format: str) -> None:
         if audio:
             self.audios.append({"format": f"audio/{audio_format}", "data": audio})
@@ -45,7 +51,7 @@ class LlmGoogle(LlmBase):
             "Content-Type": "application/json",
         }
         data = json.dumps({"file": {"display_name": audio_name}})
-        request = requests_post(url, headers=headers, data=data, verify=True, timeout=None)
+        request = HttpPool.post(Constants.VENDOR_GOOGLE, url, headers=headers, data=data)
         if request.status_code == HTTPStatus.OK.value:
             # upload the file
             headers = {
@@ -54,7 +60,7 @@ class LlmGoogle(LlmBase):
                 "X-Goog-Upload-Command": "upload, finalize",
             }
             url = request.headers["x-goog-upload-url"]
-            request = requests_post(url, headers=headers, params={}, data=audio, verify=True, timeout=None)
+            request = HttpPool.post(Constants.VENDOR_GOOGLE, url, headers=headers, params={}, data=audio)
             if request.status_code == HTTPStatus.OK.value:
                 content = json.loads(request.text)
                 result = content["file"]["uri"]
@@ -74,7 +80,13 @@ class LlmGoogle(LlmBase):
         data = json.dumps(self.to_dict(audio_uris))
         self.memory_log.log("--- request begins:")
         self.memory_log.log(json.dumps(self.to_dict(audio_uris), indent=2))
-        request = requests_post(url, headers=headers, params={}, data=data, verify=True, timeout=None)
+        if self.is_streaming():
+            url = (
+                f"https://generativelanguage.googleapis.com/v1beta/{self.model}:streamGenerateContent"
+                f"?alt=sse&key={self.api_key}"
+            )
+            return self.stream_request(url, headers, data, self.stream_event)
+        request = HttpPool.post(Constants.VENDOR_GOOGLE, url, headers=headers, params={}, data=data)
         self.memory_log.log(f"status code: {request.status_code}")
         self.memory_log.log(request.text)
         self.memory_log.log("--- request ends ---")
@@ -97,3 +109,17 @@ class LlmGoogle(LlmBase):
             )
 
         return result
+
+    @classmethod
+    def stream_event(cls, event: dict) -> tuple[str, TokenCounts]:
+        parts = event.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+        usage = event.get("usageMetadata", {})
+        return "".join(part.get("text", "") for part in parts), TokenCounts(
+            prompt=usage.get("promptTokenCount") or 0,
+            generated=(usage.get("candidatesTokenCount") or 0) + (usage.get("thoughtsTokenCount") or 0),
+        )
+
+    @classmethod
+    def stream_ended(cls, event: dict) -> bool:
+        # the last chunk has the finish reason and the final usage
+        return bool((event.get("candidates") or [{}])[0].get("finishReason"))
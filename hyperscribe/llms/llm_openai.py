@@ -4,8 +4,8 @@ import json
 from base64 import b64encode
 from http import HTTPStatus
 
-from requests import post as requests_post
-
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.token_counts import TokenCounts
@@ -15,6 +15,12 @@ class LlmOpenai(LlmBase):
     def support_speaker_identification(self) -> bool:
         return True
 
+    def vendor(self) -> str:
+        return Constants.VENDOR_OPENAI
+
+    def support_streaming(self) -> bool:
+        return True
+
     def add_audio(self, audio: bytes, audio_format: str) -> None:
         if audio:
             self.audios.append({"format": audio_format, "data": b64encode(audio).decode("utf-8")})
@@ -45,7 +51,10 @@ class LlmOpenai(LlmBase):
         data = json.dumps(self.to_dict(False))
         self.memory_log.log("--- request begins:")
         self.memory_log.log(json.dumps(self.to_dict(True), indent=2))
-        request = requests_post(url, headers=headers, params={}, data=data, verify=True, timeout=None)
+        if self.is_streaming():
+            data = json.dumps(self.to_dict(False) | {"stream": True, "stream_options": {"include_usage": True}})
+            return self.stream_request(url, headers, data, self.stream_event)
+        request = HttpPool.post(Constants.VENDOR_OPENAI, url, headers=headers, params={}, data=data)
         self.memory_log.log(f"status code: {request.status_code}")
         self.memory_log.log(request.text)
         self.memory_log.log("--- request ends ---")
@@ -69,6 +78,19 @@ class LlmOpenai(LlmBase):
 
         return result
 
+    @classmethod
+    def stream_event(cls, event: dict) -> tuple[str, TokenCounts]:
+        text = ""
+        if choices := event.get("choices"):
+            text = choices[0].get("delta", {}).get("content") or ""
+        usage = event.get("usage") or {}
+        return text, TokenCounts(prompt=usage.get("prompt_tokens") or 0, generated=usage.get("completion_tokens") or 0)
+
+    @classmethod
+    def stream_ended(cls, event: dict) -> bool:
+        # the usage is sent in a last chunk, after the one with the finish reason
+        return bool(event.get("usage"))
+
     def audio_to_text(self, audio: bytes) -> HttpResponse:
         default_model = "whisper-1"
         language = "en"
@@ -87,7 +109,7 @@ class LlmOpenai(LlmBase):
             "Authorization": f"Bearer {self.api_key}",
         }
         files = {"file": ("audio.mp3", audio, "application/octet-stream")}
-        request = requests_post(url, headers=headers, params={}, data=data, files=files, verify=True)
+        request = HttpPool.post(Constants.VENDOR_OPENAI, url, headers=headers, params={}, data=data, files=files)
         return HttpResponse(
             code=request.status_code,
             response=request.text,
@@ -17,6 +17,10 @@ class LlmOpenaiO3(LlmOpenai):
         super().__init__(memory_log, api_key, Constants.OPENAI_CHAT_TEXT_O3, with_audit)
         self.temperature = temperature
 
+    def support_streaming(self) -> bool:
+        # streaming the reasoning models requires a verified organization
+        return False
+
     def to_dict(self, for_log: bool) -> dict:
         result = super().to_dict(for_log)
         result.pop("modalities", None)
@@ -3,8 +3,8 @@ from __future__ import annotations
 import json
 from http import HTTPStatus
 
-from requests import post as requests_post
-
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.http_pool import HttpPool
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.token_counts import TokenCounts
@@ -14,6 +14,9 @@ class LlmOpenaiResponses(LlmBase):
     def support_speaker_identification(self) -> bool:
         return False
 
+    def vendor(self) -> str:
+        return Constants.VENDOR_OPENAI
+
     def to_dict(self) -> dict:
         roles = {
             self.ROLE_SYSTEM: "developer",
@@ -56,7 +59,7 @@ class LlmOpenaiResponses(LlmBase):
         data = json.dumps(self.to_dict())
         self.memory_log.log("--- request begins:")
         self.memory_log.log(json.dumps(self.to_dict(), indent=2))
-        request = requests_post(url, headers=headers, params={}, data=data, verify=True, timeout=None)
+        request = HttpPool.post(Constants.VENDOR_OPENAI, url, headers=headers, params={}, data=data)
         self.memory_log.log(f"status code: {request.status_code}")
         self.memory_log.log(request.text)
         self.memory_log.log("--- request ends ---")
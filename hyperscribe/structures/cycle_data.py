@@ -6,10 +6,13 @@ from typing import NamedTuple
 
 from hyperscribe.libraries.aws_s3 import AwsS3
 from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.cycle_hand_off import CycleHandOff
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.cycle_data_source import CycleDataSource
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.line import Line
+from hyperscribe.structures.webm_prefix import WebmPrefix
 
 
 class CycleData(NamedTuple):
@@ -34,13 +37,71 @@ class CycleData(NamedTuple):
         return "text/plain"
 
     @classmethod
-    def from_s3(cls, aws_s3: AwsS3Credentials, identification: IdentificationParameters, cycle: int) -> CycleData:
+    def coalesce(cls, cycles: list[CycleData]) -> CycleData:
+        # the cycles are all of the same source, mixed sources are kept as separate parts by the caller
+        # the audio chunks are consecutive parts of the same recording, only the first one keeps its WebM header
+        audios = [cycle.audio for cycle in cycles if cycle.audio]
+        return CycleData(
+            audio=b"".join(audios[:1] + [WebmPrefix.remove_prefix(audio) for audio in audios[1:]]),
+            transcript=[line for cycle in cycles for line in cycle.transcript],
+            source=cycles[0].source,
+        )
+
+    @classmethod
+    def from_content(cls, content: bytes, content_type: str) -> CycleData:
+        if content_type == cls.content_type_text():
+            return CycleData(
+                audio=b"",
+                transcript=[Line(speaker="Clinician", text=content.decode("utf-8"), start=0.0, end=0.0)],
+                source=CycleDataSource.TRANSCRIPT,
+            )
+        return CycleData(audio=content, transcript=[], source=CycleDataSource.AUDIO)
+
+    @classmethod
+    def hand_off(
+        cls,
+        identification: IdentificationParameters,
+        cycle: int,
+        content: bytes,
+        content_type: str,
+    ) -> None:
+        # the content already stored in S3 is also kept for the commander, when run by the same process
+        CycleHandOff.put(cls.s3_key_path(identification, cycle), content, content_type)
+
+    @classmethod
+    def retrieve(
+        cls,
+        aws_s3: AwsS3Credentials,
+        identification: IdentificationParameters,
+        cycle: int,
+        parent: Tracer | None = None,
+    ) -> CycleData:
+        if handed := CycleHandOff.take(cls.s3_key_path(identification, cycle)):
+            span = Tracer.begin(identification.note_uuid, "CycleData.hand_off", parent)
+            result = cls.from_content(handed[0], handed[1])
+            span.end({"cycle": cycle, "bytes": len(handed[0])})
+            return result
+        return cls.from_s3(aws_s3, identification, cycle, parent)
+
+    @classmethod
+    def from_s3(
+        cls,
+        aws_s3: AwsS3Credentials,
+        identification: IdentificationParameters,
+        cycle: int,
+        parent: Tracer | None = None,
+    ) -> CycleData:
         # ATTENTION:
         #  there could be some delay between adding the cycle to the waiting list
         #  and recording the data in S3, thus the `sleep`
+        span = Tracer.begin(identification.note_uuid, "CycleData.from_s3", parent)
+        result = CycleData(audio=b"", transcript=[], source=CycleDataSource.TRANSCRIPT)
+        attempts = 0
+        size = 0
         client_s3 = AwsS3(aws_s3)
         if client_s3.is_ready():
             for _ in range(Constants.CYCLE_DATA_MAX_ATTEMPTS):
+                attempts = attempts + 1
                 data = client_s3.access_s3_object(cls.s3_key_path(identification, cycle))
                 if data.status_code == HTTPStatus.OK.value:
                     audio = b""
@@ -48,10 +109,14 @@ class CycleData(NamedTuple):
                     if data.headers["content-type"] == CycleData.content_type_text():
                         transcript = [Line(speaker="Clinician", text=data.text, start=0.0, end=0.0)]
                         source = CycleDataSource.TRANSCRIPT
+                        size = len(data.text)
                     else:
                         audio = data.content
                         source = CycleDataSource.AUDIO
-                    return CycleData(audio=audio, transcript=transcript, source=source)
+                        size = len(audio)
+                    result = CycleData(audio=audio, transcript=transcript, source=source)
+                    break
                 sleep(Constants.CYCLE_DATA_PAUSE_SECONDS)
 
-        return CycleData(audio=b"", transcript=[], source=CycleDataSource.TRANSCRIPT)
+        span.end({"cycle": cycle, "attempts": attempts, "bytes": size})
+        return result
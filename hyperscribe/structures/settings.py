@@ -27,6 +27,9 @@ class Settings(NamedTuple):
     trial_staffers_policy: AccessPolicy
     cycle_transcript_overlap: int
     custom_prompts: list[CustomPrompt]
+    hedged_model_specs: list[str] = []  # the slow LLM requests of these model specs are duplicated
+    audio_interval_seconds: int = 0  # duration of the audio of a cycle, 0 when the cycles have no deadline
+    llm_response_cache: str = ""  # backend of the cache of the LLM responses, none by default
 
     @classmethod
     def from_dictionary(cls, dictionary: dict) -> Settings:
@@ -89,6 +92,16 @@ class Settings(NamedTuple):
             custom_prompts=CustomPrompt.load_from_json_list(
                 json.loads(dictionary.get(Constants.SECRET_CUSTOM_PROMPTS) or "[]") or []
             ),
+            hedged_model_specs=[
+                spec.lower() for spec in cls.list_from(dictionary.get(Constants.SECRET_HEDGED_MODEL_SPECS))
+            ],
+            audio_interval_seconds=cls.clamp_int(
+                dictionary.get(Constants.SECRET_AUDIO_INTERVAL),
+                0,
+                Constants.CYCLE_DEADLINE_INTERVAL_MAX,
+                0,
+            ),
+            llm_response_cache=(dictionary.get(Constants.SECRET_LLM_RESPONSE_CACHE) or "").strip().lower(),
         )
 
     @classmethod
@@ -138,6 +151,9 @@ class Settings(NamedTuple):
             return result.split()[0]
         return result  # <--- not used with the APIs - just for logging
 
+    def is_hedged(self, model_spec: ModelSpec) -> bool:
+        return model_spec.value in self.hedged_model_specs
+
     def llm_text_temperature(self) -> float:
         result = 0.0
         if self.llm_text_model(ModelSpec.SIMPLER) == Constants.OPENAI_CHAT_TEXT_O3:
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class TraceSpan(NamedTuple):
+    span_id: str
+    parent_id: str
+    name: str
+    start: float  # seconds since the epoch
+    duration: float  # seconds
+    attributes: dict
+
+    @classmethod
+    def load_from_json(cls, json_list: list) -> list[TraceSpan]:
+        return [
+            TraceSpan(
+                span_id=json_object.get("id", ""),
+                parent_id=json_object.get("parent", ""),
+                name=json_object.get("name", ""),
+                start=json_object.get("start", 0) / 1000,
+                duration=json_object.get("duration", 0) / 1000,
+                attributes=json_object.get("attributes") or {},
+            )
+            for json_object in json_list
+        ]
+
+    def to_json(self) -> dict:
+        # compact: the times are in milliseconds
+        return {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": int(self.start * 1000),
+            "duration": int(self.duration * 1000),
+            "attributes": self.attributes,
+        }
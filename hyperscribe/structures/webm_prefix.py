@@ -6,6 +6,10 @@ class WebmPrefix:
     def add_prefix(cls, content: bytes) -> bytes:
         return cls.decoded_prefix() + content
 
+    @classmethod
+    def remove_prefix(cls, content: bytes) -> bytes:
+        return content.removeprefix(cls.decoded_prefix())
+
     @classmethod
     def decoded_prefix(cls) -> bytes:
         return base64.b64decode(
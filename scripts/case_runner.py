@@ -1,7 +1,9 @@
 from argparse import ArgumentParser
 from argparse import Namespace
+from pathlib import Path
 
 from evaluations.datastores.datastore_case import DatastoreCase
+from evaluations.datastores.filesystem.llm_response_cache import LlmResponseCacheDisk
 from evaluations.helper_evaluation import HelperEvaluation
 from hyperscribe.libraries.commander import Commander
 from hyperscribe.libraries.audio_interpreter import AudioInterpreter
@@ -9,6 +11,7 @@ from hyperscribe.libraries.cached_sdk import CachedSdk
 from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.libraries.limited_cache import LimitedCache
+from hyperscribe.libraries.llm_response_cache import LlmResponseCache
 from hyperscribe.libraries.memory_log import MemoryLog
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.line import Line
@@ -31,6 +34,12 @@ class CaseRunner:
             default=0,
             help="The ID of the experiment_resul table record where to store the results",
         )
+        parser.add_argument(
+            "--llm_cache_folder",
+            type=str,
+            default="",
+            help="The folder where to cache the LLM responses across runs, no cache if not provided",
+        )
         return parser.parse_args()
 
     @classmethod
@@ -41,6 +50,13 @@ class CaseRunner:
         if not DatastoreCase.already_generated(parameters.case):
             print(f"Case '{parameters.case}' not generated yet")
             return
+        if parameters.llm_cache_folder:
+            LlmResponseCache.use(
+                LlmResponseCacheDisk(
+                    Path(parameters.llm_cache_folder),
+                    Constants.LLM_RESPONSE_CACHE_DISK_MAX_ENTRIES,
+                ),
+            )
         auditor = HelperEvaluation.get_auditor(parameters.case, 0)
         full_transcript = cls.prepare_cycles(auditor.full_transcript(), parameters.cycles)
 
@@ -0,0 +1,49 @@
+import sqlite3
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from hyperscribe.libraries.constants import Constants
+
+
+class LabTestIndexBuilder:
+    @classmethod
+    def parameters(cls) -> Namespace:
+        parser = ArgumentParser(
+            description="Build the full-text table of the generic lab tests used by the evaluations"
+        )
+        parser.add_argument(
+            "--database",
+            type=Path,
+            default=Path(__file__).parent.parent / "hyperscribe" / "libraries" / Constants.SQLITE_LAB_TESTS_DATABASE,
+            help="SQLite database with the generic_lab_test table",
+        )
+        return parser.parse_args()
+
+    @classmethod
+    def build(cls, database: Path) -> int:
+        # the trigram tokenizer lets the LIKE '%keyword%' conditions use the index instead of scanning the table
+        with sqlite3.connect(database) as conn:
+            conn.execute("DROP TABLE IF EXISTS `generic_lab_test_fts`")
+            conn.execute(
+                "CREATE VIRTUAL TABLE `generic_lab_test_fts` USING fts5("
+                "`keywords`, `order_code` UNINDEXED, `order_name` UNINDEXED, tokenize='trigram')"
+            )
+            conn.execute(
+                "INSERT INTO `generic_lab_test_fts` (`rowid`, `keywords`, `order_code`, `order_name`) "
+                "SELECT `dbid`, `keywords`, `order_code`, `order_name` FROM `generic_lab_test`"
+            )
+            conn.execute("INSERT INTO `generic_lab_test_fts` (`generic_lab_test_fts`) VALUES ('optimize')")
+            result = conn.execute("SELECT COUNT(*) FROM `generic_lab_test_fts`").fetchone()[0]
+        with sqlite3.connect(database) as conn:
+            conn.execute("VACUUM")
+        return int(result)
+
+    @classmethod
+    def run(cls) -> None:
+        parameters = cls.parameters()
+        count = cls.build(parameters.database)
+        print(f"indexed lab tests: {count}")
+
+
+if __name__ == "__main__":
+    LabTestIndexBuilder.run()
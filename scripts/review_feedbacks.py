@@ -42,19 +42,19 @@ class ReviewFeedbacks:
             initial_indent=" " * 3,
             subsequent_indent=" " * 3,
         )
+        matches = [(feedback, information) for feedback in feedbacks if (information := re_match(pattern, feedback))]
+        responses = client_s3.get_many([feedback for feedback, _ in matches])
         current_note = ""
-        for feedback in feedbacks:
-            if information := re_match(pattern, feedback):
-                if information.group(1) != current_note:
-                    current_note = information.group(1)
-                    print("")
-                    print(f"Note: {current_note}")
-
-                print(f"Date: {information.group(2)} {information.group(3)}")
-                response = client_s3.access_s3_object(feedback)
-                if response.status_code == HTTPStatus.OK.value:
-                    print(wrapper.fill(response.content.decode("utf-8")))
-                    print("")
+        for (feedback, information), response in zip(matches, responses):
+            if information.group(1) != current_note:
+                current_note = information.group(1)
+                print("")
+                print(f"Note: {current_note}")
+
+            print(f"Date: {information.group(2)} {information.group(3)}")
+            if response.status_code == HTTPStatus.OK.value:
+                print(wrapper.fill(response.content.decode("utf-8")))
+                print("")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import json
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from canvas_sdk.questionnaires.utils import Draft7Validator
+
+from hyperscribe.libraries.json_schema import JsonSchema
+from hyperscribe.libraries.schema_registry import SchemaRegistry
+
+
+class SchemaRegistryBenchmark:
+    @classmethod
+    def parameters(cls) -> Namespace:
+        parser = ArgumentParser(description="Per-call cost of the JSON validation, without and with the registry")
+        parser.add_argument(
+            "--cases",
+            type=Path,
+            default=Path(__file__).parent.parent / "evaluations/cases",
+            help="Folder of the cases providing the transcripts",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Number of passes over the transcripts")
+        return parser.parse_args()
+
+    @classmethod
+    def payloads(cls, folder: Path) -> list:
+        return [json.loads(file.read_text()) for file in sorted(folder.glob("**/transcript.json"))]
+
+    @classmethod
+    def validate_before(cls, content: Any, schema: dict) -> str:
+        # the validation as done before the registry: one compiled validator per call
+        return "\n".join([error.message for error in Draft7Validator(schema).iter_errors(content)])
+
+    @classmethod
+    def measure(
+        cls,
+        validate: Callable[[Any, dict], str],
+        payloads: list,
+        schema: Callable[[], dict],
+        validations: int,
+        repeat: int,
+    ) -> float:
+        # returns the average cost in micro-seconds of one call
+        calls = 0
+        start = perf_counter()
+        for _ in range(repeat):
+            for payload in payloads:
+                used_schema = schema()
+                for _ in range(validations):
+                    validate(payload, used_schema)
+                    calls = calls + 1
+        return (perf_counter() - start) * 1_000_000 / max(calls, 1)
+
+    @classmethod
+    def run(cls) -> None:
+        parameters = cls.parameters()
+        payloads = cls.payloads(parameters.cases)
+        schema = JsonSchema.get(["voice_turns"])[0]
+        scenarios = [
+            ("static schema", lambda: schema, 1),
+            ("dynamic schema", lambda: json.loads(json.dumps(schema)), 1),
+            ("dynamic schema, streamed and extracted", lambda: json.loads(json.dumps(schema)), 2),
+        ]
+        print(f"transcripts: {len(payloads)}, passes: {parameters.repeat}")
+        print(f"| {'scenario':<40} | {'before (us)':>12} | {'after (us)':>12} |")
+        for label, builder, validations in scenarios:
+            before = cls.measure(cls.validate_before, payloads, builder, validations, parameters.repeat)
+            after = cls.measure(SchemaRegistry.validate, payloads, builder, validations, parameters.repeat)
+            print(f"| {label:<40} | {before:>12.1f} | {after:>12.1f} |")
+
+
+if __name__ == "__main__":
+    SchemaRegistryBenchmark.run()
@@ -0,0 +1,120 @@
+import json
+from argparse import ArgumentParser, Namespace
+from http import HTTPStatus
+from pathlib import Path
+
+from evaluations.helper_evaluation import HelperEvaluation
+from hyperscribe.libraries.aws_s3 import AwsS3
+from hyperscribe.structures.trace_span import TraceSpan
+
+
+class TraceViewer:
+    @classmethod
+    def parameters(cls) -> Namespace:
+        parser = ArgumentParser(description="Display the spans of a cycle trace, as stored in AWS S3")
+        parser.add_argument(
+            "trace",
+            type=str,
+            help="Local file or AWS S3 key (hyperscribe-{customer}/traces/{day}/{note}/{cycle}.json) of the trace",
+        )
+        parser.add_argument(
+            "--chrome",
+            type=Path,
+            default=None,
+            help="File to write the trace in the Chrome Trace Event format (chrome://tracing, ui.perfetto.dev)",
+        )
+        return parser.parse_args()
+
+    @classmethod
+    def load(cls, trace: str) -> dict:
+        result: dict = {}
+        if (file := Path(trace)).exists():
+            result = json.loads(file.read_text())
+        else:
+            client_s3 = AwsS3(HelperEvaluation.aws_s3_credentials())
+            response = client_s3.access_s3_object(trace)
+            if response.status_code == HTTPStatus.OK.value:
+                result = json.loads(response.content.decode("utf-8"))
+        return result
+
+    @classmethod
+    def tree(cls, spans: list[TraceSpan]) -> list[str]:
+        # the spans whose parent is not in the trace (e.g. started during the previous cycle) are shown at the top
+        identifiers = {span.span_id for span in spans}
+        children: dict[str, list[TraceSpan]] = {}
+        for span in sorted(spans, key=lambda s: s.start):
+            parent_id = span.parent_id if span.parent_id in identifiers else ""
+            children.setdefault(parent_id, []).append(span)
+        origin = min([span.start for span in spans], default=0.0)
+
+        result: list[str] = []
+
+        def add(parent_id: str, depth: int) -> None:
+            for span in children.get(parent_id, []):
+                attributes = json.dumps(span.attributes) if span.attributes else ""
+                result.append(
+                    f"{'  ' * depth}{span.name:<{48 - 2 * depth}} "
+                    f"{round((span.start - origin) * 1000):>7}ms "
+                    f"{round(span.duration * 1000):>7}ms "
+                    f"{attributes}".rstrip()
+                )
+                add(span.span_id, depth + 1)
+
+        add("", 0)
+        return result
+
+    @classmethod
+    def lanes(cls, spans: list[TraceSpan]) -> list[int]:
+        # the spans run concurrently (threads), each lane only has properly nested spans
+        result = [0] * len(spans)
+        stacks: list[list[float]] = []  # end of the opened spans, per lane
+        for idx in sorted(range(len(spans)), key=lambda i: (spans[i].start, -spans[i].duration)):
+            span = spans[idx]
+            end = span.start + span.duration
+            for stack in stacks:
+                while stack and stack[-1] <= span.start:
+                    stack.pop()
+            # nested in an opened span first, then in an idle lane, then in a new one
+            nesting = [lane for lane, stack in enumerate(stacks) if stack and end <= stack[-1]]
+            idle = [lane for lane, stack in enumerate(stacks) if not stack]
+            lane = (nesting + idle + [len(stacks)])[0]
+            if lane == len(stacks):
+                stacks.append([])
+            stacks[lane].append(end)
+            result[idx] = lane
+        return result
+
+    @classmethod
+    def chrome_events(cls, document: dict) -> list[dict]:
+        spans = TraceSpan.load_from_json(document.get("spans", []))
+        return [
+            {
+                "name": span.name,
+                "cat": "hyperscribe",
+                "ph": "X",
+                "ts": round(span.start * 1_000_000),
+                "dur": round(span.duration * 1_000_000),
+                "pid": document.get("cycle", 0),
+                "tid": lane,
+                "args": span.attributes,
+            }
+            for span, lane in zip(spans, cls.lanes(spans))
+        ]
+
+    @classmethod
+    def run(cls) -> None:
+        parameters = cls.parameters()
+        document = cls.load(parameters.trace)
+        if not document:
+            print(f"trace not found: {parameters.trace}")
+            return
+        print(f"note: {document.get('note')}, cycle: {document.get('cycle')}")
+        for line in cls.tree(TraceSpan.load_from_json(document.get("spans", []))):
+            print(line)
+        if parameters.chrome:
+            parameters.chrome.write_text(json.dumps({"traceEvents": cls.chrome_events(document)}))
+            print(f"Chrome trace: {parameters.chrome}")
+
+
+if __name__ == "__main__":
+    TraceViewer.run()
@@ -175,21 +175,21 @@ def test__run(
         calls = [
             call(
                 recorder,
-                CycleData(audio=b"audio1", transcript=[], source=CycleDataSource.AUDIO),
+                [CycleData(audio=b"audio1", transcript=[], source=CycleDataSource.AUDIO)],
                 audio_interpreter.return_value,
                 instructions[:1],
                 [],
             ),
             call(
                 recorder,
-                CycleData(audio=b"audio2", transcript=[], source=CycleDataSource.AUDIO),
+                [CycleData(audio=b"audio2", transcript=[], source=CycleDataSource.AUDIO)],
                 audio_interpreter.return_value,
                 instructions[:2],
                 lines[0],
             ),
             call(
                 recorder,
-                CycleData(audio=b"audio3", transcript=[], source=CycleDataSource.AUDIO),
+                [CycleData(audio=b"audio3", transcript=[], source=CycleDataSource.AUDIO)],
                 audio_interpreter.return_value,
                 instructions[:3],
                 lines[1],
@@ -181,35 +181,35 @@ def test__run(audio2commands, limited_cache, implemented_commands, cached_discus
     calls = [
         call(
             recorder,
-            CycleData(audio=exp_combined[0], transcript=[], source=CycleDataSource.AUDIO),
+            [CycleData(audio=exp_combined[0], transcript=[], source=CycleDataSource.AUDIO)],
             audio_interpreter.return_value,
             instructions[:1],
             [],
         ),
         call(
             recorder,
-            CycleData(audio=exp_combined[1], transcript=[], source=CycleDataSource.AUDIO),
+            [CycleData(audio=exp_combined[1], transcript=[], source=CycleDataSource.AUDIO)],
             audio_interpreter.return_value,
             instructions[:2],
             lines[0],
         ),
         call(
             recorder,
-            CycleData(audio=exp_combined[2], transcript=[], source=CycleDataSource.AUDIO),
+            [CycleData(audio=exp_combined[2], transcript=[], source=CycleDataSource.AUDIO)],
             audio_interpreter.return_value,
             instructions[:3],
             lines[1],
         ),
         call(
             recorder,
-            CycleData(audio=exp_combined[3], transcript=[], source=CycleDataSource.AUDIO),
+            [CycleData(audio=exp_combined[3], transcript=[], source=CycleDataSource.AUDIO)],
             audio_interpreter.return_value,
             instructions[:4],
             lines[2],
         ),
         call(
             recorder,
-            CycleData(audio=exp_combined[4], transcript=[], source=CycleDataSource.AUDIO),
+            [CycleData(audio=exp_combined[4], transcript=[], source=CycleDataSource.AUDIO)],
             audio_interpreter.return_value,
             instructions[:5],
             lines[3],
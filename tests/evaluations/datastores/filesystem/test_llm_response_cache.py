@@ -0,0 +1,41 @@
+import os
+
+from evaluations.datastores.filesystem.llm_response_cache import LlmResponseCacheDisk
+from hyperscribe.structures.http_response import HttpResponse
+from hyperscribe.structures.token_counts import TokenCounts
+
+
+def test___init__(tmp_path):
+    folder = tmp_path / "llm_cache"
+    tested = LlmResponseCacheDisk(folder, 3)
+    assert tested.folder == folder
+    assert tested.max_entries == 3
+    assert folder.is_dir()
+
+
+def test_get(tmp_path):
+    tested = LlmResponseCacheDisk(tmp_path, 3)
+    assert tested.get("theKey") is None
+
+    (tmp_path / "theKey.json").write_text('{"code": 200, "response": "theResponse"}')
+    os.utime(tmp_path / "theKey.json", (1000, 1000))
+    result = tested.get("theKey")
+    expected = HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+    assert (tmp_path / "theKey.json").stat().st_mtime > 1000
+
+
+def test_set(tmp_path):
+    tested = LlmResponseCacheDisk(tmp_path, 2)
+    for idx in range(1, 3):
+        tested.set(
+            f"key{idx}",
+            HttpResponse(code=200, response=f"theResponse{idx}", tokens=TokenCounts(prompt=idx, generated=idx)),
+        )
+        os.utime(tmp_path / f"key{idx}.json", (1000 + idx, 1000 + idx))
+    assert (tmp_path / "key1.json").read_text() == '{"code": 200, "response": "theResponse1"}'
+    assert sorted(f.name for f in tmp_path.glob("*.json")) == ["key1.json", "key2.json"]
+
+    # the least recently used is evicted
+    tested.set("key3", HttpResponse(code=200, response="theResponse3", tokens=TokenCounts(prompt=3, generated=3)))
+    assert sorted(f.name for f in tmp_path.glob("*.json")) == ["key2.json", "key3.json"]
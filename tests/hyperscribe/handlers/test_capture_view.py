@@ -19,8 +19,11 @@ from hyperscribe.structures.access_policy import AccessPolicy
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.custom_prompt import CustomPrompt
 from hyperscribe.structures.customization import Customization
+from hyperscribe.structures.cycle_data import CycleData
+from hyperscribe.structures.cycle_data_source import CycleDataSource
 from hyperscribe.structures.default_tab import DefaultTab
 from hyperscribe.structures.identification_parameters import IdentificationParameters
+from hyperscribe.structures.line import Line
 from hyperscribe.structures.notion_feedback_record import NotionFeedbackRecord
 from hyperscribe.structures.progress_message import ProgressMessage
 from hyperscribe.structures.settings import Settings
@@ -153,6 +156,7 @@ def test_session_progress_log(progress):
         staffers_policy=AccessPolicy(policy=False, items=[]),
         trial_staffers_policy=AccessPolicy(policy=True, items=[]),
         cycle_transcript_overlap=37,
+        audio_interval_seconds=5,
     )
     tested = helper_instance()
     tested.session_progress_log("thePatientId", "theNoteId", "theProgress")
@@ -768,7 +772,7 @@ def test_transcript_session_post(stop_and_go, executor, helper, cycle_data, aws_
     stop_and_go.get.return_value.waiting_cycles.side_effect = [[21]]
     helper.editable_note.side_effect = [True]
     cycle_data.s3_key_path.side_effect = ["theS3Path"]
-    cycle_data.content_type_text.side_effect = ["text/plain"]
+    cycle_data.content_type_text.side_effect = ["text/plain", "text/plain"]
     aws_s3.return_value.upload_binary_to_s3.side_effect = [SimpleNamespace(content=b"Good", status_code=200)]
     note_db.filter.return_value.first.side_effect = [
         SimpleNamespace(dbid=42, provider=SimpleNamespace(id="theProviderId")),
@@ -787,7 +791,12 @@ def test_transcript_session_post(stop_and_go, executor, helper, cycle_data, aws_
     assert executor.mock_calls == exp_calls
     exp_calls = [call.editable_note(42), call.with_cleanup(tested.run_commander)]
     assert helper.mock_calls == exp_calls
-    exp_calls = [call.s3_key_path(identification, 21), call.content_type_text()]
+    exp_calls = [
+        call.s3_key_path(identification, 21),
+        call.content_type_text(),
+        call.content_type_text(),
+        call.hand_off(identification, 21, b"theTranscript", "text/plain"),
+    ]
     assert cycle_data.mock_calls == exp_calls
     exp_calls = [
         call.get("theNoteId"),
@@ -993,7 +1002,10 @@ def test__add_cycle(executor, helper, cycle_data, stop_and_go, aws_s3, log, note
     assert executor.mock_calls == exp_calls
     exp_calls = [call.with_cleanup(tested.run_commander)]
     assert helper.mock_calls == exp_calls
-    exp_calls = [call.s3_key_path(identification, 21)]
+    exp_calls = [
+        call.s3_key_path(identification, 21),
+        call.hand_off(identification, 21, b"theContent", "content/type"),
+    ]
     assert cycle_data.mock_calls == exp_calls
     exp_calls = [call.get("theNoteId")]
     assert stop_and_go.mock_calls == exp_calls
@@ -1029,7 +1041,10 @@ def test__add_cycle(executor, helper, cycle_data, stop_and_go, aws_s3, log, note
 
     assert executor.mock_calls == []
     assert helper.mock_calls == []
-    exp_calls = [call.s3_key_path(identification, 28)]
+    exp_calls = [
+        call.s3_key_path(identification, 28),
+        call.hand_off(identification, 28, b"theContent", "content/type"),
+    ]
     assert cycle_data.mock_calls == exp_calls
     exp_calls = [call.get("theNoteId")]
     assert stop_and_go.mock_calls == exp_calls
@@ -1310,6 +1325,7 @@ def test_run_reviewer(session_progress_log, log, implemented_commands, llm_decis
         staffers_policy=AccessPolicy(policy=False, items=[]),
         trial_staffers_policy=AccessPolicy(policy=True, items=[]),
         cycle_transcript_overlap=37,
+        audio_interval_seconds=5,
     )
     credentials = AwsS3Credentials(
         aws_key="theKey",
@@ -1390,42 +1406,132 @@ def test_run_reviewer(session_progress_log, log, implemented_commands, llm_decis
     reset_mocks()
 
 
+@patch("hyperscribe.handlers.capture_view.UploadQueue")
+@patch("hyperscribe.handlers.capture_view.RateLimiter")
+@patch("hyperscribe.handlers.capture_view.ScienceCache")
+@patch("hyperscribe.handlers.capture_view.Tracer")
+@patch("hyperscribe.handlers.capture_view.CachedSdk")
+@patch("hyperscribe.handlers.capture_view.AwsS3")
+def test_store_trace(aws_s3, cached_sdk, tracer, science_cache, rate_limiter, upload_queue):
+    trace = MagicMock()
+
+    def reset_mocks():
+        aws_s3.reset_mock()
+        upload_queue.reset_mock()
+        cached_sdk.reset_mock()
+        tracer.reset_mock()
+        science_cache.reset_mock()
+        rate_limiter.reset_mock()
+        trace.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientId",
+        note_uuid="noteId",
+        provider_uuid="theProviderId",
+        canvas_instance="customerIdentifier",
+    )
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+
+    tested = helper_instance()
+    for is_ready in [True, False]:
+        tracer.end_cycle.side_effect = [{"note": "noteId", "cycle": 7, "spans": [{"id": "span1"}]}]
+        tracer.store_path.side_effect = ["thePath"]
+        aws_s3.return_value.is_ready.side_effect = [is_ready]
+        cached_sdk.get_discussion.return_value.creation_day.side_effect = ["2025-12-05"]
+        science_cache.statistics.side_effect = [{"hits": 3}]
+        rate_limiter.statistics.side_effect = [{"Anthropic": {"throttled": 2}}]
+
+        tested.store_trace(identification, credentials, trace, 7)
+
+        exp_calls = [call(credentials), call().is_ready()]
+        assert aws_s3.mock_calls == exp_calls
+        exp_calls = []
+        if is_ready:
+            exp_calls = [
+                call.enqueue(
+                    "noteId",
+                    credentials,
+                    "thePath",
+                    '{"note":"noteId","cycle":7,"spans":[{"id":"span1"}]}',
+                )
+            ]
+        assert upload_queue.mock_calls == exp_calls
+        exp_calls = []
+        if is_ready:
+            exp_calls = [call.get_discussion("noteId"), call.get_discussion().creation_day()]
+        assert cached_sdk.mock_calls == exp_calls
+        exp_calls = [call.end_cycle(trace, 7)]
+        if is_ready:
+            exp_calls.append(call.store_path(identification, "2025-12-05", 7))
+        assert tracer.mock_calls == exp_calls
+        assert science_cache.mock_calls == [call.statistics()]
+        assert rate_limiter.mock_calls == [call.statistics()]
+        calls = [call.set({"scienceCache": {"hits": 3}, "rateLimiter": {"Anthropic": {"throttled": 2}}})]
+        assert trace.mock_calls == calls
+        reset_mocks()
+
+
+@patch("hyperscribe.handlers.capture_view.time")
+@patch("hyperscribe.handlers.capture_view.UploadQueue")
+@patch("hyperscribe.handlers.capture_view.Tracer")
 @patch("hyperscribe.handlers.capture_view.Customization")
 @patch("hyperscribe.handlers.capture_view.LlmTurnsStore")
 @patch("hyperscribe.handlers.capture_view.Commander")
+@patch("hyperscribe.handlers.capture_view.CachedSdk")
+@patch("hyperscribe.handlers.capture_view.ThreadPoolExecutor")
+@patch("hyperscribe.handlers.capture_view.Helper")
 @patch("hyperscribe.handlers.capture_view.ProgressDisplay")
 @patch("hyperscribe.handlers.capture_view.MemoryLog")
 @patch("hyperscribe.handlers.capture_view.StopAndGo")
 @patch("hyperscribe.handlers.capture_view.log")
+@patch.object(Line, "tail_of")
 @patch.object(CaptureView, "session_progress_log")
+@patch.object(CaptureView, "store_trace")
 @patch.object(CaptureView, "run_reviewer")
 @patch.object(CaptureView, "trigger_render")
 def test_run_commander(
     trigger_render,
     run_reviewer,
+    store_trace,
     session_progress_log,
+    tail_of,
     log,
     stop_and_go,
     memory_log,
     progress,
+    helper,
+    thread_pool,
+    cached_sdk,
     commander,
     llm_turns_store,
     customization,
+    tracer,
+    upload_queue,
+    time,
     monkeypatch,
 ):
     monkeypatch.setattr("hyperscribe.handlers.capture_view.version", "theVersion")
 
     def reset_mocks():
+        time.reset_mock()
         trigger_render.reset_mock()
         run_reviewer.reset_mock()
+        store_trace.reset_mock()
+        tracer.reset_mock()
         session_progress_log.reset_mock()
+        tail_of.reset_mock()
         log.reset_mock()
         stop_and_go.reset_mock()
         memory_log.reset_mock()
         progress.reset_mock()
+        helper.reset_mock()
+        thread_pool.reset_mock()
+        cached_sdk.reset_mock()
         commander.reset_mock()
         llm_turns_store.reset_mock()
         customization.reset_mock()
+        upload_queue.reset_mock()
+        future.reset_mock()
 
     date_0 = datetime(2025, 12, 5, 13, 35, 46, tzinfo=timezone.utc)
     identification = IdentificationParameters(
@@ -1455,6 +1561,7 @@ def test_run_commander(
             staffers_policy=AccessPolicy(policy=False, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=37,
+            audio_interval_seconds=5,
         ),
         Settings(
             api_signing_key="signingKey",
@@ -1472,6 +1579,7 @@ def test_run_commander(
             staffers_policy=AccessPolicy(policy=False, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=37,
+            audio_interval_seconds=5,
         ),
     ]
     credentials = AwsS3Credentials(
@@ -1487,17 +1595,33 @@ def test_run_commander(
         Effect(type="LOG", payload="Log4"),
     ]
 
+    transcripts = [
+        [Line(speaker="speaker1", text="textA", start=0.0, end=1.3)],
+        [Line(speaker="speaker2", text="textB", start=1.3, end=2.5)],
+    ]
+    cycle_data = [
+        [CycleData(audio=b"audio2", transcript=transcripts[0], source=CycleDataSource.AUDIO)],
+        [
+            CycleData(audio=b"", transcript=transcripts[1], source=CycleDataSource.TRANSCRIPT),
+            CycleData(audio=b"audio3", transcript=[], source=CycleDataSource.AUDIO),
+        ],
+        [CycleData(audio=b"", transcript=transcripts[1], source=CycleDataSource.TRANSCRIPT)],
+    ]
+    future = MagicMock()
+
     tested = helper_instance()
     # all good
     # -- already running
-    commander.compute_cycle.side_effect = []
+    commander.compute_cycle_from.side_effect = []
     stop_and_go.get.return_value.is_running.side_effect = [True]
 
     tested.run_commander(identification, "theUserId")
 
     assert trigger_render.mock_calls == []
     assert run_reviewer.mock_calls == []
+    assert store_trace.mock_calls == []
     assert session_progress_log.mock_calls == []
+    assert tail_of.mock_calls == []
     assert log.mock_calls == []
     exp_calls = [
         call.get("noteId"),
@@ -1506,22 +1630,41 @@ def test_run_commander(
     assert stop_and_go.mock_calls == exp_calls
     assert memory_log.mock_calls == []
     assert progress.mock_calls == []
+    assert helper.mock_calls == []
+    assert thread_pool.mock_calls == []
+    assert cached_sdk.mock_calls == []
     assert commander.mock_calls == []
     assert llm_turns_store.mock_calls == []
+    assert upload_queue.mock_calls == []
     assert customization.mock_calls == []
+    assert future.mock_calls == []
+    assert tracer.mock_calls == []
+    assert time.mock_calls == []
     reset_mocks()
 
     # -- no exception
+    # cycle 2: transcribed on the spot, the transcription of the coalesced cycles 3 to 5 is prefetched
+    # cycles 3 to 5: prefetched, but without transcript so no prefetch of the cycle 6
+    # cycle 6: transcribed on the spot, no more waiting cycles
     tests = [
-        (True, [call(identification, date_0, 5)], [call("patientId", "noteId", "finished")]),
+        (True, [call(identification, date_0, 6)], [call("patientId", "noteId", "finished")]),
         (False, [], []),
     ]
     for is_ended, exp_call_reviewed, exp_call_progress in tests:
-        commander.compute_cycle.side_effect = [(False, effects[0:2]), (False, []), (False, effects[2:])]
+        # start of the cycle 2, of the prefetch of the cycles 3 to 5, of the loops of the cycles 3 to 5, 6 and none
+        time.side_effect = [1000.0, 1001.0, 1002.0, 1003.0, 1004.0]
+        tail_of.side_effect = ["theTail"]
+        helper.with_cleanup.side_effect = lambda fn: fn
+        future.result.side_effect = [cycle_data[1]]
+        thread_pool.return_value.__enter__.return_value.submit.side_effect = [future]
+        cached_sdk.get_discussion.return_value.previous_transcript = "thePreviousTranscript"
+        commander.transcribe_cycles.side_effect = [cycle_data[0], cycle_data[2]]
+        commander.compute_cycle_from.side_effect = [(False, effects[0:2]), (False, []), (False, effects[2:])]
         stop_and_go.get.return_value.is_running.side_effect = [False]
-        stop_and_go.get.return_value.consume_next_waiting_cycles.side_effect = [True, True, True, False]
+        stop_and_go.get.return_value.consume_waiting_cycles.side_effect = [True, True, True, False]
         stop_and_go.get.return_value.created.side_effect = [date_0]
-        stop_and_go.get.return_value.cycle.side_effect = [2, 3, 4, 5]
+        stop_and_go.get.return_value.cycle.side_effect = [2, 5, 6, 6]
+        stop_and_go.get.return_value.next_waiting_cycles.side_effect = [[2], [3, 4, 5], [6], [6], [], []]
         stop_and_go.get.return_value.is_ended.side_effect = [is_ended]
         customization.custom_prompts_as_secret.side_effect = [
             {
@@ -1539,7 +1682,15 @@ def test_run_commander(
         ]
         assert trigger_render.mock_calls == exp_calls
         assert run_reviewer.mock_calls == exp_call_reviewed
+        exp_calls = [
+            call(identification, credentials, tracer.begin_cycle.return_value, 2),
+            call(identification, credentials, tracer.begin_cycle.return_value, 5),
+            call(identification, credentials, tracer.begin_cycle.return_value, 6),
+        ]
+        assert store_trace.mock_calls == exp_calls
         assert session_progress_log.mock_calls == exp_call_progress
+        exp_calls = [call(transcripts[0], 37)]
+        assert tail_of.mock_calls == exp_calls
         assert log.mock_calls == []
         exp_calls = [
             call.get("noteId"),
@@ -1547,22 +1698,28 @@ def test_run_commander(
             call.get().set_running(True),
             call.get().set_running().save(),
             call.get("noteId"),
-            call.get().consume_next_waiting_cycles(True),
+            call.get().next_waiting_cycles(),
+            call.get().consume_waiting_cycles([2], True),
             call.get().cycle(),
+            call.get().next_waiting_cycles(),
             call.get("noteId"),
             call.get().add_paused_effects(effects[0:2]),
             call.get().add_paused_effects().save(),
             call.get("noteId"),
-            call.get().consume_next_waiting_cycles(True),
+            call.get().consume_waiting_cycles([3, 4, 5], True),
             call.get().cycle(),
+            call.get().next_waiting_cycles(),
             call.get("noteId"),
-            call.get().consume_next_waiting_cycles(True),
+            call.get().next_waiting_cycles(),
+            call.get().consume_waiting_cycles([6], True),
             call.get().cycle(),
+            call.get().next_waiting_cycles(),
             call.get("noteId"),
             call.get().add_paused_effects(effects[2:]),
             call.get().add_paused_effects().save(),
             call.get("noteId"),
-            call.get().consume_next_waiting_cycles(True),
+            call.get().next_waiting_cycles(),
+            call.get().consume_waiting_cycles([], True),
             call.get("noteId"),
             call.get().set_running(False),
             call.get().set_running().save(),
@@ -1579,16 +1736,59 @@ def test_run_commander(
         exp_calls = [
             call.instance(identification, "main", credentials),
             call.instance().output("SDK: theVersion - Text: theVendorTextLLM - Audio: theVendorAudioLLM - Workers: 5"),
+            call.adopt("noteId", 2),
             call.end_session("noteId"),
+            call.adopt("noteId", 5),
+            call.instance(identification, "main", credentials),
+            call.instance().output("--> coalesced cycles: [3, 4, 5]"),
             call.end_session("noteId"),
+            call.adopt("noteId", 6),
             call.end_session("noteId"),
+            call.discard("noteId"),
         ]
         assert memory_log.mock_calls == exp_calls
         assert progress.mock_calls == []
+        exp_calls = [call.with_cleanup(commander.transcribe_cycles)]
+        assert helper.mock_calls == exp_calls
+        exp_calls = [
+            call(max_workers=1),
+            call().__enter__(),
+            call(max_workers=4),
+            call().__enter__(),
+            call()
+            .__enter__()
+            .submit(
+                commander.transcribe_cycles,
+                identification,
+                settings[0],
+                credentials,
+                [3, 4, 5],
+                "theTail",
+            ),
+            call().__exit__(None, None, None),
+            call().__exit__(None, None, None),
+        ]
+        assert thread_pool.mock_calls == exp_calls
+        exp_calls = [
+            call.get_discussion("noteId"),
+            call.get_discussion("noteId"),
+        ]
+        assert cached_sdk.mock_calls == exp_calls
+        cache = commander.chart_cache.return_value
+        warmer = thread_pool.return_value.__enter__.return_value
         exp_calls = [
-            call.compute_cycle(identification, settings[0], credentials, 2),
-            call.compute_cycle(identification, settings[0], credentials, 3),
-            call.compute_cycle(identification, settings[0], credentials, 4),
+            call.chart_cache(identification, settings[0]),
+            call.chart_cache().warm_up(warmer),
+            call.transcribe_cycles(identification, settings[0], credentials, [2], "thePreviousTranscript"),
+            call.compute_cycle_from(identification, settings[0], credentials, 2, cycle_data[0], cache, 1000.0),
+            call.chart_cache(identification, settings[0]),
+            call.chart_cache().warm_up(warmer),
+            # the prefetched cycles started with their transcription
+            call.compute_cycle_from(identification, settings[0], credentials, 5, cycle_data[1], cache, 1001.0),
+            call.chart_cache(identification, settings[0]),
+            call.chart_cache().warm_up(warmer),
+            call.transcribe_cycles(identification, settings[0], credentials, [6], "thePreviousTranscript"),
+            call.compute_cycle_from(identification, settings[0], credentials, 6, cycle_data[2], cache, 1003.0),
         ]
         assert commander.mock_calls == exp_calls
         exp_calls = [
@@ -1597,15 +1797,47 @@ def test_run_commander(
             call.end_session("noteId"),
         ]
         assert llm_turns_store.mock_calls == exp_calls
+        exp_calls = [
+            call.prune("noteId"),
+            call.prune("noteId"),
+            call.prune("noteId"),
+        ]
+        assert upload_queue.mock_calls == exp_calls
         exp_calls = [call.custom_prompts_as_secret(credentials, "customerIdentifier", "theUserId")]
         assert customization.mock_calls == exp_calls
+        exp_calls = [call.result()]
+        assert future.mock_calls == exp_calls
+        exp_calls = [
+            call.begin_cycle("noteId", {}),
+            call.adopt(tracer.begin_cycle.return_value, 2),
+            call.begin_cycle().set({"cycles": [2]}),
+            call.begin("noteId", "trigger_render", tracer.begin_cycle.return_value),
+            call.begin().end({"effects": 2}),
+            call.begin_cycle("noteId", {}),
+            call.adopt(tracer.begin_cycle.return_value, 5),
+            call.begin_cycle().set({"cycles": [3, 4, 5]}),
+            call.begin_cycle("noteId", {}),
+            call.adopt(tracer.begin_cycle.return_value, 6),
+            call.begin_cycle().set({"cycles": [6]}),
+            call.begin("noteId", "trigger_render", tracer.begin_cycle.return_value),
+            call.begin().end({"effects": 2}),
+            call.begin_cycle("noteId", {}),
+            call.discard("noteId"),
+        ]
+        assert tracer.mock_calls == exp_calls
+        assert time.mock_calls == [call()] * 5
         reset_mocks()
 
-    # error in Commander.compute_audio
-    commander.compute_cycle.side_effect = [Exception("Test error")]
+    # error in Commander.compute_cycle_from
+    error = Exception("Test error")
+    time.side_effect = [1005.0]
+    cached_sdk.get_discussion.return_value.previous_transcript = "thePreviousTranscript"
+    commander.transcribe_cycles.side_effect = [cycle_data[1]]
+    commander.compute_cycle_from.side_effect = [error]
     stop_and_go.get.return_value.is_running.side_effect = [False]
-    stop_and_go.get.return_value.consume_next_waiting_cycles.side_effect = [True]
+    stop_and_go.get.return_value.consume_waiting_cycles.side_effect = [True]
     stop_and_go.get.return_value.cycle.side_effect = [7]
+    stop_and_go.get.return_value.next_waiting_cycles.side_effect = [[7], [8]]
     stop_and_go.get.return_value.is_ended.side_effect = [False]
     customization.custom_prompts_as_secret.side_effect = [
         {"CustomPrompts": '[{"command":"theCommand1","prompt":"thePrompt1","active":true}]'}
@@ -1615,7 +1847,9 @@ def test_run_commander(
 
     assert trigger_render.mock_calls == []
     assert run_reviewer.mock_calls == []
+    assert store_trace.mock_calls == []
     assert session_progress_log.mock_calls == []
+    assert tail_of.mock_calls == []
     exp_calls = [
         call.info("************************"),
         call.error("Error while running commander: Test error", exc_info=True),
@@ -1628,8 +1862,10 @@ def test_run_commander(
         call.get().set_running(True),
         call.get().set_running().save(),
         call.get("noteId"),
-        call.get().consume_next_waiting_cycles(True),
+        call.get().next_waiting_cycles(),
+        call.get().consume_waiting_cycles([7], True),
         call.get().cycle(),
+        call.get().next_waiting_cycles(),
         call.get("noteId"),
         call.get().set_running(False),
         call.get().set_running().save(),
@@ -1639,12 +1875,42 @@ def test_run_commander(
     exp_calls = [
         call.instance(identification, "main", credentials),
         call.instance().output("SDK: theVersion - Text: theVendorTextLLM - Audio: theVendorAudioLLM - Workers: 5"),
+        call.adopt("noteId", 7),
+        call.discard("noteId"),
     ]
     assert memory_log.mock_calls == exp_calls
     assert progress.mock_calls == []
-    exp_calls = [call.compute_cycle(identification, settings[1], credentials, 7)]
+    assert helper.mock_calls == []
+    exp_calls = [
+        call(max_workers=1),
+        call().__enter__(),
+        call(max_workers=4),
+        call().__enter__(),
+        call().__exit__(Exception, error, error.__traceback__),
+        call().__exit__(Exception, error, error.__traceback__),
+    ]
+    assert thread_pool.mock_calls == exp_calls
+    exp_calls = [call.get_discussion("noteId")]
+    assert cached_sdk.mock_calls == exp_calls
+    exp_calls = [
+        call.chart_cache(identification, settings[1]),
+        call.chart_cache().warm_up(thread_pool.return_value.__enter__.return_value),
+        call.transcribe_cycles(identification, settings[1], credentials, [7], "thePreviousTranscript"),
+        call.compute_cycle_from(
+            identification, settings[1], credentials, 7, cycle_data[1], commander.chart_cache.return_value, 1005.0
+        ),
+    ]
     assert commander.mock_calls == exp_calls
     assert llm_turns_store.mock_calls == []
+    assert upload_queue.mock_calls == []
     exp_calls = [call.custom_prompts_as_secret(credentials, "customerIdentifier", "theUserId")]
     assert customization.mock_calls == exp_calls
+    assert future.mock_calls == []
+    exp_calls = [
+        call.begin_cycle("noteId", {}),
+        call.adopt(tracer.begin_cycle.return_value, 7),
+        call.begin_cycle().set({"cycles": [7]}),
+        call.discard("noteId"),
+    ]
+    assert tracer.mock_calls == exp_calls
     reset_mocks()
@@ -198,12 +198,14 @@ def test_key_cache():
 
 
 @patch("hyperscribe.handlers.progress_display.datetime", wraps=datetime)
+@patch("hyperscribe.handlers.progress_display.Tracer")
 @patch("hyperscribe.handlers.progress_display.Authenticator")
 @patch("hyperscribe.handlers.progress_display.requests_post")
-def test_send_to_user(requests_post, authenticator, mock_datetime):
+def test_send_to_user(requests_post, authenticator, tracer, mock_datetime):
     def reset_mocks():
         requests_post.reset_mock()
         authenticator.reset_mock()
+        tracer.reset_mock()
         mock_datetime.reset_mock()
 
     a_date = datetime(2025, 5, 15, 11, 17, 31, tzinfo=timezone.utc)
@@ -268,6 +270,11 @@ def test_send_to_user(requests_post, authenticator, mock_datetime):
         ),
     ]
     assert requests_post.mock_calls == calls
+    calls = [
+        call.begin("noteUuid", "ProgressDisplay.send_to_user"),
+        call.begin().end({"messages": 2}),
+    ]
+    assert tracer.mock_calls == calls
     calls = [call.now(UTC)]
     assert mock_datetime.mock_calls == calls
     reset_mocks()
@@ -303,6 +310,7 @@ def test_send_to_user(requests_post, authenticator, mock_datetime):
 
     assert authenticator.mock_calls == []
     assert requests_post.mock_calls == []
+    assert tracer.mock_calls == []
     assert mock_datetime.mock_calls == []
     reset_mocks()
 
@@ -5,6 +5,7 @@ import pytest
 
 from hyperscribe.commands.base_questionnaire import BaseQuestionnaire
 from hyperscribe.libraries.audio_interpreter import AudioInterpreter
+from hyperscribe.libraries.cycle_deadline import CycleDeadline
 from hyperscribe.libraries.helper import Helper
 from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.libraries.limited_cache import LimitedCache
@@ -111,6 +112,7 @@ def test___init__(command_list, template_permissions):
         staffers_policy=AccessPolicy(policy=False, items=["31", "47"]),
         trial_staffers_policy=AccessPolicy(policy=True, items=[]),
         cycle_transcript_overlap=37,
+        audio_interval_seconds=20,
     )
     aws_s3 = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
 
@@ -136,11 +138,14 @@ def test___init__(command_list, template_permissions):
         provider_uuid="providerUuid",
         canvas_instance="canvasInstance",
     )
-    instance = AudioInterpreter(settings, aws_s3, cache, identification)
+    instance = AudioInterpreter(settings, aws_s3, cache, identification, 987.5)
     assert instance.settings == settings
     assert instance.s3_credentials == aws_s3
     assert instance.identification == identification
     assert instance.cache == cache
+    assert isinstance(instance.deadline, CycleDeadline)
+    assert instance.deadline.budget_seconds == 18.0
+    assert instance.deadline.started_at == 987.5
     calls = [call()]
     assert command_list.mock_calls == calls
     calls = [call("noteUuid")]
@@ -461,17 +466,20 @@ def test_command_schema(questionnaire_command_name_list):
 
 @patch.object(AudioInterpreter, "combine_and_speaker_detection_double_step")
 @patch.object(AudioInterpreter, "combine_and_speaker_detection_single_step")
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
 @patch("hyperscribe.libraries.audio_interpreter.MemoryLog")
 @patch("hyperscribe.libraries.audio_interpreter.Helper")
 def test_combine_and_speaker_detection(
     helper,
     memory_log,
+    tracer,
     combine_and_speaker_detection_single_step,
     combine_and_speaker_detection_double_step,
 ):
     def reset_mocks():
         helper.reset_mock()
         memory_log.reset_mock()
+        tracer.reset_mock()
         combine_and_speaker_detection_single_step.reset_mock()
         combine_and_speaker_detection_double_step.reset_mock()
 
@@ -483,10 +491,12 @@ def test_combine_and_speaker_detection(
         Line(speaker="speaker", text="last words 3", start=2.5, end=3.6),
     ]
 
+    single = JsonExtract(has_error=False, error="", content=[{"speaker": "theSpeaker", "text": "theText"}])
+    double = JsonExtract(has_error=True, error="theError", content=[])
     tests = [
         (
             True,
-            "single",
+            single,
             [call(helper.audio2texter.return_value, lines)],
             [],
             [
@@ -494,11 +504,11 @@ def test_combine_and_speaker_detection(
                 call.audio2texter().add_audio(b"chunkAudio", "mp3"),
                 call.audio2texter().support_speaker_identification(),
             ],
-            [call.instance(tested.identification, "audio2transcript", aws_credentials)],
+            ["audio2transcript"],
         ),
         (
             False,
-            "double",
+            double,
             [],
             [call(helper.audio2texter.return_value, helper.chatter.return_value, lines)],
             [
@@ -507,25 +517,42 @@ def test_combine_and_speaker_detection(
                 call.audio2texter().support_speaker_identification(),
                 call.chatter(settings, memory_log.instance.return_value, ModelSpec.COMPLEX),
             ],
-            [
-                call.instance(tested.identification, "audio2transcript", aws_credentials),
-                call.instance(tested.identification, "speakerDetection", aws_credentials),
-            ],
+            ["audio2transcript", "speakerDetection"],
         ),
     ]
-    for identification, expected, exp_call_single, exp_calls_double, exp_call_helper, exp_call_memory_log in tests:
-        helper.audio2texter.return_value.support_speaker_identification.side_effect = [identification]
-        combine_and_speaker_detection_single_step.side_effect = ["single"]
-        combine_and_speaker_detection_double_step.side_effect = ["double"]
+    # the cycle being computed or the cycle transcribed ahead
+    for cycle in [None, 5]:
+        for identification, expected, exp_call_single, exp_calls_double, exp_call_helper, exp_labels in tests:
+            helper.audio2texter.return_value.support_speaker_identification.side_effect = [identification]
+            combine_and_speaker_detection_single_step.side_effect = [single]
+            combine_and_speaker_detection_double_step.side_effect = [double]
+            tracer.cycle_key.side_effect = ["theCycleKey"]
 
-        result = tested.combine_and_speaker_detection(audio_bytes, lines)
-        assert result == expected
+            result = tested.combine_and_speaker_detection(audio_bytes, lines, cycle)
+            assert result == expected
 
-        assert helper.mock_calls == exp_call_helper
-        assert memory_log.mock_calls == exp_call_memory_log
-        assert combine_and_speaker_detection_single_step.mock_calls == exp_call_single
-        assert combine_and_speaker_detection_double_step.mock_calls == exp_calls_double
-        reset_mocks()
+            assert helper.mock_calls == exp_call_helper
+            calls = [
+                call.instance(tested.identification, label, aws_credentials, cycle, tracer.begin.return_value)
+                for label in exp_labels
+            ]
+            assert memory_log.mock_calls == calls
+            calls = [
+                call.cycle_key("noteUuid", cycle),
+                call.begin("theCycleKey", "combine_and_speaker_detection"),
+                call.begin().end(
+                    {
+                        "vendor": "audioVendor",
+                        "bytes": 10,
+                        "lines": len(expected.content),
+                        "error": expected.has_error,
+                    }
+                ),
+            ]
+            assert tracer.mock_calls == calls
+            assert combine_and_speaker_detection_single_step.mock_calls == exp_call_single
+            assert combine_and_speaker_detection_double_step.mock_calls == exp_calls_double
+            reset_mocks()
 
 
 def test_combine_and_speaker_detection_double_step():
@@ -894,11 +921,13 @@ def test_combine_and_speaker_detection_single_step():
     reset_mocks()
 
 
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
 @patch.object(AudioInterpreter, "detect_instructions_per_section")
 @patch.object(AudioInterpreter, "detect_instructions_flat")
 @patch.object(AudioInterpreter, "common_instructions")
-def test_detect_instructions(common_instructions, detect_instructions_flat, detect_instructions_per_section):
+def test_detect_instructions(common_instructions, detect_instructions_flat, detect_instructions_per_section, tracer):
     def reset_mocks():
+        tracer.reset_mock()
         common_instructions.reset_mock()
         detect_instructions_flat.reset_mock()
         detect_instructions_per_section.reset_mock()
@@ -961,21 +990,21 @@ def test_detect_instructions(common_instructions, detect_instructions_flat, dete
     tests = [
         (
             known_instructions[:3],
-            "resultFlat",
-            [call(lines, known_instructions[:3], "theCommonInstructions", "allAtOnce")],
+            ["resultFlat"],
+            [call(lines, known_instructions[:3], "theCommonInstructions", "allAtOnce", tracer.begin.return_value)],
             [],
         ),
         (
             known_instructions[:4],
-            "resultPerSection",
+            ["resultPerSection1", "resultPerSection2"],
             [],
-            [call(lines, known_instructions[:4], "theCommonInstructions")],
+            [call(lines, known_instructions[:4], "theCommonInstructions", tracer.begin.return_value)],
         ),
     ]
     for instructions, expected, exp_calls_flat, exp_calls_per_section in tests:
         common_instructions.side_effect = ["theCommonInstructions"]
-        detect_instructions_flat.side_effect = ["resultFlat"]
-        detect_instructions_per_section.side_effect = ["resultPerSection"]
+        detect_instructions_flat.side_effect = [["resultFlat"]]
+        detect_instructions_per_section.side_effect = [["resultPerSection1", "resultPerSection2"]]
 
         result = tested.detect_instructions(lines, instructions)
 
@@ -984,6 +1013,11 @@ def test_detect_instructions(common_instructions, detect_instructions_flat, dete
         assert common_instructions.mock_calls == calls
         assert detect_instructions_flat.mock_calls == exp_calls_flat
         assert detect_instructions_per_section.mock_calls == exp_calls_per_section
+        calls = [
+            call.begin("noteUuid", "detect_instructions"),
+            call.begin().end({"vendor": "textVendor", "lines": 3, "instructions": len(expected)}),
+        ]
+        assert tracer.mock_calls == calls
         reset_mocks()
 
 
@@ -1088,7 +1122,10 @@ def test_detect_sections(json_schema, chatter, memory_log):
         ]
     ]
     memory_log.side_effect = ["MemoryLogInstance"]
-    result = tested.detect_sections(discussion, mocks)
+    # the cycle deadline is close, the simpler model is used
+    tested.deadline = MagicMock()
+    tested.deadline.model_spec.side_effect = [ModelSpec.SIMPLER]
+    result = tested.detect_sections(discussion, mocks, "theSpan")
     expected = [
         SectionWithTranscript(
             section="SectionX",
@@ -1109,11 +1146,13 @@ def test_detect_sections(json_schema, chatter, memory_log):
     calls = [call(["Assessment", "History", "Objective", "Plan", "Procedures", "Subjective"])]
     assert json_schema.mock_calls == calls
     calls = [
-        call(settings, "MemoryLogInstance", ModelSpec.COMPLEX),
+        call(settings, "MemoryLogInstance", ModelSpec.SIMPLER),
         call().single_conversation(system_prompt, user_prompt, ["theJsonSchema"], None),
     ]
     assert chatter.mock_calls == calls
-    calls = [call(tested.identification, "transcript2sections", aws_credentials)]
+    calls = [call.model_spec(ModelSpec.COMPLEX, "transcript2sections")]
+    assert tested.deadline.mock_calls == calls
+    calls = [call(tested.identification, "transcript2sections", aws_credentials, None, "theSpan")]
     assert memory_log.mock_calls == calls
     for idx, mock in enumerate(mocks):
         calls = [
@@ -1234,7 +1273,7 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
     detect_sections.side_effect = [transcript_sections]
     detect_instructions_flat.side_effect = detected
 
-    result = tested.detect_instructions_per_section(discussion, [], mocks)
+    result = tested.detect_instructions_per_section(discussion, [], mocks, "theSpan")
     expected = [
         {
             "index": 0,
@@ -1263,7 +1302,7 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
     ]
     assert result == expected
 
-    calls = [call(discussion, mocks)]
+    calls = [call(discussion, mocks, "theSpan")]
     assert detect_sections.mock_calls == calls
     calls = [
         call(
@@ -1271,12 +1310,14 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
             [],
             [mocks[0], mocks[3]],
             "SectionX",
+            "theSpan",
         ),
         call(
             [Line(speaker="personA", text="the text 3")],
             [],
             [mocks[1], mocks[2]],
             "SectionZ",
+            "theSpan",
         ),
     ]
     assert detect_instructions_flat.mock_calls == calls
@@ -1286,7 +1327,7 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
     detect_sections.side_effect = [transcript_sections]
     detect_instructions_flat.side_effect = detected
 
-    result = tested.detect_instructions_per_section(discussion, known_instructions, mocks)
+    result = tested.detect_instructions_per_section(discussion, known_instructions, mocks, "theSpan")
     expected = [
         {
             "index": 0,
@@ -1323,7 +1364,7 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
     ]
     assert result == expected
 
-    calls = [call(discussion, mocks)]
+    calls = [call(discussion, mocks, "theSpan")]
     assert detect_sections.mock_calls == calls
     calls = [
         call(
@@ -1331,12 +1372,14 @@ def test_detect_instructions_per_section(detect_sections, detect_instructions_fl
             [known_instructions[0]],
             [mocks[0], mocks[3]],
             "SectionX",
+            "theSpan",
         ),
         call(
             [Line(speaker="personA", text="the text 3")],
             [],
             [mocks[1], mocks[2]],
             "SectionZ",
+            "theSpan",
         ),
     ]
     assert detect_instructions_flat.mock_calls == calls
@@ -1513,7 +1556,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         [{"information": "response2"}],
     ]
     memory_log.side_effect = ["MemoryLogInstance"]
-    result = tested.detect_instructions_flat(discussion, [], mocks, "theSection")
+    result = tested.detect_instructions_flat(discussion, [], mocks, "theSection", "theSpan")
     expected = [{"information": "response2"}]
     assert result == expected
     calls = [call(["First", "Second", "Third", "Fourth", "Fifth"])]
@@ -1541,7 +1584,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         call().single_conversation(system_prompt, user_prompts["constraints"], ["theJsonSchema"], None),
     ]
     assert chatter.mock_calls == calls
-    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials)]
+    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials, None, "theSpan")]
     assert memory_log.mock_calls == calls
     for idx, mock in enumerate(mocks):
         calls = [
@@ -1571,7 +1614,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         [{"information": "response2"}],
     ]
     memory_log.side_effect = ["MemoryLogInstance"]
-    result = tested.detect_instructions_flat(discussion, [], mocks, "theSection")
+    result = tested.detect_instructions_flat(discussion, [], mocks, "theSection", "theSpan")
     expected = [{"information": "response1"}]
     assert result == expected
     calls = [call(["First", "Second", "Third", "Fourth", "Fifth"])]
@@ -1597,7 +1640,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         call().single_conversation(system_prompt, user_prompts["noKnownInstructions"], ["theJsonSchema"], None),
     ]
     assert chatter.mock_calls == calls
-    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials)]
+    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials, None, "theSpan")]
     assert memory_log.mock_calls == calls
     for idx, mock in enumerate(mocks):
         calls = [call.class_name(), call.class_name(), call.instruction_description()]
@@ -1621,7 +1664,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         ],
     ]
     memory_log.side_effect = ["MemoryLogInstance"]
-    result = tested.detect_instructions_flat(discussion, known_instructions, mocks, "theSection")
+    result = tested.detect_instructions_flat(discussion, known_instructions, mocks, "theSection", "theSpan")
     expected = [
         {"instruction": "theInstruction1", "uuid": "uuid1", "index": 0},
         {"instruction": "theInstruction2", "uuid": "uuid2", "index": 1},
@@ -1680,7 +1723,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         call().single_conversation(system_prompt, user_prompts["constraints"], ["theJsonSchema"], None),
     ]
     assert chatter.mock_calls == calls
-    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials)]
+    calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials, None, "theSpan")]
     assert memory_log.mock_calls == calls
     for idx, mock in enumerate(mocks):
         calls = [call.class_name(), call.class_name(), call.instruction_description()]
@@ -1704,7 +1747,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
         instruction_constraints.side_effect = [[]]
         chatter.return_value.single_conversation.side_effect = [first_response]
         memory_log.side_effect = ["MemoryLogInstance"]
-        result = tested.detect_instructions_flat(discussion, known_instructions, mocks, "theSection")
+        result = tested.detect_instructions_flat(discussion, known_instructions, mocks, "theSection", "theSpan")
         expected = [
             {"instruction": "theInstruction2", "uuid": "uuid2", "index": 1, "isNew": False, "isUpdated": False},
             {"instruction": "theInstruction3a", "uuid": "uuid3", "index": 2, "isNew": False, "isUpdated": True},
@@ -1752,7 +1795,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
             call().single_conversation(system_prompt, user_prompts["withKnownInstructions"], ["theJsonSchema"], None),
         ]
         assert chatter.mock_calls == calls
-        calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials)]
+        calls = [call(tested.identification, "transcript2instructions:theSection", aws_credentials, None, "theSpan")]
         assert memory_log.mock_calls == calls
         for idx, mock in enumerate(mocks):
             calls = [call.class_name(), call.class_name(), call.instruction_description()]
@@ -1761,6 +1804,7 @@ def test_detect_instructions_flat(json_schema, instruction_constraints, chatter,
 
 
 @patch("hyperscribe.libraries.audio_interpreter.datetime", wraps=datetime)
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
 @patch("hyperscribe.libraries.audio_interpreter.ProgressDisplay")
 @patch("hyperscribe.libraries.audio_interpreter.MemoryLog")
 @patch.object(Helper, "chatter")
@@ -1772,9 +1816,11 @@ def test_create_sdk_command_parameters(
     chatter,
     memory_log,
     progress,
+    tracer,
     mock_datetime,
 ):
     def reset_mocks():
+        tracer.reset_mock()
         command_structures.reset_mock()
         command_schema.reset_mock()
         chatter.reset_mock()
@@ -1894,7 +1940,15 @@ def test_create_sdk_command_parameters(
         call().single_conversation(system_prompt, user_prompts["commandWithSchema"], ["theSchema"], instruction),
     ]
     assert chatter.mock_calls == calls
-    calls = [call.instance(tested.identification, "Second_theUuid_instruction2parameters", aws_credentials)]
+    calls = [
+        call.instance(
+            tested.identification,
+            "Second_theUuid_instruction2parameters",
+            aws_credentials,
+            None,
+            tracer.begin.return_value,
+        )
+    ]
     assert memory_log.mock_calls == calls
     calls = [
         call.send_to_user(
@@ -1904,6 +1958,11 @@ def test_create_sdk_command_parameters(
         )
     ]
     assert progress.mock_calls == calls
+    calls = [
+        call.begin("noteUuid", "create_sdk_command_parameters"),
+        call.begin().end({"vendor": "textVendor", "command": "Second", "found": True}),
+    ]
+    assert tracer.mock_calls == calls
     calls = [call.now()]
     assert mock_datetime.mock_calls == calls
     reset_mocks()
@@ -1933,7 +1992,15 @@ def test_create_sdk_command_parameters(
         call().single_conversation(system_prompt, user_prompts["commandNoSchema"], schemas, instruction),
     ]
     assert chatter.mock_calls == calls
-    calls = [call.instance(tested.identification, "Second_theUuid_instruction2parameters", aws_credentials)]
+    calls = [
+        call.instance(
+            tested.identification,
+            "Second_theUuid_instruction2parameters",
+            aws_credentials,
+            None,
+            tracer.begin.return_value,
+        )
+    ]
     assert memory_log.mock_calls == calls
     calls = [
         call.send_to_user(
@@ -1943,6 +2010,11 @@ def test_create_sdk_command_parameters(
         )
     ]
     assert progress.mock_calls == calls
+    calls = [
+        call.begin("noteUuid", "create_sdk_command_parameters"),
+        call.begin().end({"vendor": "textVendor", "command": "Second", "found": True}),
+    ]
+    assert tracer.mock_calls == calls
     calls = [call.now()]
     assert mock_datetime.mock_calls == calls
     reset_mocks()
@@ -1964,19 +2036,245 @@ def test_create_sdk_command_parameters(
         call().single_conversation(system_prompt, user_prompts["commandWithSchema"], ["theSchema"], instruction),
     ]
     assert chatter.mock_calls == calls
-    calls = [call.instance(tested.identification, "Second_theUuid_instruction2parameters", aws_credentials)]
+    calls = [
+        call.instance(
+            tested.identification,
+            "Second_theUuid_instruction2parameters",
+            aws_credentials,
+            None,
+            tracer.begin.return_value,
+        )
+    ]
     assert memory_log.mock_calls == calls
     calls = []
     assert progress.mock_calls == calls
+    calls = [
+        call.begin("noteUuid", "create_sdk_command_parameters"),
+        call.begin().end({"vendor": "textVendor", "command": "Second", "found": False}),
+    ]
+    assert tracer.mock_calls == calls
+    calls = [call.now()]
+    assert mock_datetime.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.audio_interpreter.datetime", wraps=datetime)
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
+@patch("hyperscribe.libraries.audio_interpreter.ProgressDisplay")
+@patch("hyperscribe.libraries.audio_interpreter.MemoryLog")
+@patch.object(LlmBase, "json_validator")
+@patch.object(Helper, "chatter")
+@patch.object(AudioInterpreter, "command_schema")
+@patch.object(AudioInterpreter, "command_structures")
+def test_create_sdk_command_parameters_batch(
+    command_structures,
+    command_schema,
+    chatter,
+    json_validator,
+    memory_log,
+    progress,
+    tracer,
+    mock_datetime,
+):
+    def reset_mocks():
+        tracer.reset_mock()
+        command_structures.reset_mock()
+        command_schema.reset_mock()
+        chatter.reset_mock()
+        json_validator.reset_mock()
+        memory_log.reset_mock()
+        progress.reset_mock()
+        mock_datetime.reset_mock()
+
+    instructions = [
+        Instruction(
+            uuid=f"theUuid{idx}",
+            index=idx,
+            instruction="Second",
+            information=f"theInformation{idx}",
+            is_new=True,
+            is_updated=False,
+            previous_information="",
+        )
+        for idx in range(3)
+    ]
+    system_prompt = [
+        "The conversation is in the context of a clinical encounter between patient (thePatientDemographic) and "
+        "licensed healthcare provider.",
+        "During the encounter, the user has identified instructions with key information to record in its software.",
+        "The user will submit several instructions of the same kind and, for each of them, the linked "
+        "information grounded in the transcript, as well as the structure of the associated command.",
+        "Your task is to help the user by writing correctly detailed data for each structured command.",
+        "Unless explicitly instructed otherwise by the user for a specific command, "
+        "you must restrict your response to information explicitly present in the transcript "
+        "or prior instructions.",
+        "",
+        "Your response has to be a JSON Markdown block encapsulating the list of the filled structures, "
+        "one per instruction, in the order of the instructions.",
+        "",
+        "Please, note that now is 2025-02-04T07:48:21+00:00.",
+    ]
+    user_prompt = [
+        "Instruction #01:",
+        "```text",
+        "theInformation0",
+        "```",
+        "",
+        "Instruction #02:",
+        "```text",
+        "theInformation1",
+        "```",
+        "",
+        "Instruction #03:",
+        "```text",
+        "theInformation2",
+        "```",
+        "",
+        "For each instruction, your task is to replace the values of the JSON object with the relevant information:",
+        "```json",
+        '"theStructure"',
+        "```",
+        "",
+        "The explanations and constraints about the fields of each object are defined in this JSON Schema:",
+        "```json",
+        '{\n "type": "object"\n}',
+        "```",
+        "",
+        "Your response must be a JSON list of exactly 3 objects, the first object for "
+        "the instruction #01, the second object for the instruction #02, and so on.",
+        "Be sure each object validates the JSON Schema.",
+        "",
+        "Before finalizing, verify completeness by checking that patient concerns are accurately captured "
+        "and any provider recommendations, follow-up plans, and instructions are complete, specific "
+        "and are accurate given the conversation.",
+        "",
+    ]
+    schema = {"type": "array", "items": {"type": "object"}}
+    batch_schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "minItems": 3,
+        "maxItems": 3,
+        "items": {"type": "object"},
+    }
+    identification = MagicMock(note_uuid="theNoteUuid")
+    settings = MagicMock(llm_text=VendorKey(vendor="textVendor", api_key="textKey"))
+    progress_calls = [
+        call.send_to_user(
+            identification,
+            settings,
+            [ProgressMessage(message="parameters identified for Second", section="events:4")],
+        )
+    ]
+
+    tested, _, aws_credentials, cache = helper_instance([], True)
+    tested.identification = identification
+    tested.settings = settings
+
+    # the invalid item is left to be computed on its own
+    command_structures.side_effect = ["theStructure"]
+    command_schema.side_effect = [[schema]]
+    mock_datetime.now.side_effect = [datetime(2025, 2, 4, 7, 48, 21, tzinfo=timezone.utc)]
+    response = [{"key": "item0"}, {"key": "item1"}, {"key": "item2"}]
+    chatter.return_value.chat.side_effect = [JsonExtract(has_error=False, error="", content=[response])]
+    json_validator.side_effect = ["", "", "some problem"]
+    result = tested.create_sdk_command_parameters_batch(instructions)
+    expected = [
+        InstructionWithParameters.add_parameters(instructions[0], {"key": "item0"}),
+        InstructionWithParameters.add_parameters(instructions[1], {"key": "item1"}),
+        None,
+    ]
+    assert result == expected
+
+    calls = [call("Second")]
+    assert command_structures.mock_calls == calls
+    assert command_schema.mock_calls == calls
+    calls = [
+        call(settings, memory_log.instance.return_value, ModelSpec.SIMPLER),
+        call().set_system_prompt(system_prompt),
+        call().set_user_prompt(user_prompt),
+        call().chat([batch_schema]),
+        call().store_llm_turns(response, instructions[0]),
+        call().store_llm_turns(response, instructions[1]),
+    ]
+    assert chatter.mock_calls == calls
+    calls = [
+        call([{"key": "item0"}], schema),
+        call([{"key": "item1"}], schema),
+        call([{"key": "item2"}], schema),
+    ]
+    assert json_validator.mock_calls == calls
+    calls = [
+        call.instance(
+            identification,
+            "Second_theUuid0_instructions2parameters",
+            aws_credentials,
+            None,
+            tracer.begin.return_value,
+        ),
+        call.instance().log("--> instruction #03 computed on its own"),
+    ]
+    assert memory_log.mock_calls == calls
+    assert progress.mock_calls == progress_calls * 2
+    calls = [
+        call.begin("theNoteUuid", "create_sdk_command_parameters_batch"),
+        call.begin().end({"vendor": "textVendor", "command": "Second", "instructions": 3}),
+    ]
+    assert tracer.mock_calls == calls
     calls = [call.now()]
     assert mock_datetime.mock_calls == calls
     reset_mocks()
 
+    # no response, all instructions are left to be computed on their own
+    for chat in [
+        JsonExtract(has_error=True, error="theError", content=[]),
+        JsonExtract(has_error=False, error="", content=[]),
+        JsonExtract(has_error=False, error="", content=[[{"key": "item0"}]]),
+    ]:
+        command_structures.side_effect = ["theStructure"]
+        command_schema.side_effect = [[schema]]
+        mock_datetime.now.side_effect = [datetime(2025, 2, 4, 7, 48, 21, tzinfo=timezone.utc)]
+        chatter.return_value.chat.side_effect = [chat]
+        json_validator.side_effect = []
+        result = tested.create_sdk_command_parameters_batch(instructions)
+        expected = [None, None, None]
+        assert result == expected
+
+        calls = [
+            call(settings, memory_log.instance.return_value, ModelSpec.SIMPLER),
+            call().set_system_prompt(system_prompt),
+            call().set_user_prompt(user_prompt),
+            call().chat([batch_schema]),
+        ]
+        assert chatter.mock_calls == calls
+        assert json_validator.mock_calls == []
+        calls = [
+            call.instance(
+                identification,
+                "Second_theUuid0_instructions2parameters",
+                aws_credentials,
+                None,
+                tracer.begin.return_value,
+            ),
+            call.instance().log("--> instruction #01 computed on its own"),
+            call.instance().log("--> instruction #02 computed on its own"),
+            call.instance().log("--> instruction #03 computed on its own"),
+        ]
+        assert memory_log.mock_calls == calls
+        assert progress.mock_calls == []
+        calls = [
+            call.begin("theNoteUuid", "create_sdk_command_parameters_batch"),
+            call.begin().end({"vendor": "textVendor", "command": "Second", "instructions": 3}),
+        ]
+        assert tracer.mock_calls == calls
+        reset_mocks()
+
 
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
 @patch("hyperscribe.libraries.audio_interpreter.ProgressDisplay")
 @patch("hyperscribe.libraries.audio_interpreter.MemoryLog")
 @patch.object(Helper, "chatter")
-def test_create_sdk_command_from(chatter, memory_log, progress):
+def test_create_sdk_command_from(chatter, memory_log, progress, tracer):
     mocks = [MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock()]
 
     commands = [
@@ -1990,6 +2288,7 @@ def test_create_sdk_command_from(chatter, memory_log, progress):
         chatter.reset_mock()
         memory_log.reset_mock()
         progress.reset_mock()
+        tracer.reset_mock()
         for item in mocks:
             item.reset_mock()
         mocks[0].return_value.class_name.side_effect = ["First", "First"]
@@ -2054,12 +2353,23 @@ def test_create_sdk_command_from(chatter, memory_log, progress):
 
         calls = [call(settings, memory_log.instance.return_value, ModelSpec.SIMPLER)] if exp_log_label else []
         assert chatter.mock_calls == calls
-        calls = [call.instance(tested.identification, exp_log_label, aws_credentials)] if exp_log_label else []
+        calls = []
+        if exp_log_label:
+            calls = [
+                call.instance(tested.identification, exp_log_label, aws_credentials, None, tracer.begin.return_value)
+            ]
         assert memory_log.mock_calls == calls
         calls = []
         if exp_log_ui:
             calls = [call.send_to_user(tested.identification, settings, exp_log_ui)]
         assert progress.mock_calls == calls
+        calls = []
+        if exp_log_label:
+            calls = [
+                call.begin("noteUuid", "create_sdk_command_from"),
+                call.begin().end({"vendor": "textVendor", "command": name, "found": expected is not None}),
+            ]
+        assert tracer.mock_calls == calls
         for idx, mock in enumerate(mocks):
             calls = [
                 call(settings, cache, tested.identification, "templatePermissionsInstance"),
@@ -2075,15 +2385,17 @@ def test_create_sdk_command_from(chatter, memory_log, progress):
         reset_mocks()
 
 
+@patch("hyperscribe.libraries.audio_interpreter.Tracer")
 @patch.object(MemoryLog, "instance")
 @patch.object(Helper, "chatter")
-def test_update_questionnaire(chatter, memory_log):
+def test_update_questionnaire(chatter, memory_log, tracer):
     command_mocks = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
     questionnaire_mocks = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
 
     def reset_mocks():
         chatter.reset_mock()
         memory_log.reset_mock()
+        tracer.reset_mock()
         for item in command_mocks:
             item.reset_mock()
             item.return_value.__class__ = BaseQuestionnaire
@@ -2154,8 +2466,15 @@ def test_update_questionnaire(chatter, memory_log):
 
         calls = [call(settings, "MemoryLogInstance", ModelSpec.COMPLEX)] if exp_log_label else []
         assert chatter.mock_calls == calls
-        calls = [call(tested.identification, exp_log_label, aws_credentials)] if exp_log_label else []
+        calls = []
+        if exp_log_label:
+            calls = [call(tested.identification, exp_log_label, aws_credentials, None, tracer.begin.return_value)]
         assert memory_log.mock_calls == calls
+        calls = [
+            call.begin("noteUuid", "update_questionnaire"),
+            call.begin().end({"vendor": "textVendor", "command": name, "found": exp_information is not None}),
+        ]
+        assert tracer.mock_calls == calls
         for idx, mock in enumerate(command_mocks):
             calls = [
                 call(settings, cache, tested.identification, "templatePermissionsInstance"),
@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest.mock import patch, call, MagicMock
 import re
 import pytest
+from hyperscribe.libraries import aws_s3
 from hyperscribe.libraries.aws_s3 import AwsS3
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.aws_s3_object import AwsS3Object
@@ -61,6 +62,52 @@ def test_get_host():
     assert result == expected
 
 
+@patch("hyperscribe.libraries.aws_s3.HttpPool")
+def test_session(http_pool):
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+    test = AwsS3(credentials)
+    http_pool.session.side_effect = ["theSession"]
+    result = test.session()
+    assert result == "theSession"
+    calls = [call.session("theBucket.s3.theRegion.amazonaws.com")]
+    assert http_pool.mock_calls == calls
+
+
+@patch("hyperscribe.libraries.aws_s3.SIGNING_KEYS", {})
+@patch("hyperscribe.libraries.aws_s3.hmac_new", wraps=aws_s3.hmac_new)
+def test_signing_key(hmac_new):
+    def reset_mocks():
+        hmac_new.reset_mock()
+
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+    test = AwsS3(credentials)
+    expected = bytes.fromhex("fc06b87064c9669e05a7f330398a186df106e500a584808008b12282bcf6061d")
+    # derived
+    result = test.signing_key("20250507")
+    assert result == expected
+    assert aws_s3.SIGNING_KEYS == {"theKey/theRegion": ("20250507", expected)}
+    assert len(hmac_new.mock_calls) == 4
+    reset_mocks()
+    # cached
+    result = test.signing_key("20250507")
+    assert result == expected
+    assert hmac_new.mock_calls == []
+    reset_mocks()
+    # another day
+    result = test.signing_key("20250508")
+    assert result != expected
+    assert aws_s3.SIGNING_KEYS == {"theKey/theRegion": ("20250508", result)}
+    assert len(hmac_new.mock_calls) == 4
+    reset_mocks()
+    # another region
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="otherRegion", bucket="theBucket")
+    other = AwsS3(credentials).signing_key("20250508")
+    assert other != result
+    assert sorted(aws_s3.SIGNING_KEYS.keys()) == ["theKey/otherRegion", "theKey/theRegion"]
+    assert len(hmac_new.mock_calls) == 4
+    reset_mocks()
+
+
 def test_get_signature_key():
     credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     test = AwsS3(credentials)
@@ -145,21 +192,21 @@ def test_headers(mock_datetime):
         reset_mocks()
 
 
-@patch("hyperscribe.libraries.aws_s3.requests_get")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_access_s3_object(is_ready, headers, requests_get):
+def test_access_s3_object(is_ready, headers, session):
     def rest_mocks():
         is_ready.reset_mock()
         headers.reset_mock()
-        requests_get.reset_mock()
+        session.reset_mock()
 
     credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     test = AwsS3(credentials)
     # ready
     is_ready.side_effect = [True]
     headers.side_effect = [{"Host": "theHost", "someKey": "someValue"}]
-    requests_get.side_effect = ["theResponse"]
+    session.return_value.get.side_effect = ["theResponse"]
     result = test.access_s3_object("theObjectKey")
     assert result == "theResponse"
 
@@ -167,92 +214,155 @@ def test_access_s3_object(is_ready, headers, requests_get):
     assert is_ready.mock_calls == calls
     calls = [call("theObjectKey")]
     assert headers.mock_calls == calls
-    calls = [call("https://theHost/theObjectKey", headers={"Host": "theHost", "someKey": "someValue"})]
-    assert requests_get.mock_calls == calls
+    calls = [
+        call(),
+        call().get("https://theHost/theObjectKey", headers={"Host": "theHost", "someKey": "someValue"}),
+    ]
+    assert session.mock_calls == calls
     rest_mocks()
     # not ready
     is_ready.side_effect = [False]
     headers.side_effect = []
-    requests_get.side_effect = []
+    session.return_value.get.side_effect = []
     result = test.access_s3_object("theObjectKey")
     assert result.status_code is None
 
     calls = [call()]
     assert is_ready.mock_calls == calls
     assert headers.mock_calls == []
-    assert requests_get.mock_calls == []
+    assert session.mock_calls == []
     rest_mocks()
 
 
-@patch("hyperscribe.libraries.aws_s3.requests_put")
+@patch.object(AwsS3, "access_s3_object")
+def test_get_many(access_s3_object):
+    def reset_mocks():
+        access_s3_object.reset_mock()
+
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+    test = AwsS3(credentials)
+    # no key
+    result = test.get_many([])
+    assert result == []
+    assert access_s3_object.mock_calls == []
+    reset_mocks()
+    # keys
+    access_s3_object.side_effect = lambda object_key: f"response-{object_key}"
+    keys = [f"key{idx:02d}" for idx in range(12)]
+    result = test.get_many(keys)
+    expected = [f"response-key{idx:02d}" for idx in range(12)]
+    assert result == expected
+    assert sorted(access_s3_object.mock_calls) == sorted([call(key) for key in keys])
+    reset_mocks()
+
+
+@patch.object(AwsS3, "upload_text_to_s3")
+def test_put_many(upload_text_to_s3):
+    def reset_mocks():
+        upload_text_to_s3.reset_mock()
+
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+    test = AwsS3(credentials)
+    # no object
+    result = test.put_many([])
+    assert result == []
+    assert upload_text_to_s3.mock_calls == []
+    reset_mocks()
+    # objects
+    upload_text_to_s3.side_effect = lambda object_key, data: f"response-{object_key}-{data}"
+    objects = [(f"key{idx:02d}", f"data{idx}") for idx in range(12)]
+    result = test.put_many(objects)
+    expected = [f"response-key{idx:02d}-data{idx}" for idx in range(12)]
+    assert result == expected
+    assert sorted(upload_text_to_s3.mock_calls) == sorted([call(key, data) for key, data in objects])
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.aws_s3.Tracer")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_upload_text_to_s3(is_ready, headers, requests_put):
+def test_upload_text_to_s3(is_ready, headers, session, tracer):
+    response = MagicMock(status_code=201)
+
     def rest_mocks():
         is_ready.reset_mock()
         headers.reset_mock()
-        requests_put.reset_mock()
+        session.reset_mock()
+        tracer.reset_mock()
 
     credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     test = AwsS3(credentials)
     # ready
     is_ready.side_effect = [True]
     headers.side_effect = [{"Host": "theHost", "someKey": "someValue"}]
-    requests_put.side_effect = ["theResponse"]
-    result = test.upload_text_to_s3("theObjectKey", "someData")
-    assert result == "theResponse"
+    session.return_value.put.side_effect = [response]
+    result = test.upload_text_to_s3("theObjectKey", "someData", "theNoteUuid")
+    assert result is response
 
     calls = [call()]
     assert is_ready.mock_calls == calls
     calls = [call("theObjectKey", (b"someData", "text/plain"))]
     assert headers.mock_calls == calls
     calls = [
-        call(
+        call(),
+        call().put(
             "https://theHost/theObjectKey",
             headers={"Host": "theHost", "someKey": "someValue", "Content-Type": "text/plain", "Content-Length": "8"},
             data="someData",
         ),
     ]
-    assert requests_put.mock_calls == calls
+    assert session.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid", "AwsS3.upload"),
+        call.begin().end({"bytes": 8, "status": 201}),
+    ]
+    assert tracer.mock_calls == calls
     rest_mocks()
     # not ready
     is_ready.side_effect = [False]
     headers.side_effect = []
-    requests_put.side_effect = []
+    session.return_value.put.side_effect = []
     result = test.upload_text_to_s3("theObjectKey", "someData")
     assert result.status_code is None
 
     calls = [call()]
     assert is_ready.mock_calls == calls
     assert headers.mock_calls == []
-    assert requests_put.mock_calls == []
+    assert session.mock_calls == []
+    assert tracer.mock_calls == []
     rest_mocks()
 
 
-@patch("hyperscribe.libraries.aws_s3.requests_put")
+@patch("hyperscribe.libraries.aws_s3.Tracer")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_upload_binary_to_s3(is_ready, headers, requests_put):
+def test_upload_binary_to_s3(is_ready, headers, session, tracer):
+    response = MagicMock(status_code=201)
+
     def rest_mocks():
         is_ready.reset_mock()
         headers.reset_mock()
-        requests_put.reset_mock()
+        session.reset_mock()
+        tracer.reset_mock()
 
     credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     test = AwsS3(credentials)
     # ready
     is_ready.side_effect = [True]
     headers.side_effect = [{"Host": "theHost", "someKey": "someValue"}]
-    requests_put.side_effect = ["theResponse"]
+    session.return_value.put.side_effect = [response]
     result = test.upload_binary_to_s3("theObjectKey", b"someData", "theContentType")
-    assert result == "theResponse"
+    assert result is response
 
     calls = [call()]
     assert is_ready.mock_calls == calls
     calls = [call("theObjectKey", (b"someData", "theContentType"))]
     assert headers.mock_calls == calls
     calls = [
-        call(
+        call(),
+        call().put(
             "https://theHost/theObjectKey",
             headers={
                 "Host": "theHost",
@@ -263,30 +373,37 @@ def test_upload_binary_to_s3(is_ready, headers, requests_put):
             data=b"someData",
         ),
     ]
-    assert requests_put.mock_calls == calls
+    assert session.mock_calls == calls
+    # without note, the upload is not part of a traced cycle
+    calls = [
+        call.begin("", "AwsS3.upload"),
+        call.begin().end({"bytes": 8, "status": 201}),
+    ]
+    assert tracer.mock_calls == calls
     rest_mocks()
     # not ready
     is_ready.side_effect = [False]
     headers.side_effect = []
-    requests_put.side_effect = []
+    session.return_value.put.side_effect = []
     result = test.upload_binary_to_s3("theObjectKey", b"someData", "theContentType")
     assert result.status_code is None
 
     calls = [call()]
     assert is_ready.mock_calls == calls
     assert headers.mock_calls == []
-    assert requests_put.mock_calls == []
+    assert session.mock_calls == []
+    assert tracer.mock_calls == []
     rest_mocks()
 
 
-@patch("hyperscribe.libraries.aws_s3.requests_get")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_list_s3_objects(is_ready, headers, requests_get):
+def test_list_s3_objects(is_ready, headers, session):
     def rest_mocks():
         is_ready.reset_mock()
         headers.reset_mock()
-        requests_get.reset_mock()
+        session.reset_mock()
 
     credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     test = AwsS3(credentials)
@@ -318,8 +435,9 @@ def test_list_s3_objects(is_ready, headers, requests_get):
         is_ready.side_effect = [True]
         headers.side_effect = [{"Host": "theHost", "someKey": "someValue"}]
         with (Path(__file__).parent / "list_s3_files.xml").open("br") as f:
-            requests_get.return_value.content = f.read()
-        requests_get.return_value.status_code = status_code
+            session.return_value.get.return_value.content = f.read()
+        session.return_value.get.return_value.status_code = status_code
+        session.return_value.get.return_value.text = "theText"
         if status_code == 500:
             with pytest.raises(Exception, match="S3 response status code"):
                 test.list_s3_objects("some/prefix")
@@ -332,17 +450,14 @@ def test_list_s3_objects(is_ready, headers, requests_get):
         calls = [call("", params={"list-type": 2, "prefix": "some/prefix"})]
         assert headers.mock_calls == calls
         calls = [
-            call(
+            call(),
+            call().get(
                 "https://theHost",
                 params={"list-type": 2, "prefix": "some/prefix"},
                 headers={"Host": "theHost", "someKey": "someValue"},
             ),
         ]
-        requests_get.assert_called_with(
-            "https://theHost",
-            params={"list-type": 2, "prefix": "some/prefix"},
-            headers={"Host": "theHost", "someKey": "someValue"},
-        )
+        assert session.mock_calls == calls
         rest_mocks()
         # not ready
         is_ready.side_effect = [False]
@@ -353,14 +468,14 @@ def test_list_s3_objects(is_ready, headers, requests_get):
         calls = [call()]
         assert is_ready.mock_calls == calls
         assert headers.mock_calls == []
-        assert requests_get.mock_calls == []
+        assert session.mock_calls == []
         rest_mocks()
 
 
-@patch("hyperscribe.libraries.aws_s3.requests_get")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_list_s3_objects__with_continuation(is_ready, headers, requests_get):
+def test_list_s3_objects__with_continuation(is_ready, headers, session):
     # prepare client
     creds = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     client = AwsS3(creds)
@@ -384,7 +499,7 @@ def test_list_s3_objects__with_continuation(is_ready, headers, requests_get):
     resp2.status_code = 200
     resp2.content = xml2
 
-    requests_get.side_effect = [resp1, resp2]
+    session.return_value.get.side_effect = [resp1, resp2]
     objs = client.list_s3_objects("some/prefix")
     assert len(objs) == 6
     assert all(isinstance(o, AwsS3Object) for o in objs)
@@ -393,13 +508,15 @@ def test_list_s3_objects__with_continuation(is_ready, headers, requests_get):
         call("", params={"list-type": 2, "prefix": "some/prefix"}),
         call("", params={"list-type": 2, "prefix": "some/prefix", "continuation-token": "tok123"}),
     ]
-    assert requests_get.mock_calls == [
-        call(
+    assert session.mock_calls == [
+        call(),
+        call().get(
             "https://theHost",
             params={"list-type": 2, "prefix": "some/prefix"},
             headers={"Host": "theHost"},
         ),
-        call(
+        call(),
+        call().get(
             "https://theHost",
             params={"list-type": 2, "prefix": "some/prefix", "continuation-token": "tok123"},
             headers={"Host": "theHost"},
@@ -409,10 +526,10 @@ def test_list_s3_objects__with_continuation(is_ready, headers, requests_get):
 
 # Simulates IsTruncated=true, but without a NextContinuationToken,
 # should can trigger break after one page.
-@patch("hyperscribe.libraries.aws_s3.requests_get")
+@patch.object(AwsS3, "session")
 @patch.object(AwsS3, "headers")
 @patch.object(AwsS3, "is_ready")
-def test_list_s3_objects__truncated_without_token(is_ready, headers, requests_get):
+def test_list_s3_objects__truncated_without_token(is_ready, headers, session):
     creds = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
     client = AwsS3(creds)
 
@@ -426,19 +543,20 @@ def test_list_s3_objects__truncated_without_token(is_ready, headers, requests_ge
     resp = MagicMock()
     resp.status_code = 200
     resp.content = xml_trunc
-    requests_get.return_value = resp
+    session.return_value.get.return_value = resp
 
     objs = client.list_s3_objects("some/prefix")
     assert len(objs) == 3
     assert all(isinstance(o, AwsS3Object) for o in objs)
     assert is_ready.mock_calls == [call()]
     assert headers.mock_calls == [call("", params={"list-type": 2, "prefix": "some/prefix"})]
-    assert requests_get.mock_calls == [
-        call(
+    assert session.mock_calls == [
+        call(),
+        call().get(
             "https://theHost",
             params={"list-type": 2, "prefix": "some/prefix"},
             headers={"Host": "theHost"},
-        )
+        ),
     ]
 
 
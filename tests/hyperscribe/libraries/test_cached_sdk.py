@@ -22,6 +22,7 @@ def test___init__(mock_datetime):
     assert tested.note_uuid == "theNoteUuid"
     assert tested.previous_instructions == []
     assert tested.previous_transcript == []
+    assert tested.deferred_instructions == []
 
     calls = [call.now(timezone.utc)]
     assert mock_datetime.mock_calls == calls
@@ -115,6 +116,16 @@ def test_save(get_cache):
             {"speaker": "speaker1", "text": "some words", "start": 0.0, "end": 1.3},
             {"speaker": "speaker2", "text": "other words", "start": 1.3, "end": 2.5},
         ],
+        "deferred_instructions": [
+            {
+                "uuid": "uuid3",
+                "index": 2,
+                "instruction": "theInstruction3",
+                "information": "theInformation3",
+                "isNew": False,
+                "isUpdated": False,
+            },
+        ],
     }
 
     tested = CachedSdk("theNoteUuid")
@@ -145,6 +156,17 @@ def test_save(get_cache):
         Line(speaker="speaker1", text="some words", start=0.0, end=1.3),
         Line(speaker="speaker2", text="other words", start=1.3, end=2.5),
     ]
+    tested.deferred_instructions = [
+        Instruction(
+            uuid="uuid3",
+            index=2,
+            instruction="theInstruction3",
+            information="theInformation3",
+            is_new=False,
+            is_updated=True,
+            previous_information="thePreviousInformation3",
+        ),
+    ]
     with patch.object(cached_sdk, "CACHED", {}):
         # cache exists
         get_cache.side_effect = [the_cache]
@@ -200,6 +222,17 @@ def test_to_json():
         Line(speaker="speaker1", text="some words", start=0.0, end=1.3),
         Line(speaker="speaker2", text="other words", start=1.3, end=2.5),
     ]
+    tested.deferred_instructions = [
+        Instruction(
+            uuid="uuid3",
+            index=2,
+            instruction="theInstruction3",
+            information="theInformation3",
+            is_new=False,
+            is_updated=True,
+            previous_information="thePreviousInformation3",
+        ),
+    ]
 
     result = tested.to_json()
     expected = {
@@ -229,6 +262,16 @@ def test_to_json():
             {"speaker": "speaker1", "text": "some words", "start": 0.0, "end": 1.3},
             {"speaker": "speaker2", "text": "other words", "start": 1.3, "end": 2.5},
         ],
+        "deferred_instructions": [
+            {
+                "uuid": "uuid3",
+                "index": 2,
+                "instruction": "theInstruction3",
+                "information": "theInformation3",
+                "isNew": False,
+                "isUpdated": False,
+            },
+        ],
     }
     assert result == expected
 
@@ -415,6 +458,16 @@ def test_load_from_json():
                 {"speaker": "speaker1", "text": "some words", "start": 0.0, "end": 2.1},
                 {"speaker": "speaker2", "text": "other words", "start": 2.1, "end": 4.8},
             ],
+            "deferred_instructions": [
+                {
+                    "uuid": "uuid3",
+                    "index": 2,
+                    "instruction": "theInstruction3",
+                    "information": "theInformation3",
+                    "isNew": False,
+                    "isUpdated": False,
+                },
+            ],
         },
     )
     assert isinstance(result, CachedSdk)
@@ -445,3 +498,28 @@ def test_load_from_json():
         Line(speaker="speaker1", text="some words", start=0.0, end=2.1),
         Line(speaker="speaker2", text="other words", start=2.1, end=4.8),
     ]
+    assert result.deferred_instructions == [
+        Instruction(
+            uuid="uuid3",
+            index=2,
+            instruction="theInstruction3",
+            information="theInformation3",
+            is_new=False,
+            is_updated=False,
+            previous_information="",
+        ),
+    ]
+
+    # cached before the deferred instructions
+    result = tested.load_from_json(
+        {
+            "created": "2025-06-12T14:33:21.123456+00:00",
+            "updated": "2025-06-12T14:33:37.123456+00:00",
+            "cycle": 7,
+            "note_uuid": "theNoteUuid",
+            "previous_instructions": [],
+            "previous_transcript": [],
+        },
+    )
+    assert result.previous_instructions == []
+    assert result.deferred_instructions == []
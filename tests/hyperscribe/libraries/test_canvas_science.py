@@ -1,8 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
 from unittest.mock import patch, call, MagicMock
 
 from canvas_sdk.commands.commands.allergy import AllergenType
 from canvas_sdk.commands.constants import ServiceProvider
 
+from hyperscribe.libraries import canvas_science, science_cache
 from hyperscribe.libraries.canvas_science import CanvasScience
 from hyperscribe.structures.allergy_detail import AllergyDetail
 from hyperscribe.structures.icd10_condition import Icd10Condition
@@ -125,10 +128,10 @@ def test_search_imagings(medical_concept):
     reset_mocks()
 
 
-@patch.object(CanvasScience, "get_attempts")
-def test_medical_concept(get_attempts):
+@patch.object(CanvasScience, "fan_out")
+def test_medical_concept(fan_out):
     def reset_mocks():
-        get_attempts.reset_mock()
+        fan_out.reset_mock()
 
     tested = CanvasScience
     url = "theUrl"
@@ -304,41 +307,60 @@ def test_medical_concept(get_attempts):
         ),
     ]
     for returned_class, side_effects, expected in tests:
-        get_attempts.side_effect = side_effects
+        fan_out.side_effect = [side_effects]
         result = tested.medical_concept(url, expressions, returned_class)
         assert result == expected
 
         calls = [
-            call(url, params | {"query": "expression1"}, False),
-            call(url, params | {"query": "expression2"}, False),
-            call(url, params | {"query": "expression3"}, False),
+            call(
+                url,
+                [
+                    params | {"query": "expression1"},
+                    params | {"query": "expression2"},
+                    params | {"query": "expression3"},
+                ],
+                False,
+            ),
         ]
-        assert get_attempts.mock_calls == calls
+        assert fan_out.mock_calls == calls
         reset_mocks()
 
     # empty/whitespace expressions are skipped
     for empty_expressions in [[""], ["", "  ", " "], []]:
-        get_attempts.side_effect = []
+        fan_out.side_effect = [[]]
         result = tested.medical_concept(url, empty_expressions, MedicalConcept)
         assert result == []
-        assert get_attempts.mock_calls == []
+        calls = [call(url, [], False)]
+        assert fan_out.mock_calls == calls
         reset_mocks()
 
-    # mixed: only non-empty expressions trigger API calls
-    get_attempts.side_effect = [
-        [{"concept_id": 123, "term": "termA"}],
+    # mixed: only non-empty and distinct expressions trigger API calls
+    fan_out.side_effect = [
+        [
+            [{"concept_id": 123, "term": "termA"}, {"concept_id": 369, "term": "termB"}],
+            [{"concept_id": 752, "term": "termC"}, {"concept_id": 123, "term": "termA"}],
+        ],
     ]
-    result = tested.medical_concept(url, ["", "expression1", "  "], MedicalConcept)
-    assert result == [MedicalConcept(concept_id=123, term="termA")]
-    calls = [call(url, params | {"query": "expression1"}, False)]
-    assert get_attempts.mock_calls == calls
+    result = tested.medical_concept(
+        url,
+        ["", "expression1", "  ", " Expression1", "expression  2", "expression 2"],
+        MedicalConcept,
+    )
+    expected = [
+        MedicalConcept(concept_id=123, term="termA"),
+        MedicalConcept(concept_id=369, term="termB"),
+        MedicalConcept(concept_id=752, term="termC"),
+    ]
+    assert result == expected
+    calls = [call(url, [params | {"query": "expression1"}, params | {"query": "expression 2"}], False)]
+    assert fan_out.mock_calls == calls
     reset_mocks()
 
 
-@patch.object(CanvasScience, "get_attempts")
-def test_search_allergy(get_attempts):
+@patch.object(CanvasScience, "fan_out")
+def test_search_allergy(fan_out):
     def reset_mocks():
-        get_attempts.reset_mock()
+        fan_out.reset_mock()
 
     tested = CanvasScience
     expressions = ["expression1", "expression2", "expression3"]
@@ -418,35 +440,50 @@ def test_search_allergy(get_attempts):
         ([AllergenType.MEDICATION], [concepts[:4], [], concepts[4:]], [details[i] for i in [2, 4]]),
     ]
     for concept_types, side_effects, expected in tests:
-        get_attempts.side_effect = side_effects
+        fan_out.side_effect = [side_effects]
         result = tested.search_allergy(expressions, concept_types)
         assert result == expected
 
         calls = [
             call(
                 "/fdb/allergy/",
-                {"dam_allergen_concept_id_description__fts": "expression1"},
-                True,
-            ),
-            call(
-                "/fdb/allergy/",
-                {"dam_allergen_concept_id_description__fts": "expression2"},
-                True,
-            ),
-            call(
-                "/fdb/allergy/",
-                {"dam_allergen_concept_id_description__fts": "expression3"},
+                [
+                    {"dam_allergen_concept_id_description__fts": "expression1"},
+                    {"dam_allergen_concept_id_description__fts": "expression2"},
+                    {"dam_allergen_concept_id_description__fts": "expression3"},
+                ],
                 True,
             ),
         ]
-        assert get_attempts.mock_calls == calls
+        assert fan_out.mock_calls == calls
         reset_mocks()
 
+    # same expressions and same concepts
+    fan_out.side_effect = [[concepts[:3], concepts[1:5]]]
+    result = tested.search_allergy(
+        ["expression1", "", "EXPRESSION1", "expression2"],
+        [AllergenType.ALLERGEN_GROUP, AllergenType.MEDICATION],
+    )
+    expected = [details[i] for i in [0, 1, 2, 4]]
+    assert result == expected
+    calls = [
+        call(
+            "/fdb/allergy/",
+            [
+                {"dam_allergen_concept_id_description__fts": "expression1"},
+                {"dam_allergen_concept_id_description__fts": "expression2"},
+            ],
+            True,
+        ),
+    ]
+    assert fan_out.mock_calls == calls
+    reset_mocks()
 
-@patch.object(CanvasScience, "get_attempts")
-def test_search_immunization(get_attempts):
+
+@patch.object(CanvasScience, "fan_out")
+def test_search_immunization(fan_out):
     def reset_mocks():
-        get_attempts.reset_mock()
+        fan_out.reset_mock()
 
     tested = CanvasScience
     expressions = ["expression1", "expression2", "expression3"]
@@ -497,19 +534,26 @@ def test_search_immunization(get_attempts):
 
     tests = [
         ([concepts[0:1], concepts[1:3], []], details),
+        ([concepts[0:2], concepts[1:3], concepts[0:1]], details),
         ([[], [], []], []),
     ]
     for side_effects, expected in tests:
-        get_attempts.side_effect = side_effects
+        fan_out.side_effect = [side_effects]
         result = tested.search_immunization(expressions)
         assert result == expected
 
         calls = [
-            call("/cpt/immunization/", {"name_or_code": "expression1"}, True),
-            call("/cpt/immunization/", {"name_or_code": "expression2"}, True),
-            call("/cpt/immunization/", {"name_or_code": "expression3"}, True),
+            call(
+                "/cpt/immunization/",
+                [
+                    {"name_or_code": "expression1"},
+                    {"name_or_code": "expression2"},
+                    {"name_or_code": "expression3"},
+                ],
+                True,
+            ),
         ]
-        assert get_attempts.mock_calls == calls
+        assert fan_out.mock_calls == calls
         reset_mocks()
 
 
@@ -611,16 +655,228 @@ def test_search_contacts(get_attempts):
     reset_mocks()
 
 
+def test_distinct_expressions():
+    tested = CanvasScience
+    tests = [
+        ([], []),
+        (["", "  "], []),
+        (["expression1", "expression2"], ["expression1", "expression2"]),
+        (
+            [" the  Expression1 ", "the expression1", "expression2", "", "EXPRESSION2", "expression3"],
+            ["the Expression1", "expression2", "expression3"],
+        ),
+    ]
+    for expressions, expected in tests:
+        result = tested.distinct_expressions(expressions)
+        assert result == expected, f"---> {expressions}"
+
+
+def test_distinct_concepts():
+    tested = CanvasScience
+    tests = [
+        ([], [], []),
+        (["concept1", "concept2", "concept3"], ["code1", "code2", "code3"], ["concept1", "concept2", "concept3"]),
+        (
+            ["concept1", "concept2", "concept3", "concept4"],
+            ["code1", "code2", "code1", 4],
+            ["concept1", "concept2", "concept4"],
+        ),
+        (["concept1", "concept2"], [(1, "code1"), (1, "code1")], ["concept1"]),
+    ]
+    for concepts, codes, expected in tests:
+        result = tested.distinct_concepts(concepts, codes)
+        assert result == expected
+
+
+@patch("hyperscribe.libraries.canvas_science.IN_FLIGHT", {})
+@patch("hyperscribe.libraries.canvas_science.ScienceCache")
+@patch.object(CanvasScience, "flight")
+def test_fan_out(flight, science_cache):
+    future1 = MagicMock()
+    future2 = MagicMock()
+
+    def reset_mocks():
+        flight.reset_mock()
+        science_cache.reset_mock()
+        future1.reset_mock()
+        future2.reset_mock()
+
+    tested = CanvasScience
+
+    # the results are in the order of the queries, from the cache or from the service
+    science_cache.key.side_effect = ["key1", "key2", "key3", "key4"]
+    science_cache.get.side_effect = [None, ["cached2"], None, []]
+    future1.result.side_effect = [["sent1"]]
+    future2.result.side_effect = [None]
+    flight.side_effect = [future1, future2]
+    canvas_science.IN_FLIGHT["key1"] = future1
+    canvas_science.IN_FLIGHT["key3"] = "otherFuture"
+    queries = [{"query": "q1"}, {"query": "q2"}, {"query": "q3"}, {"query": "q4"}]
+    result = tested.fan_out("theUrl", queries, True)
+    expected = [["sent1"], ["cached2"], [], []]
+    assert result == expected
+    assert canvas_science.IN_FLIGHT == {"key3": "otherFuture"}
+
+    calls = [
+        call.key("theUrl", {"query": "q1"}, True),
+        call.key("theUrl", {"query": "q2"}, True),
+        call.key("theUrl", {"query": "q3"}, True),
+        call.key("theUrl", {"query": "q4"}, True),
+        call.get("key1"),
+        call.get("key2"),
+        call.get("key3"),
+        call.get("key4"),
+    ]
+    assert science_cache.mock_calls == calls
+    calls = [
+        call("key1", "theUrl", {"query": "q1"}, True),
+        call("key3", "theUrl", {"query": "q3"}, True),
+    ]
+    assert flight.mock_calls == calls
+    assert future1.mock_calls == [call.result()]
+    assert future2.mock_calls == [call.result()]
+    reset_mocks()
+
+    # no query
+    result = tested.fan_out("theUrl", [], False)
+    assert result == []
+    assert science_cache.mock_calls == []
+    assert flight.mock_calls == []
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.canvas_science.IN_FLIGHT", {})
+@patch("hyperscribe.libraries.canvas_science.ScienceCache")
+@patch("hyperscribe.libraries.canvas_science.searcher")
+def test_flight(searcher, science_cache):
+    pending = MagicMock()
+    done = MagicMock()
+
+    def reset_mocks():
+        searcher.reset_mock()
+        science_cache.reset_mock()
+        pending.reset_mock()
+        done.reset_mock()
+
+    tested = CanvasScience
+
+    # the same lookup is in progress
+    pending.done.side_effect = [False]
+    canvas_science.IN_FLIGHT["theKey"] = pending
+    result = tested.flight("theKey", "theUrl", {"query": "q1"}, True)
+    assert result is pending
+    assert searcher.mock_calls == []
+    assert science_cache.mock_calls == [call.count("coalesced")]
+    assert pending.mock_calls == [call.done()]
+    reset_mocks()
+
+    # no lookup in progress, or it is over
+    for previous in [None, done]:
+        canvas_science.IN_FLIGHT.clear()
+        if previous is not None:
+            canvas_science.IN_FLIGHT["theKey"] = previous
+        done.done.side_effect = [True]
+        searcher.submit.side_effect = ["theFuture"]
+        result = tested.flight("theKey", "theUrl", {"query": "q1"}, True)
+        assert result == "theFuture"
+        assert canvas_science.IN_FLIGHT == {"theKey": "theFuture"}
+        calls = [call.submit(tested.request_and_store, "theKey", "theUrl", {"query": "q1"}, True)]
+        assert searcher.mock_calls == calls
+        assert science_cache.mock_calls == []
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.canvas_science.ScienceCache")
+@patch.object(CanvasScience, "request_attempts")
+def test_request_and_store(request_attempts, science_cache):
+    def reset_mocks():
+        request_attempts.reset_mock()
+        science_cache.reset_mock()
+
+    tested = CanvasScience
+    tests = [
+        (["result1"], [call.set("theKey", ["result1"])]),
+        ([], [call.set("theKey", [])]),
+        (None, []),
+    ]
+    for response, exp_cache_calls in tests:
+        request_attempts.side_effect = [response]
+        result = tested.request_and_store("theKey", "theUrl", {"query": "q1"}, False)
+        assert result == response
+        assert request_attempts.mock_calls == [call("theUrl", {"query": "q1"}, False)]
+        assert science_cache.mock_calls == exp_cache_calls
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.canvas_science.IN_FLIGHT", {})
+@patch("hyperscribe.libraries.science_cache.ENTRIES", {})
+@patch("hyperscribe.libraries.science_cache.COUNTERS", {"hits": 0, "misses": 0, "coalesced": 0})
+@patch("hyperscribe.libraries.science_cache.get_cache")
+@patch.object(CanvasScience, "request_attempts")
+def test_fan_out__concurrent(request_attempts, get_cache):
+    def reset_mocks():
+        request_attempts.reset_mock()
+        get_cache.reset_mock()
+
+    tested = CanvasScience
+
+    # the results are in the order of the queries, whatever the order of the responses,
+    # the identical queries are sent once
+    def responses(url: str, params: dict, is_ontologies: bool) -> list:
+        sleep(0.03 if params["query"] == "first" else 0.0)
+        return [f"{url}-{params['query']}-{is_ontologies}"]
+
+    get_cache.side_effect = RuntimeError("no cache")
+    with ThreadPoolExecutor(max_workers=3) as executor, patch.object(canvas_science, "searcher", executor):
+        request_attempts.side_effect = responses
+        queries = [{"query": "first"}, {"query": "second"}, {"query": "First"}, {"query": "third"}]
+        result = tested.fan_out("theUrl", queries, True)
+    expected = [["theUrl-first-True"], ["theUrl-second-True"], ["theUrl-first-True"], ["theUrl-third-True"]]
+    assert result == expected
+    calls = [
+        call("theUrl", {"query": "first"}, True),
+        call("theUrl", {"query": "second"}, True),
+        call("theUrl", {"query": "third"}, True),
+    ]
+    assert sorted(request_attempts.mock_calls, key=str) == calls
+    assert canvas_science.IN_FLIGHT == {}
+    assert science_cache.COUNTERS == {"hits": 0, "misses": 4, "coalesced": 1}
+    reset_mocks()
+
+    # the same queries are now in the cache
+    result = tested.fan_out("theUrl", queries, True)
+    assert result == expected
+    assert request_attempts.mock_calls == []
+    assert science_cache.COUNTERS == {"hits": 4, "misses": 4, "coalesced": 1}
+    reset_mocks()
+
+
+@patch.object(CanvasScience, "fan_out")
+def test_get_attempts(fan_out):
+    def reset_mocks():
+        fan_out.reset_mock()
+
+    tested = CanvasScience
+    fan_out.side_effect = [[["result1", "result2"]]]
+    result = tested.get_attempts("theUrl", {"query": "q1"}, True)
+    assert result == ["result1", "result2"]
+    calls = [call("theUrl", [{"query": "q1"}], True)]
+    assert fan_out.mock_calls == calls
+    reset_mocks()
+
+
 @patch("hyperscribe.libraries.canvas_science.ontologies_http")
 @patch("hyperscribe.libraries.canvas_science.science_http")
 @patch("hyperscribe.libraries.canvas_science.log")
-def test_get_attempts(log, science, ontologies):
+@patch("hyperscribe.libraries.canvas_science.RateLimiter")
+def test_request_attempts(rate_limiter, log, science, ontologies):
     mock_1 = MagicMock()
     mock_2 = MagicMock()
     mock_3 = MagicMock()
     mock_4 = MagicMock()
 
     def reset_mocks():
+        rate_limiter.reset_mock()
         log.reset_mock()
         science.reset_mock()
         ontologies.reset_mock()
@@ -633,6 +889,19 @@ def test_get_attempts(log, science, ontologies):
 
     headers_no_key = {"Content-Type": "application/json"}
     params = {"param": "value"}
+    rate_limiter.for_key.return_value.acquire.return_value = "theTicket"
+    rate_limiter.is_retryable.side_effect = lambda status_code: status_code in (0, 429)
+
+    def limiter_calls(responses: list) -> list:
+        result = [call.for_key("CanvasServices")]
+        for idx, (status_code, headers) in enumerate(responses):
+            result.append(call.for_key().acquire())
+            result.append(call.for_key().release("theTicket", status_code, headers))
+            if idx == 0 and status_code != 200:
+                result.append(call.is_retryable(status_code))
+                if status_code in (0, 429):
+                    result.append(call.for_key().backoff(0))
+        return result
 
     # too many attempts
     mock_1.status_code = 401
@@ -646,8 +915,8 @@ def test_get_attempts(log, science, ontologies):
 
     science.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
     ontologies.get_json.side_effect = []
-    result = tested.get_attempts("/theUrl", params, False)
-    assert result == []
+    result = tested.request_attempts("/theUrl", params, False)
+    assert result is None
     calls = [
         call.info("get response code: 401 - science: /theUrl?param=value"),
         call.info("get response code: 402 - science: /theUrl?param=value"),
@@ -663,15 +932,31 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == []
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    assert rate_limiter.mock_calls == limiter_calls([(401, mock_1.headers), (402, mock_2.headers)])
     reset_mocks()
 
+    # throttled
+    mock_1.status_code = 429
+    mock_2.status_code = 200
+    mock_2.json.return_value = {"results": ["mock list 2"]}
+
+    science.get_json.side_effect = [mock_1, mock_2]
+    ontologies.get_json.side_effect = []
+    result = tested.request_attempts("/theUrl", params, False)
+    assert result == ["mock list 2"]
+    calls = [call.info("get response code: 429 - science: /theUrl?param=value")]
+    assert log.mock_calls == calls
+    assert rate_limiter.mock_calls == limiter_calls([(429, mock_1.headers), (200, mock_2.headers)])
+    reset_mocks()
+    mock_1.status_code = 401
+
     # enough attempts
     mock_2.status_code = 200
     mock_2.json.return_value = {"results": ["mock list 2"]}
 
     science.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
     ontologies.get_json.side_effect = []
-    result = tested.get_attempts("/theUrl", params, False)
+    result = tested.request_attempts("/theUrl", params, False)
     assert result == ["mock list 2"]
     calls = [call.info("get response code: 401 - science: /theUrl?param=value")]
     assert log.mock_calls == calls
@@ -685,6 +970,7 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == [call.json()]
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    assert rate_limiter.mock_calls == limiter_calls([(401, mock_1.headers), (200, mock_2.headers)])
     reset_mocks()
 
     # using SDK Ontologies
@@ -693,7 +979,7 @@ def test_get_attempts(log, science, ontologies):
 
     science.get_json.side_effect = []
     ontologies.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
-    result = tested.get_attempts("/theUrl", params, True)
+    result = tested.request_attempts("/theUrl", params, True)
     assert result == ["mock list 2"]
     calls = [call.info("get response code: 401 - ontologies: /theUrl?param=value")]
     assert log.mock_calls == calls
@@ -707,6 +993,7 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == [call.json()]
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    assert rate_limiter.mock_calls == limiter_calls([(401, mock_1.headers), (200, mock_2.headers)])
     reset_mocks()
 
     # using SDK Sciences
@@ -715,7 +1002,7 @@ def test_get_attempts(log, science, ontologies):
 
     science.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
     ontologies.get_json.side_effect = []
-    result = tested.get_attempts("/theUrl", params, False)
+    result = tested.request_attempts("/theUrl", params, False)
     assert result == ["mock list 2"]
     calls = [call.info("get response code: 401 - science: /theUrl?param=value")]
     assert log.mock_calls == calls
@@ -729,6 +1016,7 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == [call.json()]
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    assert rate_limiter.mock_calls == limiter_calls([(401, mock_1.headers), (200, mock_2.headers)])
     reset_mocks()
     # -- no key, no params
     mock_2.status_code = 200
@@ -736,7 +1024,7 @@ def test_get_attempts(log, science, ontologies):
 
     science.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
     ontologies.get_json.side_effect = []
-    result = tested.get_attempts("/theUrl", {}, False)
+    result = tested.request_attempts("/theUrl", {}, False)
     assert result == ["mock list 2"]
     calls = [call.info("get response code: 401 - science: /theUrl")]
     assert log.mock_calls == calls
@@ -750,6 +1038,7 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == [call.json()]
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    assert rate_limiter.mock_calls == limiter_calls([(401, mock_1.headers), (200, mock_2.headers)])
     reset_mocks()
 
     # -- exception
@@ -758,8 +1047,8 @@ def test_get_attempts(log, science, ontologies):
 
     science.get_json.side_effect = [mock_1, mock_2, mock_3, mock_4]
     ontologies.get_json.side_effect = []
-    result = tested.get_attempts("/theUrl", {}, False)
-    assert result == []
+    result = tested.request_attempts("/theUrl", {}, False)
+    assert result is None
     calls = [
         call.info("get response code: 401 - science: /theUrl"),
         call.info("error raised by Canvas Service: Test error"),
@@ -775,4 +1064,15 @@ def test_get_attempts(log, science, ontologies):
     assert mock_2.mock_calls == [call.json()]
     assert mock_3.mock_calls == []
     assert mock_4.mock_calls == []
+    calls = limiter_calls([(401, mock_1.headers), (200, mock_2.headers)]) + [call.for_key().release("theTicket", 0, {})]
+    assert rate_limiter.mock_calls == calls
+    reset_mocks()
+
+    # no results
+    mock_1.status_code = 200
+    mock_1.json.return_value = {"results": None}
+    science.get_json.side_effect = [mock_1]
+    result = tested.request_attempts("/theUrl", {}, False)
+    assert result == []
+    assert log.mock_calls == []
     reset_mocks()
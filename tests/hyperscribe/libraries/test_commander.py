@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timezone
 from unittest.mock import patch, call, MagicMock
 
@@ -6,6 +7,7 @@ from canvas_sdk.v1.data import Command
 
 from hyperscribe.libraries.cached_sdk import CachedSdk
 from hyperscribe.libraries.commander import Commander
+from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.implemented_commands import ImplementedCommands
 from hyperscribe.structures.access_policy import AccessPolicy
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
@@ -23,48 +25,378 @@ from hyperscribe.structures.settings import Settings
 from hyperscribe.structures.vendor_key import VendorKey
 
 
+@patch("hyperscribe.libraries.commander.time")
+@patch("hyperscribe.libraries.commander.ThreadPoolExecutor")
+@patch("hyperscribe.libraries.commander.CycleData")
+@patch.object(Commander, "chart_cache")
+@patch.object(Commander, "compute_cycle_from")
+def test_compute_cycle(compute_cycle_from, chart_cache, cycle_data, thread_pool_executor, time):
+    def reset_mocks():
+        compute_cycle_from.reset_mock()
+        chart_cache.reset_mock()
+        cycle_data.reset_mock()
+        thread_pool_executor.reset_mock()
+        time.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    tested = Commander
+
+    compute_cycle_from.side_effect = [(True, ["effect1", "effect2"])]
+    cycle_data.retrieve.side_effect = ["theCycleData"]
+    time.side_effect = [1000.0]
+    result = tested.compute_cycle(identification, "theSettings", "theAwsS3", 3)
+    expected = (True, ["effect1", "effect2"])
+    assert result == expected
+
+    # the deadline of the cycle runs since before its retrieval
+    calls = [
+        call(identification, "theSettings", "theAwsS3", 3, ["theCycleData"], chart_cache.return_value, 1000.0),
+    ]
+    assert compute_cycle_from.mock_calls == calls
+    warmer = thread_pool_executor.return_value.__enter__.return_value
+    calls = [call(identification, "theSettings"), call().warm_up(warmer)]
+    assert chart_cache.mock_calls == calls
+    calls = [call.retrieve("theAwsS3", identification, 3)]
+    assert cycle_data.mock_calls == calls
+    calls = [call(max_workers=4), call().__enter__(), call().__exit__(None, None, None)]
+    assert thread_pool_executor.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.LimitedCache")
+@patch.object(Command, "objects")
+@patch.object(Commander, "existing_commands_to_coded_items")
+def test_chart_cache(existing_commands_to_coded_items, command_db, limited_cache):
+    def reset_mocks():
+        existing_commands_to_coded_items.reset_mock()
+        command_db.reset_mock()
+        limited_cache.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    settings = MagicMock(commands_policy=AccessPolicy(policy=False, items=["Command1"]))
+    tested = Commander
+
+    command_db.filter.return_value.order_by.side_effect = ["QuerySetCommands"]
+    existing_commands_to_coded_items.side_effect = ["stagedCommands"]
+    limited_cache.from_snapshot.side_effect = ["theCache"]
+    result = tested.chart_cache(identification, settings)
+    assert result == "theCache"
+
+    calls = [call("QuerySetCommands", AccessPolicy(policy=False, items=["Command1"]), True)]
+    assert existing_commands_to_coded_items.mock_calls == calls
+    calls = [
+        call.filter(patient__id="patientUuid", note__id="noteUuid", state="staged"),
+        call.filter().order_by("dbid"),
+    ]
+    assert command_db.mock_calls == calls
+    calls = [call.from_snapshot("noteUuid", "patientUuid", "providerUuid", "stagedCommands")]
+    assert limited_cache.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.Tracer")
+@patch("hyperscribe.libraries.commander.CycleData")
+@patch.object(Line, "tail_of")
+@patch.object(Commander, "transcribe_cycle")
+def test_transcribe_cycles(transcribe_cycle, tail_of, cycle_data, tracer):
+    def reset_mocks():
+        transcribe_cycle.reset_mock()
+        tail_of.reset_mock()
+        cycle_data.reset_mock()
+        tracer.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    settings = Settings(
+        llm_text=VendorKey(vendor="theVendorTextLLM", api_key="theKeyTextLLM"),
+        llm_audio=VendorKey(vendor="theVendorAudioLLM", api_key="theKeyAudioLLM"),
+        structured_rfv=True,
+        audit_llm=True,
+        reasoning_llm=False,
+        custom_prompts=[],
+        is_tuning=False,
+        api_signing_key="theApiSigningKey",
+        max_workers=7,
+        hierarchical_detection_threshold=5,
+        send_progress=True,
+        commands_policy=AccessPolicy(policy=False, items=[]),
+        staffers_policy=AccessPolicy(policy=False, items=[]),
+        trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+        cycle_transcript_overlap=37,
+    )
+    previous_transcript = [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)]
+    transcripts = [
+        [Line(speaker="speaker1", text="textA", start=0.0, end=1.3)],
+        [Line(speaker="speaker2", text="textB", start=1.3, end=2.5)],
+    ]
+    audios = [
+        CycleData(audio=b"audio1", transcript=[], source=CycleDataSource.AUDIO),
+        CycleData(audio=b"audio2", transcript=[], source=CycleDataSource.AUDIO),
+        CycleData(audio=b"audio3", transcript=[], source=CycleDataSource.AUDIO),
+    ]
+    typed = CycleData(audio=b"", transcript=transcripts[1], source=CycleDataSource.TRANSCRIPT)
+    tested = Commander
+
+    # single cycle
+    cycle_data.retrieve.side_effect = [audios[0]]
+    cycle_data.coalesce.side_effect = ["theCoalescedData"]
+    transcribe_cycle.side_effect = ["theTranscribedData"]
+    tracer.cycle_key.side_effect = ["theCycleKey"]
+    tracer.begin_cycle.side_effect = ["theRoot"]
+    result = tested.transcribe_cycles(identification, settings, "theAwsS3", [3], previous_transcript)
+    expected = ["theTranscribedData"]
+    assert result == expected
+
+    calls = [call(identification, settings, "theAwsS3", 3, "theCoalescedData", previous_transcript)]
+    assert transcribe_cycle.mock_calls == calls
+    assert tail_of.mock_calls == []
+    calls = [
+        call.retrieve("theAwsS3", identification, 3, "theRoot"),
+        call.coalesce([audios[0]]),
+    ]
+    assert cycle_data.mock_calls == calls
+    calls = [call.cycle_key("noteUuid", 3), call.begin_cycle("theCycleKey", {})]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # coalesced cycles of the same source
+    cycle_data.retrieve.side_effect = audios
+    cycle_data.coalesce.side_effect = ["theCoalescedData"]
+    transcribe_cycle.side_effect = ["theTranscribedData"]
+    tracer.cycle_key.side_effect = ["theCycleKey"]
+    tracer.begin_cycle.side_effect = ["theRoot"]
+    result = tested.transcribe_cycles(identification, settings, "theAwsS3", [3, 4, 5], previous_transcript)
+    expected = ["theTranscribedData"]
+    assert result == expected
+
+    calls = [call(identification, settings, "theAwsS3", 5, "theCoalescedData", previous_transcript)]
+    assert transcribe_cycle.mock_calls == calls
+    assert tail_of.mock_calls == []
+    calls = [
+        call.retrieve("theAwsS3", identification, 3, "theRoot"),
+        call.retrieve("theAwsS3", identification, 4, "theRoot"),
+        call.retrieve("theAwsS3", identification, 5, "theRoot"),
+        call.coalesce(audios),
+    ]
+    assert cycle_data.mock_calls == calls
+    calls = [call.cycle_key("noteUuid", 5), call.begin_cycle("theCycleKey", {})]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # coalesced cycles of different sources, each source is a separate part
+    # -- all transcripts available
+    cycle_data.retrieve.side_effect = [audios[0], audios[1], typed, audios[2]]
+    cycle_data.coalesce.side_effect = ["theCoalescedData1", "theCoalescedData2", "theCoalescedData3"]
+    transcribe_cycle.side_effect = [
+        CycleData(audio=b"audio1audio2", transcript=transcripts[0], source=CycleDataSource.AUDIO),
+        typed,
+        CycleData(audio=b"audio3", transcript=transcripts[0], source=CycleDataSource.AUDIO),
+    ]
+    tail_of.side_effect = ["theTail1", "theTail2"]
+    tracer.cycle_key.side_effect = ["theCycleKey"]
+    tracer.begin_cycle.side_effect = ["theRoot"]
+    result = tested.transcribe_cycles(identification, settings, "theAwsS3", [3, 4, 5, 6], previous_transcript)
+    expected = [
+        CycleData(audio=b"audio1audio2", transcript=transcripts[0], source=CycleDataSource.AUDIO),
+        typed,
+        CycleData(audio=b"audio3", transcript=transcripts[0], source=CycleDataSource.AUDIO),
+    ]
+    assert result == expected
+
+    calls = [
+        call(identification, settings, "theAwsS3", 6, "theCoalescedData1", previous_transcript),
+        call(identification, settings, "theAwsS3", 6, "theCoalescedData2", "theTail1"),
+        call(identification, settings, "theAwsS3", 6, "theCoalescedData3", "theTail2"),
+    ]
+    assert transcribe_cycle.mock_calls == calls
+    calls = [call(transcripts[0], 37), call(transcripts[1], 37)]
+    assert tail_of.mock_calls == calls
+    calls = [
+        call.retrieve("theAwsS3", identification, 3, "theRoot"),
+        call.retrieve("theAwsS3", identification, 4, "theRoot"),
+        call.retrieve("theAwsS3", identification, 5, "theRoot"),
+        call.retrieve("theAwsS3", identification, 6, "theRoot"),
+        call.coalesce(audios[:2]),
+        call.coalesce([typed]),
+        call.coalesce([audios[2]]),
+    ]
+    assert cycle_data.mock_calls == calls
+    calls = [call.cycle_key("noteUuid", 6), call.begin_cycle("theCycleKey", {})]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # -- a transcript is missing, the audio is kept to be transcribed again
+    cycle_data.retrieve.side_effect = [audios[0], typed]
+    cycle_data.coalesce.side_effect = ["theCoalescedData1", "theCoalescedData2"]
+    transcribe_cycle.side_effect = [audios[0], typed]
+    tracer.cycle_key.side_effect = ["theCycleKey"]
+    tracer.begin_cycle.side_effect = ["theRoot"]
+    result = tested.transcribe_cycles(identification, settings, "theAwsS3", [3, 4], previous_transcript)
+    expected = [audios[0], typed]
+    assert result == expected
+
+    calls = [
+        call(identification, settings, "theAwsS3", 4, "theCoalescedData1", previous_transcript),
+        call(identification, settings, "theAwsS3", 4, "theCoalescedData2", previous_transcript),
+    ]
+    assert transcribe_cycle.mock_calls == calls
+    assert tail_of.mock_calls == []
+    calls = [
+        call.retrieve("theAwsS3", identification, 3, "theRoot"),
+        call.retrieve("theAwsS3", identification, 4, "theRoot"),
+        call.coalesce([audios[0]]),
+        call.coalesce([typed]),
+    ]
+    assert cycle_data.mock_calls == calls
+    calls = [call.cycle_key("noteUuid", 4), call.begin_cycle("theCycleKey", {})]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.MemoryLog")
+@patch("hyperscribe.libraries.commander.LimitedCache")
+@patch("hyperscribe.libraries.commander.AudioInterpreter")
+def test_transcribe_cycle(audio_interpreter, limited_cache, memory_log):
+    def reset_mocks():
+        audio_interpreter.reset_mock()
+        limited_cache.reset_mock()
+        memory_log.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    previous_transcript = [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)]
+    tested = Commander
+
+    # transcript or no audio
+    for data in [
+        CycleData(audio=b"", transcript=[], source=CycleDataSource.AUDIO),
+        CycleData(audio=b"", transcript=previous_transcript, source=CycleDataSource.TRANSCRIPT),
+    ]:
+        result = tested.transcribe_cycle(identification, "theSettings", "theAwsS3", 3, data, previous_transcript)
+        assert result is data
+
+        assert audio_interpreter.mock_calls == []
+        assert limited_cache.mock_calls == []
+        assert memory_log.mock_calls == []
+        reset_mocks()
+
+    # audio
+    data = CycleData(audio=b"raw-audio-bytes", transcript=[], source=CycleDataSource.AUDIO)
+    # -- transcription error
+    limited_cache.side_effect = ["LimitedCacheInstance"]
+    audio_interpreter.return_value.combine_and_speaker_detection.side_effect = [
+        JsonExtract(has_error=True, error="theError", content=[]),
+    ]
+    result = tested.transcribe_cycle(identification, "theSettings", "theAwsS3", 3, data, previous_transcript)
+    assert result is data
+
+    calls = [
+        call("theSettings", "theAwsS3", "LimitedCacheInstance", identification),
+        call().combine_and_speaker_detection(b"raw-audio-bytes", previous_transcript, 3),
+    ]
+    assert audio_interpreter.mock_calls == calls
+    calls = [call("patientUuid", "providerUuid", {})]
+    assert limited_cache.mock_calls == calls
+    calls = [
+        call.instance(identification, "main", "theAwsS3", 3),
+        call.instance().output("--> transcript of the cycle 3 encountered: theError"),
+    ]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+    # -- transcription done
+    limited_cache.side_effect = ["LimitedCacheInstance"]
+    audio_interpreter.return_value.combine_and_speaker_detection.side_effect = [
+        JsonExtract(
+            has_error=False,
+            error="",
+            content=[
+                {"speaker": "speaker1", "text": "textA", "start": 0.0, "end": 1.3},
+                {"speaker": "speaker2", "text": "textB", "start": 1.3, "end": 2.5},
+            ],
+        ),
+    ]
+    result = tested.transcribe_cycle(identification, "theSettings", "theAwsS3", 3, data, previous_transcript)
+    expected = CycleData(
+        audio=b"raw-audio-bytes",
+        transcript=[
+            Line(speaker="speaker1", text="textA", start=0.0, end=1.3),
+            Line(speaker="speaker2", text="textB", start=1.3, end=2.5),
+        ],
+        source=CycleDataSource.AUDIO,
+    )
+    assert result == expected
+
+    calls = [
+        call("theSettings", "theAwsS3", "LimitedCacheInstance", identification),
+        call().combine_and_speaker_detection(b"raw-audio-bytes", previous_transcript, 3),
+    ]
+    assert audio_interpreter.mock_calls == calls
+    calls = [call("patientUuid", "providerUuid", {})]
+    assert limited_cache.mock_calls == calls
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.UploadQueue")
 @patch("hyperscribe.libraries.commander.AwsS3")
 @patch("hyperscribe.libraries.commander.ProgressDisplay")
 @patch("hyperscribe.libraries.commander.MemoryLog")
-@patch("hyperscribe.libraries.commander.LimitedCache")
 @patch("hyperscribe.libraries.commander.AudioInterpreter")
 @patch("hyperscribe.libraries.commander.AuditorLive")
-@patch("hyperscribe.libraries.commander.CycleData")
 @patch.object(CachedSdk, "save")
 @patch.object(CachedSdk, "get_discussion")
 @patch.object(Command, "objects")
-@patch.object(Commander, "existing_commands_to_coded_items")
 @patch.object(Commander, "existing_commands_to_instructions")
 @patch.object(Commander, "audio2commands")
-def test_compute_cycle(
+def test_compute_cycle_from(
     audio2commands,
     existing_commands_to_instructions,
-    existing_commands_to_coded_items,
     command_db,
     cache_get_discussion,
     cache_save,
-    cycle_data,
     auditor_live,
     audio_interpreter,
-    limited_cache,
     memory_log,
     progress,
     aws_s3,
+    upload_queue,
 ):
+    limited_cache_instance = MagicMock()
+    audio_interpreter_instance = MagicMock()
+
     def reset_mocks():
         audio2commands.reset_mock()
         existing_commands_to_instructions.reset_mock()
-        existing_commands_to_coded_items.reset_mock()
         command_db.reset_mock()
         cache_get_discussion.reset_mock()
         cache_save.reset_mock()
-        cycle_data.reset_mock()
         auditor_live.reset_mock()
         audio_interpreter.reset_mock()
-        limited_cache.reset_mock()
+        limited_cache_instance.reset_mock()
+        audio_interpreter_instance.reset_mock()
         memory_log.reset_mock()
         progress.reset_mock()
         aws_s3.reset_mock()
+        upload_queue.reset_mock()
 
     identification = IdentificationParameters(
         patient_uuid="patientUuid",
@@ -100,31 +432,28 @@ def test_compute_cycle(
     # no more audio
     audio2commands.side_effect = []
     existing_commands_to_instructions.side_effect = []
-    existing_commands_to_coded_items.side_effect = []
     command_db.filter.return_value.order_by.side_effect = []
     cache_get_discussion.side_effect = []
-    cycle_data.from_s3.side_effect = [CycleData(audio=b"", transcript=[], source=CycleDataSource.AUDIO)]
     auditor_live.side_effect = []
     audio_interpreter.side_effect = []
-    limited_cache.side_effect = []
     memory_log.end_session.side_effect = []
     aws_s3.return_value.is_ready.side_effect = []
 
-    result = tested.compute_cycle(identification, settings, aws_s3_credentials, 3)
+    cycle_data = CycleData(audio=b"", transcript=[], source=CycleDataSource.AUDIO)
+    result = tested.compute_cycle_from(
+        identification, settings, aws_s3_credentials, 3, [cycle_data], limited_cache_instance, 1000.0
+    )
     expected = (False, [])
     assert result == expected
 
     assert audio2commands.mock_calls == []
     assert existing_commands_to_instructions.mock_calls == []
-    assert existing_commands_to_coded_items.mock_calls == []
     assert command_db.mock_calls == []
     assert cache_get_discussion.mock_calls == []
     assert cache_save.mock_calls == []
-    calls = [call.from_s3(aws_s3_credentials, identification, 3)]
-    assert cycle_data.mock_calls == calls
     assert auditor_live.mock_calls == []
     assert audio_interpreter.mock_calls == []
-    assert limited_cache.mock_calls == []
+    assert limited_cache_instance.mock_calls == []
     calls = [call.instance(identification, "main", aws_s3_credentials), call.instance().output("--> cycle length: 0")]
     assert memory_log.mock_calls == calls
     assert progress.mock_calls == []
@@ -203,34 +532,44 @@ def test_compute_cycle(
         discussion.cycle = 7
         discussion.previous_instructions = instructions[2:]
         discussion.previous_transcript = [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)]
+        discussion.deferred_instructions = instructions[:1]
 
-        cycle_data_instance = CycleData(audio=b"raw-audio-bytes", transcript=[], source=CycleDataSource.AUDIO)
+        cycle_parts = [
+            CycleData(audio=b"raw-audio", transcript=[], source=CycleDataSource.AUDIO),
+            CycleData(
+                audio=b"", transcript=[Line(speaker="Clinician", text="typed")], source=CycleDataSource.TRANSCRIPT
+            ),
+            CycleData(audio=b"bytes", transcript=[], source=CycleDataSource.AUDIO),
+        ]
 
         audio2commands.side_effect = [(exp_instructions, exp_effects, "other last words.")]
         existing_commands_to_instructions.side_effect = [instructions]
-        existing_commands_to_coded_items.side_effect = ["stagedCommands"]
         command_db.filter.return_value.order_by.side_effect = ["QuerySetCommands"]
         cache_get_discussion.side_effect = [discussion]
-        cycle_data.from_s3.side_effect = [cycle_data_instance]
         auditor_live.side_effect = ["AuditorInstance"]
-        audio_interpreter.side_effect = ["AudioInterpreterInstance"]
-        limited_cache.side_effect = ["LimitedCacheInstance"]
+        audio_interpreter.side_effect = [audio_interpreter_instance]
+        audio_interpreter_instance.deadline.pending.side_effect = [instructions[1:2]]
+        audio_interpreter_instance.deadline.degraded = ["theDecision1", "theDecision2"]
         memory_log.end_session.side_effect = ["flushedMemoryLog"]
         aws_s3.return_value.is_ready.side_effect = [s3_is_ready]
 
-        result = tested.compute_cycle(identification, settings, aws_s3_credentials, 3)
+        result = tested.compute_cycle_from(
+            identification, settings, aws_s3_credentials, 3, cycle_parts, limited_cache_instance, 1000.0
+        )
         expected = (True, exp_effects)
         assert result == expected
 
         assert discussion.cycle == 3
         assert discussion.previous_instructions == exp_instructions
         assert discussion.previous_transcript == "other last words."
+        assert discussion.deferred_instructions == instructions[1:2]
+        assert audio_interpreter_instance.deadline.carried == instructions[:1]
 
         calls = [
             call(
                 "AuditorInstance",
-                cycle_data_instance,
-                "AudioInterpreterInstance",
+                cycle_parts,
+                audio_interpreter_instance,
                 instructions,
                 [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)],
             )
@@ -238,8 +577,6 @@ def test_compute_cycle(
         assert audio2commands.mock_calls == calls
         calls = [call("QuerySetCommands", instructions[2:])]
         assert existing_commands_to_instructions.mock_calls == calls
-        calls = [call("QuerySetCommands", AccessPolicy(policy=False, items=["Command1", "Command2", "Command3"]), True)]
-        assert existing_commands_to_coded_items.mock_calls == calls
         calls = [
             call.filter(patient__id="patientUuid", note__id="noteUuid", state="staged"),
             call.filter().order_by("dbid"),
@@ -249,14 +586,14 @@ def test_compute_cycle(
         assert cache_get_discussion.mock_calls == calls
         calls = [call(), call()]
         assert cache_save.mock_calls == calls
-        calls = [call.from_s3(aws_s3_credentials, identification, 3)]
-        assert cycle_data.mock_calls == calls
         calls = [call(3, settings, aws_s3_credentials, identification)]
         assert auditor_live.mock_calls == calls
-        calls = [call(settings, aws_s3_credentials, "LimitedCacheInstance", identification)]
+        calls = [call(settings, aws_s3_credentials, limited_cache_instance, identification, 1000.0)]
         assert audio_interpreter.mock_calls == calls
-        calls = [call("patientUuid", "providerUuid", "stagedCommands")]
-        assert limited_cache.mock_calls == calls
+        calls = [call.deadline.pending()]
+        assert audio_interpreter_instance.mock_calls == calls
+        calls = [call.store_snapshot("noteUuid")]
+        assert limited_cache_instance.mock_calls == calls
         calls = [
             call.instance(identification, "main", aws_s3_credentials),
             call.instance().output("--> cycle length: 15"),
@@ -267,6 +604,9 @@ def test_compute_cycle(
             call.instance().output("- theInstructionA #00 (uuidA, new/updated: False/True): theInformationA"),
             call.instance().output("- theInstructionB #01 (uuidB, new/updated: True/False): theInformationB"),
             call.instance().output("- theInstructionC #02 (uuidC, new/updated: True/False): theInformationC"),
+            call.instance().output("degraded decisions: 2"),
+            call.instance().output("- theDecision1"),
+            call.instance().output("- theDecision2"),
             call.instance().output("<-------->"),
             call.instance().output("command: LOG"),
             call.instance().output("Log1"),
@@ -297,14 +637,18 @@ def test_compute_cycle(
             call().__bool__(),
             call().is_ready(),
         ]
+        assert aws_s3.mock_calls == calls
+        calls = []
         if s3_is_ready:
-            calls.append(
-                call().upload_text_to_s3(
+            calls = [
+                call.enqueue(
+                    "noteUuid",
+                    AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket"),
                     "hyperscribe-canvasInstance/finals/2025-03-10/patientUuid-noteUuid/03.log",
                     "flushedMemoryLog",
                 ),
-            )
-        assert aws_s3.mock_calls == calls
+            ]
+        assert upload_queue.mock_calls == calls
         reset_mocks()
 
 
@@ -387,7 +731,7 @@ def test_audio2commands(transcript2commands, tail_of, memory_log, progress):
     cycle_data = CycleData(audio=b"audioBytes", transcript=[], source=CycleDataSource.AUDIO)
     result = tested.audio2commands(
         mock_auditor,
-        cycle_data,
+        [cycle_data],
         mock_chatter,
         previous,
         [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)],
@@ -484,7 +828,7 @@ def test_audio2commands(transcript2commands, tail_of, memory_log, progress):
     )
     result = tested.audio2commands(
         mock_auditor,
-        cycle_data,
+        [cycle_data],
         mock_chatter,
         previous,
         [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)],
@@ -535,6 +879,73 @@ def test_audio2commands(transcript2commands, tail_of, memory_log, progress):
     assert mock_auditor.mock_calls == calls
     assert mock_chatter.mock_calls == []
     reset_mocks()
+    # -- chunks are text and audio, the audio not transcribed yet follows the text
+    typed = [Line(speaker="theSpeaker", text="the text", start=0.0, end=0.0)]
+    spoken = [
+        Line(speaker="speaker1", text=f"{text} textA.", start=0.0, end=1.3),
+        Line(speaker="speaker2", text=f"{text} textB.", start=1.3, end=2.5),
+        Line(speaker="speaker1", text=f"{text} textC.", start=2.5, end=3.6),
+    ]
+    cycle_parts = [
+        CycleData(audio=b"", transcript=typed, source=CycleDataSource.TRANSCRIPT),
+        CycleData(audio=b"audioBytes", transcript=[], source=CycleDataSource.AUDIO),
+    ]
+    tests = [
+        # the audio is transcribed
+        (
+            JsonExtract(has_error=False, error="", content=transcript),
+            typed + spoken,
+            [call.instance().output("--> transcript back and forth: 4")],
+        ),
+        # the audio is not transcribed, the text is still computed
+        (
+            JsonExtract(has_error=True, error="theError", content=[]),
+            typed,
+            [
+                call.instance().output("--> transcript encountered: theError"),
+                call.instance().output("--> transcript back and forth: 1"),
+            ],
+        ),
+    ]
+    for response, exp_transcript, exp_outputs in tests:
+        transcript2commands.side_effect = [("instructions", "effects")]
+        tail_of.side_effect = ["theTail", lines]
+        mock_chatter.combine_and_speaker_detection.side_effect = [response]
+
+        result = tested.audio2commands(
+            mock_auditor,
+            cycle_parts,
+            mock_chatter,
+            previous,
+            [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)],
+        )
+        expected = ("instructions", "effects", lines)
+        assert result == expected
+
+        calls = [call.instance(identification, "main", "s3Credentials")] + exp_outputs
+        assert memory_log.mock_calls == calls
+        calls = [
+            call.send_to_user(
+                identification,
+                settings,
+                [
+                    ProgressMessage(
+                        message=json.dumps([line.to_json() for line in exp_transcript]),
+                        section="transcript",
+                    )
+                ],
+            )
+        ]
+        assert progress.mock_calls == calls
+        calls = [call(mock_auditor, exp_transcript, mock_chatter, previous)]
+        assert transcript2commands.mock_calls == calls
+        calls = [call(typed, 37), call(exp_transcript, 37)]
+        assert tail_of.mock_calls == calls
+        calls = [call.identified_transcript(b"audioBytes", exp_transcript)]
+        assert mock_auditor.mock_calls == calls
+        calls = [call.combine_and_speaker_detection(b"audioBytes", "theTail")]
+        assert mock_chatter.mock_calls == calls
+        reset_mocks()
 
     # transcript has error
     transcript2commands.side_effect = []
@@ -546,7 +957,7 @@ def test_audio2commands(transcript2commands, tail_of, memory_log, progress):
     cycle_data = CycleData(audio=b"audioBytes", transcript=[], source=CycleDataSource.AUDIO)
     result = tested.audio2commands(
         mock_auditor,
-        cycle_data,
+        [cycle_data],
         mock_chatter,
         previous,
         [Line(speaker="speaker0", text="some text", start=0.0, end=2.1)],
@@ -702,12 +1113,14 @@ def test_transcript2command(transcript2commands_common, transcript2commands_ques
 @patch("hyperscribe.libraries.commander.ProgressDisplay")
 @patch("hyperscribe.libraries.commander.MemoryLog")
 @patch("hyperscribe.libraries.commander.time")
-def test_transcript2commands_common(time, memory_log, progress):
+@patch.object(Commander, "instructions2commands")
+def test_transcript2commands_common(instructions2commands, time, memory_log, progress):
     mock_auditor = MagicMock()
     mock_chatter = MagicMock()
     mock_commands = [MagicMock(), MagicMock(), MagicMock()]
 
     def reset_mocks():
+        instructions2commands.reset_mock()
         time.reset_mock()
         memory_log.reset_mock()
         progress.reset_mock()
@@ -808,50 +1221,6 @@ def test_transcript2commands_common(time, memory_log, progress):
             previous_information="",
         ),
     ]
-    instructions_with_parameters = [
-        InstructionWithParameters(
-            uuid="uuidA",
-            index=1,
-            instruction="theInstructionA",
-            information="changedInformationA",
-            is_new=False,
-            is_updated=True,
-            previous_information="thePreviousInformation1",
-            parameters={"params": "instruction0"},
-        ),
-        # B is unchanged
-        InstructionWithParameters(
-            uuid="uuidF",
-            index=6,
-            instruction="theInstructionA",
-            information="changedInformationF",
-            is_new=False,
-            is_updated=True,
-            previous_information="thePreviousInformation6",
-            parameters={"params": "instruction5"},
-        ),
-        None,  # C results with None
-        InstructionWithParameters(
-            uuid="uuidD",
-            index=4,
-            instruction="theInstructionD",
-            information="theInformationD",
-            is_new=True,
-            is_updated=False,
-            previous_information="thePreviousInformation4",
-            parameters={"params": "instruction3"},
-        ),
-        InstructionWithParameters(
-            uuid="uuidE",
-            index=5,
-            instruction="theInstructionD",
-            information="theInformationE",
-            is_new=True,
-            is_updated=False,
-            previous_information="thePreviousInformation5",
-            parameters={"params": "instruction4"},
-        ),
-    ]
     instructions_with_commands = [
         InstructionWithCommand(
             uuid="uuidA",
@@ -982,8 +1351,9 @@ def test_transcript2commands_common(time, memory_log, progress):
                 },
             ],
         ]
-        mock_chatter.create_sdk_command_parameters.side_effect = instructions_with_parameters
-        mock_chatter.create_sdk_command_from.side_effect = instructions_with_commands
+        instructions2commands.side_effect = [instructions_with_commands[:3]]
+        # -- the unchanged B is an update deferred by the previous cycle
+        mock_chatter.deadline.carried_over.side_effect = lambda *args: [args[0][1]]
 
         mock_commands[0].edit.side_effect = [Effect(type="LOG", payload="Log1")]
         mock_commands[1].edit.side_effect = [Effect(type="LOG", payload="Log2")]
@@ -999,13 +1369,10 @@ def test_transcript2commands_common(time, memory_log, progress):
         assert result[0] == expected[0]
         assert result[1] == expected[1]
 
-        exp_instructions_w_parameters = [instructions_with_parameters[i] for i in [0, 1, 3, 4]]
-        exp_instructions_w_commands = [instructions_with_commands[i] for i in [0, 1, 2]]
         calls = [
             call.instance(identification, "main", "awsS3"),
             call.instance().output("--> instructions: 6"),
-            call.instance().output("--> computed instructions: 5"),
-            call.instance().output("--> computed commands: 4"),
+            call.instance().output("--> computed instructions: 6"),
             call.instance().output("DURATION COMMONS: 108"),
         ]
         assert memory_log.mock_calls == calls
@@ -1023,11 +1390,6 @@ def test_transcript2commands_common(time, memory_log, progress):
                     )
                 ],
             ),
-            call.send_to_user(
-                identification,
-                settings,
-                [ProgressMessage(message="parameters computation done (4)", section="events:4")],
-            ),
             call.send_to_user(
                 identification,
                 settings,
@@ -1038,22 +1400,23 @@ def test_transcript2commands_common(time, memory_log, progress):
         calls = [call(), call()]
         assert time.mock_calls == calls
         calls = [
-            call.found_instructions(transcript, previous_instructions, expected[0]),
-            call.computed_parameters(exp_instructions_w_parameters),
-            call.computed_commands(exp_instructions_w_commands),
+            call(
+                mock_auditor,
+                mock_chatter,
+                [exp_instructions[i] for i in [0, 2, 3, 4, 5, 1]],
+                {instruction.uuid: instruction for instruction in previous_instructions},
+            ),
         ]
+        assert instructions2commands.mock_calls == calls
+        calls = [call.found_instructions(transcript, previous_instructions, expected[0])]
         assert mock_auditor.mock_calls == calls
         calls = [
             call.detect_instructions(transcript, previous_instructions),
-            call.create_sdk_command_parameters(exp_instructions[0]),
-            call.create_sdk_command_parameters(exp_instructions[2]),
-            call.create_sdk_command_parameters(exp_instructions[3]),
-            call.create_sdk_command_parameters(exp_instructions[4]),
-            call.create_sdk_command_parameters(exp_instructions[5]),
-            call.create_sdk_command_from(exp_instructions_w_parameters[0]),
-            call.create_sdk_command_from(exp_instructions_w_parameters[1]),
-            call.create_sdk_command_from(exp_instructions_w_parameters[2]),
-            call.create_sdk_command_from(exp_instructions_w_parameters[3]),
+            call.deadline.carried_over(
+                exp_instructions,
+                {instruction.uuid: instruction for instruction in previous_instructions},
+                [exp_instructions[i] for i in [0, 2, 3, 4, 5, 1]],
+            ),
         ]
         assert mock_chatter.mock_calls == calls
         for idx, command_call in enumerate(exp_command_calls):
@@ -1147,8 +1510,8 @@ def test_transcript2commands_common(time, memory_log, progress):
             },
         ],
     ]
-    mock_chatter.create_sdk_command_parameters.side_effect = instructions_with_parameters
-    mock_chatter.create_sdk_command_from.side_effect = instructions_with_commands
+    instructions2commands.side_effect = [[]]
+    mock_chatter.deadline.carried_over.side_effect = [[]]
 
     mock_commands[0].edit.side_effect = []
     mock_commands[1].edit.side_effect = []
@@ -1164,13 +1527,10 @@ def test_transcript2commands_common(time, memory_log, progress):
     assert result[0] == expected[0]
     assert result[1] == expected[1]
 
-    exp_instructions_w_parameters = []
-    exp_instructions_w_commands = []
     calls = [
         call.instance(identification, "main", "awsS3"),
         call.instance().output("--> instructions: 3"),
         call.instance().output("--> computed instructions: 0"),
-        call.instance().output("--> computed commands: 0"),
         call.instance().output("DURATION COMMONS: 108"),
     ]
     assert memory_log.mock_calls == calls
@@ -1180,11 +1540,6 @@ def test_transcript2commands_common(time, memory_log, progress):
             settings,
             [ProgressMessage(message="instructions detection: total: 3", section="events:4")],
         ),
-        call.send_to_user(
-            identification,
-            settings,
-            [ProgressMessage(message="parameters computation done (0)", section="events:4")],
-        ),
         call.send_to_user(
             identification,
             settings,
@@ -1195,12 +1550,19 @@ def test_transcript2commands_common(time, memory_log, progress):
     calls = [call(), call()]
     assert time.mock_calls == calls
     calls = [
-        call.found_instructions(transcript, previous_instructions, expected[0]),
-        call.computed_parameters(exp_instructions_w_parameters),
-        call.computed_commands(exp_instructions_w_commands),
+        call(mock_auditor, mock_chatter, [], {instruction.uuid: instruction for instruction in previous_instructions})
     ]
+    assert instructions2commands.mock_calls == calls
+    calls = [call.found_instructions(transcript, previous_instructions, expected[0])]
     assert mock_auditor.mock_calls == calls
-    calls = [call.detect_instructions(transcript, previous_instructions)]
+    calls = [
+        call.detect_instructions(transcript, previous_instructions),
+        call.deadline.carried_over(
+            previous_instructions,
+            {instruction.uuid: instruction for instruction in previous_instructions},
+            [],
+        ),
+    ]
     assert mock_chatter.mock_calls == calls
     for mock_command in mock_commands:
         assert mock_command.mock_calls == []
@@ -1208,6 +1570,508 @@ def test_transcript2commands_common(time, memory_log, progress):
     reset_mocks()
 
 
+@patch("hyperscribe.libraries.commander.ProgressDisplay")
+@patch("hyperscribe.libraries.commander.MemoryLog")
+def test_instructions2commands(memory_log, progress):
+    mock_auditor = MagicMock()
+    mock_chatter = MagicMock()
+    mock_commands = [MagicMock(), MagicMock()]
+
+    def reset_mocks():
+        memory_log.reset_mock()
+        progress.reset_mock()
+        mock_auditor.reset_mock()
+        mock_chatter.reset_mock()
+        for a_command in mock_commands:
+            a_command.reset_mock()
+
+    tested = Commander
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    instructions = [
+        Instruction(
+            uuid=f"uuid{letter}",
+            index=idx,
+            instruction=f"theInstruction{letter}",
+            information=f"theInformation{letter}",
+            is_new=letter != "A",
+            is_updated=letter == "A",
+            previous_information="",
+        )
+        for idx, letter in enumerate("ABCD")
+    ]
+    past_uuids = {"uuidA": instructions[0]}
+    parameters = {
+        instruction.uuid: InstructionWithParameters.add_parameters(instruction, {"params": instruction.uuid})
+        for instruction in instructions
+    }
+    parameters["uuidC"] = None  # <-- no parameters for C
+    commands = {
+        "uuidA": InstructionWithCommand.add_command(parameters["uuidA"], mock_commands[0]),
+        "uuidB": None,  # <-- no command for B
+        "uuidD": InstructionWithCommand.add_command(parameters["uuidD"], mock_commands[1]),
+    }
+
+    def create_parameters(instruction: Instruction):
+        return parameters[instruction.uuid]
+
+    def create_command(instruction: InstructionWithParameters):
+        return commands[instruction.uuid]
+
+    for max_workers in [1, 3, 7]:
+        settings = Settings(
+            llm_text=VendorKey(vendor="textVendor", api_key="textAPIKey"),
+            llm_audio=VendorKey(vendor="audioVendor", api_key="audioAPIKey"),
+            structured_rfv=True,
+            audit_llm=True,
+            reasoning_llm=False,
+            custom_prompts=[],
+            is_tuning=False,
+            api_signing_key="theApiSigningKey",
+            max_workers=max_workers,
+            hierarchical_detection_threshold=5,
+            send_progress=False,
+            commands_policy=AccessPolicy(policy=False, items=[]),
+            staffers_policy=AccessPolicy(policy=False, items=[]),
+            trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+            cycle_transcript_overlap=37,
+        )
+        mock_chatter.identification = identification
+        mock_chatter.settings = settings
+        mock_chatter.s3_credentials = "awsS3"
+        mock_chatter.create_sdk_command_parameters.side_effect = create_parameters
+        mock_chatter.create_sdk_command_from.side_effect = create_command
+        mock_chatter.deadline.defers.side_effect = lambda instruction: False
+
+        result = tested.instructions2commands(mock_auditor, mock_chatter, instructions, past_uuids)
+        expected = [commands["uuidA"], commands["uuidD"]]
+        assert result == expected
+        assert mock_commands[0].command_uuid == "uuidA"
+
+        calls = [
+            call.instance(identification, "main", "awsS3"),
+            call.instance().output("--> computed commands: 2"),
+        ]
+        assert memory_log.mock_calls == calls
+        calls = [
+            call.send_to_user(
+                identification,
+                settings,
+                [ProgressMessage(message=f"parameters computation done ({count})", section="events:4")],
+            )
+            for count in [1, 2, 3]
+        ]
+        assert progress.mock_calls == calls
+        # the auditor is called for each item, as soon as it is handled
+        audited = mock_auditor.mock_calls
+        assert len(audited) == 5
+        for uuid in ["uuidA", "uuidB", "uuidD"]:
+            assert call.computed_parameters([parameters[uuid]]) in audited
+        for uuid in ["uuidA", "uuidD"]:
+            assert audited.index(call.computed_parameters([parameters[uuid]])) < audited.index(
+                call.computed_commands([commands[uuid]])
+            )
+        # all parameters are requested, commands only for the instructions with parameters
+        chatter_calls = mock_chatter.mock_calls
+        assert len(chatter_calls) == 11
+        for instruction in instructions:
+            assert call.deadline.defers(instruction) in chatter_calls
+            assert call.create_sdk_command_parameters(instruction) in chatter_calls
+        for uuid in ["uuidA", "uuidB", "uuidD"]:
+            assert call.create_sdk_command_from(parameters[uuid]) in chatter_calls
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.ProgressDisplay")
+@patch("hyperscribe.libraries.commander.MemoryLog")
+def test_instructions2commands__batched(memory_log, progress):
+    mock_auditor = MagicMock()
+    mock_chatter = MagicMock()
+    mock_commands = [MagicMock(), MagicMock(), MagicMock(), MagicMock()]
+
+    def reset_mocks():
+        memory_log.reset_mock()
+        progress.reset_mock()
+        mock_auditor.reset_mock()
+        mock_chatter.reset_mock()
+        for a_command in mock_commands:
+            a_command.reset_mock()
+
+    tested = Commander
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    instructions = [
+        Instruction(
+            uuid=f"uuid{letter}",
+            index=idx,
+            instruction=f"theInstruction{command}",
+            information=f"theInformation{letter}",
+            is_new=True,
+            is_updated=False,
+            previous_information="",
+        )
+        for idx, (letter, command) in enumerate(zip("ABCD", "XYXX"))
+    ]
+    parameters = {
+        instruction.uuid: InstructionWithParameters.add_parameters(instruction, {"params": instruction.uuid})
+        for instruction in instructions
+    }
+    commands = {
+        "uuidA": InstructionWithCommand.add_command(parameters["uuidA"], mock_commands[0]),
+        "uuidB": InstructionWithCommand.add_command(parameters["uuidB"], mock_commands[1]),
+        "uuidC": InstructionWithCommand.add_command(parameters["uuidC"], mock_commands[2]),
+        "uuidD": InstructionWithCommand.add_command(parameters["uuidD"], mock_commands[3]),
+    }
+
+    def create_parameters_batch(batch: list[Instruction]):
+        # <-- no parameters for C, to be computed on its own
+        return [None if instruction.uuid == "uuidC" else parameters[instruction.uuid] for instruction in batch]
+
+    def create_command(instruction: InstructionWithParameters):
+        return commands[instruction.uuid]
+
+    for max_workers in [1, 3]:
+        settings = Settings(
+            llm_text=VendorKey(vendor="textVendor", api_key="textAPIKey"),
+            llm_audio=VendorKey(vendor="audioVendor", api_key="audioAPIKey"),
+            structured_rfv=True,
+            audit_llm=True,
+            reasoning_llm=False,
+            custom_prompts=[],
+            is_tuning=False,
+            api_signing_key="theApiSigningKey",
+            max_workers=max_workers,
+            hierarchical_detection_threshold=5,
+            send_progress=False,
+            commands_policy=AccessPolicy(policy=False, items=[]),
+            staffers_policy=AccessPolicy(policy=False, items=[]),
+            trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+            cycle_transcript_overlap=37,
+        )
+        mock_chatter.identification = identification
+        mock_chatter.settings = settings
+        mock_chatter.s3_credentials = "awsS3"
+        mock_chatter.create_sdk_command_parameters.side_effect = lambda instruction: parameters[instruction.uuid]
+        mock_chatter.create_sdk_command_parameters_batch.side_effect = create_parameters_batch
+        mock_chatter.create_sdk_command_from.side_effect = create_command
+        mock_chatter.deadline.defers.side_effect = lambda instruction: False
+
+        result = tested.instructions2commands(mock_auditor, mock_chatter, instructions, {})
+        expected = [commands["uuidA"], commands["uuidB"], commands["uuidC"], commands["uuidD"]]
+        assert result == expected
+
+        calls = [
+            call.instance(identification, "main", "awsS3"),
+            call.instance().output("--> batched parameters: 3"),
+            call.instance().output("--> computed commands: 4"),
+        ]
+        assert memory_log.mock_calls == calls
+        calls = [
+            call.send_to_user(
+                identification,
+                settings,
+                [ProgressMessage(message=f"parameters computation done ({count})", section="events:4")],
+            )
+            for count in [1, 2, 3, 4]
+        ]
+        assert progress.mock_calls == calls
+        audited = mock_auditor.mock_calls
+        assert len(audited) == 8
+        for uuid in ["uuidA", "uuidB", "uuidC", "uuidD"]:
+            assert audited.index(call.computed_parameters([parameters[uuid]])) < audited.index(
+                call.computed_commands([commands[uuid]])
+            )
+        # the parameters of the instructions of the same command are computed at once,
+        # the instruction the batch could not compute is then computed on its own
+        chatter_calls = mock_chatter.mock_calls
+        assert len(chatter_calls) == 12
+        for instruction in instructions:
+            assert call.deadline.defers(instruction) in chatter_calls
+        assert chatter_calls.count(call.deadline.defers(instructions[2])) == 2
+        assert call.create_sdk_command_parameters(instructions[1]) in chatter_calls
+        assert call.create_sdk_command_parameters(instructions[2]) in chatter_calls
+        assert call.create_sdk_command_parameters_batch([instructions[0], instructions[2], instructions[3]]) in (
+            chatter_calls
+        )
+        for uuid in ["uuidA", "uuidB", "uuidC", "uuidD"]:
+            assert call.create_sdk_command_from(parameters[uuid]) in chatter_calls
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.commander.ProgressDisplay")
+@patch("hyperscribe.libraries.commander.MemoryLog")
+def test_instructions2commands__deferred(memory_log, progress):
+    mock_auditor = MagicMock()
+    mock_chatter = MagicMock()
+    mock_commands = [MagicMock(), MagicMock()]
+
+    def reset_mocks():
+        memory_log.reset_mock()
+        progress.reset_mock()
+        mock_auditor.reset_mock()
+        mock_chatter.reset_mock()
+        for a_command in mock_commands:
+            a_command.reset_mock()
+
+    tested = Commander
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    instructions = [
+        Instruction(
+            uuid=f"uuid{letter}",
+            index=idx,
+            instruction=f"theInstruction{command}",
+            information=f"theInformation{letter}",
+            is_new=letter == "C",
+            is_updated=letter != "C",
+            previous_information="",
+        )
+        for idx, (letter, command) in enumerate(zip("ABCD", "XXYZ"))
+    ]
+    past_uuids = {instructions[idx].uuid: instructions[idx] for idx in [0, 1, 3]}
+    parameters = {
+        instruction.uuid: InstructionWithParameters.add_parameters(instruction, {"params": instruction.uuid})
+        for instruction in instructions
+    }
+    commands = {
+        "uuidB": InstructionWithCommand.add_command(parameters["uuidB"], mock_commands[0]),
+        "uuidC": InstructionWithCommand.add_command(parameters["uuidC"], mock_commands[1]),
+    }
+
+    def create_parameters(instruction: Instruction):
+        return parameters[instruction.uuid]
+
+    def create_command(instruction: InstructionWithParameters):
+        return commands[instruction.uuid]
+
+    settings = Settings(
+        llm_text=VendorKey(vendor="textVendor", api_key="textAPIKey"),
+        llm_audio=VendorKey(vendor="audioVendor", api_key="audioAPIKey"),
+        structured_rfv=True,
+        audit_llm=True,
+        reasoning_llm=False,
+        custom_prompts=[],
+        is_tuning=False,
+        api_signing_key="theApiSigningKey",
+        max_workers=1,
+        hierarchical_detection_threshold=5,
+        send_progress=False,
+        commands_policy=AccessPolicy(policy=False, items=[]),
+        staffers_policy=AccessPolicy(policy=False, items=[]),
+        trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+        cycle_transcript_overlap=37,
+    )
+    mock_chatter.identification = identification
+    mock_chatter.settings = settings
+    mock_chatter.s3_credentials = "awsS3"
+    mock_chatter.create_sdk_command_parameters.side_effect = create_parameters
+    mock_chatter.create_sdk_command_from.side_effect = create_command
+    # the updates of A and D are deferred, A when its batch is submitted, D when it is started
+    mock_chatter.deadline.defers.side_effect = lambda instruction: instruction.uuid in ["uuidA", "uuidD"]
+
+    result = tested.instructions2commands(mock_auditor, mock_chatter, instructions, past_uuids)
+    expected = [commands["uuidB"], commands["uuidC"]]
+    assert result == expected
+
+    calls = [
+        call.instance(identification, "main", "awsS3"),
+        call.instance().output("--> computed commands: 2"),
+    ]
+    assert memory_log.mock_calls == calls
+    calls = [
+        call.send_to_user(
+            identification,
+            settings,
+            [ProgressMessage(message=f"parameters computation done ({count})", section="events:4")],
+        )
+        for count in [1, 2]
+    ]
+    assert progress.mock_calls == calls
+    # the auditor follows the completion order
+    calls = [
+        call.computed_parameters([parameters["uuidC"]]),
+        call.computed_parameters([parameters["uuidB"]]),
+    ]
+    assert [c for c in mock_auditor.mock_calls if c[0] == "computed_parameters"] == calls
+    calls = [
+        call.computed_commands([commands["uuidC"]]),
+        call.computed_commands([commands["uuidB"]]),
+    ]
+    assert [c for c in mock_auditor.mock_calls if c[0] == "computed_commands"] == calls
+    # the new instruction is computed first, with a single worker
+    calls = [
+        call.create_sdk_command_parameters(instructions[2]),
+        call.create_sdk_command_parameters(instructions[1]),
+    ]
+    assert [c for c in mock_chatter.mock_calls if c[0] == "create_sdk_command_parameters"] == calls
+    calls = [
+        call.create_sdk_command_from(parameters["uuidC"]),
+        call.create_sdk_command_from(parameters["uuidB"]),
+    ]
+    assert [c for c in mock_chatter.mock_calls if c[0] == "create_sdk_command_from"] == calls
+    # B is checked when its batch is submitted and when it is started
+    defers_calls = [c for c in mock_chatter.mock_calls if c[0] == "deadline.defers"]
+    assert len(defers_calls) == 5
+    for idx, count in enumerate([1, 2, 1, 1]):
+        assert defers_calls.count(call.deadline.defers(instructions[idx])) == count
+    reset_mocks()
+
+
+def test_parameters_batches():
+    tested = Commander
+    instructions = [
+        Instruction(
+            uuid=f"uuid{idx}",
+            index=idx,
+            instruction=f"theInstruction{command}",
+            information=f"theInformation{idx}",
+            is_new=True,
+            is_updated=False,
+            previous_information="",
+        )
+        for idx, command in enumerate("XYXZXXY")
+    ]
+    tests = [
+        (8, [[0, 2, 4, 5], [1, 6], [3]]),
+        (3, [[0, 2, 4], [5], [1, 6], [3]]),
+        (1, [[0], [2], [4], [5], [1], [6], [3]]),
+    ]
+    for size, expected in tests:
+        with patch.object(Constants, "MAX_INSTRUCTIONS_PER_PARAMETERS_BATCH", size):
+            result = tested.parameters_batches(instructions)
+            assert result == expected, f"---> {size}"
+    assert tested.parameters_batches([]) == []
+
+    # the new instructions before the updated ones, the cheap commands before the expensive ones
+    instructions = [
+        Instruction(
+            uuid=f"uuid{idx}",
+            index=idx,
+            instruction=command,
+            information=f"theInformation{idx}",
+            is_new=is_new,
+            is_updated=not is_new,
+            previous_information="",
+        )
+        for idx, (command, is_new) in enumerate(
+            [
+                ("Plan", False),
+                ("Diagnose", True),
+                ("Vitals", True),
+                ("Plan", True),
+                ("Diagnose", False),
+                ("Goal", False),
+            ]
+        )
+    ]
+    result = tested.parameters_batches(instructions)
+    expected = [[2], [3, 0], [1, 4], [5]]
+    assert result == expected
+
+
+def test_instruction2parameters():
+    mock_chatter = MagicMock()
+
+    def reset_mocks():
+        mock_chatter.reset_mock()
+
+    tested = Commander
+
+    instruction = Instruction(
+        uuid="uuidA",
+        index=0,
+        instruction="theInstructionA",
+        information="theInformationA",
+        is_new=False,
+        is_updated=True,
+        previous_information="",
+    )
+    parameters = InstructionWithParameters.add_parameters(instruction, {"params": "uuidA"})
+
+    # deferred
+    mock_chatter.deadline.defers.side_effect = [True]
+    result = tested.instruction2parameters(mock_chatter, instruction)
+    assert result is None
+
+    calls = [call.deadline.defers(instruction)]
+    assert mock_chatter.mock_calls == calls
+    reset_mocks()
+
+    # not deferred
+    for exp_parameters in [None, parameters]:
+        mock_chatter.deadline.defers.side_effect = [False]
+        mock_chatter.create_sdk_command_parameters.side_effect = [exp_parameters]
+        result = tested.instruction2parameters(mock_chatter, instruction)
+        assert result is exp_parameters
+
+        calls = [call.deadline.defers(instruction), call.create_sdk_command_parameters(instruction)]
+        assert mock_chatter.mock_calls == calls
+        reset_mocks()
+
+
+def test_parameters2command():
+    mock_chatter = MagicMock()
+    mock_command = MagicMock()
+
+    def reset_mocks():
+        mock_chatter.reset_mock()
+        mock_command.reset_mock()
+
+    tested = Commander
+
+    instruction = Instruction(
+        uuid="uuidA",
+        index=0,
+        instruction="theInstructionA",
+        information="theInformationA",
+        is_new=False,
+        is_updated=True,
+        previous_information="",
+    )
+    parameters = InstructionWithParameters.add_parameters(instruction, {"params": "uuidA"})
+    command = InstructionWithCommand.add_command(parameters, mock_command)
+
+    # no command
+    mock_chatter.create_sdk_command_from.side_effect = [None]
+    result = tested.parameters2command(mock_chatter, parameters, {})
+    assert result is None
+
+    calls = [call.create_sdk_command_from(parameters)]
+    assert mock_chatter.mock_calls == calls
+    reset_mocks()
+
+    # command
+    tests = [
+        ({}, "theCommandUuid"),
+        ({"uuidA": instruction}, "uuidA"),
+    ]
+    for past_uuids, exp_uuid in tests:
+        mock_command.command_uuid = "theCommandUuid"
+        mock_chatter.create_sdk_command_from.side_effect = [command]
+        result = tested.parameters2command(mock_chatter, parameters, past_uuids)
+        assert result is command
+        assert mock_command.command_uuid == exp_uuid
+
+        calls = [call.create_sdk_command_from(parameters)]
+        assert mock_chatter.mock_calls == calls
+        reset_mocks()
+
+
 @patch("hyperscribe.libraries.commander.ProgressDisplay")
 @patch("hyperscribe.libraries.commander.MemoryLog")
 @patch("hyperscribe.libraries.commander.time")
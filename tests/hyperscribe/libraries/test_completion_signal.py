@@ -0,0 +1,101 @@
+from time import sleep
+from unittest.mock import patch, call, MagicMock
+
+from canvas_sdk.utils.http import ThreadPoolExecutor
+
+from hyperscribe.libraries import completion_signal
+from hyperscribe.libraries.completion_signal import CompletionSignal
+
+
+def test___init__():
+    tested = CompletionSignal()
+    assert tested.waiter is None
+
+
+def test_watch():
+    future = MagicMock()
+    tested = CompletionSignal()
+    result = tested.watch(future)
+    assert result is future
+    calls = [call.add_done_callback(tested.notify)]
+    assert future.mock_calls == calls
+
+
+@patch("hyperscribe.libraries.completion_signal.PARKING", {})
+@patch("hyperscribe.libraries.completion_signal.parking")
+def test_arm(parking):
+    sleeping = MagicMock()
+
+    def reset_mocks():
+        parking.reset_mock()
+        sleeping.reset_mock()
+
+    tests = [
+        # no sleeping task yet
+        (None, "theSleeping"),
+        # the sleeping task is over
+        (True, "theSleeping"),
+        # the sleeping task is still running
+        (False, sleeping),
+    ]
+    for sleeping_done, exp_sleeping in tests:
+        completion_signal.PARKING.clear()
+        if sleeping_done is not None:
+            completion_signal.PARKING["sleeping"] = sleeping
+            sleeping.done.side_effect = [sleeping_done]
+        if sleeping_done is False:
+            parking.submit.side_effect = ["theWaiter"]
+        else:
+            parking.submit.side_effect = ["theSleeping", "theWaiter"]
+        tested = CompletionSignal()
+        tested.arm()
+        assert tested.waiter == "theWaiter"
+        assert completion_signal.PARKING == {"sleeping": exp_sleeping}
+        calls = [call.submit(int)]
+        if sleeping_done is not False:
+            calls.insert(0, call.submit(completion_signal.sleep, 1.0))
+        assert parking.mock_calls == calls, f"---> {sleeping_done}"
+        calls = [] if sleeping_done is None else [call.done()]
+        assert sleeping.mock_calls == calls, f"---> {sleeping_done}"
+        reset_mocks()
+
+
+def test_wait():
+    waiter = MagicMock()
+    tests = [
+        # the sleeping task is over
+        [None],
+        # cancelled by a completion
+        [RuntimeError("cancelled")],
+    ]
+    for side_effect in tests:
+        waiter.result.side_effect = side_effect
+        tested = CompletionSignal()
+        tested.waiter = waiter
+        tested.wait()
+        assert waiter.mock_calls == [call.result()]
+        waiter.reset_mock()
+
+
+def test_notify():
+    waiter = MagicMock()
+    tested = CompletionSignal()
+    # not armed
+    tested.notify("theFuture")
+    # armed
+    tested.waiter = waiter
+    tested.notify("theFuture")
+    assert waiter.mock_calls == [call.cancel()]
+
+
+@patch("hyperscribe.libraries.completion_signal.PARKING", {})
+def test_wait__woken_up():
+    tested = CompletionSignal()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tested.arm()
+        future = tested.watch(executor.submit(sleep, 0.05))
+        # the waiting thread is woken up as soon as the future is done, long before the end of the sleeping task
+        sleeping = completion_signal.PARKING["sleeping"]
+        tested.wait()
+        assert future.done()
+        assert not sleeping.done()
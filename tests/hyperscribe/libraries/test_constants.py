@@ -8,10 +8,32 @@ def test_constants():
         "ANTHROPIC_CHAT_TEXT": "claude-sonnet-4-5-20250929",
         "ANTHROPIC_REASONING_TEXT": "claude-opus-4-1-20250805",
         "AWS3_LINK_EXPIRATION_SECONDS": 1200,
+        "AWS_S3_MAX_WORKERS": 8,
         "API_SIGNED_EXPIRATION_SECONDS": 3600,
         "CYCLE_TRANSCRIPT_OVERLAP_MIN": 5,
         "CYCLE_TRANSCRIPT_OVERLAP_MAX": 250,
         "CYCLE_TRANSCRIPT_OVERLAP_DEFAULT": 100,
+        "CYCLE_DEADLINE_BUDGET_RATIO": 0.9,
+        "CYCLE_DEADLINE_DOWNGRADE_RATIO": 0.6,
+        "CYCLE_DEADLINE_DEFER_RATIO": 0.85,
+        "CYCLE_DEADLINE_INTERVAL_MAX": 3600,
+        "CYCLE_DEADLINE_EXPENSIVE_COMMANDS": [
+            "AdjustPrescription",
+            "Allergy",
+            "Diagnose",
+            "FamilyHistory",
+            "ImagingOrder",
+            "ImmunizationStatement",
+            "Instruct",
+            "LabOrder",
+            "MedicalHistory",
+            "Medication",
+            "Prescription",
+            "Refer",
+            "Refill",
+            "SurgeryHistory",
+            "UpdateDiagnose",
+        ],
         "ELEVEN_LABS_AUDIO": "scribe_v1",
         "DISCUSSION_CACHED_DURATION": 90,
         "GOOGLE_CHAT_ALL": "models/gemini-2.5-flash",
@@ -24,11 +46,53 @@ def test_constants():
         "MAX_ATTEMPTS_LLM_HTTP": 3,
         "MAX_ATTEMPTS_LLM_JSON": 3,
         "MAX_ATTEMPTS_CANVAS_SERVICES": 2,
+        "HTTP_POOL_CONNECT_TIMEOUT_SECONDS": 10,
+        "HTTP_POOL_READ_TIMEOUT_SECONDS": 300,
+        "HTTP_POOL_CANVAS_SERVICES": "CanvasServices",
+        "CANVAS_SCIENCE_LOOKUP_WORKERS": 32,
+        "HEDGING_LATENCY_PERCENTILE": 0.95,
+        "HEDGING_LATENCY_SAMPLES": 50,
+        "HEDGING_MIN_SAMPLES": 10,
+        "HEDGING_POLL_SECONDS": 0.05,
+        "HEDGING_MAX_WORKERS": 64,
+        "HEDGING_INSTRUCTION_STAGES": [
+            "instruction2parameters",
+            "instructions2parameters",
+            "parameters2command",
+            "questionnaire_update",
+        ],
+        "RATE_LIMITER_REQUESTS_PER_SECOND": 20.0,
+        "RATE_LIMITER_BURST": 40,
+        "RATE_LIMITER_WAIT_MAX_SECONDS": 1.0,
+        "RATE_LIMITER_DEFAULT_CONCURRENCY": (16, 64),
+        "RATE_LIMITER_THROTTLED_CODES": [429, 503, 529],
+        "RATE_LIMITER_DECREASE_FACTOR": 0.5,
+        "RATE_LIMITER_DECREASE_INTERVAL_SECONDS": 1.0,
+        "RATE_LIMITER_RETRY_AFTER_MAX_SECONDS": 60.0,
+        "RATE_LIMITER_BACKOFF_BASE_SECONDS": 0.5,
+        "RATE_LIMITER_BACKOFF_MAX_SECONDS": 20.0,
+        "LLM_RESPONSE_CACHE_DISK_MAX_ENTRIES": 5000,
+        "LLM_RESPONSE_CACHE_KEY_PREFIX": "llm_response:",
+        "LLM_RESPONSE_CACHE_MEMORY": "memory",
+        "LLM_RESPONSE_CACHE_MEMORY_MAX_ENTRIES": 256,
+        "LLM_RESPONSE_CACHE_PLUGIN": "plugin",
+        "LLM_RESPONSE_CACHE_TTL_SECONDS": 86400,
+        "SCHEMA_REGISTRY_MAX_VALIDATORS": 128,
+        "SCIENCE_CACHE_KEY_PREFIX": "science:",
+        "SCIENCE_CACHE_MEMORY_MAX_ENTRIES": 2000,
+        "SCIENCE_CACHE_TTL_SECONDS": 86400,
+        "SCIENCE_CACHE_NEGATIVE_TTL_SECONDS": 3600,
         "MAX_TIME_OUT_CANVAS_SERVICES": 7,
         "MAX_CHARGE_DESCRIPTIONS": 500,
         "CYCLE_DATA_MAX_ATTEMPTS": 3,
         "CYCLE_DATA_PAUSE_SECONDS": 3,
+        "CYCLE_DATA_HAND_OFF_MAX": 32,
         "STUCK_SESSION_WAITING_CYCLES_THRESHOLD": 5,
+        "COALESCING_WAITING_CYCLES_THRESHOLD": 1,
+        "COALESCING_WAITING_CYCLES_MAX": 4,
+        "MAX_INSTRUCTIONS_PER_PARAMETERS_BATCH": 8,
+        "COMPLETION_WAIT_MAX_SECONDS": 1.0,
+        "CHART_WARM_UP_MAX_WORKERS": 4,
         "MAX_WORKERS_MIN": 1,
         "MAX_WORKERS_MAX": 10,
         "MAX_WORKERS_DEFAULT": 3,
@@ -36,6 +100,14 @@ def test_constants():
         "TEXT_MODEL_REASONING": "reasoning",
         "TEXT_MODEL_CHAT": "chat",
         "MEMORY_LOG_LABEL": "main",
+        "MEMORY_LOG_MAX_LINES": 20000,
+        "MEMORY_LOG_SHIP_INTERVAL_SECONDS": 5.0,
+        "MEMORY_LOG_SHIP_BYTES": 65536,
+        "MEMORY_LOG_SHIP_WORKERS": 4,
+        "UPLOAD_QUEUE_LANES": 4,
+        "UPLOAD_QUEUE_MAX_SIZE": 500,
+        "UPLOAD_QUEUE_MAX_ATTEMPTS": 4,
+        "UPLOAD_QUEUE_BACKOFF_SECONDS": 0.5,
         "OPENAI_CHAT_AUDIO": "gpt-4o-audio-preview",
         "OPENAI_CHAT_TEXT": "gpt-4.1",
         "OPENAI_CHAT_TEXT_O3": "o3",
@@ -48,11 +120,19 @@ def test_constants():
         "VENDOR_OPENAI": "OpenAI",
         "VENDOR_NOTION_API_VERSION": "2022-06-28",
         "VENDOR_NOTION_API_BASE_URL": "https://api.notion.com/v1/pages",
+        "RATE_LIMITER_CONCURRENCY": {
+            "Anthropic": (32, 256),
+            "Google": (32, 256),
+            "OpenAI": (32, 256),
+            "CanvasServices": (16, 32),
+        },
         #
         "FAUX_NOTE_UUID": "_NoteUuid",
         "FAUX_PATIENT_UUID": "_PatientUuid",
         "FAUX_PROVIDER_UUID": "_ProviderUuid",
         "SQLITE_LAB_TESTS_DATABASE": "generic_lab_tests.db",
+        "LAB_TEST_INDEX_TTL_SECONDS": 86400,
+        "LAB_TEST_MAX_CANDIDATES": 30,
         #
         "SCHEMA_KEY_ADJUST_PRESCRIPTION": "adjustPrescription",
         "SCHEMA_KEY_ALLERGY": "allergy",
@@ -122,8 +202,10 @@ def test_constants():
         "SECRET_COMMANDS_POLICY": "CommandsPolicy",
         "SECRET_CUSTOM_PROMPTS": "CustomPrompts",
         "SECRET_CYCLE_TRANSCRIPT_OVERLAP": "CycleTranscriptOverlap",
+        "SECRET_HEDGED_MODEL_SPECS": "HedgedModelSpecs",
         "SECRET_HIERARCHICAL_DETECTION_THRESHOLD": "HierarchicalDetectionThreshold",
         "SECRET_IS_TUNING": "IsTuning",
+        "SECRET_LLM_RESPONSE_CACHE": "LlmResponseCache",
         "SECRET_MAX_WORKERS": "MaxWorkers",
         "SECRET_STAFFERS_LIST": "StaffersList",
         "SECRET_STAFFERS_POLICY": "StaffersPolicy",
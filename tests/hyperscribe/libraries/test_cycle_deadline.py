@@ -0,0 +1,255 @@
+from unittest.mock import patch, call
+
+from hyperscribe.libraries.constants import Constants
+from hyperscribe.libraries.cycle_deadline import CycleDeadline
+from hyperscribe.structures.instruction import Instruction
+from hyperscribe.structures.model_spec import ModelSpec
+
+
+def helper_instance(budget: float) -> CycleDeadline:
+    with patch("hyperscribe.libraries.cycle_deadline.time") as mock_time:
+        mock_time.side_effect = [1000.0]
+        return CycleDeadline(budget)
+
+
+def helper_instruction(uuid: str, command: str, is_new: bool, is_updated: bool) -> Instruction:
+    return Instruction(
+        uuid=uuid,
+        index=int(uuid[-1]),
+        instruction=command,
+        information=f"theInformation{uuid[-1]}",
+        is_new=is_new,
+        is_updated=is_updated,
+        previous_information=f"thePreviousInformation{uuid[-1]}",
+    )
+
+
+@patch("hyperscribe.libraries.cycle_deadline.time")
+def test___init__(time):
+    def reset_mocks():
+        time.reset_mock()
+
+    tests = [
+        (None, 1000.0, [call()]),
+        (987.5, 987.5, []),
+    ]
+    for started_at, exp_started_at, exp_calls in tests:
+        time.side_effect = [1000.0]
+        tested = CycleDeadline(20.0, started_at)
+        assert tested.budget_seconds == 20.0
+        assert tested.started_at == exp_started_at
+        assert tested.carried == []
+        assert tested.deferred == []
+        assert tested.degraded == []
+        assert time.mock_calls == exp_calls
+        reset_mocks()
+
+
+def test_priority():
+    tested = CycleDeadline
+    instructions = [
+        helper_instruction("uuid0", "Diagnose", False, True),
+        helper_instruction("uuid1", "Plan", False, True),
+        helper_instruction("uuid2", "Prescription", True, False),
+        helper_instruction("uuid3", "Vitals", True, False),
+        helper_instruction("uuid4", "Plan", True, False),
+    ]
+    result = [instruction.uuid for instruction in sorted(instructions, key=tested.priority)]
+    expected = ["uuid3", "uuid4", "uuid2", "uuid1", "uuid0"]
+    assert result == expected
+
+    result = tested.priority(instructions[0])
+    expected = (True, True, 0)
+    assert result == expected
+
+
+@patch("hyperscribe.libraries.cycle_deadline.time")
+def test_is_past(time):
+    def reset_mocks():
+        time.reset_mock()
+
+    tests = [
+        (20.0, 1011.9, False),
+        (20.0, 1012.0, True),
+        (20.0, 1030.0, True),
+        (0.0, 1030.0, False),
+    ]
+    for budget, now, expected in tests:
+        tested = helper_instance(budget)
+        time.side_effect = [now]
+        result = tested.is_past(0.6)
+        assert result is expected, f"---> {budget} {now}"
+        calls = [call()] if budget else []
+        assert time.mock_calls == calls
+        reset_mocks()
+
+
+@patch.object(CycleDeadline, "degrade")
+@patch.object(CycleDeadline, "is_past")
+def test_model_spec(is_past, degrade):
+    def reset_mocks():
+        is_past.reset_mock()
+        degrade.reset_mock()
+
+    tested = helper_instance(20.0)
+    # complex model
+    for past, expected in [(True, ModelSpec.SIMPLER), (False, ModelSpec.COMPLEX)]:
+        is_past.side_effect = [past]
+        result = tested.model_spec(ModelSpec.COMPLEX, "theTask")
+        assert result == expected
+        calls = [call(0.6)]
+        assert is_past.mock_calls == calls
+        calls = [call("theTask: simpler model instead of the complex one")] if past else []
+        assert degrade.mock_calls == calls
+        reset_mocks()
+
+    # other models
+    for model_spec in [ModelSpec.SIMPLER, ModelSpec.LISTED]:
+        is_past.side_effect = []
+        result = tested.model_spec(model_spec, "theTask")
+        assert result == model_spec
+        assert is_past.mock_calls == []
+        assert degrade.mock_calls == []
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.cycle_deadline.time")
+def test_model_spec__transcription_time(time):
+    def reset_mocks():
+        time.reset_mock()
+
+    # a 20s audio interval, the retrieval and the transcription of the cycle took 12s,
+    # the first complex LLM call of its computation comes 0.5s later
+    budget = 20 * Constants.CYCLE_DEADLINE_BUDGET_RATIO
+    tests = [
+        # the deadline runs since the cycle started: the transcription time counts
+        (1000.0, ModelSpec.SIMPLER, ["theTask: simpler model instead of the complex one (12.5s of 18.0s)"]),
+        # the deadline would run since the computation started: the transcription time is ignored
+        (1012.0, ModelSpec.COMPLEX, []),
+    ]
+    for started_at, expected, exp_degraded in tests:
+        tested = CycleDeadline(budget, started_at)
+        time.side_effect = [1012.5, 1012.5]
+        result = tested.model_spec(ModelSpec.COMPLEX, "theTask")
+        assert result == expected, f"---> {started_at}"
+        assert tested.degraded == exp_degraded, f"---> {started_at}"
+        reset_mocks()
+
+
+@patch.object(CycleDeadline, "degrade")
+@patch.object(CycleDeadline, "is_past")
+def test_defers(is_past, degrade):
+    def reset_mocks():
+        is_past.reset_mock()
+        degrade.reset_mock()
+
+    tested = helper_instance(20.0)
+    updated = helper_instruction("uuid3", "Plan", False, True)
+    new = helper_instruction("uuid4", "Plan", True, False)
+
+    # the deadline is close for an update
+    is_past.side_effect = [True]
+    result = tested.defers(updated)
+    assert result is True
+    expected = [
+        Instruction(
+            uuid="uuid3",
+            index=3,
+            instruction="Plan",
+            information="thePreviousInformation3",
+            is_new=False,
+            is_updated=False,
+            previous_information="",
+        ),
+    ]
+    assert tested.deferred == expected
+    calls = [call(0.85)]
+    assert is_past.mock_calls == calls
+    calls = [call("Plan #03: update deferred to the next cycle")]
+    assert degrade.mock_calls == calls
+    reset_mocks()
+
+    # the deadline is not close for an update
+    is_past.side_effect = [False]
+    result = tested.defers(updated)
+    assert result is False
+    assert len(tested.deferred) == 1
+    calls = [call(0.85)]
+    assert is_past.mock_calls == calls
+    assert degrade.mock_calls == []
+    reset_mocks()
+
+    # a new instruction is never deferred
+    is_past.side_effect = []
+    result = tested.defers(new)
+    assert result is False
+    assert len(tested.deferred) == 1
+    assert is_past.mock_calls == []
+    assert degrade.mock_calls == []
+    reset_mocks()
+
+
+def test_carried_over():
+    tested = helper_instance(20.0)
+    tested.carried = [
+        helper_instruction("uuid1", "Plan", False, False),  # <-- updated since, by the LLM
+        helper_instruction("uuid2", "Plan", False, False),  # <-- not staged anymore
+        helper_instruction("uuid3", "Goal", False, False),  # <-- still to update
+        helper_instruction("uuid4", "Goal", False, False),  # <-- no change since the deferral
+        helper_instruction("uuid5", "Goal", False, False),  # <-- not detected anymore
+    ]
+    for idx in range(1, 6):
+        tested.carried[idx - 1].information = f"theStagedInformation{idx}"
+    instructions = [
+        helper_instruction("uuid1", "Plan", False, True),
+        helper_instruction("uuid2", "Plan", False, False),
+        helper_instruction("uuid3", "Goal", False, False),
+        helper_instruction("uuid4", "Goal", False, False),
+        helper_instruction("uuid6", "Goal", True, False),
+    ]
+    instructions[3].information = "theStagedInformation4"
+    past_uuids = {uuid: instructions[0] for uuid in ["uuid1", "uuid3", "uuid4", "uuid5"]}
+    computed = [instructions[0], instructions[4]]
+
+    result = tested.carried_over(instructions, past_uuids, computed)
+    expected = [
+        Instruction(
+            uuid="uuid3",
+            index=3,
+            instruction="Goal",
+            information="theInformation3",
+            is_new=False,
+            is_updated=True,
+            previous_information="theStagedInformation3",
+        ),
+    ]
+    assert result == expected
+    assert result[0] is instructions[2]
+    assert tested.carried == []
+
+
+def test_pending():
+    tested = helper_instance(20.0)
+    tested.carried = [helper_instruction("uuid1", "Plan", False, False)]
+    tested.deferred = [helper_instruction("uuid2", "Goal", False, False)]
+    result = tested.pending()
+    expected = [
+        helper_instruction("uuid1", "Plan", False, False),
+        helper_instruction("uuid2", "Goal", False, False),
+    ]
+    assert result == expected
+
+
+@patch("hyperscribe.libraries.cycle_deadline.time")
+def test_degrade(time):
+    tested = helper_instance(20.0)
+    time.side_effect = [1012.345, 1019.06]
+    tested.degrade("theDecision1")
+    tested.degrade("theDecision2")
+    expected = [
+        "theDecision1 (12.3s of 20.0s)",
+        "theDecision2 (19.1s of 20.0s)",
+    ]
+    assert tested.degraded == expected
+    calls = [call(), call()]
+    assert time.mock_calls == calls
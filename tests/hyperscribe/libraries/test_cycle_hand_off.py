@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from hyperscribe.libraries import cycle_hand_off
+from hyperscribe.libraries.cycle_hand_off import CycleHandOff
+
+
+@patch("hyperscribe.libraries.cycle_hand_off.Constants.CYCLE_DATA_HAND_OFF_MAX", 3)
+@patch("hyperscribe.libraries.cycle_hand_off.HAND_OFFS", {})
+def test_put():
+    tested = CycleHandOff
+    tested.put("key1", b"content1", "audio/webm")
+    tested.put("key2", b"content2", "text/plain")
+    tested.put("key3", b"content3", "audio/webm")
+    expected = {
+        "key1": (b"content1", "audio/webm"),
+        "key2": (b"content2", "text/plain"),
+        "key3": (b"content3", "audio/webm"),
+    }
+    assert cycle_hand_off.HAND_OFFS == expected
+    # the oldest is forgotten
+    tested.put("key4", b"content4", "audio/webm")
+    expected = {
+        "key2": (b"content2", "text/plain"),
+        "key3": (b"content3", "audio/webm"),
+        "key4": (b"content4", "audio/webm"),
+    }
+    assert cycle_hand_off.HAND_OFFS == expected
+
+
+@patch("hyperscribe.libraries.cycle_hand_off.HAND_OFFS", {})
+def test_take():
+    tested = CycleHandOff
+    cycle_hand_off.HAND_OFFS["key1"] = (b"content1", "audio/webm")
+    cycle_hand_off.HAND_OFFS["key2"] = (b"content2", "text/plain")
+
+    result = tested.take("key1")
+    assert result == (b"content1", "audio/webm")
+    assert cycle_hand_off.HAND_OFFS == {"key2": (b"content2", "text/plain")}
+    # taken only once
+    result = tested.take("key1")
+    assert result is None
+    assert cycle_hand_off.HAND_OFFS == {"key2": (b"content2", "text/plain")}
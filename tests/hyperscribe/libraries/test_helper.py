@@ -6,6 +6,7 @@ import pytest
 from canvas_sdk.v1.data.note import NoteStateChangeEvent, NoteStates
 
 from hyperscribe.libraries.helper import Helper
+from hyperscribe.libraries.llm_response_cache import LlmResponseCache
 from hyperscribe.llms.llm_anthropic import LlmAnthropic
 from hyperscribe.llms.llm_eleven_labs import LlmElevenLabs
 from hyperscribe.llms.llm_google import LlmGoogle
@@ -116,7 +117,66 @@ def test_icd10_strip_dot():
         assert result == expected, f"---> {code}"
 
 
-def test_chatter():
+@patch.object(LlmResponseCache, "select")
+@patch.object(Helper, "text_chatter")
+def test_chatter(text_chatter, cache_select):
+    memory_log = MagicMock()
+    chatters = [MagicMock(hedging=None), MagicMock(hedging=None)]
+
+    def reset_mocks():
+        text_chatter.reset_mock()
+        cache_select.reset_mock()
+        memory_log.reset_mock()
+
+    tested = Helper
+    settings = Settings(
+        llm_text=VendorKey(vendor="textVendor", api_key="textKey"),
+        llm_audio=VendorKey(vendor="audioVendor", api_key="audioKey"),
+        structured_rfv=False,
+        audit_llm=False,
+        reasoning_llm=False,
+        custom_prompts=[],
+        is_tuning=False,
+        api_signing_key="theApiSigningKey",
+        max_workers=3,
+        hierarchical_detection_threshold=5,
+        send_progress=False,
+        commands_policy=AccessPolicy(policy=False, items=[]),
+        staffers_policy=AccessPolicy(policy=False, items=[]),
+        trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+        cycle_transcript_overlap=37,
+        hedged_model_specs=["complex"],
+        llm_response_cache="memory",
+    )
+
+    # not hedged
+    text_chatter.side_effect = [chatters[0]]
+    result = tested.chatter(settings, memory_log, ModelSpec.SIMPLER)
+    assert result is chatters[0]
+    assert result.hedging is None
+    calls = [call(settings, memory_log, ModelSpec.SIMPLER)]
+    assert text_chatter.mock_calls == calls
+    calls = [call("memory")]
+    assert cache_select.mock_calls == calls
+    reset_mocks()
+
+    # hedged
+    text_chatter.side_effect = [chatters[0], chatters[1]]
+    result = tested.chatter(settings, memory_log, ModelSpec.COMPLEX)
+    assert result is chatters[0]
+    calls = [call(settings, memory_log, ModelSpec.COMPLEX)]
+    assert text_chatter.mock_calls == calls
+    # -- the duplicate
+    assert result.hedging() is chatters[1]
+    calls = [call(settings, memory_log, ModelSpec.COMPLEX), call(settings, memory_log, ModelSpec.COMPLEX)]
+    assert text_chatter.mock_calls == calls
+    calls = [call("memory")]
+    assert cache_select.mock_calls == calls
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+
+def test_text_chatter():
     memory_log = MagicMock()
     tested = Helper
     tests = [
@@ -148,9 +208,9 @@ def test_chatter():
         # handle o3 alternative.
         if exp_model == "o3":
             with patch("hyperscribe.structures.settings.Settings.llm_text_model", return_value="o3"):
-                result = tested.chatter(settings, memory_log, ModelSpec.SIMPLER)
+                result = tested.text_chatter(settings, memory_log, ModelSpec.SIMPLER)
         else:
-            result = tested.chatter(settings, memory_log, ModelSpec.SIMPLER)
+            result = tested.text_chatter(settings, memory_log, ModelSpec.SIMPLER)
 
         assert memory_log.mock_calls == []
         assert isinstance(result, exp_class)
@@ -159,7 +219,8 @@ def test_chatter():
         assert result.memory_log == memory_log
 
 
-def test_audio2texter():
+@patch.object(LlmResponseCache, "select")
+def test_audio2texter(cache_select):
     memory_log = MagicMock()
     tested = Helper
     tests = [
@@ -169,6 +230,7 @@ def test_audio2texter():
     ]
     for vendor, exp_class, exp_model in tests:
         memory_log.reset_mock()
+        cache_select.reset_mock()
         result = tested.audio2texter(
             Settings(
                 llm_text=VendorKey(vendor="textVendor", api_key="textKey"),
@@ -186,10 +248,12 @@ def test_audio2texter():
                 staffers_policy=AccessPolicy(policy=False, items=[]),
                 trial_staffers_policy=AccessPolicy(policy=True, items=[]),
                 cycle_transcript_overlap=37,
+                llm_response_cache="plugin",
             ),
             memory_log,
         )
         assert memory_log.mock_calls == []
+        assert cache_select.mock_calls == [call("plugin")]
         assert isinstance(result, exp_class)
         assert result.api_key == "audioKey"
         assert result.model == exp_model
@@ -0,0 +1,146 @@
+from unittest.mock import patch, call, MagicMock
+
+import pytest
+
+from hyperscribe.libraries.http_pool import HttpPool
+
+
+@patch("hyperscribe.libraries.http_pool.SESSIONS", {})
+@patch("hyperscribe.libraries.http_pool.Session")
+def test_session(session):
+    def reset_mocks():
+        session.reset_mock()
+
+    tested = HttpPool
+
+    session.side_effect = ["theSession1", "theSession2"]
+    # first call for a vendor creates the session
+    result = tested.session("theVendor1")
+    assert result == "theSession1"
+    calls = [call()]
+    assert session.mock_calls == calls
+    reset_mocks()
+
+    # next calls for the same vendor reuse it
+    result = tested.session("theVendor1")
+    assert result == "theSession1"
+    assert session.mock_calls == []
+    reset_mocks()
+
+    # another vendor gets its own session
+    result = tested.session("theVendor2")
+    assert result == "theSession2"
+    calls = [call()]
+    assert session.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.http_pool.RateLimiter")
+@patch.object(HttpPool, "session")
+def test_send(session, rate_limiter):
+    response = MagicMock(status_code=429, headers={"retry-after": "3"})
+
+    def reset_mocks():
+        session.reset_mock()
+        rate_limiter.reset_mock()
+
+    tested = HttpPool
+
+    # response received
+    session.return_value.post.side_effect = [response]
+    rate_limiter.for_key.return_value.acquire.side_effect = ["theTicket"]
+    result = tested.send("theVendor", "theUrl", headers={"key": "value"}, data="theData")
+    assert result is response
+    calls = [
+        call("theVendor"),
+        call().post(
+            "theUrl",
+            verify=True,
+            timeout=(10, 300),
+            headers={"key": "value"},
+            data="theData",
+        ),
+    ]
+    assert session.mock_calls == calls
+    calls = [
+        call.for_key("theVendor"),
+        call.for_key().acquire(),
+        call.for_key().release("theTicket", 429, {"retry-after": "3"}),
+    ]
+    assert rate_limiter.mock_calls == calls
+    reset_mocks()
+
+    # no response
+    session.return_value.post.side_effect = [ConnectionError("dropped")]
+    rate_limiter.for_key.return_value.acquire.side_effect = ["theTicket"]
+    with pytest.raises(ConnectionError, match="dropped"):
+        tested.send("theVendor", "theUrl", data="theData")
+    calls = [call("theVendor"), call().post("theUrl", verify=True, timeout=(10, 300), data="theData")]
+    assert session.mock_calls == calls
+    calls = [
+        call.for_key("theVendor"),
+        call.for_key().acquire(),
+        call.for_key().release("theTicket", 0, {}),
+    ]
+    assert rate_limiter.mock_calls == calls
+    reset_mocks()
+
+    # streamed response, consumed and closed before the ticket is released
+    streamed = MagicMock(status_code=200, headers={"key": "value"})
+    consume = MagicMock()
+    for consumed in ["theResult", RuntimeError("interrupted")]:
+        session.return_value.post.side_effect = [streamed]
+        rate_limiter.for_key.return_value.acquire.side_effect = ["theTicket"]
+        consume.side_effect = [consumed]
+        if isinstance(consumed, Exception):
+            with pytest.raises(RuntimeError, match="interrupted"):
+                tested.send("theVendor", "theUrl", consume, data="theData", stream=True)
+        else:
+            result = tested.send("theVendor", "theUrl", consume, data="theData", stream=True)
+            assert result == "theResult"
+        calls = [
+            call("theVendor"),
+            call().post("theUrl", verify=True, timeout=(10, 300), data="theData", stream=True),
+        ]
+        assert session.mock_calls == calls
+        calls = [
+            call.for_key("theVendor"),
+            call.for_key().acquire(),
+            call.for_key().release("theTicket", 200, {"key": "value"}),
+        ]
+        assert rate_limiter.mock_calls == calls
+        assert consume.mock_calls == [call(streamed)]
+        assert streamed.mock_calls == [call.close()]
+        reset_mocks()
+        consume.reset_mock()
+        streamed.reset_mock()
+
+
+@patch.object(HttpPool, "send")
+def test_post(send):
+    def reset_mocks():
+        send.reset_mock()
+
+    tested = HttpPool
+
+    send.side_effect = ["theResponse"]
+    result = tested.post("theVendor", "theUrl", headers={"key": "value"}, data="theData")
+    assert result == "theResponse"
+    calls = [call("theVendor", "theUrl", headers={"key": "value"}, data="theData")]
+    assert send.mock_calls == calls
+    reset_mocks()
+
+
+@patch.object(HttpPool, "send")
+def test_stream(send):
+    def reset_mocks():
+        send.reset_mock()
+
+    tested = HttpPool
+
+    send.side_effect = ["theResult"]
+    result = tested.stream("theVendor", "theUrl", "theConsume", headers={"key": "value"}, data="theData")
+    assert result == "theResult"
+    calls = [call("theVendor", "theUrl", "theConsume", stream=True, headers={"key": "value"}, data="theData")]
+    assert send.mock_calls == calls
+    reset_mocks()
@@ -0,0 +1,186 @@
+from unittest.mock import MagicMock, call
+
+from hyperscribe.libraries.json_repair import JsonRepair
+from tests.helper import is_constant
+
+
+def test_constants():
+    tested = JsonRepair
+    constants = {
+        "PATTERN_FENCED": JsonRepair.PATTERN_FENCED,
+        "PATTERN_TRAILING_COMMA": JsonRepair.PATTERN_TRAILING_COMMA,
+        "PATTERN_SINGLE_QUOTED": JsonRepair.PATTERN_SINGLE_QUOTED,
+    }
+    assert is_constant(tested, constants)
+
+
+def test_blocks():
+    tested = JsonRepair
+    tests = [
+        ('text\n```json\n{"key": 1}\n```\nend', ['{"key": 1}']),
+        ('```json\n{"key": 1}\n```\n```JSON\n[1, 2]\n```', ['{"key": 1}', "[1, 2]"]),
+        # fences without the language
+        ('```\n{"key": 1}\n```', ['{"key": 1}']),
+        # last fence truncated
+        ('```json\n{"key": 1}\n```\n```json\n[1, 2', ['{"key": 1}', "[1, 2"]),
+        # no fences
+        ('the response: {"key": [1]} end', ['{"key": [1]} end']),
+        ("the response: [1, 2]", ["[1, 2]"]),
+        ("no JSON", []),
+    ]
+    for content, expected in tests:
+        result = tested.blocks(content)
+        assert result == expected, f"---> {content}"
+
+
+def test_loads():
+    tested = JsonRepair
+    tests = [
+        ('{"key": 1}', (True, {"key": 1})),
+        ('  {"key": 1}\n', (True, {"key": 1})),
+        # text after the JSON
+        ('{"key": [1, 2]} end', (True, {"key": [1, 2]})),
+        # trailing commas
+        ('{"key": [1, 2,], }', (True, {"key": [1, 2]})),
+        # single quotes
+        ("{'key': 'it\\'s', 'other': \"it's 'here' now\"}", (True, {"key": "it's", "other": "it's 'here' now"})),
+        # truncated
+        ('[{"key": 1}, {"key": 2}, {"key": "val', (True, [{"key": 1}, {"key": 2}, {"key": "val"}])),
+        ('[{"key": 1}, {"key": 2}, {"key":', (True, [{"key": 1}, {"key": 2}])),
+        ('[{"key": 1}, {"key": 2},', (True, [{"key": 1}, {"key": 2}])),
+        ('{"key": "a\\"b", "other": [1, 2', (True, {"key": 'a"b', "other": [1, 2]})),
+        # not JSON
+        ("not a JSON", (False, None)),
+        ("{not a JSON}", (False, None)),
+    ]
+    for text, expected in tests:
+        result = tested.loads(text)
+        assert result == expected, f"---> {text}"
+
+
+def test_candidates():
+    tested = JsonRepair
+    # the candidates are ordered from the less to the more intrusive changes
+    result = [candidate for candidate in tested.candidates("{'key': [1,],")]
+    expected = [
+        "{'key': [1,],",
+        "{'key': [1],",
+        '{"key": [1],',
+        "{'key': [1,]",
+        "{'key': [1]",
+        '{"key": [1]',
+        '{"key": [1]}',
+        '{"key": [1]}',
+    ]
+    assert result == expected
+
+
+def test_single_to_double_quotes():
+    tested = JsonRepair
+    tests = [
+        ("{'key': 'value'}", '{"key": "value"}'),
+        ("['a', 'b c']", '["a", "b c"]'),
+        ("{'key': 'it\\'s'}", '{"key": "it\'s"}'),
+        ('{"key": "it\'s \'here\' now"}', '{"key": "it\'s \'here\' now"}'),
+    ]
+    for text, expected in tests:
+        result = tested.single_to_double_quotes(text)
+        assert result == expected, f"---> {text}"
+
+
+def test_closings():
+    tested = JsonRepair
+    tests = [
+        ('{"key": 1}', []),
+        ('[1, {"key": "a,b', ['[1, {"key": "a,b"}]', "[1]"]),
+        (
+            '{"a": [1, 2], "b": {"c": 3, "d"',
+            ['{"a": [1, 2], "b": {"c": 3, "d"}}', '{"a": [1, 2], "b": {"c": 3}}', '{"a": [1, 2]}', '{"a": [1]}'],
+        ),
+    ]
+    for text, expected in tests:
+        result = [closed for closed in tested.closings(text)]
+        assert result == expected, f"---> {text}"
+
+
+def test_fit():
+    tested = JsonRepair
+    tests = [
+        ({"key": 1}, {"type": "object"}, {"key": 1}),
+        ([1, 2, 3], {"type": "object"}, [1, 2, 3]),
+        ([1, 2, 3], {"type": "array"}, [1, 2, 3]),
+        ([1, 2, 3], {"type": "array", "maxItems": 2}, [1, 2]),
+        ([1, 2, 3], {"type": "array", "maxItems": 4}, [1, 2, 3]),
+        ({"key": 1}, {"type": "array", "maxItems": 2}, [{"key": 1}]),
+        ("text", {"type": "array", "maxItems": 2}, "text"),
+    ]
+    for content, schema, expected in tests:
+        result = tested.fit(content, schema)
+        assert result == expected, f"---> {content}"
+
+
+def test_contents():
+    tested = JsonRepair
+    schemas = [{"type": "object"}, {"type": "array", "maxItems": 1}]
+    tests = [
+        ('```json\n{"key": 1,}\n```\n```json\n[1, 2]\n```', schemas, [{"key": 1}, [1]]),
+        ('```json\n{"key": 1}\n```\n```json\n[1, 2]\n```\n```json\n[3]\n```', schemas, [{"key": 1}, [1], [3]]),
+        ('```json\n{"key": 1}\n```\n```json\n[1, 2]\n```', [], [{"key": 1}, [1, 2]]),
+        ('```json\n{"key": 1}\n```\n```json\nnot a JSON\n```', schemas, []),
+        ("no JSON", schemas, []),
+    ]
+    for content, schemas, expected in tests:
+        result = tested.contents(content, schemas)
+        assert result == expected, f"---> {content}"
+
+
+def test_invalid_items():
+    validator = MagicMock()
+
+    def reset_mocks():
+        validator.reset_mock()
+
+    tested = JsonRepair
+    schema = {"type": "array", "minItems": 4, "items": {"type": "object"}}
+
+    # some items invalid or missing
+    validator.side_effect = ["", "theProblem", ""]
+    result = tested.invalid_items(["item1", "item2", "item3"], schema, validator)
+    expected = [(1, "theProblem"), (3, "missing item")]
+    assert result == expected
+    calls = [call("item1", {"type": "object"}), call("item2", {"type": "object"}), call("item3", {"type": "object"})]
+    assert validator.mock_calls == calls
+    reset_mocks()
+
+    # all items invalid or missing
+    validator.side_effect = ["theProblem1", "theProblem2", "theProblem3"]
+    result = tested.invalid_items(["item1", "item2", "item3"], schema, validator)
+    assert result == []
+    calls = [call("item1", {"type": "object"}), call("item2", {"type": "object"}), call("item3", {"type": "object"})]
+    assert validator.mock_calls == calls
+    reset_mocks()
+
+    # all items valid
+    validator.side_effect = ["", "", "", ""]
+    result = tested.invalid_items(["item1", "item2", "item3", "item4"], schema, validator)
+    assert result == []
+    reset_mocks()
+
+    # not an array of objects
+    for content, schema in [
+        ({"key": 1}, {"type": "array", "items": {"type": "object"}}),
+        (["item1"], {"type": "object"}),
+        (["item1"], {"type": "array", "items": [{"type": "object"}]}),
+    ]:
+        validator.side_effect = []
+        result = tested.invalid_items(content, schema, validator)
+        assert result == []
+        assert validator.mock_calls == []
+        reset_mocks()
+
+
+def test_to_markdown():
+    tested = JsonRepair
+    result = tested.to_markdown([{"key": 1}, [1, 2]])
+    expected = '```json\n{\n "key": 1\n}\n```\n```json\n[\n 1,\n 2\n]\n```'
+    assert result == expected
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock, call
+
+from hyperscribe.libraries.json_stream import JsonStream
+from tests.helper import is_constant
+
+
+def test_constants():
+    tested = JsonStream
+    constants = {"PATTERN_JSON": JsonStream.PATTERN_JSON}
+    assert is_constant(tested, constants)
+    assert tested.PATTERN_JSON.pattern == r"```json\s*\n(.*?)\n\s*```"
+
+
+def test___init__():
+    validator = MagicMock()
+    tested = JsonStream(["schema1", "schema2"], validator)
+    assert tested.schemas == ["schema1", "schema2"]
+    assert tested.validator is validator
+    assert tested.text == ""
+    assert tested.position == 0
+    assert tested.blocks == 0
+    assert tested.has_error is False
+    assert validator.mock_calls == []
+
+
+def test_server_sent_events():
+    response = MagicMock()
+
+    response.iter_lines.side_effect = [
+        [
+            b"event: message_start",
+            b'data: {"type": "start"}',
+            b"",
+            b": some comment",
+            b'data:{"type": "delta", "text": "abc"}',
+            b"data: [DONE]",
+        ],
+    ]
+    tested = JsonStream
+    result = [event for event in tested.server_sent_events(response)]
+    expected = [{"type": "start"}, {"type": "delta", "text": "abc"}]
+    assert result == expected
+    calls = [call.iter_lines()]
+    assert response.mock_calls == calls
+
+
+def test_add():
+    validator = MagicMock()
+
+    def reset_mocks():
+        validator.reset_mock()
+
+    # all blocks valid
+    validator.side_effect = ["", ""]
+    tested = JsonStream(["schema1", "schema2"], validator)
+    for text in ["some text\n```js", 'on\n{"key": "val', 'ue"}\n``', "`\nthen\n```json\n[1, 2]", "\n```\nend."]:
+        tested.add(text)
+    assert tested.text == 'some text\n```json\n{"key": "value"}\n```\nthen\n```json\n[1, 2]\n```\nend.'
+    assert tested.blocks == 2
+    assert tested.has_error is False
+    assert tested.is_done() is True
+    calls = [call({"key": "value"}, "schema1"), call([1, 2], "schema2")]
+    assert validator.mock_calls == calls
+    reset_mocks()
+
+    # first block invalid against its schema, the next blocks are still expected
+    validator.side_effect = ["some problem", ""]
+    tested = JsonStream(["schema1", "schema2"], validator)
+    tested.add('```json\n{"key": "value"}\n```\n')
+    assert tested.blocks == 1
+    assert tested.has_error is True
+    assert tested.is_done() is False
+    tested.add("```json\n[1, 2]\n```\n```json\n[3]\n```")
+    assert tested.blocks == 2
+    assert tested.has_error is True
+    assert tested.is_done() is True
+    calls = [call({"key": "value"}, "schema1"), call([1, 2], "schema2")]
+    assert validator.mock_calls == calls
+    reset_mocks()
+
+    # block not JSON
+    validator.side_effect = []
+    tested = JsonStream(["schema1"], validator)
+    tested.add("```json\n{not a json}\n```")
+    assert tested.blocks == 1
+    assert tested.has_error is True
+    assert tested.is_done() is True
+    assert validator.mock_calls == []
+    reset_mocks()
+
+    # block not complete yet
+    validator.side_effect = []
+    tested = JsonStream(["schema1"], validator)
+    tested.add('```json\n{"key": "value"}\n')
+    assert tested.blocks == 0
+    assert tested.has_error is False
+    assert tested.is_done() is False
+    assert validator.mock_calls == []
+    reset_mocks()
+
+
+def test_is_done():
+    tests = [
+        (["schema1"], 0, False, False),
+        (["schema1"], 0, True, False),
+        (["schema1"], 1, False, True),
+        (["schema1"], 1, True, True),
+        (["schema1", "schema2"], 1, False, False),
+        (["schema1", "schema2"], 1, True, False),
+        ([], 0, False, True),
+    ]
+    for schemas, blocks, has_error, expected in tests:
+        tested = JsonStream(schemas, MagicMock())
+        tested.blocks = blocks
+        tested.has_error = has_error
+        assert tested.is_done() is expected
@@ -0,0 +1,149 @@
+from unittest.mock import patch, call
+
+from canvas_sdk.v1.data.lab import LabPartnerTest
+
+from hyperscribe.libraries import lab_test_index
+from hyperscribe.libraries.lab_test_index import LabTestIndex
+from hyperscribe.structures.coded_item import CodedItem
+
+TESTS = [
+    CodedItem(uuid="", label="GLUCOSE, PLEURAL FLUID", code="code1"),
+    CodedItem(uuid="", label="BETA GLUCOSIDASE, LEUKOCYTES", code="code2"),
+    CodedItem(uuid="", label="GLUCOSE", code="code3"),
+    CodedItem(uuid="", label="HEMOGLOBIN A1C", code="code4"),
+    CodedItem(uuid="", label="WHOLE BLOOD CHOLESTEROL AND GLUCOSE", code="code5"),
+]
+KEYWORDS = [
+    "82945 GLUCOSE, PLEURAL FLUID",
+    "BETA GLUCOSIDASE, LEUKOCYTES",
+    "82947 GLUCOSE",
+    "83036 HbA1c HEMOGLOBIN A1C",
+    "WHOLE BLOOD CHOLESTEROL AND GLUCOSE",
+]
+
+
+def test___init__():
+    tested = LabTestIndex(TESTS[:2], ["GLUCOSE", "beta gluc"])
+    assert tested.tests == TESTS[:2]
+    assert tested.keywords == ["glucose", "beta gluc"]
+    expected = {
+        "glu": {0, 1},
+        "luc": {0, 1},
+        "uco": {0},
+        "cos": {0},
+        "ose": {0},
+        "bet": {1},
+        "eta": {1},
+        "ta ": {1},
+        "a g": {1},
+        " gl": {1},
+    }
+    assert tested.trigrams == expected
+
+
+def test_trigrams_of():
+    tested = LabTestIndex
+    tests = [
+        ("glucose", {"glu", "luc", "uco", "cos", "ose"}),
+        ("a1c", {"a1c"}),
+        ("aaaa", {"aaa"}),
+        ("a1", set()),
+        ("", set()),
+    ]
+    for text, expected in tests:
+        result = tested.trigrams_of(text)
+        assert result == expected, f"---> {text}"
+
+
+@patch("hyperscribe.libraries.lab_test_index.INDEXES", {})
+@patch("hyperscribe.libraries.lab_test_index.time")
+@patch.object(LabPartnerTest, "objects")
+def test_for_lab_partner(lab_test_db, time):
+    def reset_mocks():
+        lab_test_db.reset_mock()
+        time.reset_mock()
+
+    tested = LabTestIndex
+
+    records = [
+        LabPartnerTest(order_code="code1", order_name="labelA", keywords="keywordsA"),
+        LabPartnerTest(order_code="code2", order_name="labelB", keywords=None),
+    ]
+    # not built yet
+    lab_test_db.filter.return_value.order_by.side_effect = [records]
+    time.side_effect = [1000.0, 1000.0]
+    result = tested.for_lab_partner("theLabPartner")
+    assert isinstance(result, LabTestIndex)
+    assert result.tests == [
+        CodedItem(uuid="", label="labelA", code="code1"),
+        CodedItem(uuid="", label="labelB", code="code2"),
+    ]
+    assert result.keywords == ["keywordsa", ""]
+    assert lab_test_index.INDEXES == {"theLabPartner": (87400.0, result)}
+
+    calls = [call.filter(lab_partner__name="theLabPartner"), call.filter().order_by("dbid")]
+    assert lab_test_db.mock_calls == calls
+    reset_mocks()
+
+    # already built
+    time.side_effect = [87399.0]
+    assert tested.for_lab_partner("theLabPartner") is result
+    assert lab_test_db.mock_calls == []
+    reset_mocks()
+
+    # expired
+    lab_test_db.filter.return_value.order_by.side_effect = [records[:1]]
+    time.side_effect = [87400.0, 87400.0]
+    rebuilt = tested.for_lab_partner("theLabPartner")
+    assert rebuilt is not result
+    assert rebuilt.tests == [CodedItem(uuid="", label="labelA", code="code1")]
+    assert lab_test_index.INDEXES == {"theLabPartner": (173800.0, rebuilt)}
+    assert lab_test_db.mock_calls == calls
+    reset_mocks()
+
+
+def test_ranked():
+    tested = LabTestIndex
+    labels = [
+        "BETA GLUCOSIDASE, LEUKOCYTES",
+        "GLUCOSE, PLEURAL FLUID",
+        "WHOLE BLOOD CHOLESTEROL AND GLUCOSE",
+        "GLUCOSE",
+        "83036 ALL",
+    ]
+    tests = [
+        (["glucose"], [3, 1, 2, 4, 0]),
+        (["gluc"], [3, 1, 0, 2, 4]),
+        (["glucose", "fluid"], [1, 3, 2, 4, 0]),
+        (["8303"], [4, 3, 1, 0, 2]),
+        ([], [3, 4, 1, 0, 2]),
+    ]
+    for terms, expected in tests:
+        result = tested.ranked(terms, labels)
+        assert result == expected, f"---> {terms}"
+
+
+def test_search():
+    tested = LabTestIndex(TESTS, KEYWORDS)
+    tests = [
+        (["Glucose"], [TESTS[2], TESTS[0], TESTS[4]]),
+        (["gluc"], [TESTS[2], TESTS[0], TESTS[1], TESTS[4]]),
+        (["fluid", "GLUCOSE"], [TESTS[0]]),
+        # keywords shorter than a trigram
+        (["A1", "c"], [TESTS[3]]),
+        (["glu", "1c"], []),
+        (["8394"], []),
+        (["unknown"], []),
+        ([], [TESTS[2], TESTS[3], TESTS[0], TESTS[1], TESTS[4]]),
+    ]
+    for keywords, expected in tests:
+        result = tested.search(keywords)
+        assert result == expected, f"---> {keywords}"
+
+
+@patch("hyperscribe.libraries.lab_test_index.Constants.LAB_TEST_MAX_CANDIDATES", 2)
+def test_search__max_candidates():
+    tested = LabTestIndex(TESTS, KEYWORDS)
+    result = tested.search(["glucose"])
+    expected = [TESTS[2], TESTS[0]]
+    assert result == expected
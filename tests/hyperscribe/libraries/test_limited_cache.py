@@ -23,6 +23,7 @@ from canvas_sdk.v1.data import (
     Observation,
     Note,
     NoteType,
+    Patient,
     ReasonForVisitSettingCoding,
     Staff,
     StaffRole,
@@ -32,10 +33,10 @@ from canvas_sdk.v1.data import (
     Team,
 )
 from canvas_sdk.v1.data.goal import GoalLifecycleStatus
-from canvas_sdk.v1.data.lab import LabPartner, LabPartnerTest
+from canvas_sdk.v1.data.lab import LabPartner
 from django.db.models import Q
-from django.db.models.expressions import When, Value, Case
 
+from hyperscribe.libraries import limited_cache
 from hyperscribe.libraries.constants import Constants
 from hyperscribe.libraries.limited_cache import LimitedCache
 from hyperscribe.structures.charge_description import ChargeDescription
@@ -80,91 +81,226 @@ def test___init__():
     assert tested._charge_descriptions is None
     assert tested._lab_tests == {}
     assert tested._local_data is False
+    assert tested._versions == {}
+    assert tested._warm_ups == {}
+
+
+@patch("hyperscribe.libraries.limited_cache.Helper")
+def test_warm_up(helper):
+    executor = MagicMock()
+
+    def reset_mocks():
+        helper.reset_mock()
+        executor.reset_mock()
+
+    helper.with_cleanup.side_effect = lambda function: f"cleanup:{function.__name__}"
+    executor.submit.side_effect = [f"theFuture{i}" for i in range(7)]
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    # sections already retrieved (e.g. from the snapshot) are not loaded again
+    tested._goals = []
+    tested._demographic = "theDemographic"
+    tested.warm_up(executor)
+    expected = {
+        "allergies": "theFuture0",
+        "conditions": "theFuture1",
+        "immunizations": "theFuture2",
+        "medications": "theFuture3",
+        "preferredLabPartner": "theFuture4",
+    }
+    assert tested._warm_ups == expected
+    calls = [
+        call.submit("cleanup:retrieve_allergies"),
+        call.submit("cleanup:retrieve_conditions"),
+        call.submit("cleanup:retrieve_immunizations"),
+        call.submit("cleanup:retrieve_medications"),
+        call.submit("cleanup:retrieve_preferred_lab_partner"),
+    ]
+    assert executor.mock_calls == calls
+    reset_mocks()
+
+    # the loading is started once
+    tested.warm_up(executor)
+    assert tested._warm_ups == expected
+    assert executor.mock_calls == []
+    reset_mocks()
+
+    # the demographic is loaded without obfuscation
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._allergies = []
+    tested._conditions = []
+    tested._goals = []
+    tested._immunizations = []
+    tested._medications = []
+    tested._preferred_lab_partner = CodedItem(uuid="", label="", code="")
+    executor.submit.side_effect = ["theFuture"]
+    tested.warm_up(executor)
+    assert tested._warm_ups == {"demographic": "theFuture"}
+    calls = [call.submit("cleanup:retrieve_demographic", False)]
+    assert executor.mock_calls == calls
+    reset_mocks()
+
+
+def test_wait_warm_up():
+    future = MagicMock()
+
+    def reset_mocks():
+        future.reset_mock()
+
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._warm_ups = {"goals": future}
+    # section being loaded
+    tested.wait_warm_up("goals")
+    calls = [call.result()]
+    assert future.mock_calls == calls
+    reset_mocks()
+    # section not loaded in the background
+    tested.wait_warm_up("medications")
+    assert future.mock_calls == []
+    reset_mocks()
+    # the loading failed
+    future.result.side_effect = [RuntimeError("theError")]
+    try:
+        tested.wait_warm_up("goals")
+        assert False
+    except RuntimeError as e:
+        assert str(e) == "theError"
+    reset_mocks()
+
+
+@patch.object(LimitedCache, "retrieve_preferred_lab_partner")
+@patch.object(LimitedCache, "retrieve_demographic")
+@patch.object(LimitedCache, "retrieve_allergies")
+@patch.object(LimitedCache, "retrieve_immunizations")
+@patch.object(LimitedCache, "retrieve_medications")
+@patch.object(LimitedCache, "retrieve_conditions")
+@patch.object(LimitedCache, "retrieve_goals")
+@patch.object(LimitedCache, "wait_warm_up")
+def test_accessors__warm_up(
+    wait_warm_up,
+    retrieve_goals,
+    retrieve_conditions,
+    retrieve_medications,
+    retrieve_immunizations,
+    retrieve_allergies,
+    retrieve_demographic,
+    retrieve_preferred_lab_partner,
+):
+    retrieves = [
+        retrieve_goals,
+        retrieve_conditions,
+        retrieve_medications,
+        retrieve_immunizations,
+        retrieve_allergies,
+        retrieve_demographic,
+        retrieve_preferred_lab_partner,
+    ]
+
+    def reset_mocks():
+        wait_warm_up.reset_mock()
+        for retrieve in retrieves:
+            retrieve.reset_mock()
+
+    item = CodedItem(uuid="theUuid", label="theLabel", code="theCode")
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._goals = [item]
+    tested._conditions = [item]
+    tested._condition_history = [item]
+    tested._surgery_history = [item]
+    tested._medications = []
+    tested._immunizations = []
+    tested._allergies = [item]
+    tested._demographic = "theDemographic"
+    tested._preferred_lab_partner = item
+
+    tests = [
+        (tested.current_goals, [item], "goals"),
+        (tested.current_conditions, [item], "conditions"),
+        (tested.condition_history, [item], "conditions"),
+        (tested.surgery_history, [item], "conditions"),
+        (tested.current_medications, [], "medications"),
+        (tested.current_immunizations, [], "immunizations"),
+        (tested.current_allergies, [item], "allergies"),
+        (tested.preferred_lab_partner, item, "preferredLabPartner"),
+    ]
+    for accessor, expected, section in tests:
+        result = accessor()
+        assert result == expected, f"---> {section}"
+        calls = [call(section)]
+        assert wait_warm_up.mock_calls == calls
+        for retrieve in retrieves:
+            assert retrieve.mock_calls == []
+        reset_mocks()
+
+    result = tested.demographic__str__(True)
+    assert result == "theDemographic"
+    calls = [call("demographic")]
+    assert wait_warm_up.mock_calls == calls
+    for retrieve in retrieves:
+        assert retrieve.mock_calls == []
+    reset_mocks()
+
+    # not retrieved
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    assert tested.preferred_lab_partner() == CodedItem(uuid="", label="", code="")
+    assert tested.demographic__str__(True) == ""
+    calls = [call("preferredLabPartner"), call("demographic")]
+    assert wait_warm_up.mock_calls == calls
+    assert retrieve_preferred_lab_partner.mock_calls == [call()]
+    assert retrieve_demographic.mock_calls == [call(True)]
+    reset_mocks()
 
 
 @patch.object(sqlite3, "connect")
-@patch.object(LabPartnerTest, "objects")
-def test_lab_tests(lab_test_db, sqlite3_connect):
-    chatter = MagicMock()
+@patch("hyperscribe.libraries.limited_cache.LabTestIndex.for_lab_partner")
+def test_lab_tests(for_lab_partner, sqlite3_connect):
     connection = MagicMock()
 
     def reset_mocks():
-        lab_test_db.reset_mock()
+        for_lab_partner.reset_mock()
         sqlite3_connect.reset_mock()
-        chatter.reset_mock()
         connection.reset_mock()
 
-    lab_tests = [
-        LabPartnerTest(order_code="code123", order_name="labelA"),
-        LabPartnerTest(order_code="code369", order_name="labelB"),
-        LabPartnerTest(order_code="code752", order_name="labelC"),
-    ]
     expected = [
-        CodedItem(code="code123", label="labelA", uuid=""),
-        CodedItem(code="code369", label="labelB", uuid=""),
-        CodedItem(code="code752", label="labelC", uuid=""),
+        CodedItem(code="code369", label="WORD1 WORD2, word3 (test)", uuid=""),
+        CodedItem(code="code123", label="word2 panel", uuid=""),
+        CodedItem(code="code752", label="word10 and others", uuid=""),
     ]
 
     # not local
-    sqlite3_connect.return_value.__enter__.side_effect = [connection]
-    connection.cursor.return_value.fetchall.side_effect = []
     tested = LimitedCache("patientUuid", "providerUuid", {})
     tested._local_data = False
     # -- word1 word2 word3
-    lab_test_db.filter.return_value.filter.side_effect = [lab_tests]
+    for_lab_partner.return_value.search.side_effect = [expected]
     result = tested.lab_tests("theLabPartner", ["word2", "word3", "word1"])
     assert result == expected
 
-    calls = [
-        call.filter(lab_partner__name="theLabPartner"),
-        call.filter().filter(
-            Q(("keywords__icontains", "word2"), ("keywords__icontains", "word3"), ("keywords__icontains", "word1")),
-        ),
-    ]
-    assert lab_test_db.mock_calls == calls
+    calls = [call("theLabPartner"), call().search(["word2", "word3", "word1"])]
+    assert for_lab_partner.mock_calls == calls
     assert sqlite3_connect.mock_calls == []
     reset_mocks()
     # -- -- repeat with different orders
     result = tested.lab_tests("theLabPartner", ["word1", "word3", "word2"])
     assert result == expected
-    assert lab_test_db.mock_calls == []
-    assert sqlite3_connect.mock_calls == []
-    assert connection.mock_calls == []
-    reset_mocks()
-    result = tested.lab_tests("theLabPartner", ["word2", "word1", "word3"])
-    assert result == expected
-    assert lab_test_db.mock_calls == []
+    assert for_lab_partner.mock_calls == []
     assert sqlite3_connect.mock_calls == []
-    assert connection.mock_calls == []
     reset_mocks()
     # -- word1 word2
-    lab_test_db.filter.return_value.filter.side_effect = [lab_tests]
+    for_lab_partner.return_value.search.side_effect = [expected[1:]]
     result = tested.lab_tests("theLabPartner", ["word2", "word1"])
-    assert result == expected
+    assert result == expected[1:]
 
-    calls = [
-        call.filter(lab_partner__name="theLabPartner"),
-        call.filter().filter(Q(("keywords__icontains", "word2"), ("keywords__icontains", "word1"))),
-    ]
-    assert lab_test_db.mock_calls == calls
+    calls = [call("theLabPartner"), call().search(["word2", "word1"])]
+    assert for_lab_partner.mock_calls == calls
     assert sqlite3_connect.mock_calls == []
-    assert connection.mock_calls == []
-    reset_mocks()
-    # -- -- repeat with different orders
-    result = tested.lab_tests("theLabPartner", ["word1", "word2"])
-    assert result == expected
-    assert lab_test_db.mock_calls == []
-    assert sqlite3_connect.mock_calls == []
-    assert connection.mock_calls == []
     reset_mocks()
 
     # local
     sqlite3_connect.return_value.__enter__.side_effect = [connection]
     connection.cursor.return_value.fetchall.side_effect = [
         [
-            {"dbid": 456, "order_code": "code123", "order_name": "labelA"},
-            {"dbid": 458, "order_code": "code369", "order_name": "labelB"},
-            {"dbid": 486, "order_code": "code752", "order_name": "labelC"},
+            {"rowid": 456, "order_code": "code123", "order_name": "word2 panel"},
+            {"rowid": 458, "order_code": "code369", "order_name": "WORD1 WORD2, word3 (test)"},
+            {"rowid": 486, "order_code": "code752", "order_name": "word10 and others"},
         ],
     ]
     tested = LimitedCache("patientUuid", "providerUuid", {})
@@ -172,19 +308,19 @@ def test_lab_tests(lab_test_db, sqlite3_connect):
 
     result = tested.lab_tests("theLabPartner", ["word1", "word3", "word2"])
     assert result == expected
-    assert lab_test_db.mock_calls == []
+    assert for_lab_partner.mock_calls == []
     directory = Path(__file__).parent.as_posix().replace("/tests", "")
     calls = [call(Path(f"{directory}/generic_lab_tests.db")), call().__enter__(), call().__exit__(None, None, None)]
     assert sqlite3_connect.mock_calls == calls
     calls = [
         call.cursor(),
         call.cursor().execute(
-            "SELECT `dbid`, `order_code`, `order_name` "
-            "FROM `generic_lab_test` WHERE 1=1 "
+            "SELECT `rowid`, `order_code`, `order_name` "
+            "FROM `generic_lab_test_fts` WHERE 1=1 "
             " AND `keywords` LIKE :kw_00"
             " AND `keywords` LIKE :kw_01"
             " AND `keywords` LIKE :kw_02 "
-            "ORDER BY `dbid`",
+            "ORDER BY `rowid`",
             {"kw_00": "%word1%", "kw_01": "%word3%", "kw_02": "%word2%"},
         ),
         call.cursor().fetchall(),
@@ -192,13 +328,22 @@ def test_lab_tests(lab_test_db, sqlite3_connect):
     assert connection.mock_calls == calls
     reset_mocks()
     # -- -- repeat with different orders
-    result = tested.lab_tests("theLabPartner", ["word1", "word3", "word2"])
+    result = tested.lab_tests("theLabPartner", ["word2", "word3", "word1"])
     assert result == expected
-    assert lab_test_db.mock_calls == []
+    assert for_lab_partner.mock_calls == []
     assert sqlite3_connect.mock_calls == []
     assert connection.mock_calls == []
     reset_mocks()
 
+    # local, more records than the candidates
+    rows = [{"rowid": idx, "order_code": f"code{idx:03d}", "order_name": f"word1 test{idx:03d}"} for idx in range(40)]
+    sqlite3_connect.return_value.__enter__.side_effect = [connection]
+    connection.cursor.return_value.fetchall.side_effect = [rows]
+    result = tested.lab_tests("theLabPartner", ["word1"])
+    expected = [CodedItem(code=f"code{idx:03d}", label=f"word1 test{idx:03d}", uuid="") for idx in range(30)]
+    assert result == expected
+    reset_mocks()
+
 
 @patch.object(ChargeDescriptionMaster, "objects")
 def test_charge_descriptions(charge_description_db):
@@ -253,31 +398,33 @@ def test_charge_descriptions(charge_description_db):
         reset_mocks()
 
 
-@patch.object(Condition, "codings")
+@patch.object(ConditionCoding, "objects")
 @patch.object(Condition, "objects")
 def test_retrieve_conditions(condition_db, codings_db):
     def reset_mocks():
         condition_db.reset_mock()
         codings_db.reset_mock()
 
-    codings_db.filter.return_value.annotate.return_value.order_by.return_value.first.side_effect = [
-        ConditionCoding(system="ICD-10", display="display1a", code="CODE123"),
-        ConditionCoding(system="ICD-10", display="display4a", code="CODE45"),
-        ConditionCoding(system="http://snomed.info/sct", display="display2c", code="44"),
-        ConditionCoding(system="ICD-10", display="display3a", code="CODE9876"),
-        ConditionCoding(system="ICD-10", display="display5a", code="CODE8888"),
-        ConditionCoding(system="ImpossibleCase", display="ImpossibleCase", code="ImpossibleCase"),
-        None,
+    codings_db.filter.return_value.order_by.side_effect = [
+        [
+            ConditionCoding(condition_id=1, system="http://snomed.info/sct", display="display1b", code="11"),
+            ConditionCoding(condition_id=1, system="ICD-10", display="display1a", code="CODE123"),
+            ConditionCoding(condition_id=4, system="ICD-10", display="display4a", code="CODE45"),
+            ConditionCoding(condition_id=2, system="http://snomed.info/sct", display="display2c", code="44"),
+            ConditionCoding(condition_id=3, system="ICD-10", display="display3a", code="CODE9876"),
+            ConditionCoding(condition_id=5, system="ICD-10", display="display5a", code="CODE8888"),
+            ConditionCoding(condition_id=6, system="ImpossibleCase", display="ImpossibleCase", code="ImpossibleCase"),
+        ],
     ]
     condition_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
         [
-            Condition(id=uuid5(NAMESPACE_DNS, "1"), clinical_status="active"),
-            Condition(id=uuid5(NAMESPACE_DNS, "2"), clinical_status="resolved", surgical=False),
-            Condition(id=uuid5(NAMESPACE_DNS, "3"), clinical_status="resolved", surgical=True),
-            Condition(id=uuid5(NAMESPACE_DNS, "4"), clinical_status="resolved", surgical=False),
-            Condition(id=uuid5(NAMESPACE_DNS, "5"), clinical_status="active"),
-            Condition(id=uuid5(NAMESPACE_DNS, "6"), clinical_status="resolved"),
-            Condition(id=uuid5(NAMESPACE_DNS, "7"), clinical_status="active"),
+            Condition(dbid=1, id=uuid5(NAMESPACE_DNS, "1"), clinical_status="active"),
+            Condition(dbid=2, id=uuid5(NAMESPACE_DNS, "2"), clinical_status="resolved", surgical=False),
+            Condition(dbid=3, id=uuid5(NAMESPACE_DNS, "3"), clinical_status="resolved", surgical=True),
+            Condition(dbid=4, id=uuid5(NAMESPACE_DNS, "4"), clinical_status="resolved", surgical=False),
+            Condition(dbid=5, id=uuid5(NAMESPACE_DNS, "5"), clinical_status="active"),
+            Condition(dbid=6, id=uuid5(NAMESPACE_DNS, "6"), clinical_status="resolved"),
+            Condition(dbid=7, id=uuid5(NAMESPACE_DNS, "7"), clinical_status="active"),
         ],
     ]
     tested = LimitedCache("patientUuid", "providerUuid", {})
@@ -291,12 +438,14 @@ def test_retrieve_conditions(condition_db, codings_db):
     assert result == expected
     result = tested._condition_history
     expected = [
-        CodedItem(uuid="4b166dbe-d99d-5091-abdd-95b83330ed3a", label="display4a", code="CODE45"),
-        CodedItem(uuid="6ed955c6-506a-5343-9be4-2c0afae02eef", label="display3a", code="CODE98.76"),
+        CodedItem(uuid="4b166dbe-d99d-5091-abdd-95b83330ed3a", label="display2c", code="44"),
+        CodedItem(uuid="6ed955c6-506a-5343-9be4-2c0afae02eef", label="display4a", code="CODE45"),
     ]
     assert result == expected
     result = tested._surgery_history
-    expected = [CodedItem(uuid="98123fde-012f-5ff3-8b50-881449dac91a", label="display2c", code="44")]
+    expected = [
+        CodedItem(uuid="98123fde-012f-5ff3-8b50-881449dac91a", label="display3a", code="CODE98.76"),
+    ]
     assert result == expected
 
     calls = [
@@ -307,21 +456,131 @@ def test_retrieve_conditions(condition_db, codings_db):
     ]
     assert condition_db.mock_calls == calls
 
+    conditions = condition_db.committed.return_value.for_patient.return_value.filter.return_value
     calls = [
-        call.filter(system__in=[CodeSystems.ICD10, CodeSystems.SNOMED]),
-        call.filter().annotate(
-            system_order=Case(
-                When(system=CodeSystems.ICD10, then=Value(1)),
-                When(system=CodeSystems.SNOMED, then=Value(2)),
-            ),
-        ),
-        call.filter().annotate().order_by("system_order"),
-        call.filter().annotate().order_by().first(),
+        call.filter(condition__in=conditions, system__in=[CodeSystems.ICD10, CodeSystems.SNOMED]),
+        call.filter().order_by("dbid"),
     ]
-    assert codings_db.mock_calls == calls * 7
+    assert codings_db.mock_calls == calls
     reset_mocks()
 
 
+def test_codings_by_record():
+    codings = MagicMock()
+
+    def reset_mocks():
+        codings.reset_mock()
+
+    tested = LimitedCache
+    records = [
+        ConditionCoding(condition_id=3, code="code3a"),
+        ConditionCoding(condition_id=1, code="code1a"),
+        ConditionCoding(condition_id=3, code="code3b"),
+    ]
+    codings.order_by.side_effect = [records]
+    result = tested.codings_by_record(codings, "condition_id")
+    expected = {3: [records[0], records[2]], 1: [records[1]]}
+    assert result == expected
+    calls = [call.order_by("dbid")]
+    assert codings.mock_calls == calls
+    reset_mocks()
+
+    codings.order_by.side_effect = [[]]
+    result = tested.codings_by_record(codings, "condition_id")
+    assert result == {}
+    reset_mocks()
+
+
+@patch.object(ImmunizationStatementCoding, "objects")
+@patch.object(ImmunizationStatement, "objects")
+@patch.object(ImmunizationCoding, "objects")
+@patch.object(Immunization, "objects")
+@patch.object(AllergyIntoleranceCoding, "objects")
+@patch.object(AllergyIntolerance, "objects")
+@patch.object(MedicationCoding, "objects")
+@patch.object(Medication, "objects")
+@patch.object(ConditionCoding, "objects")
+@patch.object(Condition, "objects")
+def test_chart_accessors__query_count(
+    condition_db,
+    condition_coding_db,
+    medication_db,
+    medication_coding_db,
+    allergy_db,
+    allergy_coding_db,
+    immunization_db,
+    immunization_coding_db,
+    statement_db,
+    statement_coding_db,
+):
+    # the number of ORM calls does not depend on the size of the chart
+    managers = [
+        condition_db,
+        condition_coding_db,
+        medication_db,
+        medication_coding_db,
+        allergy_db,
+        allergy_coding_db,
+        immunization_db,
+        immunization_coding_db,
+        statement_db,
+        statement_coding_db,
+    ]
+
+    def reset_mocks():
+        for manager in managers:
+            manager.reset_mock()
+
+    def query_count(size: int) -> int:
+        note = Note(datetime_of_service=datetime(2025, 9, 21, 8, 53, 21, tzinfo=timezone.utc))
+        dbids = range(1, size + 1)
+        condition_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
+            [Condition(dbid=i, id=uuid5(NAMESPACE_DNS, str(i)), clinical_status="active") for i in dbids],
+        ]
+        condition_coding_db.filter.return_value.order_by.side_effect = [
+            [ConditionCoding(condition_id=i, system="ICD-10", display=f"display{i}", code=f"CODE{i}") for i in dbids],
+        ]
+        medication_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
+            [Medication(dbid=i, id=uuid5(NAMESPACE_DNS, str(i))) for i in dbids],
+        ]
+        medication_coding_db.filter.return_value.order_by.side_effect = [
+            [MedicationCoding(medication_id=i, system="OTHER", display=f"display{i}", code=f"C{i}") for i in dbids],
+        ]
+        allergy_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
+            [AllergyIntolerance(dbid=i, id=uuid5(NAMESPACE_DNS, str(i))) for i in dbids],
+        ]
+        allergy_coding_db.filter.return_value.order_by.side_effect = [
+            [AllergyIntoleranceCoding(allergy_intolerance_id=i, system="OTHER", code=f"C{i}") for i in dbids],
+        ]
+        immunizations = immunization_db.for_patient.return_value.filter.return_value.select_related.return_value
+        immunizations.order_by.side_effect = [
+            [Immunization(dbid=i, id=uuid5(NAMESPACE_DNS, str(i)), note=note) for i in dbids],
+        ]
+        immunization_coding_db.filter.return_value.order_by.side_effect = [
+            [ImmunizationCoding(immunization_id=i, code=f"C{i}") for i in dbids],
+        ]
+        statement_db.for_patient.return_value.filter.return_value.order_by.side_effect = [
+            [ImmunizationStatement(dbid=i, id=uuid5(NAMESPACE_DNS, str(i))) for i in dbids],
+        ]
+        statement_coding_db.filter.return_value.order_by.side_effect = [
+            [ImmunizationStatementCoding(immunization_statement_id=i, code=f"C{i}") for i in dbids],
+        ]
+
+        tested = LimitedCache("patientUuid", "providerUuid", {})
+        assert len(tested.current_conditions()) == size
+        assert len(tested.current_medications()) == size
+        assert len(tested.current_allergies()) == 0
+        assert len(tested.current_immunizations()) == 2 * size
+        result = sum(len(manager.mock_calls) for manager in managers)
+        reset_mocks()
+        return result
+
+    expected = query_count(1)
+    for size in [5, 50]:
+        result = query_count(size)
+        assert result == expected, f"---> {size}"
+
+
 def test_add_instructions_as_staged_commands():
     schema_key2instruction = {
         "keyA": "theInstruction0",
@@ -529,7 +788,7 @@ def test_current_conditions(retrieve_conditions):
     reset_mocks()
 
 
-@patch.object(Medication, "codings")
+@patch.object(MedicationCoding, "objects")
 @patch.object(Medication, "objects")
 def test_current_medications(medication_db, codings_db):
     def reset_mocks():
@@ -539,29 +798,26 @@ def test_current_medications(medication_db, codings_db):
     rx_norm = "http://www.nlm.nih.gov/research/umls/rxnorm"
     fdb = "http://www.fdbhealth.com/"
 
-    codings_db.all.side_effect = [
-        [
-            MedicationCoding(system=rx_norm, display="display1a", code="CODE123"),
-            MedicationCoding(system="OTHER", display="display1b", code="CODE321"),
-            MedicationCoding(system=fdb, display="display1c", code="CODE231"),
-        ],
+    codings_db.filter.return_value.order_by.side_effect = [
         [
-            MedicationCoding(system=rx_norm, display="display2a", code="CODE45"),
-            MedicationCoding(system="OTHER", display="display2b", code="CODE54"),
+            MedicationCoding(medication_id=1, system=rx_norm, display="display1a", code="CODE123"),
+            MedicationCoding(medication_id=1, system="OTHER", display="display1b", code="CODE321"),
+            MedicationCoding(medication_id=1, system=fdb, display="display1c", code="CODE231"),
+            MedicationCoding(medication_id=2, system=rx_norm, display="display2a", code="CODE45"),
+            MedicationCoding(medication_id=2, system="OTHER", display="display2b", code="CODE54"),
+            MedicationCoding(medication_id=3, system="OTHER", display="display3b", code="CODE6789"),
+            MedicationCoding(medication_id=3, system=rx_norm, display="display3a", code="CODE9876"),
+            MedicationCoding(medication_id=3, system=fdb, display="display3c", code="CODE8976"),
+            MedicationCoding(medication_id=4, system=fdb, display="display4c", code="CODE5654"),
         ],
-        [
-            MedicationCoding(system="OTHER", display="display3b", code="CODE6789"),
-            MedicationCoding(system=rx_norm, display="display3a", code="CODE9876"),
-            MedicationCoding(system=fdb, display="display3c", code="CODE8976"),
-        ],
-        [MedicationCoding(system=fdb, display="display4c", code="CODE5654")],
     ]
     medication_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
         [
-            Medication(id=uuid5(NAMESPACE_DNS, "1"), national_drug_code="ndc1", potency_unit_code="puc1"),
-            Medication(id=uuid5(NAMESPACE_DNS, "2"), national_drug_code="ndc2", potency_unit_code="puc2"),
-            Medication(id=uuid5(NAMESPACE_DNS, "3"), national_drug_code="ndc3", potency_unit_code="puc3"),
-            Medication(id=uuid5(NAMESPACE_DNS, "4"), national_drug_code="ndc4", potency_unit_code="puc4"),
+            Medication(dbid=1, id=uuid5(NAMESPACE_DNS, "1"), national_drug_code="ndc1", potency_unit_code="puc1"),
+            Medication(dbid=2, id=uuid5(NAMESPACE_DNS, "2"), national_drug_code="ndc2", potency_unit_code="puc2"),
+            Medication(dbid=3, id=uuid5(NAMESPACE_DNS, "3"), national_drug_code="ndc3", potency_unit_code="puc3"),
+            Medication(dbid=4, id=uuid5(NAMESPACE_DNS, "4"), national_drug_code="ndc4", potency_unit_code="puc4"),
+            Medication(dbid=5, id=uuid5(NAMESPACE_DNS, "5"), national_drug_code="ndc5", potency_unit_code="puc5"),
         ],
     ]
 
@@ -599,6 +855,14 @@ def test_current_medications(medication_db, codings_db):
             national_drug_code="ndc4",
             potency_unit_code="puc4",
         ),
+        MedicationCached(
+            uuid="c8691da2-158a-5ed6-8537-0e6f140801f2",
+            label="",
+            code_rx_norm="",
+            code_fdb="",
+            national_drug_code="ndc5",
+            potency_unit_code="puc5",
+        ),
     ]
     result = tested.current_medications()
     assert result == expected
@@ -610,7 +874,8 @@ def test_current_medications(medication_db, codings_db):
         call.committed().for_patient().filter().order_by("-dbid"),
     ]
     assert medication_db.mock_calls == calls
-    calls = [call.all(), call.all(), call.all(), call.all()]
+    medications = medication_db.committed.return_value.for_patient.return_value.filter.return_value
+    calls = [call.filter(medication__in=medications), call.filter().order_by("dbid")]
     assert codings_db.mock_calls == calls
     reset_mocks()
 
@@ -683,9 +948,9 @@ def test_immunization_from():
 
 
 @patch.object(LimitedCache, "immunization_from")
-@patch.object(ImmunizationStatement, "coding")
+@patch.object(ImmunizationStatementCoding, "objects")
 @patch.object(ImmunizationStatement, "objects")
-@patch.object(Immunization, "codings")
+@patch.object(ImmunizationCoding, "objects")
 @patch.object(Immunization, "objects")
 def test_current_immunizations(
     immunization_db,
@@ -713,29 +978,34 @@ def test_current_immunizations(
         date(2025, 9, 26),
     ]
 
-    immunization_codings_db.all.side_effect = [
-        "theImmunizationCodings0",
-        "theImmunizationCodings1",
-        "theImmunizationCodings2",
+    immunization_codings = [
+        ImmunizationCoding(immunization_id=1, code="code1a"),
+        ImmunizationCoding(immunization_id=3, code="code3a"),
+        ImmunizationCoding(immunization_id=1, code="code1b"),
     ]
-    immunization_statement_coding_db.all.side_effect = [
-        "theImmunizationStatementCoding0",
-        "theImmunizationStatementCoding1",
-        "theImmunizationStatementCoding2",
+    statement_codings = [
+        ImmunizationStatementCoding(immunization_statement_id=2, code="code2a"),
+        ImmunizationStatementCoding(immunization_statement_id=3, code="code3a"),
+        ImmunizationStatementCoding(immunization_statement_id=2, code="code2b"),
     ]
-    immunization_db.for_patient.return_value.filter.return_value.order_by.side_effect = [
+    immunization_codings_db.filter.return_value.order_by.side_effect = [immunization_codings]
+    immunization_statement_coding_db.filter.return_value.order_by.side_effect = [statement_codings]
+    immunization_db.for_patient.return_value.filter.return_value.select_related.return_value.order_by.side_effect = [
         [
             Immunization(
+                dbid=1,
                 id=uuid5(NAMESPACE_DNS, "1"),
                 sig_original="theSigOriginal1",
                 note=Note(datetime_of_service=date_times[0]),
             ),
             Immunization(
+                dbid=2,
                 id=uuid5(NAMESPACE_DNS, "2"),
                 sig_original="theSigOriginal2",
                 note=Note(datetime_of_service=date_times[1]),
             ),
             Immunization(
+                dbid=3,
                 id=uuid5(NAMESPACE_DNS, "3"),
                 sig_original="theSigOriginal3",
                 note=Note(datetime_of_service=date_times[2]),
@@ -745,16 +1015,19 @@ def test_current_immunizations(
     immunization_statement_db.for_patient.return_value.filter.return_value.order_by.side_effect = [
         [
             ImmunizationStatement(
+                dbid=1,
                 id=uuid5(NAMESPACE_DNS, "1"),
                 comment="theComment1",
                 date=dates[0],
             ),
             ImmunizationStatement(
+                dbid=2,
                 id=uuid5(NAMESPACE_DNS, "2"),
                 comment="theComment2",
                 date=dates[1],
             ),
             ImmunizationStatement(
+                dbid=3,
                 id=uuid5(NAMESPACE_DNS, "3"),
                 comment="theComment3",
                 date=dates[2],
@@ -779,49 +1052,58 @@ def test_current_immunizations(
     calls = [
         call.for_patient("patientUuid"),
         call.for_patient().filter(deleted=False),
-        call.for_patient().filter().order_by("-dbid"),
+        call.for_patient().filter().select_related("note"),
+        call.for_patient().filter().select_related().order_by("-dbid"),
     ]
     assert immunization_db.mock_calls == calls
+    calls = [
+        call.for_patient("patientUuid"),
+        call.for_patient().filter(deleted=False),
+        call.for_patient().filter().order_by("-dbid"),
+    ]
     assert immunization_statement_db.mock_calls == calls
-    calls = [call.all(), call.all(), call.all()]
+    immunizations = immunization_db.for_patient.return_value.filter.return_value
+    calls = [call.filter(immunization__in=immunizations), call.filter().order_by("dbid")]
     assert immunization_codings_db.mock_calls == calls
+    statements = immunization_statement_db.for_patient.return_value.filter.return_value
+    calls = [call.filter(immunization_statement__in=statements), call.filter().order_by("dbid")]
     assert immunization_statement_coding_db.mock_calls == calls
     calls = [
         call(
             "b04965e6-a9bb-591f-8f8a-1adcb2c8dc39",
             "theSigOriginal1",
             date(2025, 9, 21),
-            "theImmunizationCodings0",
+            [immunization_codings[0], immunization_codings[2]],
         ),
         call(
             "4b166dbe-d99d-5091-abdd-95b83330ed3a",
             "theSigOriginal2",
             date(2025, 9, 22),
-            "theImmunizationCodings1",
+            [],
         ),
         call(
             "98123fde-012f-5ff3-8b50-881449dac91a",
             "theSigOriginal3",
             date(2025, 9, 23),
-            "theImmunizationCodings2",
+            [immunization_codings[1]],
         ),
         call(
             "b04965e6-a9bb-591f-8f8a-1adcb2c8dc39",
             "theComment1",
             date(2025, 9, 24),
-            "theImmunizationStatementCoding0",
+            [],
         ),
         call(
             "4b166dbe-d99d-5091-abdd-95b83330ed3a",
             "theComment2",
             date(2025, 9, 25),
-            "theImmunizationStatementCoding1",
+            [statement_codings[0], statement_codings[2]],
         ),
         call(
             "98123fde-012f-5ff3-8b50-881449dac91a",
             "theComment3",
             date(2025, 9, 26),
-            "theImmunizationStatementCoding2",
+            [statement_codings[1]],
         ),
     ]
     assert immunization_from.mock_calls == calls
@@ -838,32 +1120,30 @@ def test_current_immunizations(
     reset_mocks()
 
 
-@patch.object(AllergyIntolerance, "codings")
+@patch.object(AllergyIntoleranceCoding, "objects")
 @patch.object(AllergyIntolerance, "objects")
 def test_current_allergies(allergy_db, codings_db):
     def reset_mocks():
         allergy_db.reset_mock()
         codings_db.reset_mock()
 
-    codings_db.all.side_effect = [
-        [
-            AllergyIntoleranceCoding(system="http://www.fdbhealth.com/", display="display1a", code="CODE123"),
-            AllergyIntoleranceCoding(system="OTHER", display="display1b", code="CODE321"),
-        ],
-        [
-            AllergyIntoleranceCoding(system="http://www.fdbhealth.com/", display="display2a", code="CODE45"),
-            AllergyIntoleranceCoding(system="OTHER", display="display2b", code="CODE54"),
-        ],
+    fdb = "http://www.fdbhealth.com/"
+    codings_db.filter.return_value.order_by.side_effect = [
         [
-            AllergyIntoleranceCoding(system="OTHER", display="display3b", code="CODE6789"),
-            AllergyIntoleranceCoding(system="http://www.fdbhealth.com/", display="display3a", code="CODE9876"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=1, system=fdb, display="display1a", code="CODE123"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=1, system="OTHER", display="display1b", code="CODE321"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=2, system=fdb, display="display2a", code="CODE45"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=2, system="OTHER", display="display2b", code="CODE54"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=3, system="OTHER", display="display3b", code="CODE6789"),
+            AllergyIntoleranceCoding(allergy_intolerance_id=3, system=fdb, display="display3a", code="CODE9876"),
         ],
     ]
     allergy_db.committed.return_value.for_patient.return_value.filter.return_value.order_by.side_effect = [
         [
-            AllergyIntolerance(id=uuid5(NAMESPACE_DNS, "1")),
-            AllergyIntolerance(id=uuid5(NAMESPACE_DNS, "2")),
-            AllergyIntolerance(id=uuid5(NAMESPACE_DNS, "3")),
+            AllergyIntolerance(dbid=1, id=uuid5(NAMESPACE_DNS, "1")),
+            AllergyIntolerance(dbid=2, id=uuid5(NAMESPACE_DNS, "2")),
+            AllergyIntolerance(dbid=3, id=uuid5(NAMESPACE_DNS, "3")),
+            AllergyIntolerance(dbid=4, id=uuid5(NAMESPACE_DNS, "4")),
         ],
     ]
     tested = LimitedCache("patientUuid", "providerUuid", {})
@@ -882,7 +1162,8 @@ def test_current_allergies(allergy_db, codings_db):
         call.committed().for_patient().filter().order_by("-dbid"),
     ]
     assert allergy_db.mock_calls == calls
-    calls = [call.all(), call.all(), call.all()]
+    allergies = allergy_db.committed.return_value.for_patient.return_value.filter.return_value
+    calls = [call.filter(allergy_intolerance__in=allergies), call.filter().order_by("dbid")]
     assert codings_db.mock_calls == calls
     reset_mocks()
 
@@ -1990,3 +2271,371 @@ def test_load_from_json():
     )
     assert result.practice_setting("preferredLabPartner") == "thePreferredLabPartner"
     assert result.practice_setting("serviceAreaZipCodes") == ["theServiceAreaZipCodes"]
+
+
+def test_version_of():
+    records = MagicMock()
+
+    def reset_mocks():
+        records.reset_mock()
+
+    tested = LimitedCache
+    tests = [
+        (
+            {"count": 3, "modified": datetime(2025, 12, 5, 13, 35, 46, tzinfo=timezone.utc)},
+            "3@2025-12-05T13:35:46+00:00",
+        ),
+        ({"count": 0, "modified": None}, "0@"),
+    ]
+    for aggregated, expected in tests:
+        records.aggregate.side_effect = [aggregated]
+        result = tested.version_of(records)
+        assert result == expected
+        assert len(records.mock_calls) == 1
+        _, args, kwargs = records.mock_calls[0]
+        assert args == ()
+        assert list(kwargs.keys()) == ["count", "modified"]
+        assert str(kwargs["count"]) == "Count(F(dbid))"
+        assert str(kwargs["modified"]) == "Max(F(modified))"
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.limited_cache.date")
+@patch.object(LimitedCache, "version_of")
+@patch.object(Medication, "objects")
+@patch.object(Goal, "objects")
+@patch.object(Condition, "objects")
+@patch.object(AllergyIntolerance, "objects")
+@patch.object(Observation, "objects")
+@patch.object(Patient, "objects")
+@patch.object(ImmunizationStatement, "objects")
+@patch.object(Immunization, "objects")
+def test_section_versions(
+    immunization_db,
+    statement_db,
+    patient_db,
+    observation_db,
+    allergy_db,
+    condition_db,
+    goal_db,
+    medication_db,
+    version_of,
+    mock_date,
+):
+    mocks = [
+        immunization_db,
+        statement_db,
+        patient_db,
+        observation_db,
+        allergy_db,
+        condition_db,
+        goal_db,
+        medication_db,
+    ]
+
+    def reset_mocks():
+        for item in mocks:
+            item.reset_mock()
+        version_of.reset_mock()
+        mock_date.reset_mock()
+
+    names = [
+        "immunizations",
+        "statements",
+        "patient",
+        "observations",
+        "allergies",
+        "conditions",
+        "goals",
+        "medications",
+    ]
+    for item, name in zip(mocks, names):
+        item.filter.side_effect = [name]
+    version_of.side_effect = lambda records: f"v-{records}"
+    mock_date.today.return_value = date(2025, 12, 5)
+
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    result = tested.section_versions()
+    expected = {
+        "allergies": "v-allergies",
+        "conditions": "v-conditions",
+        "demographic": "2025-12-05|v-patient|v-observations",
+        "goals": "v-goals",
+        "immunizations": "v-immunizations|v-statements",
+        "medications": "v-medications",
+    }
+    assert result == expected
+
+    of_patient = Q(patient__id="patientUuid")
+    for item in [immunization_db, statement_db, allergy_db, condition_db, goal_db, medication_db]:
+        assert item.mock_calls == [call.filter(of_patient)]
+    assert patient_db.mock_calls == [call.filter(id="patientUuid")]
+    assert observation_db.mock_calls == [call.filter(of_patient, name="weight", category="vital-signs")]
+    calls = [
+        call("allergies"),
+        call("conditions"),
+        call("patient"),
+        call("observations"),
+        call("goals"),
+        call("immunizations"),
+        call("statements"),
+        call("medications"),
+    ]
+    assert version_of.mock_calls == calls
+    reset_mocks()
+
+
+def helper_snapshot_sections() -> dict:
+    return {
+        "allergies": {
+            "version": "vA",
+            "values": {"currentAllergies": [{"uuid": "uuid1", "label": "label1", "code": "code1"}]},
+        },
+        "conditions": {
+            "version": "vC",
+            "values": {
+                "conditionHistory": [{"uuid": "uuid2", "label": "label2", "code": "code2"}],
+                "currentConditions": [{"uuid": "uuid3", "label": "label3", "code": "code3"}],
+                "surgeryHistory": [{"uuid": "uuid4", "label": "label4", "code": "code4"}],
+            },
+        },
+        "demographic": {"version": "vD", "values": {"demographicStr": "theDemographic"}},
+        "goals": {
+            "version": "vG",
+            "values": {"currentGoals": [{"uuid": "uuid5", "label": "label5", "code": "code5"}]},
+        },
+        "immunizations": {
+            "version": "vI",
+            "values": {
+                "currentImmunization": [
+                    {
+                        "uuid": "uuid6",
+                        "label": "label6",
+                        "codeCpt": "codeCpt6",
+                        "codeCvx": "codeCvx6",
+                        "comments": "theComments6",
+                        "approximateDate": "2025-07-21",
+                    },
+                ],
+            },
+        },
+        "medications": {
+            "version": "vM",
+            "values": {
+                "currentMedications": [
+                    {
+                        "uuid": "uuid7",
+                        "label": "label7",
+                        "codeRxNorm": "codeRxNorm7",
+                        "codeFdb": "codeFdb7",
+                        "nationalDrugCode": "ndc7",
+                        "potencyUnitCode": "puc7",
+                    },
+                ],
+            },
+        },
+    }
+
+
+def test_snapshot():
+    versions = {
+        "allergies": "vA",
+        "conditions": "vC",
+        "demographic": "vD",
+        "goals": "vG",
+        "immunizations": "vI",
+        "medications": "vM",
+    }
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._versions = versions
+    # nothing retrieved
+    assert tested.snapshot() == {}
+    # all retrieved
+    tested._allergies = [CodedItem(uuid="uuid1", label="label1", code="code1")]
+    tested._condition_history = [CodedItem(uuid="uuid2", label="label2", code="code2")]
+    tested._conditions = [CodedItem(uuid="uuid3", label="label3", code="code3")]
+    tested._surgery_history = [CodedItem(uuid="uuid4", label="label4", code="code4")]
+    tested._demographic = "theDemographic"
+    tested._goals = [CodedItem(uuid="uuid5", label="label5", code="code5")]
+    tested._immunizations = [
+        ImmunizationCached(
+            uuid="uuid6",
+            label="label6",
+            code_cpt="codeCpt6",
+            code_cvx="codeCvx6",
+            comments="theComments6",
+            approximate_date=date(2025, 7, 21),
+        ),
+    ]
+    tested._medications = [
+        MedicationCached(
+            uuid="uuid7",
+            label="label7",
+            code_rx_norm="codeRxNorm7",
+            code_fdb="codeFdb7",
+            national_drug_code="ndc7",
+            potency_unit_code="puc7",
+        ),
+    ]
+    # the practice sections are not part of the snapshot
+    tested._teams = [CodedItem(uuid="uuid8", label="label8", code="code8")]
+    assert tested.snapshot() == helper_snapshot_sections()
+    # sections without version
+    tested._versions = {"goals": "vG"}
+    assert tested.snapshot() == {"goals": helper_snapshot_sections()["goals"]}
+
+
+def test_restore():
+    versions = {
+        "allergies": "vA",
+        "conditions": "vC",
+        "demographic": "vD",
+        "goals": "vG",
+        "immunizations": "vI",
+        "medications": "vM",
+    }
+    # all sections up to date
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._versions = versions
+    tested.restore(helper_snapshot_sections())
+    assert tested._allergies == [CodedItem(uuid="uuid1", label="label1", code="code1")]
+    assert tested._condition_history == [CodedItem(uuid="uuid2", label="label2", code="code2")]
+    assert tested._conditions == [CodedItem(uuid="uuid3", label="label3", code="code3")]
+    assert tested._surgery_history == [CodedItem(uuid="uuid4", label="label4", code="code4")]
+    assert tested._demographic == "theDemographic"
+    assert tested._goals == [CodedItem(uuid="uuid5", label="label5", code="code5")]
+    assert tested._immunizations == [
+        ImmunizationCached(
+            uuid="uuid6",
+            label="label6",
+            code_cpt="codeCpt6",
+            code_cvx="codeCvx6",
+            comments="theComments6",
+            approximate_date=date(2025, 7, 21),
+        ),
+    ]
+    assert tested._medications == [
+        MedicationCached(
+            uuid="uuid7",
+            label="label7",
+            code_rx_norm="codeRxNorm7",
+            code_fdb="codeFdb7",
+            national_drug_code="ndc7",
+            potency_unit_code="puc7",
+        ),
+    ]
+    assert tested.patient_uuid == "patientUuid"
+    assert tested._local_data is False
+
+    # stale or unknown sections are left to be retrieved
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._versions = versions | {"conditions": "vC2", "medications": "vM2"}
+    del tested._versions["goals"]
+    tested.restore(helper_snapshot_sections())
+    assert tested._allergies == [CodedItem(uuid="uuid1", label="label1", code="code1")]
+    assert tested._condition_history is None
+    assert tested._conditions is None
+    assert tested._surgery_history is None
+    assert tested._demographic == "theDemographic"
+    assert tested._goals is None
+    assert tested._immunizations is not None
+    assert tested._medications is None
+
+    # no snapshot
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    tested._versions = versions
+    tested.restore({})
+    assert tested._allergies is None
+    assert tested._conditions is None
+    assert tested._demographic is None
+    assert tested._goals is None
+    assert tested._immunizations is None
+    assert tested._medications is None
+
+
+def test_snapshot_key():
+    tested = LimitedCache
+    result = tested.snapshot_key("noteUuid")
+    expected = "chartSnapshot:noteUuid"
+    assert result == expected
+
+
+@patch.object(LimitedCache, "restore")
+@patch.object(LimitedCache, "section_versions")
+@patch("hyperscribe.libraries.limited_cache.get_cache")
+def test_from_snapshot(get_cache, section_versions, restore):
+    the_cache = MagicMock()
+
+    def reset_mocks():
+        get_cache.reset_mock()
+        section_versions.reset_mock()
+        restore.reset_mock()
+        the_cache.reset_mock()
+
+    tested = LimitedCache
+    staged = {"keyX": [CodedItem(code="code1", label="label1", uuid="uuid1")]}
+    # with the SDK cache
+    for snapshot, exp_restored in [({"goals": "theSnapshot"}, {"goals": "theSnapshot"}), (None, {})]:
+        get_cache.side_effect = [the_cache]
+        the_cache.get.side_effect = [snapshot]
+        section_versions.side_effect = [{"goals": "vG"}]
+        result = tested.from_snapshot("noteUuid", "patientUuid", "providerUuid", staged)
+        assert isinstance(result, LimitedCache)
+        assert result.patient_uuid == "patientUuid"
+        assert result.provider_uuid == "providerUuid"
+        assert result._staged_commands == staged
+        assert result._versions == {"goals": "vG"}
+
+        assert get_cache.mock_calls == [call()]
+        assert the_cache.mock_calls == [call.get("chartSnapshot:noteUuid")]
+        assert section_versions.mock_calls == [call()]
+        assert restore.mock_calls == [call(exp_restored)]
+        reset_mocks()
+
+    # without the SDK cache
+    with patch.object(limited_cache, "SNAPSHOTS", {"chartSnapshot:noteUuid": {"goals": "theSnapshot"}}):
+        get_cache.side_effect = [RuntimeError("no cache")]
+        section_versions.side_effect = [{"goals": "vG"}]
+        result = tested.from_snapshot("noteUuid", "patientUuid", "providerUuid", staged)
+        assert result._versions == {"goals": "vG"}
+        assert get_cache.mock_calls == [call()]
+        assert restore.mock_calls == [call({"goals": "theSnapshot"})]
+        reset_mocks()
+
+
+@patch.object(LimitedCache, "snapshot")
+@patch("hyperscribe.libraries.limited_cache.get_cache")
+def test_store_snapshot(get_cache, snapshot):
+    the_cache = MagicMock()
+
+    def reset_mocks():
+        get_cache.reset_mock()
+        snapshot.reset_mock()
+        the_cache.reset_mock()
+
+    tested = LimitedCache("patientUuid", "providerUuid", {})
+    # no versions
+    tested.store_snapshot("noteUuid")
+    assert get_cache.mock_calls == []
+    assert snapshot.mock_calls == []
+    reset_mocks()
+
+    tested._versions = {"goals": "vG"}
+    # with the SDK cache
+    get_cache.side_effect = [the_cache]
+    snapshot.side_effect = [{"goals": "theSnapshot"}]
+    tested.store_snapshot("noteUuid")
+    assert get_cache.mock_calls == [call()]
+    assert snapshot.mock_calls == [call()]
+    assert the_cache.mock_calls == [call.set("chartSnapshot:noteUuid", {"goals": "theSnapshot"})]
+    reset_mocks()
+
+    # without the SDK cache
+    with patch.object(limited_cache, "SNAPSHOTS", {}):
+        get_cache.side_effect = [RuntimeError("no cache")]
+        snapshot.side_effect = [{"goals": "theSnapshot"}]
+        tested.store_snapshot("noteUuid")
+        assert limited_cache.SNAPSHOTS == {"chartSnapshot:noteUuid": {"goals": "theSnapshot"}}
+        assert get_cache.mock_calls == [call()]
+        assert snapshot.mock_calls == [call()]
+        reset_mocks()
@@ -15,6 +15,7 @@ from hyperscribe.structures.settings import Settings
 from hyperscribe.structures.vendor_key import VendorKey
 
 
+@patch("hyperscribe.libraries.llm_decisions_reviewer.UploadQueue")
 @patch("hyperscribe.libraries.llm_decisions_reviewer.ProgressDisplay")
 @patch("hyperscribe.libraries.llm_decisions_reviewer.MemoryLog")
 @patch("hyperscribe.libraries.llm_decisions_reviewer.LlmTurnsStore")
@@ -22,7 +23,7 @@ from hyperscribe.structures.vendor_key import VendorKey
 @patch("hyperscribe.libraries.llm_decisions_reviewer.AwsS3")
 @patch.object(CachedSdk, "save")
 @patch.object(CachedSdk, "get_discussion")
-def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_store, memory_log, progress):
+def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_store, memory_log, progress, upload_queue):
     def reset_mocks():
         cache_get_discussion.reset_mock()
         cache_save.reset_mock()
@@ -31,6 +32,7 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
         llm_turns_store.reset_mock()
         memory_log.reset_mock()
         progress.reset_mock()
+        upload_queue.reset_mock()
 
     identification = IdentificationParameters(
         patient_uuid="patientUuid",
@@ -212,6 +214,7 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
     assert llm_turns_store.mock_calls == []
     assert memory_log.mock_calls == []
     assert progress.mock_calls == []
+    assert upload_queue.mock_calls == []
     reset_mocks()
 
     # with audit
@@ -248,6 +251,7 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
     assert llm_turns_store.mock_calls == []
     assert memory_log.mock_calls == []
     assert progress.mock_calls == []
+    assert upload_queue.mock_calls == []
     reset_mocks()
 
     # -- S3 ready + already some audits
@@ -271,6 +275,7 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
     assert llm_turns_store.mock_calls == []
     assert memory_log.mock_calls == []
     assert progress.mock_calls == []
+    assert upload_queue.mock_calls == [call.flush("noteUuid")]
     reset_mocks()
 
     # -- S3 ready + documents
@@ -377,19 +382,19 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
         call().list_s3_objects("hyperscribe-canvasInstance/audits/noteUuid/"),
         call().upload_text_to_s3(
             "hyperscribe-canvasInstance/audits/noteUuid/final_audit_01.log",
-            json.dumps(expected_uploads[0], indent=2),
+            json.dumps(expected_uploads[0], separators=(",", ":")),
         ),
         call().upload_text_to_s3(
             "hyperscribe-canvasInstance/audits/noteUuid/final_audit_02.log",
-            json.dumps(expected_uploads[1], indent=2),
+            json.dumps(expected_uploads[1], separators=(",", ":")),
         ),
         call().upload_text_to_s3(
             "hyperscribe-canvasInstance/audits/noteUuid/final_audit_03.log",
-            json.dumps(expected_uploads[2], indent=2),
+            json.dumps(expected_uploads[2], separators=(",", ":")),
         ),
         call().upload_text_to_s3(
             "hyperscribe-canvasInstance/audits/noteUuid/final_audit_04.log",
-            json.dumps(expected_uploads[3], indent=2),
+            json.dumps(expected_uploads[3], separators=(",", ":")),
         ),
     ]
     assert aws_s3.mock_calls == calls
@@ -501,4 +506,5 @@ def test_review(cache_get_discussion, cache_save, aws_s3, helper, llm_turns_stor
         call.send_to_user(identification, settings, [ProgressMessage(message="audits done", section="events:4")]),
     ]
     assert progress.mock_calls == calls
+    assert upload_queue.mock_calls == [call.flush("noteUuid")]
     reset_mocks()
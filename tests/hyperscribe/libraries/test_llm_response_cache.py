@@ -0,0 +1,197 @@
+from unittest.mock import patch, call, MagicMock
+
+import pytest
+
+import hyperscribe.libraries.llm_response_cache as llm_response_cache
+from hyperscribe.libraries.llm_response_cache import (
+    LlmResponseCache,
+    LlmResponseCacheMemory,
+    LlmResponseCachePlugin,
+)
+from hyperscribe.structures.http_response import HttpResponse
+from hyperscribe.structures.llm_turn import LlmTurn
+from hyperscribe.structures.token_counts import TokenCounts
+
+
+@patch.object(llm_response_cache, "BACKEND", {})
+def test_use():
+    tested = LlmResponseCache
+    backend = LlmResponseCache()
+
+    tested.use(backend)
+    assert llm_response_cache.BACKEND == {"current": backend}
+    tested.use(None)
+    assert llm_response_cache.BACKEND == {}
+
+
+@patch.object(llm_response_cache, "BACKEND", {})
+def test_select():
+    tested = LlmResponseCache
+
+    # no backend named
+    tested.select("")
+    assert llm_response_cache.BACKEND == {}
+    backend = LlmResponseCache()
+    llm_response_cache.BACKEND["current"] = backend
+    tested.select("")
+    assert llm_response_cache.BACKEND == {"current": backend}
+    tested.select("unknown")
+    assert llm_response_cache.BACKEND == {"current": backend}
+
+    # memory
+    tested.select("memory")
+    memory = llm_response_cache.BACKEND["current"]
+    assert isinstance(memory, LlmResponseCacheMemory)
+    assert memory.max_entries == 256
+    # -- kept across the notes
+    tested.select("memory")
+    assert llm_response_cache.BACKEND == {"current": memory}
+
+    # plugin
+    tested.select("plugin")
+    plugin = llm_response_cache.BACKEND["current"]
+    assert isinstance(plugin, LlmResponseCachePlugin)
+    assert plugin.ttl_seconds == 86400
+    tested.select("plugin")
+    assert llm_response_cache.BACKEND == {"current": plugin}
+
+
+@patch.object(llm_response_cache, "BACKEND", {})
+def test_current():
+    tested = LlmResponseCache
+    backend = LlmResponseCache()
+
+    assert tested.current() is None
+    llm_response_cache.BACKEND["current"] = backend
+    assert tested.current() is backend
+
+
+def test_key():
+    tested = LlmResponseCache
+    prompts = [
+        LlmTurn(role="system", text=["theSystemPrompt"]),
+        LlmTurn(role="user", text=["theUserPrompt"]),
+    ]
+    audios = [
+        {"format": "mp3", "data": b"theAudio1"},
+        {"format": "mp3", "data": "theAudio2"},
+    ]
+    schemas = [{"type": "array"}]
+
+    result = tested.key("theVendor", "theModel", 0.0, prompts, audios, schemas)
+    assert len(result) == 64
+    # deterministic
+    assert tested.key("theVendor", "theModel", 0.0, prompts, audios, schemas) == result
+    # any difference leads to another key
+    tests = [
+        ("otherVendor", "theModel", 0.0, prompts, audios, schemas),
+        ("theVendor", "otherModel", 0.0, prompts, audios, schemas),
+        ("theVendor", "theModel", 1.0, prompts, audios, schemas),
+        ("theVendor", "theModel", 0.0, prompts[:1], audios, schemas),
+        ("theVendor", "theModel", 0.0, prompts, [{"format": "mp3", "data": b"theAudio3"}], schemas),
+        ("theVendor", "theModel", 0.0, prompts, [{"format": "wav", "data": b"theAudio1"}], schemas),
+        ("theVendor", "theModel", 0.0, prompts, audios, [{"type": "object"}]),
+    ]
+    for parameters in tests:
+        assert tested.key(*parameters) != result
+
+
+def test_to_json():
+    tested = LlmResponseCache
+    result = tested.to_json(
+        HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=178, generated=37)),
+    )
+    expected = {"code": 200, "response": "theResponse"}
+    assert result == expected
+
+
+def test_from_json():
+    tested = LlmResponseCache
+    result = tested.from_json({"code": 200, "response": "theResponse"})
+    expected = HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+
+
+def test_get():
+    tested = LlmResponseCache()
+    with pytest.raises(NotImplementedError):
+        _ = tested.get("theKey")
+
+
+def test_set():
+    tested = LlmResponseCache()
+    response = HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+    with pytest.raises(NotImplementedError):
+        tested.set("theKey", response)
+
+
+def test_memory():
+    tested = LlmResponseCacheMemory(2)
+    responses = [
+        HttpResponse(code=200, response=f"theResponse{idx}", tokens=TokenCounts(prompt=idx, generated=idx))
+        for idx in range(4)
+    ]
+    assert tested.get("key1") is None
+
+    tested.set("key1", responses[1])
+    tested.set("key2", responses[2])
+    result = tested.get("key1")
+    expected = HttpResponse(code=200, response="theResponse1", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+
+    # the least recently used is evicted
+    tested.set("key3", responses[3])
+    assert list(tested.entries.keys()) == ["key1", "key3"]
+    assert tested.get("key2") is None
+
+    # an existing key is replaced
+    tested.set("key1", responses[0])
+    assert list(tested.entries.keys()) == ["key3", "key1"]
+    result = tested.get("key1")
+    expected = HttpResponse(code=200, response="theResponse0", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+
+
+@patch("hyperscribe.libraries.llm_response_cache.get_cache")
+def test_plugin(get_cache):
+    mock_cache = MagicMock()
+
+    def reset_mocks():
+        get_cache.reset_mock()
+        mock_cache.reset_mock()
+
+    tested = LlmResponseCachePlugin(3600)
+
+    # get -- miss
+    get_cache.side_effect = [mock_cache]
+    mock_cache.get.side_effect = [None]
+    assert tested.get("theKey") is None
+    calls = [call()]
+    assert get_cache.mock_calls == calls
+    calls = [call.get("llm_response:theKey")]
+    assert mock_cache.mock_calls == calls
+    reset_mocks()
+
+    # get -- hit
+    get_cache.side_effect = [mock_cache]
+    mock_cache.get.side_effect = [{"code": 200, "response": "theResponse"}]
+    result = tested.get("theKey")
+    expected = HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+    calls = [call()]
+    assert get_cache.mock_calls == calls
+    calls = [call.get("llm_response:theKey")]
+    assert mock_cache.mock_calls == calls
+    reset_mocks()
+
+    # set
+    get_cache.side_effect = [mock_cache]
+    tested.set(
+        "theKey",
+        HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=178, generated=37)),
+    )
+    calls = [call()]
+    assert get_cache.mock_calls == calls
+    calls = [call.set("llm_response:theKey", {"code": 200, "response": "theResponse"}, timeout_seconds=3600)]
+    assert mock_cache.mock_calls == calls
+    reset_mocks()
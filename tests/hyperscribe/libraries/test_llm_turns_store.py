@@ -78,6 +78,17 @@ def test_instance(get_discussion):
     assert get_discussion.mock_calls == calls
     reset_mocks()
 
+    # explicit cycle
+    get_discussion.side_effect = [cached]
+    result = tested.instance(s3_credentials, identification, 5)
+    assert isinstance(result, LlmTurnsStore)
+    assert result.creation_day == "2025-05-07"
+    assert result.cycle == 5
+
+    calls = [call("noteUuid")]
+    assert get_discussion.mock_calls == calls
+    reset_mocks()
+
 
 def test___init__():
     identification = IdentificationParameters(
@@ -183,10 +194,12 @@ def test_store(store_document):
         reset_mocks()
 
 
+@patch("hyperscribe.libraries.llm_turns_store.UploadQueue")
 @patch("hyperscribe.libraries.llm_turns_store.AwsS3")
-def test_store_document(aws_s3):
+def test_store_document(aws_s3, upload_queue):
     def reset_mocks():
         aws_s3.reset_mock()
+        upload_queue.reset_mock()
 
     document = [
         {"role": "system", "text": ["line 1"]},
@@ -200,24 +213,25 @@ def test_store_document(aws_s3):
     tested.store_document("theInstruction", document)
     calls = [call(tested.s3_credentials), call().is_ready()]
     assert aws_s3.mock_calls == calls
+    assert upload_queue.mock_calls == []
     reset_mocks()
 
     # S3 is ready
     aws_s3.return_value.is_ready.side_effect = [True]
     tested.store_document("theInstruction", document)
+    calls = [call(tested.s3_credentials), call().is_ready()]
+    assert aws_s3.mock_calls == calls
     calls = [
-        call(tested.s3_credentials),
-        call().is_ready(),
-        call().upload_text_to_s3(
+        call.enqueue(
+            "noteUuid",
+            tested.s3_credentials,
             "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction",
-            "[\n"
-            '  {\n    "role": "system",\n    "text": [\n      "line 1"\n    ]\n  },\n'
-            '  {\n    "role": "user",\n    "text": [\n      "line 2"\n    ]\n  },\n'
-            '  {\n    "role": "model",\n    "text": [\n      "line 3"\n    ]\n  }'
-            "\n]",
+            '[{"role":"system","text":["line 1"]},'
+            '{"role":"user","text":["line 2"]},'
+            '{"role":"model","text":["line 3"]}]',
         ),
     ]
-    assert aws_s3.mock_calls == calls
+    assert upload_queue.mock_calls == calls
     reset_mocks()
 
 
@@ -285,7 +299,7 @@ def test_stored_documents(aws_s3):
     # S3 not ready
     aws_s3.return_value.is_ready.side_effect = [False]
     aws_s3.return_value.list_s3_objects.side_effect = []
-    aws_s3.return_value.access_s3_object.side_effect = []
+    aws_s3.return_value.get_many.side_effect = []
     result = [d for d in tested.stored_documents()]
     assert result == []
     calls = [call(tested.s3_credentials), call().is_ready()]
@@ -295,13 +309,14 @@ def test_stored_documents(aws_s3):
     # -- no document
     aws_s3.return_value.is_ready.side_effect = [True]
     aws_s3.return_value.list_s3_objects.side_effect = [[]]
-    aws_s3.return_value.access_s3_object.side_effect = []
+    aws_s3.return_value.get_many.side_effect = [[]]
     result = [d for d in tested.stored_documents()]
     assert result == []
     calls = [
         call(tested.s3_credentials),
         call().is_ready(),
         call().list_s3_objects("hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007"),
+        call().get_many([]),
     ]
     assert aws_s3.mock_calls == calls
     reset_mocks()
@@ -341,7 +356,7 @@ def test_stored_documents(aws_s3):
     responses[3].status_code = 200
     responses[3]._content = json.dumps({"key": "document3"}).encode()
 
-    aws_s3.return_value.access_s3_object.side_effect = responses
+    aws_s3.return_value.get_many.side_effect = [responses]
     result = [d for d in tested.stored_documents()]
     expected = [
         ("transcript2instructions_01", {"key": "document0"}),
@@ -353,17 +368,13 @@ def test_stored_documents(aws_s3):
         call(tested.s3_credentials),
         call().is_ready(),
         call().list_s3_objects("hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007"),
-        call().access_s3_object(
-            "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/transcript2instructions_01.json",
-        ),
-        call().access_s3_object(
-            "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_00_01.json",
-        ),
-        call().access_s3_object(
-            "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_01_00.json",
-        ),
-        call().access_s3_object(
-            "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_01_01.json",
+        call().get_many(
+            [
+                "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/transcript2instructions_01.json",
+                "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_00_01.json",
+                "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_01_00.json",
+                "hyperscribe-canvasInstance/llm_turns/2025-05-08/noteUuid/007/theInstruction_01_01.json",
+            ]
         ),
     ]
     assert aws_s3.mock_calls == calls
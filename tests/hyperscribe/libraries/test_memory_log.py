@@ -1,9 +1,11 @@
+from collections import Counter
 from datetime import datetime, timezone
-from unittest.mock import patch, call
+from unittest.mock import patch, call, MagicMock
 
 import hyperscribe.libraries.memory_log as memory_log
 from hyperscribe.libraries.cached_sdk import CachedSdk
 from hyperscribe.libraries.memory_log import MemoryLog
+from hyperscribe.libraries.tracer import Tracer
 from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
 from hyperscribe.structures.identification_parameters import IdentificationParameters
 from hyperscribe.structures.token_counts import TokenCounts
@@ -70,6 +72,240 @@ def test_end_session():
             #
             assert memory_log.ENTRIES == {}
 
+            # no consumption recorded
+            memory_log.ENTRIES = {"noteUuid_5": {"label1": ["m", "n"]}}
+            memory_log.PROMPTS = {}
+            result = tested.end_session("noteUuid_5")
+            expected = "TOTAL Tokens: 0 / 0\n\n\n\nm\nn"
+            assert result == expected
+            assert memory_log.ENTRIES == {}
+
+            # with the LLM response cache
+            with patch.object(memory_log, "CACHE_LOOKUPS", {}):
+                memory_log.ENTRIES = {"noteUuid_6": {"label1": ["m", "n"]}}
+                memory_log.PROMPTS = {"noteUuid_6": TokenCounts(prompt=126, generated=86)}
+                memory_log.CACHE_LOOKUPS = {
+                    "noteUuid_6": Counter({"hits": 3, "misses": 5}),
+                    "noteUuid_7": Counter({"hits": 1}),
+                }
+                result = tested.end_session("noteUuid_6")
+                expected = "LLM cache: 3 hits / 5 misses\n\n\n\nTOTAL Tokens: 126 / 86\n\n\n\nm\nn"
+                assert result == expected
+                assert memory_log.ENTRIES == {}
+                assert memory_log.CACHE_LOOKUPS == {"noteUuid_7": Counter({"hits": 1})}
+
+            # with the JSON outcomes
+            with patch.object(memory_log, "JSON_OUTCOMES", {}):
+                memory_log.ENTRIES = {"noteUuid_8": {"label1": ["m", "n"]}}
+                memory_log.PROMPTS = {"noteUuid_8": TokenCounts(prompt=128, generated=88)}
+                memory_log.JSON_OUTCOMES = {
+                    "noteUuid_8": Counter({"valid": 7, "repaired": 2, "retried": 1}),
+                    "noteUuid_9": Counter({"valid": 1}),
+                }
+                result = tested.end_session("noteUuid_8")
+                expected = (
+                    "LLM JSON: 7 valid / 2 repaired / 0 re-asked / 1 retried\n\n\n\nTOTAL Tokens: 128 / 88\n\n\n\nm\nn"
+                )
+                assert result == expected
+                assert memory_log.ENTRIES == {}
+                assert memory_log.JSON_OUTCOMES == {"noteUuid_9": Counter({"valid": 1})}
+
+            # with dropped lines
+            with patch.object(memory_log, "LINES", {}), patch.object(memory_log, "DROPPED", {}):
+                memory_log.ENTRIES = {"noteUuid_10": {"label1": ["m", "n"]}}
+                memory_log.PROMPTS = {"noteUuid_10": TokenCounts(prompt=130, generated=90)}
+                memory_log.LINES = {"noteUuid_10": 20000, "noteUuid_11": 3}
+                memory_log.DROPPED = {"noteUuid_10": 17, "noteUuid_11": 2}
+                result = tested.end_session("noteUuid_10")
+                expected = "Log lines dropped: 17\n\n\n\nTOTAL Tokens: 130 / 90\n\n\n\nm\nn"
+                assert result == expected
+                assert memory_log.ENTRIES == {}
+                assert memory_log.LINES == {"noteUuid_11": 3}
+                assert memory_log.DROPPED == {"noteUuid_11": 2}
+
+            # the counters of a note without logs are cleared
+            with (
+                patch.object(memory_log, "CACHE_LOOKUPS", {}),
+                patch.object(memory_log, "JSON_OUTCOMES", {}),
+            ):
+                memory_log.ENTRIES = {}
+                memory_log.CACHE_LOOKUPS = {"noteUuid_14": Counter({"hits": 1}), "noteUuid_15": Counter({"hits": 2})}
+                memory_log.JSON_OUTCOMES = {"noteUuid_14": Counter({"valid": 1}), "noteUuid_15": Counter({"valid": 2})}
+                result = tested.end_session("noteUuid_14")
+                assert result == ""
+                assert memory_log.CACHE_LOOKUPS == {"noteUuid_15": Counter({"hits": 2})}
+                assert memory_log.JSON_OUTCOMES == {"noteUuid_15": Counter({"valid": 2})}
+
+            # the partial logs are flushed in the background
+            credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theB")
+            with (
+                patch.object(memory_log, "shipper") as shipper,
+                patch.object(memory_log, "PENDING", {}),
+                patch.object(memory_log, "SHIPPED", {}),
+                patch.object(memory_log, "UPLOADS", {}),
+            ):
+                memory_log.ENTRIES = {"noteUuid_12": {"label1": ["m", "n"]}}
+                memory_log.PROMPTS = {}
+                memory_log.PENDING = {
+                    "noteUuid_12": {"thePath1": (credentials, "theContent1")},
+                    "noteUuid_16": {"thePath2": (credentials, "theContent2")},
+                }
+                memory_log.SHIPPED = {"noteUuid_12": {"thePath1": (1000.0, 11)}, "noteUuid_16": {}}
+                memory_log.UPLOADS = {"noteUuid_12": ["upload1", "upload2"], "noteUuid_16": ["upload3"]}
+                result = tested.end_session("noteUuid_12")
+                expected = "TOTAL Tokens: 0 / 0\n\n\n\nm\nn"
+                assert result == expected
+                assert memory_log.PENDING == {"noteUuid_16": {"thePath2": (credentials, "theContent2")}}
+                assert memory_log.SHIPPED == {"noteUuid_16": {}}
+                assert memory_log.UPLOADS == {"noteUuid_16": ["upload3"]}
+                calls = [
+                    call.submit(
+                        MemoryLog.flush,
+                        "noteUuid_12",
+                        ["upload1", "upload2"],
+                        {"thePath1": (credentials, "theContent1")},
+                    )
+                ]
+                assert shipper.mock_calls == calls
+                shipper.reset_mock()
+                # nothing pending
+                result = tested.end_session("noteUuid_13")
+                assert result == ""
+                assert shipper.mock_calls == []
+
+
+@patch("hyperscribe.libraries.memory_log.DROPPED", {"noteUuid/05": 3})
+@patch("hyperscribe.libraries.memory_log.LINES", {"noteUuid": 4, "noteUuid/05": 6})
+@patch("hyperscribe.libraries.memory_log.JSON_OUTCOMES", {"noteUuid/05": Counter({"valid": 2})})
+@patch(
+    "hyperscribe.libraries.memory_log.CACHE_LOOKUPS",
+    {"noteUuid": Counter({"hits": 1}), "noteUuid/05": Counter({"hits": 2, "misses": 1})},
+)
+@patch("hyperscribe.libraries.memory_log.PROMPTS", {})
+@patch("hyperscribe.libraries.memory_log.ENTRIES", {})
+def test_adopt():
+    tested = MemoryLog
+    memory_log.ENTRIES["noteUuid"] = {"main": ["line1"]}
+    memory_log.ENTRIES["noteUuid/05"] = {"main": ["line2"], "audio2transcript": ["line3", "line4"]}
+    memory_log.ENTRIES["noteUuid/06"] = {"main": ["line5"]}
+    memory_log.PROMPTS["noteUuid"] = TokenCounts(prompt=100, generated=50)
+    memory_log.PROMPTS["noteUuid/05"] = TokenCounts(prompt=20, generated=10)
+    memory_log.PROMPTS["noteUuid/06"] = TokenCounts(prompt=3, generated=1)
+
+    tested.adopt("noteUuid", 5)
+    assert memory_log.ENTRIES == {
+        "noteUuid": {"main": ["line1", "line2"], "audio2transcript": ["line3", "line4"]},
+        "noteUuid/06": {"main": ["line5"]},
+    }
+    assert memory_log.PROMPTS == {
+        "noteUuid": TokenCounts(prompt=120, generated=60),
+        "noteUuid/06": TokenCounts(prompt=3, generated=1),
+    }
+    assert memory_log.CACHE_LOOKUPS == {"noteUuid": Counter({"hits": 3, "misses": 1})}
+    assert memory_log.JSON_OUTCOMES == {"noteUuid": Counter({"valid": 2})}
+    assert memory_log.LINES == {"noteUuid": 10}
+    assert memory_log.DROPPED == {"noteUuid": 3}
+
+    # nothing transcribed ahead
+    tested.adopt("noteUuid", 7)
+    assert memory_log.ENTRIES == {
+        "noteUuid": {"main": ["line1", "line2"], "audio2transcript": ["line3", "line4"]},
+        "noteUuid/06": {"main": ["line5"]},
+    }
+    assert memory_log.LINES == {"noteUuid": 10}
+
+    # the session of the note has been ended
+    memory_log.ENTRIES.pop("noteUuid")
+    memory_log.PROMPTS.pop("noteUuid")
+    tested.adopt("noteUuid", 6)
+    assert memory_log.ENTRIES == {"noteUuid": {"main": ["line5"]}}
+    assert memory_log.PROMPTS == {"noteUuid": TokenCounts(prompt=3, generated=1)}
+
+
+@patch("hyperscribe.libraries.memory_log.DROPPED", {"noteUuid/05": 3})
+@patch("hyperscribe.libraries.memory_log.LINES", {"noteUuid": 4, "noteUuid/05": 6})
+@patch("hyperscribe.libraries.memory_log.JSON_OUTCOMES", {"noteUuid/05": Counter({"valid": 2})})
+@patch("hyperscribe.libraries.memory_log.CACHE_LOOKUPS", {"noteUuid/05": Counter({"hits": 2})})
+@patch("hyperscribe.libraries.memory_log.PROMPTS", {})
+@patch("hyperscribe.libraries.memory_log.ENTRIES", {})
+def test_discard():
+    tested = MemoryLog
+    memory_log.ENTRIES["noteUuid"] = {"main": ["line1"]}
+    memory_log.ENTRIES["noteUuid/05"] = {"main": ["line2"]}
+    memory_log.ENTRIES["otherUuid/05"] = {"main": ["line3"]}
+    memory_log.PROMPTS["noteUuid"] = TokenCounts(prompt=100, generated=50)
+    memory_log.PROMPTS["noteUuid/05"] = TokenCounts(prompt=20, generated=10)
+
+    tested.discard("noteUuid")
+    assert memory_log.ENTRIES == {"noteUuid": {"main": ["line1"]}, "otherUuid/05": {"main": ["line3"]}}
+    assert memory_log.PROMPTS == {"noteUuid": TokenCounts(prompt=100, generated=50)}
+    assert memory_log.CACHE_LOOKUPS == {}
+    assert memory_log.JSON_OUTCOMES == {}
+    assert memory_log.LINES == {"noteUuid": 4}
+    assert memory_log.DROPPED == {}
+
+
+@patch("hyperscribe.libraries.memory_log.AwsS3")
+def test_flush(aws_s3):
+    upload_1 = MagicMock()
+    upload_2 = MagicMock()
+
+    def reset_mocks():
+        aws_s3.reset_mock()
+        upload_1.reset_mock()
+        upload_2.reset_mock()
+
+    credentials_1 = AwsS3Credentials(aws_key="theKey1", aws_secret="theSecret1", region="theRegion", bucket="theBucket")
+    credentials_2 = AwsS3Credentials(aws_key="theKey2", aws_secret="theSecret2", region="theRegion", bucket="theBucket")
+    tested = MemoryLog
+    upload_1.exception.side_effect = lambda: RuntimeError("theError")
+    upload_2.exception.side_effect = [None]
+    pending = {"thePath1": (credentials_1, "theContent1"), "thePath2": (credentials_2, "theContent2")}
+
+    tested.flush("theNoteUuid", [upload_1, upload_2], pending)
+    calls = [
+        call(credentials_1),
+        call().upload_text_to_s3("thePath1", "theContent1", "theNoteUuid"),
+        call(credentials_2),
+        call().upload_text_to_s3("thePath2", "theContent2", "theNoteUuid"),
+    ]
+    assert aws_s3.mock_calls == calls
+    calls = [call.exception()]
+    assert upload_1.mock_calls == calls
+    assert upload_2.mock_calls == calls
+    reset_mocks()
+
+    # nothing to flush
+    tested.flush("theNoteUuid", [], {})
+    assert aws_s3.mock_calls == []
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.memory_log.AwsS3")
+def test_ship(aws_s3):
+    def reset_mocks():
+        aws_s3.reset_mock()
+
+    credentials = AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+    tested = MemoryLog
+    with patch.object(memory_log, "PENDING", {}):
+        memory_log.PENDING = {
+            "noteUuid_1": {"thePath1": (credentials, "theContent1"), "thePath2": (credentials, "theContent2")},
+        }
+        # pending content
+        tested.ship("noteUuid_1", "thePath1")
+        assert memory_log.PENDING == {"noteUuid_1": {"thePath2": (credentials, "theContent2")}}
+        calls = [call(credentials), call().upload_text_to_s3("thePath1", "theContent1", "noteUuid_1")]
+        assert aws_s3.mock_calls == calls
+        reset_mocks()
+
+        # already uploaded
+        tested.ship("noteUuid_1", "thePath1")
+        tested.ship("noteUuid_2", "thePath1")
+        assert memory_log.PENDING == {"noteUuid_1": {"thePath2": (credentials, "theContent2")}}
+        assert aws_s3.mock_calls == []
+        reset_mocks()
+
 
 def test_dev_null_instance():
     tested = MemoryLog
@@ -99,7 +335,28 @@ def test_instance():
     assert isinstance(result, MemoryLog)
     assert result.identification == identification
     assert result.label == "theLabel"
+    assert result.cycle is None
+    assert result.key == "noteUuid"
+    assert result.s3_credentials == aws_s3
+    assert result.span is None
+
+    # the cycle transcribed ahead
+    result = tested.instance(identification, "theLabel", aws_s3, 5)
+    assert isinstance(result, MemoryLog)
+    assert result.identification == identification
+    assert result.label == "theLabel"
+    assert result.cycle == 5
+    assert result.key == "noteUuid/05"
     assert result.s3_credentials == aws_s3
+    assert result.span is None
+
+    # the span of the stage
+    span = Tracer("noteUuid", "theStage", "")
+    result = tested.instance(identification, "theLabel", aws_s3, None, span)
+    assert isinstance(result, MemoryLog)
+    assert result.cycle is None
+    assert result.key == "noteUuid"
+    assert result.span is span
 
 
 def test___init__():
@@ -131,8 +388,44 @@ def test___init__():
 
             assert tested.identification == identification
             assert tested.label == "theLabel"
+            assert tested.cycle is None
+            assert tested.key == "noteUuid"
             assert tested.s3_credentials == s3_credentials
             assert tested.current_idx == 0
+            assert tested.session is memory_log.ENTRIES["noteUuid"]
+
+            # the cycle transcribed ahead is kept apart
+            tested = MemoryLog(identification, "theLabel", 5)
+            expected = {"noteUuid": {"theLabel": []}, "noteUuid/05": {"theLabel": []}}
+            assert memory_log.ENTRIES == expected
+            expected = {
+                "noteUuid": TokenCounts(prompt=0, generated=0),
+                "noteUuid/05": TokenCounts(prompt=0, generated=0),
+            }
+            assert memory_log.PROMPTS == expected
+            assert tested.cycle == 5
+            assert tested.key == "noteUuid/05"
+            assert tested.session is memory_log.ENTRIES["noteUuid/05"]
+
+
+def test_is_session_open():
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    with patch.object(memory_log, "ENTRIES", {}):
+        with patch.object(memory_log, "PROMPTS", {}):
+            tested = MemoryLog(identification, "theLabel")
+            # the session is open
+            assert tested.is_session_open() is True
+            # the session is ended
+            memory_log.ENTRIES.pop("noteUuid")
+            assert tested.is_session_open() is False
+            # the next session of the note
+            _ = MemoryLog(identification, "theLabel")
+            assert tested.is_session_open() is False
 
 
 @patch("hyperscribe.libraries.memory_log.datetime", wraps=datetime)
@@ -176,6 +469,37 @@ def test_log(mock_datetime):
         reset_mocks()
         MemoryLog.end_session("noteUuid")
 
+        # the logs of the note are full
+        with (
+            patch.object(memory_log, "LINES", {}),
+            patch.object(memory_log, "DROPPED", {}),
+            patch.object(memory_log.Constants, "MEMORY_LOG_MAX_LINES", 2),
+        ):
+            tested = MemoryLog(identification, "theLabel")
+            mock_datetime.now.side_effect = [
+                datetime(2025, 3, 6, 19, 11, 55, tzinfo=timezone.utc),
+                datetime(2025, 3, 6, 19, 11, 57, tzinfo=timezone.utc),
+            ]
+            tested.log("message5")
+            tested.log("message6")
+            tested.log("message7")
+            tested.log("message8")
+            expected = {
+                "noteUuid": {
+                    "theLabel": [
+                        "2025-03-06T19:11:55+00:00: message5",
+                        "2025-03-06T19:11:57+00:00: message6",
+                    ],
+                },
+            }
+            assert memory_log.ENTRIES == expected
+            assert memory_log.LINES == {"noteUuid": 2}
+            assert memory_log.DROPPED == {"noteUuid": 2}
+            calls = [call.now(timezone.utc), call.now(timezone.utc)]
+            assert mock_datetime.mock_calls == calls
+            reset_mocks()
+            MemoryLog.end_session("noteUuid")
+
 
 @patch("hyperscribe.libraries.memory_log.log")
 @patch("hyperscribe.libraries.memory_log.datetime", wraps=datetime)
@@ -222,6 +546,59 @@ def test_output(mock_datetime, log):
         reset_mocks()
         MemoryLog.end_session("noteUuid")
 
+        # the logs of the note are full: the outputs are kept
+        with (
+            patch.object(memory_log, "LINES", {"noteUuid": 2}),
+            patch.object(memory_log, "DROPPED", {}),
+            patch.object(memory_log.Constants, "MEMORY_LOG_MAX_LINES", 2),
+        ):
+            tested = MemoryLog(identification, "theLabel")
+            mock_datetime.now.side_effect = [datetime(2025, 3, 6, 19, 11, 55, tzinfo=timezone.utc)]
+            tested.output("message4")
+            expected = {"noteUuid": {"theLabel": ["2025-03-06T19:11:55+00:00: message4"]}}
+            assert memory_log.ENTRIES == expected
+            assert memory_log.LINES == {"noteUuid": 3}
+            assert memory_log.DROPPED == {}
+            calls = [call.info("message4")]
+            assert log.mock_calls == calls
+            reset_mocks()
+            MemoryLog.end_session("noteUuid")
+
+
+@patch("hyperscribe.libraries.memory_log.datetime", wraps=datetime)
+def test_append(mock_datetime):
+    def reset_mocks():
+        mock_datetime.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    with patch.object(memory_log, "ENTRIES", {}), patch.object(memory_log, "LINES", {"otherNote": 7}):
+        tested = MemoryLog(identification, "theLabel")
+        mock_datetime.now.side_effect = [
+            datetime(2025, 3, 6, 7, 53, 21, tzinfo=timezone.utc),
+            datetime(2025, 3, 6, 11, 53, 37, tzinfo=timezone.utc),
+        ]
+        tested.append("message1")
+        tested.append("message2")
+        expected = {
+            "noteUuid": {
+                "theLabel": [
+                    "2025-03-06T07:53:21+00:00: message1",
+                    "2025-03-06T11:53:37+00:00: message2",
+                ],
+            },
+        }
+        assert memory_log.ENTRIES == expected
+        assert memory_log.LINES == {"otherNote": 7, "noteUuid": 2}
+
+        calls = [call.now(timezone.utc), call.now(timezone.utc)]
+        assert mock_datetime.mock_calls == calls
+        reset_mocks()
+
 
 @patch("hyperscribe.libraries.memory_log.datetime", wraps=datetime)
 def test_logs(mock_datetime):
@@ -287,14 +664,18 @@ def test_logs(mock_datetime):
     MemoryLog.end_session("noteUuid")
 
 
+@patch("hyperscribe.libraries.memory_log.shipper")
+@patch("hyperscribe.libraries.memory_log.time")
 @patch("hyperscribe.libraries.memory_log.AwsS3")
 @patch.object(CachedSdk, "get_discussion")
 @patch.object(MemoryLog, "log")
-def test_store_so_far(log, get_discussion, aws_s3):
+def test_store_so_far(log, get_discussion, aws_s3, time, shipper):
     def reset_mocks():
         log.reset_mock()
         get_discussion.reset_mock()
         aws_s3.reset_mock()
+        time.reset_mock()
+        shipper.reset_mock()
 
     identification = IdentificationParameters(
         patient_uuid="patientUuid",
@@ -317,49 +698,136 @@ def test_store_so_far(log, get_discussion, aws_s3):
             ],
         },
     }
+    log_path = "hyperscribe-canvasInstance/partials/2025-03-11/noteUuid/07/theLabel.log"
+    content = (
+        "2025-03-06T07:53:21+00:00: message1\n2025-03-06T11:53:37+00:00: message2\n2025-03-06T19:11:51+00:00: message3"
+    )
     tested = MemoryLog(identification, "theLabel")
     tested.s3_credentials = aws_s3_credentials
     tested.counts = TokenCounts(prompt=127, generated=93)
-    with patch.object(memory_log, "ENTRIES", entries):
-        #
+    with (
+        patch.object(memory_log, "ENTRIES", entries),
+        patch.object(memory_log, "PENDING", {}),
+        patch.object(memory_log, "SHIPPED", {}),
+        patch.object(memory_log, "UPLOADS", {}),
+    ):
+        # S3 not ready
         aws_s3.return_value.is_ready.side_effect = [False]
         get_discussion.side_effect = []
+        time.side_effect = []
         tested.store_so_far()
         assert tested.current_idx == 0
+        assert memory_log.PENDING == {}
 
         calls = [call(aws_s3_credentials), call().is_ready()]
         assert aws_s3.mock_calls == calls
         assert get_discussion.mock_calls == []
+        assert time.mock_calls == []
+        assert shipper.mock_calls == []
         reset_mocks()
-        #
+
         cached = CachedSdk("theNoteUuid")
         cached.created = datetime(2025, 3, 11, 23, 59, 37, tzinfo=timezone.utc)
         cached.updated = datetime(2025, 3, 12, 0, 38, 21, tzinfo=timezone.utc)
         cached.cycle = 7
 
+        tests = [
+            # -- first upload of the log
+            ({}, True),
+            # -- uploaded long enough ago
+            ({log_path: (994.9, 100)}, True),
+            # -- uploaded recently, but the log has grown enough
+            ({log_path: (999.0, len(content) - 65536)}, True),
+            # -- uploaded recently
+            ({log_path: (999.0, len(content) - 65535)}, False),
+        ]
+        for shipped, exp_shipped in tests:
+            memory_log.PENDING = {}
+            memory_log.SHIPPED = {"noteUuid": shipped.copy()}
+            memory_log.UPLOADS = {"noteUuid": ["previousUpload"]}
+            aws_s3.return_value.is_ready.side_effect = [True]
+            get_discussion.side_effect = [cached]
+            time.side_effect = [1000.0]
+            shipper.submit.side_effect = ["theUpload"]
+            tested.store_so_far()
+            assert tested.current_idx == 0  # <-- ensure full log is stored
+
+            assert memory_log.PENDING == {"noteUuid": {log_path: (aws_s3_credentials, content)}}
+            if exp_shipped:
+                assert memory_log.SHIPPED == {"noteUuid": {log_path: (1000.0, len(content))}}
+                assert memory_log.UPLOADS == {"noteUuid": ["previousUpload", "theUpload"]}
+                calls = [call.submit(tested.ship, "noteUuid", log_path)]
+            else:
+                assert memory_log.SHIPPED == {"noteUuid": shipped}
+                assert memory_log.UPLOADS == {"noteUuid": ["previousUpload"]}
+                calls = []
+            assert shipper.mock_calls == calls
+
+            calls = [call("---> tokens: 127 / 93")]
+            assert log.mock_calls == calls
+            calls = [call("noteUuid")]
+            assert get_discussion.mock_calls == calls
+            # no upload by the caller
+            calls = [call(aws_s3_credentials), call().is_ready()]
+            assert aws_s3.mock_calls == calls
+            calls = [call()]
+            assert time.mock_calls == calls
+            reset_mocks()
+
+        # the cycle transcribed ahead
+        memory_log.PENDING = {}
+        memory_log.SHIPPED = {}
+        memory_log.UPLOADS = {}
+        tested = MemoryLog(identification, "theLabel", 5)
+        memory_log.ENTRIES["noteUuid/05"]["theLabel"].extend(entries["noteUuid"]["theLabel"])
+        tested.s3_credentials = aws_s3_credentials
+        tested.counts = TokenCounts(prompt=127, generated=93)
         aws_s3.return_value.is_ready.side_effect = [True]
         get_discussion.side_effect = [cached]
+        time.side_effect = [1000.0]
+        shipper.submit.side_effect = ["theUpload"]
         tested.store_so_far()
-        assert tested.current_idx == 0  # <-- ensure full log is stored
 
-        calls = [call("---> tokens: 127 / 93")]
-        assert log.mock_calls == calls
-        calls = [call("noteUuid")]
-        assert get_discussion.mock_calls == calls
-        calls = [
-            call(aws_s3_credentials),
-            call().is_ready(),
-            call().upload_text_to_s3(
-                "hyperscribe-canvasInstance/partials/2025-03-11/noteUuid/07/theLabel.log",
-                "2025-03-06T07:53:21+00:00: message1\n"
-                "2025-03-06T11:53:37+00:00: message2\n"
-                "2025-03-06T19:11:51+00:00: message3",
-            ),
-        ]
-        assert aws_s3.mock_calls == calls
+        exp_path = "hyperscribe-canvasInstance/partials/2025-03-11/noteUuid/05/theLabel.log"
+        assert memory_log.PENDING == {"noteUuid": {exp_path: (aws_s3_credentials, content)}}
+        assert memory_log.UPLOADS == {"noteUuid": ["theUpload"]}
+        calls = [call.submit(tested.ship, "noteUuid", exp_path)]
+        assert shipper.mock_calls == calls
         reset_mocks()
 
 
+def test_add_cache_lookup():
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    with patch.object(memory_log, "CACHE_LOOKUPS", {}):
+        tested = MemoryLog(identification, "theLabel")
+
+        tested.add_cache_lookup(True)
+        tested.add_cache_lookup(False)
+        tested.add_cache_lookup(True)
+        assert memory_log.CACHE_LOOKUPS == {"noteUuid": Counter({"hits": 2, "misses": 1})}
+
+
+def test_add_json_outcome():
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    with patch.object(memory_log, "JSON_OUTCOMES", {}):
+        tested = MemoryLog(identification, "theLabel")
+
+        tested.add_json_outcome("valid")
+        tested.add_json_outcome("repaired")
+        tested.add_json_outcome("valid")
+        assert memory_log.JSON_OUTCOMES == {"noteUuid": Counter({"valid": 2, "repaired": 1})}
+
+
 def test_add_consumption():
     identification = IdentificationParameters(
         patient_uuid="patientUuid",
@@ -375,3 +843,9 @@ def test_add_consumption():
         tested.add_consumption(TokenCounts(prompt=100, generated=50))
         assert tested.counts == TokenCounts(prompt=227, generated=143)
         assert memory_log.PROMPTS == {"noteUuid": TokenCounts(prompt=623, generated=237)}
+
+        # the session ended while the instance is still in use
+        memory_log.PROMPTS = {}
+        tested.add_consumption(TokenCounts(prompt=10, generated=5))
+        assert tested.counts == TokenCounts(prompt=237, generated=148)
+        assert memory_log.PROMPTS == {"noteUuid": TokenCounts(prompt=10, generated=5)}
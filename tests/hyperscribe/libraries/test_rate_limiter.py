@@ -0,0 +1,398 @@
+from time import sleep
+from unittest.mock import patch, call, MagicMock
+
+from canvas_sdk.utils.http import ThreadPoolExecutor
+
+from hyperscribe.libraries import rate_limiter
+from hyperscribe.libraries.rate_limiter import RateLimiter
+
+
+def helper_instance(now: float = 1000.0) -> RateLimiter:
+    with patch("hyperscribe.libraries.rate_limiter.time") as mock_time:
+        mock_time.side_effect = [now]
+        return RateLimiter("theVendor")
+
+
+@patch("hyperscribe.libraries.rate_limiter.time")
+def test___init__(time):
+    time.side_effect = [1000.0]
+    tested = RateLimiter("theVendor")
+    assert tested.key == "theVendor"
+    assert tested.limit == 16.0
+    assert tested.ceiling == 64.0
+    assert tested.active == set()
+    assert tested.waiters == []
+    assert tested.tokens == 40.0
+    assert tested.refilled_at == 1000.0
+    assert tested.blocked_until == 0.0
+    assert tested.decreased_at == 0.0
+    assert tested.counters == {"requests": 0, "throttled": 0, "waitSeconds": 0.0, "backoffSeconds": 0.0}
+
+    # configured vendor
+    time.side_effect = [1000.0]
+    tested = RateLimiter("Anthropic")
+    assert tested.limit == 32.0
+    assert tested.ceiling == 256.0
+
+
+@patch("hyperscribe.libraries.rate_limiter.LIMITERS", {})
+def test_for_key():
+    tested = RateLimiter
+    result = tested.for_key("theVendor")
+    assert isinstance(result, RateLimiter)
+    assert result.key == "theVendor"
+    assert tested.for_key("theVendor") is result
+    other = tested.for_key("otherVendor")
+    assert other is not result
+    assert rate_limiter.LIMITERS == {"theVendor": result, "otherVendor": other}
+
+
+@patch("hyperscribe.libraries.rate_limiter.LIMITERS", {})
+def test_statistics():
+    tested = RateLimiter
+    assert tested.statistics() == {}
+
+    limiter = helper_instance()
+    limiter.limit = 3.75
+    limiter.counters = {"requests": 7, "throttled": 2, "waitSeconds": 1.23456, "backoffSeconds": 0.5}
+    rate_limiter.LIMITERS["theVendor"] = limiter
+    result = tested.statistics()
+    expected = {
+        "theVendor": {"requests": 7, "throttled": 2, "waitSeconds": 1.235, "backoffSeconds": 0.5, "limit": 3},
+    }
+    assert result == expected
+
+
+def test_is_retryable():
+    tested = RateLimiter
+    tests = [
+        (0, True),
+        (200, False),
+        (400, False),
+        (401, False),
+        (429, True),
+        (500, True),
+        (503, True),
+        (529, True),
+    ]
+    for status_code, expected in tests:
+        result = tested.is_retryable(status_code)
+        assert result is expected, f"---> {status_code}"
+
+
+def test_retry_after():
+    tested = RateLimiter
+    tests = [
+        ({"Retry-After": "3"}, 3.0),
+        ({"retry-after": "2.5"}, 2.5),
+        ({"retry-after-ms": "750", "retry-after": "1"}, 0.75),
+        ({"retry-after-ms": "invalid", "retry-after": "1"}, 1.0),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+        ({"Retry-After": "-5"}, 0.0),
+        ({"Retry-After": "3600"}, 60.0),
+        ({"Content-Type": "application/json"}, 0.0),
+        ({}, 0.0),
+        (None, 0.0),
+    ]
+    for headers, expected in tests:
+        result = tested.retry_after(headers)
+        assert result == expected, f"---> {headers}"
+
+
+def test_has_free_slot():
+    tests = [
+        # free slots
+        (3.0, True),
+        (3.9, True),
+        # all the slots are taken
+        (2.0, False),
+        (2.9, False),
+    ]
+    for limit, expected in tests:
+        tested = helper_instance()
+        tested.limit = limit
+        tested.active = {"ticket1", "ticket2"}
+        result = tested.has_free_slot()
+        assert result is expected, f"---> {limit}"
+
+
+@patch("hyperscribe.libraries.rate_limiter.uuid4")
+@patch("hyperscribe.libraries.rate_limiter.sleep")
+@patch("hyperscribe.libraries.rate_limiter.time")
+@patch.object(RateLimiter, "wait_release")
+def test_acquire(wait_release, time, sleep, uuid4):
+    def reset_mocks():
+        wait_release.reset_mock()
+        time.reset_mock()
+        sleep.reset_mock()
+        uuid4.reset_mock()
+
+    # slot available
+    tested = helper_instance()
+    uuid4.return_value.hex = "theTicket"
+    time.side_effect = [1000.0, 1000.0]
+    result = tested.acquire()
+    assert result == "theTicket"
+    assert tested.active == {"theTicket"}
+    assert tested.tokens == 39.0
+    assert tested.counters == {"requests": 1, "throttled": 0, "waitSeconds": 0.0, "backoffSeconds": 0.0}
+    assert sleep.mock_calls == []
+    assert wait_release.mock_calls == []
+    reset_mocks()
+
+    # blocked by the vendor, until the end of the block
+    tested = helper_instance()
+    tested.blocked_until = 1000.5
+    uuid4.return_value.hex = "theTicket"
+    time.side_effect = [1000.0, 1000.0, 1000.5]
+    result = tested.acquire()
+    assert result == "theTicket"
+    assert tested.active == {"theTicket"}
+    assert tested.tokens == 39.0
+    assert tested.counters == {"requests": 1, "throttled": 0, "waitSeconds": 0.5, "backoffSeconds": 0.0}
+    assert sleep.mock_calls == [call(0.5)]
+    assert wait_release.mock_calls == []
+    reset_mocks()
+
+    # all the slots are used, until one is released
+    tested = helper_instance()
+    tested.limit = 2.5
+    tested.active = {"ticket1", "ticket2"}
+    uuid4.return_value.hex = "theTicket"
+    time.side_effect = [1000.0, 1000.0, 1000.25]
+    wait_release.side_effect = lambda: tested.active.discard("ticket1")
+    result = tested.acquire()
+    assert result == "theTicket"
+    assert tested.active == {"ticket2", "theTicket"}
+    assert tested.counters == {"requests": 1, "throttled": 0, "waitSeconds": 0.25, "backoffSeconds": 0.0}
+    assert sleep.mock_calls == []
+    assert wait_release.mock_calls == [call()]
+    wait_release.side_effect = None
+    reset_mocks()
+
+    # no token left, until the next one
+    tested = helper_instance()
+    tested.tokens = 0.0
+    uuid4.return_value.hex = "theTicket"
+    time.side_effect = [1000.0, 1000.0, 1000.0625]
+    result = tested.acquire()
+    assert result == "theTicket"
+    assert tested.tokens == 0.25
+    assert tested.refilled_at == 1000.0625
+    assert tested.counters == {"requests": 1, "throttled": 0, "waitSeconds": 0.0625, "backoffSeconds": 0.0}
+    assert sleep.mock_calls == [call(0.05)]
+    assert wait_release.mock_calls == []
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.rate_limiter.PARKING", {})
+@patch("hyperscribe.libraries.rate_limiter.parking")
+def test_wait_release(parking):
+    sleeping = MagicMock()
+    waiter = MagicMock()
+
+    def reset_mocks():
+        parking.reset_mock()
+        sleeping.reset_mock()
+        waiter.reset_mock()
+
+    tests = [
+        # woken up by a release
+        (None, True, [], None),
+        # the sleeping task is over
+        (None, False, [], True),
+        # cancelled by a release
+        (RuntimeError("cancelled"), True, [], False),
+        # a slot was released while registering
+        (None, False, ["ticket2"], False),
+    ]
+    for outcome, popped, released, sleeping_done in tests:
+        rate_limiter.PARKING.clear()
+        if sleeping_done is not None:
+            rate_limiter.PARKING["sleeping"] = sleeping
+            sleeping.done.side_effect = [sleeping_done]
+        tested = helper_instance()
+        tested.limit = 2.0
+        tested.active = {"ticket1", "ticket2"}
+        tested.waiters = ["otherWaiter"]
+
+        def result() -> None:
+            if popped:
+                tested.waiters.remove(waiter)
+            if outcome is not None:
+                raise outcome
+
+        waiter.result.side_effect = result
+        for ticket in released:
+            tested.active.discard(ticket)
+        if sleeping_done is False:
+            parking.submit.side_effect = [waiter]
+        else:
+            parking.submit.side_effect = ["theSleeping", waiter]
+        tested.wait_release()
+        assert tested.waiters == ["otherWaiter"]
+        calls = [] if released else [call()]
+        assert waiter.result.mock_calls == calls
+        calls = [call.submit(int)]
+        if sleeping_done is not False:
+            calls.insert(0, call.submit(rate_limiter.sleep, 1.0))
+        assert parking.mock_calls == calls
+        assert rate_limiter.PARKING == {"sleeping": sleeping if sleeping_done is False else "theSleeping"}
+        calls = [] if sleeping_done is None else [call.done()]
+        assert sleeping.mock_calls == calls
+        reset_mocks()
+
+
+def test_wait_release__woken_up():
+    tested = helper_instance()
+    tested.limit = 1.0
+    tested.active = {"ticket1"}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        waiting = executor.submit(tested.wait_release)
+        while not tested.waiters:
+            sleep(0.001)
+        # the waiting thread is woken up as soon as the slot is released, long before the end of the sleeping task
+        tested.active.discard("ticket1")
+        tested.wake_up()
+        waiting.result(timeout=0.5)
+    assert tested.waiters == []
+
+
+def test_wake_up():
+    waiters = [MagicMock(), MagicMock(), MagicMock()]
+
+    def reset_mocks():
+        for waiter in waiters:
+            waiter.reset_mock()
+
+    tests = [
+        # one free slot
+        (3.0, [True, True, True], [1, 0, 0], 2),
+        # two free slots, the first waiter is already awake
+        (4.0, [False, True, True], [1, 1, 1], 0),
+        # more free slots than waiters
+        (9.0, [True, True, True], [1, 1, 1], 0),
+        # no free slot
+        (2.0, [True, True, True], [0, 0, 0], 3),
+    ]
+    for limit, cancelled, exp_cancels, exp_left in tests:
+        tested = helper_instance()
+        tested.limit = limit
+        tested.active = {"ticket1", "ticket2"}
+        tested.waiters = list(waiters)
+        for waiter, result in zip(waiters, cancelled):
+            waiter.cancel.side_effect = [result]
+        tested.wake_up()
+        assert tested.waiters == waiters[len(waiters) - exp_left :], f"---> {limit}"
+        for waiter, exp_cancel in zip(waiters, exp_cancels):
+            assert waiter.mock_calls == [call.cancel()] * exp_cancel, f"---> {limit}"
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.rate_limiter.time")
+@patch.object(RateLimiter, "wake_up")
+def test_release(wake_up, time):
+    def reset_mocks():
+        wake_up.reset_mock()
+        time.reset_mock()
+
+    tested = helper_instance()
+    tested.limit = 10.0
+    tested.ceiling = 10.0
+    tested.active = {"ticket1", "ticket2", "ticket3"}
+
+    # throttled, with Retry-After
+    time.side_effect = [1000.0]
+    tested.release("ticket1", 429, {"Retry-After": "3"})
+    assert tested.active == {"ticket2", "ticket3"}
+    assert tested.blocked_until == 1003.0
+    assert tested.limit == 5.0
+    assert wake_up.mock_calls == [call()]
+    assert tested.decreased_at == 1000.0
+    assert tested.counters["throttled"] == 1
+    reset_mocks()
+    # -- throttled at the same time: the limit is decreased once
+    time.side_effect = [1000.5]
+    tested.release("ticket2", 529, {})
+    assert tested.active == {"ticket3"}
+    assert tested.blocked_until == 1003.0
+    assert tested.limit == 5.0
+    assert tested.decreased_at == 1000.0
+    assert tested.counters["throttled"] == 2
+    reset_mocks()
+    # -- throttled later
+    time.side_effect = [1001.0]
+    tested.release("ticket3", 503, {"retry-after-ms": "500"})
+    assert tested.active == set()
+    assert tested.blocked_until == 1003.0
+    assert tested.limit == 2.5
+    assert tested.decreased_at == 1001.0
+    assert tested.counters["throttled"] == 3
+    reset_mocks()
+
+    # successes
+    time.side_effect = [1002.0, 1002.1, 1002.2]
+    tested.release("ticket4", 200, {})
+    assert tested.limit == 2.9
+    tested.release("ticket5", 404, {})
+    assert round(tested.limit, 3) == 3.245
+    tested.release("ticket6", 200, {})
+    assert round(tested.limit, 3) == 3.553
+    reset_mocks()
+    # -- capped
+    tested.limit = 9.95
+    time.side_effect = [1003.0]
+    tested.release("ticket7", 200, {})
+    assert tested.limit == 10.0
+    assert wake_up.mock_calls == [call()]
+    reset_mocks()
+
+    # no response or server error: unchanged limit
+    for status_code in [0, 500]:
+        tested.limit = 4.0
+        time.side_effect = [1004.0]
+        tested.release("ticket8", status_code, {})
+        assert tested.limit == 4.0
+        assert tested.counters["throttled"] == 3
+        reset_mocks()
+
+    # the limit is at least 1
+    tested.limit = 1.5
+    time.side_effect = [1010.0]
+    tested.release("ticket9", 429, {})
+    assert tested.limit == 1.0
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.rate_limiter.uniform")
+@patch("hyperscribe.libraries.rate_limiter.sleep")
+def test_backoff(sleep, uniform):
+    def reset_mocks():
+        sleep.reset_mock()
+        uniform.reset_mock()
+
+    tested = helper_instance()
+    tests = [
+        (0, 0.25, 0.5),
+        (1, 0.5, 1.0),
+        (3, 2.0, 4.0),
+        (8, 10.0, 20.0),
+    ]
+    total = 0.0
+    for attempt, exp_min, exp_max in tests:
+        uniform.side_effect = [exp_max * 0.75]
+        tested.backoff(attempt)
+        total = total + exp_max * 0.75
+        assert uniform.mock_calls == [call(exp_min, exp_max)]
+        assert sleep.mock_calls == [call(exp_max * 0.75)]
+        assert tested.counters["backoffSeconds"] == total
+        reset_mocks()
+
+
+def test_count():
+    tested = helper_instance()
+    tested.count("requests", 1)
+    tested.count("waitSeconds", 0.5)
+    tested.count("requests", 1)
+    tested.count("waitSeconds", 0.25)
+    assert tested.counters == {"requests": 2, "throttled": 0, "waitSeconds": 0.75, "backoffSeconds": 0.0}
@@ -0,0 +1,147 @@
+from unittest.mock import patch, call
+
+from hyperscribe.libraries import schema_registry
+from hyperscribe.libraries.schema_registry import SchemaRegistry
+
+
+def test_key():
+    tested = SchemaRegistry
+    result = tested.key({"type": "array", "items": {"type": "object"}})
+    expected = "91e487e2bcb9a7c01513d69508c0668ceff8a7ebe060674d8e2fe9e7182ac378"
+    assert result == expected
+    # the key depends on the content only
+    result = tested.key({"items": {"type": "object"}, "type": "array"})
+    assert result == expected
+    result = tested.key({"type": "array", "items": {"type": "string"}})
+    assert result != expected
+
+
+@patch("hyperscribe.libraries.schema_registry.INTERNED", {})
+@patch.object(SchemaRegistry, "key")
+def test_intern(key):
+    def reset_mocks():
+        key.reset_mock()
+
+    tested = SchemaRegistry
+    schema1 = {"type": "object"}
+    schema2 = {"type": "object"}
+
+    # first call for a schema computes its key
+    key.side_effect = ["theKey1"]
+    result = tested.intern(schema1)
+    assert result == "theKey1"
+    calls = [call(schema1)]
+    assert key.mock_calls == calls
+    reset_mocks()
+
+    # next calls for the same schema reuse it
+    key.side_effect = []
+    result = tested.intern(schema1)
+    assert result == "theKey1"
+    assert key.mock_calls == []
+    reset_mocks()
+
+    # another schema with the same content gets its key computed
+    key.side_effect = ["theKey2"]
+    result = tested.intern(schema2)
+    assert result == "theKey2"
+    calls = [call(schema2)]
+    assert key.mock_calls == calls
+    assert schema_registry.INTERNED == {id(schema1): (schema1, "theKey1"), id(schema2): (schema2, "theKey2")}
+    reset_mocks()
+
+    # the bound is respected
+    with patch("hyperscribe.libraries.schema_registry.Constants.SCHEMA_REGISTRY_MAX_VALIDATORS", 1):
+        schema3 = {"type": "string"}
+        key.side_effect = ["theKey3"]
+        result = tested.intern(schema3)
+        assert result == "theKey3"
+        assert schema_registry.INTERNED == {id(schema3): (schema3, "theKey3")}
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.schema_registry.VALIDATORS", {})
+@patch("hyperscribe.libraries.schema_registry.Draft7Validator")
+@patch.object(SchemaRegistry, "intern")
+def test_validator(intern, draft7_validator):
+    def reset_mocks():
+        intern.reset_mock()
+        draft7_validator.reset_mock()
+
+    tested = SchemaRegistry
+
+    with patch("hyperscribe.libraries.schema_registry.Constants.SCHEMA_REGISTRY_MAX_VALIDATORS", 2):
+        # new schemas are compiled
+        for idx in range(2):
+            intern.side_effect = [f"theKey{idx}"]
+            draft7_validator.side_effect = [f"theValidator{idx}"]
+            result = tested.validator({"schema": idx})
+            assert result == f"theValidator{idx}"
+            calls = [call({"schema": idx})]
+            assert intern.mock_calls == calls
+            assert draft7_validator.mock_calls == calls
+            reset_mocks()
+        assert list(schema_registry.VALIDATORS.keys()) == ["theKey0", "theKey1"]
+
+        # known schemas are not compiled, and become the most recently used
+        intern.side_effect = ["theKey0"]
+        draft7_validator.side_effect = []
+        result = tested.validator({"schema": 0})
+        assert result == "theValidator0"
+        calls = [call({"schema": 0})]
+        assert intern.mock_calls == calls
+        assert draft7_validator.mock_calls == []
+        assert list(schema_registry.VALIDATORS.keys()) == ["theKey1", "theKey0"]
+        reset_mocks()
+
+        # the least recently used is evicted
+        intern.side_effect = ["theKey2"]
+        draft7_validator.side_effect = ["theValidator2"]
+        result = tested.validator({"schema": 2})
+        assert result == "theValidator2"
+        assert schema_registry.VALIDATORS == {"theKey0": "theValidator0", "theKey2": "theValidator2"}
+        reset_mocks()
+
+
+def test_evict():
+    tested = SchemaRegistry
+    with patch("hyperscribe.libraries.schema_registry.Constants.SCHEMA_REGISTRY_MAX_VALIDATORS", 2):
+        entries = {"a": 1, "b": 2}
+        tested.evict(entries)
+        assert entries == {"a": 1, "b": 2}
+
+        entries = {"a": 1, "b": 2, "c": 3, "d": 4}
+        tested.evict(entries)
+        assert entries == {"c": 3, "d": 4}
+
+
+@patch("hyperscribe.libraries.schema_registry.INTERNED", {})
+@patch("hyperscribe.libraries.schema_registry.VALIDATORS", {})
+def test_validate():
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "minItems": 1,
+        "items": {
+            "type": "object",
+            "properties": {"a": {"type": "integer", "minimum": 5}, "b": {"type": "string", "minLength": 2}},
+            "required": ["a", "b"],
+            "additionalProperties": False,
+        },
+    }
+
+    tests = [
+        ([], "[] should be non-empty"),
+        ([{"a": 7}], "'b' is a required property, in path [0]"),
+        ([{"b": "xy"}], "'a' is a required property, in path [0]"),
+        ([{"a": 7, "b": ""}], "'' is too short, in path [0, 'b']"),
+        ([{"a": 3, "b": "xy"}], "3 is less than the minimum of 5, in path [0, 'a']"),
+        ([{"a": 3, "b": ""}], "3 is less than the minimum of 5, in path [0, 'a']\n'' is too short, in path [0, 'b']"),
+        ([{"a": 7, "b": "xy"}], ""),
+    ]
+    tested = SchemaRegistry
+    for response, expected in tests:
+        result = tested.validate(response, schema)
+        assert result == expected, f"---> {response}"
+    # one validator for all the validations
+    assert len(schema_registry.VALIDATORS) == 1
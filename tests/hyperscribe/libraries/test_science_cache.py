@@ -0,0 +1,145 @@
+from unittest.mock import patch, call
+
+from hyperscribe.libraries import science_cache
+from hyperscribe.libraries.science_cache import ScienceCache
+
+
+def test_key():
+    tested = ScienceCache
+    result = tested.key("/search/condition", {"query": "High  Blood pressure ", "limit": 10}, False)
+    expected = "science:f9aeec6fe6733bef7a319bd56cd7cc76ae4b2e04a1ab017a6b2feee051fba5c5"
+    assert result == expected
+    # same key, case and spaces aside
+    assert tested.key("/search/condition", {"limit": "10", "query": "high blood pressure"}, False) == result
+    # different keys
+    assert tested.key("/search/condition", {"query": "high blood pressure", "limit": 10}, True) != result
+    assert tested.key("/search/other", {"query": "high blood pressure", "limit": 10}, False) != result
+    assert tested.key("/search/condition", {"query": "high blood", "limit": 10}, False) != result
+
+
+@patch("hyperscribe.libraries.science_cache.COUNTERS", {"hits": 0, "misses": 0, "coalesced": 0})
+@patch("hyperscribe.libraries.science_cache.ENTRIES", {})
+@patch("hyperscribe.libraries.science_cache.get_cache")
+@patch("hyperscribe.libraries.science_cache.time")
+def test_get(time, get_cache):
+    def reset_mocks():
+        time.reset_mock()
+        get_cache.reset_mock()
+
+    tested = ScienceCache
+
+    # in memory, not expired
+    science_cache.ENTRIES["key1"] = (1000.0, ["result1"])
+    science_cache.ENTRIES["key2"] = (1000.0, [])
+    time.side_effect = [999.0]
+    result = tested.get("key1")
+    assert result == ["result1"]
+    # re-inserted as the most recently used
+    assert list(science_cache.ENTRIES.keys()) == ["key2", "key1"]
+    assert science_cache.COUNTERS == {"hits": 1, "misses": 0, "coalesced": 0}
+    assert get_cache.mock_calls == []
+    reset_mocks()
+
+    # in memory but expired, and not in the plugin cache
+    time.side_effect = [1001.0]
+    get_cache.return_value.get.side_effect = [None]
+    result = tested.get("key2")
+    assert result is None
+    assert list(science_cache.ENTRIES.keys()) == ["key1"]
+    assert science_cache.COUNTERS == {"hits": 1, "misses": 1, "coalesced": 0}
+    assert get_cache.mock_calls == [call(), call().get("key2")]
+    reset_mocks()
+
+    # in the plugin cache
+    time.side_effect = [1001.0]
+    get_cache.return_value.get.side_effect = [["result3"]]
+    result = tested.get("key3")
+    assert result == ["result3"]
+    assert science_cache.ENTRIES == {"key1": (1000.0, ["result1"]), "key3": (4601.0, ["result3"])}
+    assert science_cache.COUNTERS == {"hits": 2, "misses": 1, "coalesced": 0}
+    assert get_cache.mock_calls == [call(), call().get("key3")]
+    reset_mocks()
+
+    # no plugin cache
+    get_cache.side_effect = [RuntimeError("no cache")]
+    result = tested.get("key4")
+    assert result is None
+    assert science_cache.COUNTERS == {"hits": 2, "misses": 2, "coalesced": 0}
+    assert get_cache.mock_calls == [call()]
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.science_cache.ENTRIES", {})
+@patch("hyperscribe.libraries.science_cache.get_cache")
+@patch("hyperscribe.libraries.science_cache.time")
+def test_set(time, get_cache):
+    def reset_mocks():
+        time.reset_mock()
+        get_cache.reset_mock()
+
+    tested = ScienceCache
+
+    # with results
+    time.side_effect = [1000.0]
+    tested.set("key1", ["result1"])
+    assert science_cache.ENTRIES == {"key1": (87400.0, ["result1"])}
+    calls = [call(), call().set("key1", ["result1"], timeout_seconds=86400)]
+    assert get_cache.mock_calls == calls
+    reset_mocks()
+
+    # without results
+    time.side_effect = [1000.0]
+    tested.set("key2", [])
+    assert science_cache.ENTRIES == {"key1": (87400.0, ["result1"]), "key2": (4600.0, [])}
+    calls = [call(), call().set("key2", [], timeout_seconds=3600)]
+    assert get_cache.mock_calls == calls
+    reset_mocks()
+
+    # no plugin cache
+    time.side_effect = [1000.0]
+    get_cache.side_effect = [RuntimeError("no cache")]
+    tested.set("key3", ["result3"])
+    assert science_cache.ENTRIES["key3"] == (87400.0, ["result3"])
+    assert get_cache.mock_calls == [call()]
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.science_cache.Constants")
+@patch("hyperscribe.libraries.science_cache.ENTRIES", {})
+@patch("hyperscribe.libraries.science_cache.time")
+def test_remember(time, constants):
+    tested = ScienceCache
+    constants.SCIENCE_CACHE_MEMORY_MAX_ENTRIES = 2
+
+    time.side_effect = [1000.0, 1001.0, 1002.0, 1003.0]
+    tested.remember("key1", ["result1"], 10)
+    tested.remember("key2", ["result2"], 20)
+    assert list(science_cache.ENTRIES.items()) == [("key1", (1010.0, ["result1"])), ("key2", (1021.0, ["result2"]))]
+    # updated as the most recently used
+    tested.remember("key1", ["result1b"], 10)
+    assert list(science_cache.ENTRIES.items()) == [("key2", (1021.0, ["result2"])), ("key1", (1012.0, ["result1b"]))]
+    # the least recently used is evicted
+    tested.remember("key3", ["result3"], 10)
+    assert list(science_cache.ENTRIES.items()) == [("key1", (1012.0, ["result1b"])), ("key3", (1013.0, ["result3"]))]
+
+
+@patch("hyperscribe.libraries.science_cache.COUNTERS", {"hits": 0, "misses": 0, "coalesced": 0})
+def test_count():
+    tested = ScienceCache
+    tested.count("hits")
+    tested.count("coalesced")
+    tested.count("hits")
+    assert science_cache.COUNTERS == {"hits": 2, "misses": 0, "coalesced": 1}
+
+
+def test_statistics():
+    tested = ScienceCache
+    tests = [
+        ({"hits": 0, "misses": 0, "coalesced": 0}, 0.0),
+        ({"hits": 2, "misses": 1, "coalesced": 4}, 0.667),
+        ({"hits": 5, "misses": 0, "coalesced": 0}, 1.0),
+    ]
+    for counters, exp_rate in tests:
+        with patch.object(science_cache, "COUNTERS", counters):
+            result = tested.statistics()
+            assert result == counters | {"hitRate": exp_rate}
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from hyperscribe.libraries import stage_latency
+from hyperscribe.libraries.stage_latency import StageLatency
+
+
+def test_stage():
+    tested = StageLatency
+    tests = [
+        ("transcript2instructions:Plan", "transcript2instructions:Plan"),
+        ("audio2transcript", "audio2transcript"),
+        ("Diagnose_uuid1_instruction2parameters", "Diagnose_instruction2parameters"),
+        ("Diagnose_instruction-001_instructions2parameters", "Diagnose_instructions2parameters"),
+        ("Medication_some_uuid_parameters2command", "Medication_parameters2command"),
+        ("Questionnaire_uuid2_questionnaire_update", "Questionnaire_questionnaire_update"),
+        ("questionnaire_update", "questionnaire_update"),
+        ("audit_3", "audit_3"),
+    ]
+    for label, expected in tests:
+        result = tested.stage(label)
+        assert result == expected, f"---> {label}"
+
+
+@patch("hyperscribe.libraries.stage_latency.Constants.HEDGING_LATENCY_SAMPLES", 3)
+@patch("hyperscribe.libraries.stage_latency.LATENCIES", {})
+def test_record():
+    tested = StageLatency
+    tested.record("stage1", 1.5)
+    tested.record("stage2", 4.0)
+    tested.record("stage1", 2.5)
+    tested.record("stage1", 0.5)
+    assert stage_latency.LATENCIES == {"stage1": [1.5, 2.5, 0.5], "stage2": [4.0]}
+    # the oldest latency is dropped
+    tested.record("stage1", 3.0)
+    assert stage_latency.LATENCIES == {"stage1": [2.5, 0.5, 3.0], "stage2": [4.0]}
+    # the instructions of the same type share their stage
+    tested.record("Diagnose_uuid1_parameters2command", 1.0)
+    tested.record("Diagnose_uuid2_parameters2command", 2.0)
+    assert stage_latency.LATENCIES == {
+        "stage1": [2.5, 0.5, 3.0],
+        "stage2": [4.0],
+        "Diagnose_parameters2command": [1.0, 2.0],
+    }
+
+
+@patch("hyperscribe.libraries.stage_latency.LATENCIES", {})
+def test_threshold():
+    tested = StageLatency
+    # not enough samples
+    stage_latency.LATENCIES["stage1"] = [float(idx) for idx in range(9)]
+    assert tested.threshold("stage1") is None
+    assert tested.threshold("stage2") is None
+    # 95th percentile
+    tests = [
+        ([float(idx) for idx in range(10, 0, -1)], 10.0),
+        ([float(idx) for idx in range(20, 0, -1)], 20.0),
+        ([float(idx) for idx in range(40)], 38.0),
+        ([float(idx) for idx in range(50)], 47.0),
+    ]
+    for latencies, expected in tests:
+        stage_latency.LATENCIES["stage1"] = latencies
+        result = tested.threshold("stage1")
+        assert result == expected, f"---> {len(latencies)}"
+    # the stage of the instruction, whatever its uuid
+    stage_latency.LATENCIES["Diagnose_parameters2command"] = [float(idx) for idx in range(10)]
+    assert tested.threshold("Diagnose_uuid3_parameters2command") == 9.0
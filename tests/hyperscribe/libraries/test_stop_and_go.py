@@ -241,41 +241,69 @@ def test__recover_stuck_session(mock_datetime, mock_log):
         reset_mocks()
 
 
+def test_next_waiting_cycles():
+    tested = StopAndGo("theNoteUuid")
+    tests = [
+        ([], []),
+        ([5], [5]),
+        ([5, 6], [5, 6]),
+        ([5, 6, 7, 8], [5, 6, 7, 8]),
+        ([5, 6, 7, 8, 9, 10], [5, 6, 7, 8]),
+    ]
+    for waiting_cycles, expected in tests:
+        tested._waiting_cycles = waiting_cycles
+        result = tested.next_waiting_cycles()
+        assert result == expected, f"---> {waiting_cycles}"
+        assert tested.waiting_cycles() == waiting_cycles
+
+
 @patch.object(StopAndGo, "save")
-def test_consume_next_waiting_cycles(save):
+def test_consume_waiting_cycles(save):
     def reset_mocks():
         save.reset_mock()
 
     tested = StopAndGo("theNoteUuid")
-    tested._waiting_cycles = [5, 3, 7]  # <-- not realistic
+    tested._waiting_cycles = [5, 3, 7, 9, 11]  # <-- not realistic
 
     # consume with save=True
-    result = tested.consume_next_waiting_cycles(True)
+    result = tested.consume_waiting_cycles([5], True)
     expected = True
     assert result == expected
     assert tested.cycle() == 5
-    assert tested.waiting_cycles() == [3, 7]
+    assert tested.waiting_cycles() == [3, 7, 9, 11]
 
     calls = [call()]
     assert save.mock_calls == calls
     reset_mocks()
 
     # consume with save=False
-    result = tested.consume_next_waiting_cycles(False)
+    result = tested.consume_waiting_cycles([3], False)
     expected = True
     assert result == expected
     assert tested.cycle() == 3
-    assert tested.waiting_cycles() == [7]
+    assert tested.waiting_cycles() == [7, 9, 11]
 
     calls = []
     assert save.mock_calls == calls
     reset_mocks()
 
-    # consume last one
-    result = tested.consume_next_waiting_cycles(True)
+    # consume not the next ones
+    for cycles in [[9], [7, 11], [7, 9, 11, 13]]:
+        result = tested.consume_waiting_cycles(cycles, True)
+        expected = False
+        assert result == expected
+        assert tested.cycle() == 3
+        assert tested.waiting_cycles() == [7, 9, 11]
+
+        calls = []
+        assert save.mock_calls == calls
+        reset_mocks()
+
+    # consume several at once
+    result = tested.consume_waiting_cycles([7, 9, 11], True)
     expected = True
     assert result == expected
-    assert tested.cycle() == 7
+    assert tested.cycle() == 11
     assert tested.waiting_cycles() == []
 
     calls = [call()]
@@ -283,15 +311,16 @@ def test_consume_next_waiting_cycles(save):
     reset_mocks()
 
     # consume when empty
-    result = tested.consume_next_waiting_cycles(True)
-    expected = False
-    assert result == expected
-    assert tested.cycle() == 7
-    assert tested.waiting_cycles() == []
-
-    calls = []
-    assert save.mock_calls == calls
-    reset_mocks()
+    for cycles in [[], [13]]:
+        result = tested.consume_waiting_cycles(cycles, True)
+        expected = False
+        assert result == expected
+        assert tested.cycle() == 11
+        assert tested.waiting_cycles() == []
+
+        calls = []
+        assert save.mock_calls == calls
+        reset_mocks()
 
 
 def test_waiting_cycles():
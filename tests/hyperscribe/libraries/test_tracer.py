@@ -0,0 +1,244 @@
+from unittest.mock import patch, call
+
+from hyperscribe.libraries import tracer
+from hyperscribe.libraries.tracer import Tracer
+from hyperscribe.structures.identification_parameters import IdentificationParameters
+from hyperscribe.structures.trace_span import TraceSpan
+
+
+@patch("hyperscribe.libraries.tracer.ROOTS", {"noteUuid": "theRootId"})
+@patch("hyperscribe.libraries.tracer.time")
+@patch("hyperscribe.libraries.tracer.uuid4")
+def test_begin(uuid4, time):
+    def reset_mocks():
+        uuid4.reset_mock()
+        time.reset_mock()
+
+    tested = Tracer
+
+    tests = [
+        # the parent is the cycle of the note
+        ("noteUuid", None, "noteUuid", "theRootId"),
+        # the parent is explicit
+        ("noteUuid", Tracer("noteUuid", "theParent", "theRootId"), "noteUuid", "theParentId"),
+        # the parent is the cycle transcribed ahead
+        ("noteUuid", Tracer("noteUuid/05", "cycle", ""), "noteUuid/05", "theParentId"),
+        # the note is not traced
+        ("otherUuid", None, "otherUuid", ""),
+    ]
+    reset_mocks()
+    for note_uuid, parent, exp_key, exp_parent_id in tests:
+        if parent is not None:
+            parent.span_id = "theParentId"
+        uuid4.return_value.hex = "a1b2c3d4e5f6a7b8c9d0"
+        time.side_effect = [1733405746.5]
+        result = tested.begin(note_uuid, "theName", parent)
+        assert isinstance(result, Tracer)
+        assert result.note_uuid == exp_key
+        assert result.name == "theName"
+        assert result.parent_id == exp_parent_id
+        assert result.span_id == "a1b2c3d4e5f6"
+        assert result.start == 1733405746.5
+        assert result.attributes == {}
+
+        calls = [call()]
+        assert uuid4.mock_calls == calls
+        assert time.mock_calls == calls
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.tracer.SPANS", {})
+@patch("hyperscribe.libraries.tracer.ROOTS", {})
+@patch("hyperscribe.libraries.tracer.time")
+@patch("hyperscribe.libraries.tracer.uuid4")
+def test_begin_cycle(uuid4, time):
+    tested = Tracer
+    tracer.SPANS["noteUuid"] = [TraceSpan("old", "", "previous", 1.0, 1.0, {})]
+
+    uuid4.return_value.hex = "a1b2c3d4e5f6a7b8c9d0"
+    time.side_effect = [1733405746.5]
+    result = tested.begin_cycle("noteUuid", {"key": "value"})
+    assert result.note_uuid == "noteUuid"
+    assert result.name == "cycle"
+    assert result.parent_id == ""
+    assert result.span_id == "a1b2c3d4e5f6"
+    assert result.attributes == {"key": "value"}
+    assert tracer.ROOTS == {"noteUuid": "a1b2c3d4e5f6"}
+    assert tracer.SPANS == {"noteUuid": []}
+
+
+@patch("hyperscribe.libraries.tracer.SPANS", {})
+@patch("hyperscribe.libraries.tracer.ROOTS", {})
+@patch("hyperscribe.libraries.tracer.time")
+@patch("hyperscribe.libraries.tracer.uuid4")
+def test_end_cycle(uuid4, time):
+    tested = Tracer
+
+    uuid4.return_value.hex = "a1b2c3d4e5f6a7b8c9d0"
+    time.side_effect = [1733405746.0]
+    root = tested.begin_cycle("noteUuid", {"cycles": [3]})
+    tracer.SPANS["noteUuid"].append(TraceSpan("span1", "a1b2c3d4e5f6", "theSpan", 1733405746.25, 0.5, {"key": 1}))
+    tracer.ROOTS["otherUuid"] = "otherRoot"
+
+    time.side_effect = [1733405749.75]
+    result = tested.end_cycle(root, 3)
+    expected = {
+        "note": "noteUuid",
+        "cycle": 3,
+        "spans": [
+            {
+                "id": "span1",
+                "parent": "a1b2c3d4e5f6",
+                "name": "theSpan",
+                "start": 1733405746250,
+                "duration": 500,
+                "attributes": {"key": 1},
+            },
+            {
+                "id": "a1b2c3d4e5f6",
+                "parent": "",
+                "name": "cycle",
+                "start": 1733405746000,
+                "duration": 3750,
+                "attributes": {"cycles": [3]},
+            },
+        ],
+    }
+    assert result == expected
+    assert tracer.ROOTS == {"otherUuid": "otherRoot"}
+    assert tracer.SPANS == {}
+
+
+def test_cycle_key():
+    tested = Tracer
+    tests = [
+        (None, "noteUuid"),
+        (5, "noteUuid/05"),
+        (123, "noteUuid/123"),
+    ]
+    for cycle, expected in tests:
+        result = tested.cycle_key("noteUuid", cycle)
+        assert result == expected, f"---> {cycle}"
+
+
+@patch("hyperscribe.libraries.tracer.SPANS", {})
+@patch("hyperscribe.libraries.tracer.ROOTS", {})
+def test_adopt():
+    tested = Tracer
+    root = Tracer("noteUuid", "cycle", "")
+    root.span_id = "theRoot"
+    tracer.ROOTS.update({"noteUuid": "theRoot", "noteUuid/05": "aheadRoot", "noteUuid/06": "otherRoot"})
+    tracer.SPANS.update(
+        {
+            "noteUuid": [TraceSpan("span1", "theRoot", "theSpan1", 1.0, 1.0, {})],
+            "noteUuid/05": [
+                TraceSpan("span2", "aheadRoot", "theSpan2", 2.0, 1.0, {"key": 2}),
+                TraceSpan("span3", "span2", "theSpan3", 2.5, 0.5, {"key": 3}),
+            ],
+            "noteUuid/06": [TraceSpan("span4", "otherRoot", "theSpan4", 3.0, 1.0, {})],
+        }
+    )
+    tested.adopt(root, 5)
+    assert tracer.ROOTS == {"noteUuid": "theRoot", "noteUuid/06": "otherRoot"}
+    assert tracer.SPANS == {
+        "noteUuid": [
+            TraceSpan("span1", "theRoot", "theSpan1", 1.0, 1.0, {}),
+            TraceSpan("span2", "theRoot", "theSpan2", 2.0, 1.0, {"key": 2}),
+            TraceSpan("span3", "span2", "theSpan3", 2.5, 0.5, {"key": 3}),
+        ],
+        "noteUuid/06": [TraceSpan("span4", "otherRoot", "theSpan4", 3.0, 1.0, {})],
+    }
+
+    # nothing transcribed ahead
+    tested.adopt(root, 7)
+    assert tracer.ROOTS == {"noteUuid": "theRoot", "noteUuid/06": "otherRoot"}
+    assert len(tracer.SPANS["noteUuid"]) == 3
+
+    # the note is not traced
+    tracer.ROOTS.pop("noteUuid")
+    tested.adopt(root, 6)
+    assert tracer.ROOTS == {}
+    assert len(tracer.SPANS["noteUuid"]) == 3
+    assert "noteUuid/06" not in tracer.SPANS
+
+
+@patch("hyperscribe.libraries.tracer.SPANS", {"noteUuid": [], "noteUuid/05": [], "otherUuid": []})
+@patch(
+    "hyperscribe.libraries.tracer.ROOTS",
+    {"noteUuid": "theRoot", "noteUuid/05": "aheadRoot", "otherUuid": "otherRoot", "otherUuid/05": "otherAhead"},
+)
+def test_discard():
+    tested = Tracer
+    tested.discard("noteUuid")
+    assert tracer.ROOTS == {"otherUuid": "otherRoot", "otherUuid/05": "otherAhead"}
+    assert tracer.SPANS == {"otherUuid": []}
+    tracer.ROOTS.pop("otherUuid/05")
+    # not traced
+    tested.discard("noteUuid")
+    assert tracer.ROOTS == {"otherUuid": "otherRoot"}
+    assert tracer.SPANS == {"otherUuid": []}
+
+
+@patch("hyperscribe.libraries.tracer.ROOTS", {"noteUuid1": "theRoot1", "noteUuid2": "theRoot2"})
+def test_store_path():
+    tested = Tracer
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    result = tested.store_path(identification, "2025-12-05", 7)
+    expected = "hyperscribe-canvasInstance/traces/2025-12-05/noteUuid/07.json"
+    assert result == expected
+
+
+def test_set():
+    tested = Tracer("noteUuid", "theName", "theParentId")
+    tested.set({"key1": "value1", "key2": "value2"})
+    assert tested.attributes == {"key1": "value1", "key2": "value2"}
+    tested.set({"key2": "value3", "key3": "value4"})
+    assert tested.attributes == {"key1": "value1", "key2": "value3", "key3": "value4"}
+
+
+@patch("hyperscribe.libraries.tracer.SPANS", {})
+@patch("hyperscribe.libraries.tracer.ROOTS", {"noteUuid": "theRootId"})
+@patch("hyperscribe.libraries.tracer.time")
+@patch("hyperscribe.libraries.tracer.uuid4")
+def test_end(uuid4, time):
+    uuid4.return_value.hex = "a1b2c3d4e5f6a7b8c9d0"
+
+    # the note is traced
+    time.side_effect = [1733405746.0, 1733405747.25, 1733405748.0, 1733405748.5]
+    tested = Tracer.begin("noteUuid", "theName")
+    tested.set({"key1": "value1"})
+    tested.end({"key2": "value2"})
+    tested = Tracer.begin("noteUuid", "otherName")
+    tested.end()
+    expected = {
+        "noteUuid": [
+            TraceSpan(
+                span_id="a1b2c3d4e5f6",
+                parent_id="theRootId",
+                name="theName",
+                start=1733405746.0,
+                duration=1.25,
+                attributes={"key1": "value1", "key2": "value2"},
+            ),
+            TraceSpan(
+                span_id="a1b2c3d4e5f6",
+                parent_id="theRootId",
+                name="otherName",
+                start=1733405748.0,
+                duration=0.5,
+                attributes={},
+            ),
+        ],
+    }
+    assert tracer.SPANS == expected
+
+    # the note is not traced
+    time.side_effect = [1733405746.0, 1733405747.25]
+    tested = Tracer.begin("otherUuid", "theName")
+    tested.end({"key2": "value2"})
+    assert tracer.SPANS == expected
@@ -0,0 +1,157 @@
+from unittest.mock import patch, call, MagicMock
+
+from hyperscribe.libraries import upload_queue
+from hyperscribe.libraries.upload_queue import UploadQueue
+from hyperscribe.structures.aws_s3_credentials import AwsS3Credentials
+
+
+def helper_credentials() -> AwsS3Credentials:
+    return AwsS3Credentials(aws_key="theKey", aws_secret="theSecret", region="theRegion", bucket="theBucket")
+
+
+def helper_future(done: bool) -> MagicMock:
+    result = MagicMock()
+    result.done.side_effect = lambda: done
+    return result
+
+
+@patch("hyperscribe.libraries.upload_queue.UPLOADS", {})
+def test_queued():
+    tested = UploadQueue
+    assert tested.queued() == 0
+
+    upload_queue.UPLOADS["note1"] = [helper_future(True), helper_future(False), helper_future(False)]
+    upload_queue.UPLOADS["note2"] = [helper_future(True)]
+    upload_queue.UPLOADS["note3"] = [helper_future(False)]
+    assert tested.queued() == 3
+
+
+@patch("hyperscribe.libraries.upload_queue.Constants.UPLOAD_QUEUE_MAX_SIZE", 2)
+@patch("hyperscribe.libraries.upload_queue.UPLOADS", {})
+@patch("hyperscribe.libraries.upload_queue.LANES", [MagicMock(), MagicMock(), MagicMock()])
+@patch("hyperscribe.libraries.upload_queue.hash")
+@patch.object(UploadQueue, "upload")
+def test_enqueue(upload, mock_hash):
+    lanes = upload_queue.LANES
+
+    def reset_mocks():
+        upload.reset_mock()
+        mock_hash.reset_mock()
+        for lane in lanes:
+            lane.reset_mock()
+
+    tested = UploadQueue
+    credentials = helper_credentials()
+
+    # room in the queue
+    mock_hash.side_effect = [7, 9]
+    lanes[1].submit.side_effect = ["future1"]
+    lanes[0].submit.side_effect = ["future2"]
+    with patch.object(UploadQueue, "queued", side_effect=[0, 1]):
+        tested.enqueue("theNote", credentials, "theKey1", "theData1")
+        tested.enqueue("theNote", credentials, "theKey2", "theData2")
+    assert upload_queue.UPLOADS == {"theNote": ["future1", "future2"]}
+    assert upload.mock_calls == []
+    calls = [call("theKey1"), call("theKey2")]
+    assert mock_hash.mock_calls == calls
+    calls = [call.submit(upload, "theNote", credentials, "theKey2", "theData2")]
+    assert lanes[0].mock_calls == calls
+    calls = [call.submit(upload, "theNote", credentials, "theKey1", "theData1")]
+    assert lanes[1].mock_calls == calls
+    assert lanes[2].mock_calls == []
+    reset_mocks()
+
+    # the queue is full
+    with patch.object(UploadQueue, "queued", side_effect=[2]):
+        tested.enqueue("theNote", credentials, "theKey3", "theData3")
+    assert upload_queue.UPLOADS == {"theNote": ["future1", "future2"]}
+    calls = [call("theNote", credentials, "theKey3", "theData3")]
+    assert upload.mock_calls == calls
+    assert mock_hash.mock_calls == []
+    for lane in lanes:
+        assert lane.mock_calls == []
+    reset_mocks()
+
+
+@patch("hyperscribe.libraries.upload_queue.log")
+@patch("hyperscribe.libraries.upload_queue.sleep")
+@patch("hyperscribe.libraries.upload_queue.AwsS3")
+def test_upload(aws_s3, sleep, log):
+    def reset_mocks():
+        aws_s3.reset_mock()
+        sleep.reset_mock()
+        log.reset_mock()
+
+    tested = UploadQueue
+    credentials = helper_credentials()
+    upload_call = [call(credentials), call().upload_text_to_s3("theKey", "theData", "theNote")]
+
+    tests = [
+        # success at once
+        ([200], 1, False),
+        # retried after a server error or a failure of the connection
+        ([503, 201], 2, False),
+        ([RuntimeError("boom"), None, 200], 3, False),
+        # not retried after a client error
+        ([403], 1, True),
+        # too many attempts
+        ([500, 500, 500, 500], 4, True),
+    ]
+    for outcomes, exp_attempts, exp_failed in tests:
+        responses = []
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                responses.append(outcome)
+            else:
+                responses.append(MagicMock(status_code=outcome))
+        aws_s3.return_value.upload_text_to_s3.side_effect = responses
+        tested.upload("theNote", credentials, "theKey", "theData")
+
+        assert aws_s3.mock_calls == upload_call * exp_attempts, f"---> {outcomes}"
+        calls = [call(0.5), call(1.0), call(2.0)][: exp_attempts - 1]
+        assert sleep.mock_calls == calls, f"---> {outcomes}"
+        calls = []
+        if exp_failed:
+            status_code = outcomes[-1] or 0
+            calls = [call.info(f"upload of theKey failed with status {status_code}")]
+        assert log.mock_calls == calls, f"---> {outcomes}"
+        reset_mocks()
+
+
+@patch("hyperscribe.libraries.upload_queue.UPLOADS", {})
+def test_flush():
+    tested = UploadQueue
+    futures = [MagicMock(), MagicMock()]
+    futures[0].exception.side_effect = [None]
+    futures[1].exception.side_effect = lambda: RuntimeError("failed upload")
+    upload_queue.UPLOADS["theNote"] = futures
+    upload_queue.UPLOADS["otherNote"] = [MagicMock()]
+
+    tested.flush("theNote")
+    assert list(upload_queue.UPLOADS.keys()) == ["otherNote"]
+    for future in futures:
+        assert future.mock_calls == [call.exception()]
+    assert upload_queue.UPLOADS["otherNote"][0].mock_calls == []
+
+    # no upload for the note
+    tested.flush("theNote")
+    assert list(upload_queue.UPLOADS.keys()) == ["otherNote"]
+
+
+@patch("hyperscribe.libraries.upload_queue.UPLOADS", {})
+def test_prune():
+    tested = UploadQueue
+    futures = [helper_future(True), helper_future(False), helper_future(True)]
+    upload_queue.UPLOADS["theNote"] = futures
+    upload_queue.UPLOADS["otherNote"] = [helper_future(True)]
+
+    tested.prune("theNote")
+    assert upload_queue.UPLOADS == {"theNote": [futures[1]], "otherNote": upload_queue.UPLOADS["otherNote"]}
+
+    # all the uploads are done
+    tested.prune("otherNote")
+    assert upload_queue.UPLOADS == {"theNote": [futures[1]]}
+
+    # no upload for the note
+    tested.prune("unknownNote")
+    assert upload_queue.UPLOADS == {"theNote": [futures[1]]}
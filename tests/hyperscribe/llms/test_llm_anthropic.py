@@ -15,6 +15,13 @@ def test_support_speaker_identification():
     assert result is True
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmAnthropic(memory_log, "anthropicKey", "theModel", False)
+    result = tested.vendor()
+    assert result == "Anthropic"
+
+
 def test_add_audio():
     memory_log = MagicMock()
     tested = LlmAnthropic(memory_log, "anthropicKey", "theModel", False)
@@ -74,14 +81,14 @@ def test_to_dict():
     assert memory_log.mock_calls == []
 
 
-@patch("hyperscribe.llms.llm_anthropic.requests_post")
+@patch("hyperscribe.llms.llm_anthropic.HttpPool")
 @patch.object(LlmAnthropic, "to_dict")
-def test_request(to_dict, requests_post):
+def test_request(to_dict, http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
         to_dict.reset_mock()
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     response = type(
@@ -100,7 +107,7 @@ def test_request(to_dict, requests_post):
 
     # error
     to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmAnthropic(memory_log, "apiKey", "theModel", False)
     result = tested.request()
@@ -115,16 +122,15 @@ def test_request(to_dict, requests_post):
     calls = [call(), call()]
     assert to_dict.mock_calls == calls
     calls = [
-        call(
+        call.post(
+            "Anthropic",
             "https://api.anthropic.com/v1/messages",
             headers={"Content-Type": "application/json", "anthropic-version": "2023-06-01", "x-api-key": "apiKey"},
             params={},
             data='{"key": "valueX"}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log('{\n  "key": "valueY"\n}'),
@@ -141,7 +147,7 @@ def test_request(to_dict, requests_post):
     # no error
     response.status_code = 200
     to_dict.side_effect = [{"key": "valueA"}, {"key": "valueB"}]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmAnthropic(memory_log, "apiKey", "theModel", False)
     result = tested.request()
@@ -155,16 +161,15 @@ def test_request(to_dict, requests_post):
     calls = [call(), call()]
     assert to_dict.mock_calls == calls
     calls = [
-        call(
+        call.post(
+            "Anthropic",
             "https://api.anthropic.com/v1/messages",
             headers={"Content-Type": "application/json", "anthropic-version": "2023-06-01", "x-api-key": "apiKey"},
             params={},
             data='{"key": "valueA"}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log('{\n  "key": "valueB"\n}'),
@@ -177,3 +182,105 @@ def test_request(to_dict, requests_post):
     ]
     assert memory_log.mock_calls == calls
     reset_mocks()
+
+
+def test_support_streaming():
+    memory_log = MagicMock()
+    tested = LlmAnthropic(memory_log, "anthropicKey", "theModel", False)
+    result = tested.support_streaming()
+    assert result is True
+
+
+@patch.object(LlmAnthropic, "stream_request")
+@patch.object(LlmAnthropic, "to_dict")
+def test_request__streaming(to_dict, stream_request):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        to_dict.reset_mock()
+        stream_request.reset_mock()
+        memory_log.reset_mock()
+
+    to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}, {"key": "valueZ"}]
+    stream_request.side_effect = ["theResponse"]
+
+    tested = LlmAnthropic(memory_log, "apiKey", "theModel", False)
+    tested.expected_schemas = ["theSchema"]
+    result = tested.request()
+    assert result == "theResponse"
+
+    calls = [call(), call(), call()]
+    assert to_dict.mock_calls == calls
+    calls = [
+        call(
+            "https://api.anthropic.com/v1/messages",
+            {"Content-Type": "application/json", "anthropic-version": "2023-06-01", "x-api-key": "apiKey"},
+            '{"key": "valueZ", "stream": true}',
+            tested.stream_event,
+        ),
+    ]
+    assert stream_request.mock_calls == calls
+    calls = [
+        call.log("--- request begins:"),
+        call.log('{\n  "key": "valueY"\n}'),
+    ]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+
+def test_stream_event():
+    tested = LlmAnthropic
+    tests = [
+        (
+            {"type": "message_start", "message": {"usage": {"input_tokens": 137, "output_tokens": 1}}},
+            ("", TokenCounts(prompt=137, generated=1)),
+        ),
+        ({"type": "content_block_start", "index": 0}, ("", TokenCounts(prompt=0, generated=0))),
+        (
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "some text"}},
+            ("some text", TokenCounts(prompt=0, generated=0)),
+        ),
+        ({"type": "message_delta", "usage": {"output_tokens": 43}}, ("", TokenCounts(prompt=0, generated=43))),
+        ({"type": "ping"}, ("", TokenCounts(prompt=0, generated=0))),
+    ]
+    for event, expected in tests:
+        result = tested.stream_event(event)
+        assert result == expected, f"---> {event}"
+
+
+def test_stream_ended():
+    tested = LlmAnthropic
+    tests = [
+        ({"type": "content_block_stop", "index": 0}, False),
+        ({"type": "message_delta", "usage": {"output_tokens": 43}}, False),
+        ({"type": "message_stop"}, True),
+    ]
+    for event, expected in tests:
+        result = tested.stream_ended(event)
+        assert result is expected, f"---> {event}"
+
+
+def test_consume_stream():
+    memory_log = MagicMock()
+    response = MagicMock(status_code=200)
+    tested = LlmAnthropic(memory_log, "apiKey", "theModel", False)
+    tested.expected_schemas = [{"type": "array"}]
+
+    # the generated tokens sent after the completion of the expected block are counted
+    events = [
+        {"type": "message_start", "message": {"usage": {"input_tokens": 1200, "output_tokens": 1}}},
+        {"type": "content_block_start", "index": 0},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "```json\n[1, 2]\n```"}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "\nsome text"}},
+        {"type": "content_block_stop", "index": 0},
+        {"type": "message_delta", "usage": {"output_tokens": 300}},
+        {"type": "message_stop"},
+    ]
+    response.iter_lines.side_effect = [[f"data: {json.dumps(event)}".encode() for event in events]]
+    result = tested.consume_stream(response, tested.stream_event)
+    expected = HttpResponse(
+        code=200,
+        response="```json\n[1, 2]\n```",
+        tokens=TokenCounts(prompt=1200, generated=300),
+    )
+    assert result == expected
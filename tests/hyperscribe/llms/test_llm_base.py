@@ -3,7 +3,9 @@ from time import time
 from unittest.mock import patch, call, MagicMock
 
 import pytest
+from requests import RequestException
 
+from hyperscribe.libraries.schema_registry import SchemaRegistry
 from hyperscribe.llms.llm_base import LlmBase
 from hyperscribe.structures.http_response import HttpResponse
 from hyperscribe.structures.instruction import Instruction
@@ -30,6 +32,8 @@ def test___init__():
     assert tested.temperature == 0.0
     assert tested.prompts == []
     assert tested.audios == []
+    assert tested.expected_schemas == []
+    assert tested.hedging is None
 
     assert memory_log.mock_calls == []
 
@@ -42,6 +46,166 @@ def test_support_speaker_identification():
     assert memory_log.mock_calls == []
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    with pytest.raises(NotImplementedError):
+        _ = tested.vendor()
+    assert memory_log.mock_calls == []
+
+
+def test_support_streaming():
+    memory_log = MagicMock()
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    result = tested.support_streaming()
+    assert result is False
+    assert memory_log.mock_calls == []
+
+
+def test_stream_ended():
+    tested = LlmBase
+    result = tested.stream_ended({"type": "message_stop"})
+    assert result is False
+
+
+@patch.object(LlmBase, "support_streaming")
+def test_is_streaming(support_streaming):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        support_streaming.reset_mock()
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    tests = [
+        ([], True, False, []),
+        (["theSchema"], True, True, [call()]),
+        (["theSchema"], False, False, [call()]),
+    ]
+    for schemas, supported, expected, exp_calls in tests:
+        tested.expected_schemas = schemas
+        support_streaming.side_effect = [supported]
+        result = tested.is_streaming()
+        assert result is expected
+        assert support_streaming.mock_calls == exp_calls
+        reset_mocks()
+    assert memory_log.mock_calls == []
+
+
+@patch("hyperscribe.llms.llm_base.HttpPool")
+@patch.object(LlmBase, "consume_stream")
+@patch.object(LlmBase, "vendor")
+def test_stream_request(vendor, consume_stream, http_pool):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        vendor.reset_mock()
+        consume_stream.reset_mock()
+        http_pool.reset_mock()
+        memory_log.reset_mock()
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+
+    # the response is consumed by the pool, while the slot and the ticket are held
+    vendor.side_effect = ["theVendor"]
+    http_pool.stream.side_effect = lambda vendor_name, url, consume, **kwargs: consume("theRequest")
+    consume_stream.side_effect = ["theResponse"]
+    result = tested.stream_request("theUrl", {"key": "value"}, "theData", "theStreamEvent")
+    assert result == "theResponse"
+    calls = [call()]
+    assert vendor.mock_calls == calls
+    calls = [call("theRequest", "theStreamEvent")]
+    assert consume_stream.mock_calls == calls
+    assert len(http_pool.mock_calls) == 1
+    assert http_pool.mock_calls[0].args[:2] == ("theVendor", "theUrl")
+    assert http_pool.mock_calls[0].kwargs == {"headers": {"key": "value"}, "params": {}, "data": "theData"}
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+
+@patch.object(LlmBase, "stream_ended")
+def test_consume_stream(stream_ended):
+    memory_log = MagicMock()
+    stream_event = MagicMock()
+    response = MagicMock()
+
+    def reset_mocks():
+        stream_ended.reset_mock()
+        memory_log.reset_mock()
+        stream_event.reset_mock()
+        response.reset_mock()
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    tested.expected_schemas = [{"type": "array"}, {"type": "array"}]
+
+    # http error
+    response.status_code = 429
+    response.text = "theError"
+    result = tested.consume_stream(response, stream_event)
+    expected = HttpResponse(code=429, response="theError", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+    calls = [
+        call.log("status code: 429"),
+        call.log("theError"),
+        call.log("--- request ends ---"),
+    ]
+    assert memory_log.mock_calls == calls
+    assert stream_event.mock_calls == []
+    assert stream_ended.mock_calls == []
+    reset_mocks()
+
+    # the response is settled as soon as the expected blocks are received, even an invalid one,
+    # the stream is read until its terminal event for the final usage
+    response.status_code = 200
+    response.iter_lines.side_effect = [[f'data: {{"id": {idx}}}'.encode() for idx in range(7)]]
+    stream_event.side_effect = [
+        ('response:\n```json\n{"key":', TokenCounts(prompt=71, generated=1)),
+        (" 1}\n```\n", TokenCounts(prompt=0, generated=0)),
+        ("```json\n[1, 2]\n", TokenCounts(prompt=0, generated=11)),
+        ("```\nmore text", TokenCounts(prompt=0, generated=23)),
+        (" ignored text", TokenCounts(prompt=0, generated=0)),
+        ("", TokenCounts(prompt=71, generated=37)),
+        ("unread", TokenCounts(prompt=0, generated=99)),
+    ]
+    stream_ended.side_effect = [False, False, False, False, False, True]
+    result = tested.consume_stream(response, stream_event)
+    expected = HttpResponse(
+        code=200,
+        response='response:\n```json\n{"key": 1}\n```\n```json\n[1, 2]\n```\nmore text',
+        tokens=TokenCounts(prompt=71, generated=37),
+    )
+    assert result == expected
+    calls = [
+        call.log("status code: 200"),
+        call.log('response:\n```json\n{"key": 1}\n```\n```json\n[1, 2]\n```\nmore text'),
+        call.log("--- request ends (2 JSON blocks) ---"),
+    ]
+    assert memory_log.mock_calls == calls
+    calls = [call({"id": idx}) for idx in range(6)]
+    assert stream_event.mock_calls == calls
+    assert stream_ended.mock_calls == calls
+    calls = [call.iter_lines()]
+    assert response.mock_calls == calls
+    reset_mocks()
+
+    # no terminal event: the stream is read until the vendor closes it
+    response.iter_lines.side_effect = [[b"data: {}", b"data: {}", b"data: [DONE]"]]
+    stream_event.side_effect = [
+        ('```json\n{"key": 1}\n```\n```json\n[]\n```', TokenCounts(prompt=71, generated=5)),
+        ("", TokenCounts(prompt=71, generated=9)),
+    ]
+    stream_ended.side_effect = [False, False]
+    result = tested.consume_stream(response, stream_event)
+    expected = HttpResponse(
+        code=200,
+        response='```json\n{"key": 1}\n```\n```json\n[]\n```',
+        tokens=TokenCounts(prompt=71, generated=9),
+    )
+    assert result == expected
+    assert stream_event.mock_calls == [call({}), call({})]
+    assert stream_ended.mock_calls == [call({}), call({})]
+    reset_mocks()
+
+
 def test_reset_prompts():
     prompts = [
         LlmTurn(role="system", text=["line 0"]),
@@ -152,35 +316,61 @@ def test_request():
     assert memory_log.mock_calls == []
 
 
+@patch("hyperscribe.llms.llm_base.RateLimiter")
+@patch.object(LlmBase, "vendor")
 @patch.object(LlmBase, "request")
-def test_attempt_requests(request):
+def test_attempt_requests(request, vendor, rate_limiter):
     memory_log = MagicMock()
 
     def reset_mocks():
         request.reset_mock()
+        vendor.reset_mock()
+        rate_limiter.reset_mock()
+        memory_log.reset_mock()
 
     tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    vendor.return_value = "theVendor"
 
     # one error
     request.side_effect = [
         HttpResponse(code=501, response="some response1", tokens=TokenCounts(prompt=0, generated=0)),
         HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0)),
     ]
+    rate_limiter.is_retryable.side_effect = [True]
+    result = tested.attempt_requests(3)
+    expected = HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+    calls = [call(), call()]
+    assert request.mock_calls == calls
+    assert memory_log.mock_calls == []
+    calls = [call.is_retryable(501), call.for_key("theVendor"), call.for_key().backoff(0)]
+    assert rate_limiter.mock_calls == calls
+    reset_mocks()
+
+    # one error, not worth waiting
+    request.side_effect = [
+        HttpResponse(code=400, response="some response1", tokens=TokenCounts(prompt=0, generated=0)),
+        HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0)),
+    ]
+    rate_limiter.is_retryable.side_effect = [False]
     result = tested.attempt_requests(3)
     expected = HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0))
     assert result == expected
     calls = [call(), call()]
     assert request.mock_calls == calls
     assert memory_log.mock_calls == []
+    calls = [call.is_retryable(400)]
+    assert rate_limiter.mock_calls == calls
     reset_mocks()
 
     # too many errors
     request.side_effect = [
-        HttpResponse(code=501, response="some response1", tokens=TokenCounts(prompt=0, generated=0)),
-        HttpResponse(code=501, response="some response2", tokens=TokenCounts(prompt=0, generated=0)),
-        HttpResponse(code=501, response="some response3", tokens=TokenCounts(prompt=0, generated=0)),
+        HttpResponse(code=429, response="some response1", tokens=TokenCounts(prompt=0, generated=0)),
+        HttpResponse(code=529, response="some response2", tokens=TokenCounts(prompt=0, generated=0)),
+        HttpResponse(code=429, response="some response3", tokens=TokenCounts(prompt=0, generated=0)),
         HttpResponse(code=200, response="some response4", tokens=TokenCounts(prompt=73, generated=31)),
     ]
+    rate_limiter.is_retryable.side_effect = [True, True]
     result = tested.attempt_requests(3)
     expected = HttpResponse(
         code=429,
@@ -192,18 +382,335 @@ def test_attempt_requests(request):
     assert request.mock_calls == calls
     calls = [call.log("error: Http error: max attempts (3) exceeded")]
     assert memory_log.mock_calls == calls
+    calls = [
+        call.is_retryable(429),
+        call.for_key("theVendor"),
+        call.for_key().backoff(0),
+        call.is_retryable(529),
+        call.for_key("theVendor"),
+        call.for_key().backoff(1),
+    ]
+    assert rate_limiter.mock_calls == calls
+    reset_mocks()
+
+    # connection error
+    request.side_effect = [
+        RequestException("read timed out"),
+        HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0)),
+    ]
+    rate_limiter.is_retryable.side_effect = [True]
+    result = tested.attempt_requests(3)
+    expected = HttpResponse(code=200, response="some response2", tokens=TokenCounts(prompt=0, generated=0))
+    assert result == expected
+    calls = [call(), call()]
+    assert request.mock_calls == calls
+    calls = [call.log("error: read timed out")]
+    assert memory_log.mock_calls == calls
+    calls = [call.is_retryable(0), call.for_key("theVendor"), call.for_key().backoff(0)]
+    assert rate_limiter.mock_calls == calls
     reset_mocks()
 
 
-@patch("hyperscribe.llms.llm_base.time", wraps=time)
-@patch.object(LlmBase, "extract_json_from")
+@patch("hyperscribe.llms.llm_base.StageLatency")
+@patch("hyperscribe.llms.llm_base.time")
 @patch.object(LlmBase, "attempt_requests")
-def test_chat(attempt_requests, extract_json_from, mock_time):
-    memory_log = MagicMock()
+def test_timed_requests(attempt_requests, mock_time, stage_latency):
+    memory_log = MagicMock(label="theLabel")
 
     def reset_mocks():
         attempt_requests.reset_mock()
+        mock_time.reset_mock()
+        stage_latency.reset_mock()
+        memory_log.reset_mock()
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    tests = [
+        (200, [call.record("theLabel", 2.5)]),
+        (429, []),
+    ]
+    for code, exp_calls in tests:
+        response = HttpResponse(code=code, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+        attempt_requests.side_effect = [response]
+        mock_time.side_effect = [100.0, 102.5]
+        result = tested.timed_requests(3)
+        assert result is response
+        assert attempt_requests.mock_calls == [call(3)]
+        assert stage_latency.mock_calls == exp_calls
+        assert memory_log.mock_calls == []
+        reset_mocks()
+
+
+@patch("hyperscribe.llms.llm_base.sleep")
+@patch("hyperscribe.llms.llm_base.time")
+@patch("hyperscribe.llms.llm_base.hedger")
+@patch("hyperscribe.llms.llm_base.RateLimiter")
+@patch("hyperscribe.llms.llm_base.StageLatency")
+@patch.object(LlmBase, "vendor")
+@patch.object(LlmBase, "first_valid")
+@patch.object(LlmBase, "timed_requests")
+def test_hedged_requests(timed_requests, first_valid, vendor, stage_latency, rate_limiter, hedger, mock_time, sleep):
+    memory_log = MagicMock(label="theLabel")
+    hedge = LlmBase(memory_log, "otherKey", "theModel", False)
+    primary = MagicMock()
+    duplicate = MagicMock()
+
+    def reset_mocks():
+        timed_requests.reset_mock()
+        first_valid.reset_mock()
+        vendor.reset_mock()
+        stage_latency.reset_mock()
+        rate_limiter.reset_mock()
+        hedger.reset_mock()
+        mock_time.reset_mock()
+        sleep.reset_mock()
+        memory_log.reset_mock()
+        primary.reset_mock()
+        duplicate.reset_mock()
+
+    response = HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    tested.temperature = 0.7
+    tested.prompts = [LlmTurn(role="user", text=["theUserPrompt"])]
+    tested.audios = [{"format": "mp3", "data": b"theAudio"}]
+    tested.expected_schemas = ["theSchema"]
+
+    # not hedged or no known latency
+    for hedging, threshold in [(None, 3.5), (lambda: hedge, None)]:
+        tested.hedging = hedging
+        stage_latency.threshold.side_effect = [threshold]
+        timed_requests.side_effect = [response]
+        result = tested.hedged_requests(3, ["theSchema"])
+        assert result is response
+        assert stage_latency.mock_calls == [call.threshold("theLabel")]
+        assert timed_requests.mock_calls == [call(3)]
+        assert first_valid.mock_calls == []
+        assert vendor.mock_calls == []
+        assert rate_limiter.mock_calls == []
+        assert hedger.mock_calls == []
+        assert mock_time.mock_calls == []
+        assert sleep.mock_calls == []
+        assert memory_log.mock_calls == []
+        reset_mocks()
+
+    tested.hedging = lambda: hedge
+    # fast enough
+    stage_latency.threshold.side_effect = [3.5]
+    hedger.submit.side_effect = [primary]
+    primary.done.side_effect = [False, True, True]
+    primary.result.side_effect = [response]
+    mock_time.side_effect = [100.0, 101.0]
+    result = tested.hedged_requests(3, ["theSchema"])
+    assert result is response
+    assert stage_latency.mock_calls == [call.threshold("theLabel")]
+    assert timed_requests.mock_calls == []
+    assert first_valid.mock_calls == []
+    assert vendor.mock_calls == []
+    assert rate_limiter.mock_calls == []
+    assert hedger.mock_calls == [call.submit(timed_requests, 3)]
+    assert primary.mock_calls == [call.done(), call.done(), call.done(), call.result()]
+    assert mock_time.mock_calls == [call(), call()]
+    assert sleep.mock_calls == [call(0.05)]
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+    # too slow, no free slot for the duplicate
+    stage_latency.threshold.side_effect = [3.5]
+    vendor.side_effect = ["theVendor"]
+    rate_limiter.for_key.return_value.has_free_slot.side_effect = [False]
+    hedger.submit.side_effect = [primary]
+    primary.done.side_effect = [False, False, False]
+    primary.result.side_effect = [response]
+    mock_time.side_effect = [100.0, 102.0, 103.6]
+    result = tested.hedged_requests(3, ["theSchema"])
+    assert result is response
+    assert stage_latency.mock_calls == [call.threshold("theLabel")]
+    assert first_valid.mock_calls == []
+    assert vendor.mock_calls == [call()]
+    assert rate_limiter.mock_calls == [call.for_key("theVendor"), call.for_key().has_free_slot()]
+    assert hedger.mock_calls == [call.submit(timed_requests, 3)]
+    assert primary.mock_calls == [call.done(), call.done(), call.done(), call.result()]
+    assert mock_time.mock_calls == [call(), call(), call()]
+    assert sleep.mock_calls == [call(0.05)]
+    assert memory_log.mock_calls == [call.log("--- no hedged request after 3.500s, no free slot ---")]
+    reset_mocks()
+
+    # too slow
+    stage_latency.threshold.side_effect = [3.5]
+    vendor.side_effect = ["theVendor"]
+    rate_limiter.for_key.return_value.has_free_slot.side_effect = [True]
+    hedger.submit.side_effect = [primary, duplicate]
+    primary.done.side_effect = [False, False, False]
+    mock_time.side_effect = [100.0, 102.0, 103.6]
+    first_valid.side_effect = [response]
+    result = tested.hedged_requests(3, ["theSchema"])
+    assert result is response
+    assert stage_latency.mock_calls == [call.threshold("theLabel")]
+    assert first_valid.mock_calls == [call([primary, duplicate], ["theSchema"])]
+    assert vendor.mock_calls == [call()]
+    assert rate_limiter.mock_calls == [call.for_key("theVendor"), call.for_key().has_free_slot()]
+    calls = [
+        call.submit(timed_requests, 3),
+        call.submit(hedge.timed_requests, 3),
+    ]
+    assert hedger.mock_calls == calls
+    assert primary.mock_calls == [call.done(), call.done(), call.done()]
+    assert mock_time.mock_calls == [call(), call(), call()]
+    assert sleep.mock_calls == [call(0.05)]
+    assert memory_log.mock_calls == [call.log("--- hedged request after 3.500s ---")]
+    assert hedge.temperature == 0.7
+    assert hedge.prompts == [LlmTurn(role="user", text=["theUserPrompt"])]
+    assert hedge.prompts is not tested.prompts
+    assert hedge.audios == [{"format": "mp3", "data": b"theAudio"}]
+    assert hedge.expected_schemas == ["theSchema"]
+    reset_mocks()
+
+
+@patch("hyperscribe.llms.llm_base.sleep")
+@patch.object(LlmBase, "extract_json_from")
+def test_first_valid(extract_json_from, sleep):
+    memory_log = MagicMock()
+    futures = [MagicMock(), MagicMock()]
+
+    def reset_mocks():
         extract_json_from.reset_mock()
+        sleep.reset_mock()
+        memory_log.reset_mock()
+        for future in futures:
+            future.reset_mock()
+
+    def response(code: int, text: str) -> HttpResponse:
+        return HttpResponse(code=code, response=text, tokens=TokenCounts(prompt=0, generated=0))
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    valid = JsonExtract(has_error=False, error="", content=["item"])
+    invalid = JsonExtract(has_error=True, error="theError", content=[])
+
+    tests = [
+        # the duplicate wins
+        (
+            [[False, False, False], [False, True]],
+            [response(200, "response1"), response(200, "response2")],
+            [valid],
+            1,
+            [call("response2", ["theSchema"])],
+            1,
+        ),
+        # the first response is invalid, the duplicate wins
+        (
+            [[True], [False, True]],
+            [response(200, "response1"), response(200, "response2")],
+            [invalid, valid],
+            1,
+            [call("response1", ["theSchema"]), call("response2", ["theSchema"])],
+            0,
+        ),
+        # http error of the duplicate, the first request wins
+        (
+            [[False, True], [True]],
+            [response(200, "response1"), response(500, "response2")],
+            [valid],
+            0,
+            [call("response1", ["theSchema"])],
+            0,
+        ),
+        # no valid response, the first request is kept
+        (
+            [[True], [True]],
+            [response(429, "response1"), response(200, "response2")],
+            [invalid],
+            0,
+            [call("response2", ["theSchema"])],
+            0,
+        ),
+    ]
+    for dones, responses, extracts, exp_winner, exp_extract_calls, exp_sleeps in tests:
+        for idx, future in enumerate(futures):
+            future.done.side_effect = dones[idx]
+            future.result.side_effect = [responses[idx], responses[idx]]
+        extract_json_from.side_effect = extracts
+
+        result = tested.first_valid(futures, ["theSchema"])
+        assert result is responses[exp_winner]
+        assert extract_json_from.mock_calls == exp_extract_calls
+        assert sleep.mock_calls == [call(0.05)] * exp_sleeps
+        loser = futures[1 - exp_winner]
+        assert loser.mock_calls[-2:] == [call.cancel(), call.add_done_callback(tested.consume_loser)]
+        assert call.cancel() not in futures[exp_winner].mock_calls
+        assert memory_log.mock_calls == []
+        reset_mocks()
+
+    # no schema: any successful response is valid
+    futures[0].done.side_effect = [False]
+    futures[1].done.side_effect = [True]
+    futures[1].result.side_effect = [response(200, "response2"), response(200, "response2")]
+    result = tested.first_valid(futures, [])
+    assert result == response(200, "response2")
+    assert extract_json_from.mock_calls == []
+    assert sleep.mock_calls == []
+    reset_mocks()
+
+
+def test_consume_loser():
+    memory_log = MagicMock()
+    future = MagicMock()
+
+    def reset_mocks():
+        memory_log.reset_mock()
+        future.reset_mock()
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+    tokens = TokenCounts(prompt=125, generated=37)
+
+    # completed
+    memory_log.is_session_open.side_effect = [True]
+    future.cancelled.side_effect = [False]
+    future.exception.side_effect = [None]
+    future.result.side_effect = [HttpResponse(code=200, response="theResponse", tokens=tokens)]
+    tested.consume_loser(future)
+    assert memory_log.mock_calls == [call.is_session_open(), call.add_consumption(tokens)]
+    reset_mocks()
+
+    # completed after the end of the session
+    memory_log.is_session_open.side_effect = [False]
+    future.cancelled.side_effect = [False]
+    future.exception.side_effect = [None]
+    tested.consume_loser(future)
+    assert memory_log.mock_calls == [call.is_session_open()]
+    assert future.mock_calls == [call.cancelled(), call.exception()]
+    reset_mocks()
+
+    # cancelled
+    future.cancelled.side_effect = [True]
+    tested.consume_loser(future)
+    assert memory_log.mock_calls == []
+    assert future.mock_calls == [call.cancelled()]
+    reset_mocks()
+
+    # failed
+    future.cancelled.side_effect = [False]
+    future.exception.side_effect = lambda: RequestException("theError")
+    tested.consume_loser(future)
+    assert memory_log.mock_calls == []
+    assert future.mock_calls == [call.cancelled(), call.exception()]
+    reset_mocks()
+
+
+@patch("hyperscribe.llms.llm_base.time", wraps=time)
+@patch("hyperscribe.llms.llm_base.Tracer")
+@patch.object(LlmBase, "repair_json")
+@patch.object(LlmBase, "extract_json_from")
+@patch.object(LlmBase, "hedged_requests")
+def test_chat(hedged_requests, extract_json_from, repair_json, tracer, mock_time):
+    memory_log = MagicMock(label="theLabel")
+    memory_log.identification.note_uuid = "theNoteUuid"
+    memory_log.key = "theNoteUuid/05"
+    memory_log.span = "theStageSpan"
+
+    def reset_mocks():
+        hedged_requests.reset_mock()
+        extract_json_from.reset_mock()
+        repair_json.reset_mock()
+        tracer.reset_mock()
         mock_time.reset_mock()
         memory_log.reset_mock()
 
@@ -214,7 +721,7 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
 
     # http error
     mock_time.side_effect = times[0:2]
-    attempt_requests.side_effect = [
+    hedged_requests.side_effect = [
         HttpResponse(
             code=429,
             response="max attempts (3) exceeded",
@@ -222,6 +729,7 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
         )
     ]
     extract_json_from.side_effect = []
+    repair_json.side_effect = []
     result = tested.chat([])
     expected = JsonExtract(has_error=True, error="max attempts (3) exceeded", content=[])
     assert result == expected
@@ -230,21 +738,35 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
 
     calls = [call(), call()]
     assert mock_time.mock_calls == calls
-    calls = [call(3)]
-    assert attempt_requests.mock_calls == calls
+    calls = [call(3, [])]
+    assert hedged_requests.mock_calls == calls
     assert extract_json_from.mock_calls == []
+    assert repair_json.mock_calls == []
     calls = [
         call.log("-- CHAT BEGINS --"),
         call.log("--- CHAT ENDS - 1 attempts - 3229ms ---"),
         call.store_so_far(),
     ]
     assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 1,
+                "tokens": {"prompt": 0, "generated": 0},
+                "error": True,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
     reset_mocks()
 
     # no http error
     # -- one json error
     mock_time.side_effect = times[2:4]
-    attempt_requests.side_effect = [
+    hedged_requests.side_effect = [
         HttpResponse(code=200, response="response1:\nline1\nline2", tokens=TokenCounts(prompt=71, generated=51)),
         HttpResponse(code=200, response="response2:\nline3\nline4", tokens=TokenCounts(prompt=83, generated=47)),
     ]
@@ -252,6 +774,7 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
         JsonExtract(has_error=True, error="some error1", content=["error 1"]),
         JsonExtract(has_error=False, error="no error", content=["line1", "line2"]),
     ]
+    repair_json.side_effect = [("retried", JsonExtract(has_error=True, error="some error1", content=[]))]
     result = tested.chat([])
     expected = JsonExtract(has_error=False, error="no error", content=["line1", "line2"])
     assert result == expected
@@ -274,14 +797,24 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
     assert tested.prompts == exp_prompts
     tested.prompts = []
 
-    calls = [call(3), call(3)]
-    assert attempt_requests.mock_calls == calls
+    calls = [call(3, []), call(3, [])]
+    assert hedged_requests.mock_calls == calls
     calls = [call("response1:\nline1\nline2", []), call("response2:\nline3\nline4", [])]
     assert extract_json_from.mock_calls == calls
+    calls = [
+        call(
+            "response1:\nline1\nline2",
+            [],
+            JsonExtract(has_error=True, error="some error1", content=["error 1"]),
+        ),
+    ]
+    assert repair_json.mock_calls == calls
     calls = [
         call.log("-- CHAT BEGINS --"),
         call.add_consumption(TokenCounts(prompt=71, generated=51)),
+        call.add_json_outcome("retried"),
         call.add_consumption(TokenCounts(prompt=83, generated=47)),
+        call.add_json_outcome("valid"),
         call.log("result->>"),
         call.log('[\n  "line1",\n  "line2"\n]'),
         call.log("<<-"),
@@ -289,10 +822,23 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
         call.store_so_far(),
     ]
     assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 2,
+                "tokens": {"prompt": 154, "generated": 98},
+                "error": False,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
     reset_mocks()
     # -- too many json error
     mock_time.side_effect = times[4:6]
-    attempt_requests.side_effect = [
+    hedged_requests.side_effect = [
         HttpResponse(code=200, response="response1:\nline1\nline2", tokens=TokenCounts(prompt=71, generated=41)),
         HttpResponse(code=200, response="response2:\nline3\nline4", tokens=TokenCounts(prompt=72, generated=42)),
         HttpResponse(code=200, response="response3:\nline5\nline6", tokens=TokenCounts(prompt=73, generated=43)),
@@ -303,6 +849,11 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
         JsonExtract(has_error=True, error="some error2", content=["error 2"]),
         JsonExtract(has_error=True, error="some error3", content=["error 3"]),
     ]
+    repair_json.side_effect = [
+        ("retried", JsonExtract(has_error=True, error="some error1", content=[])),
+        ("retried", JsonExtract(has_error=True, error="some error2", content=[])),
+        ("retried", JsonExtract(has_error=True, error="some error3", content=[])),
+    ]
     result = tested.chat([])
     expected = JsonExtract(has_error=True, error="JSON incorrect: max attempts (3) exceeded", content=[])
     assert result == expected
@@ -351,24 +902,475 @@ def test_chat(attempt_requests, extract_json_from, mock_time):
     assert tested.prompts == exp_prompts
     tested.prompts = []
 
-    calls = [call(3), call(3), call(3)]
-    assert attempt_requests.mock_calls == calls
+    calls = [call(3, []), call(3, []), call(3, [])]
+    assert hedged_requests.mock_calls == calls
     calls = [
         call("response1:\nline1\nline2", []),
         call("response2:\nline3\nline4", []),
         call("response3:\nline5\nline6", []),
     ]
     assert extract_json_from.mock_calls == calls
+    calls = [
+        call("response1:\nline1\nline2", [], JsonExtract(has_error=True, error="some error1", content=["error 1"])),
+        call("response2:\nline3\nline4", [], JsonExtract(has_error=True, error="some error2", content=["error 2"])),
+        call("response3:\nline5\nline6", [], JsonExtract(has_error=True, error="some error3", content=["error 3"])),
+    ]
+    assert repair_json.mock_calls == calls
     calls = [
         call.log("-- CHAT BEGINS --"),
         call.add_consumption(TokenCounts(prompt=71, generated=41)),
+        call.add_json_outcome("retried"),
         call.add_consumption(TokenCounts(prompt=72, generated=42)),
+        call.add_json_outcome("retried"),
         call.add_consumption(TokenCounts(prompt=73, generated=43)),
+        call.add_json_outcome("retried"),
         call.log("error: JSON incorrect: max attempts (3) exceeded"),
         call.log("--- CHAT ENDS - 3 attempts - 14206ms ---"),
         call.store_so_far(),
     ]
     assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 3,
+                "tokens": {"prompt": 216, "generated": 126},
+                "error": True,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+
+@patch("hyperscribe.llms.llm_base.time", wraps=time)
+@patch("hyperscribe.llms.llm_base.LlmResponseCache")
+@patch("hyperscribe.llms.llm_base.Tracer")
+@patch.object(LlmBase, "vendor")
+@patch.object(LlmBase, "repair_json")
+@patch.object(LlmBase, "extract_json_from")
+@patch.object(LlmBase, "hedged_requests")
+def test_chat__response_cache(
+    hedged_requests,
+    extract_json_from,
+    repair_json,
+    vendor,
+    tracer,
+    llm_response_cache,
+    mock_time,
+):
+    memory_log = MagicMock(label="theLabel")
+    memory_log.identification.note_uuid = "theNoteUuid"
+    memory_log.key = "theNoteUuid/05"
+    memory_log.span = "theStageSpan"
+    response_cache = MagicMock()
+
+    def reset_mocks():
+        tracer.reset_mock()
+        hedged_requests.reset_mock()
+        extract_json_from.reset_mock()
+        repair_json.reset_mock()
+        vendor.reset_mock()
+        llm_response_cache.reset_mock()
+        mock_time.reset_mock()
+        memory_log.reset_mock()
+        response_cache.reset_mock()
+
+    times = [136.458, 139.687, 141.951, 147.632]
+    prompts = [LlmTurn(role="user", text=["theUserPrompt"])]
+
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+
+    # cache hit
+    tested.prompts = [p for p in prompts]
+    mock_time.side_effect = times[0:2]
+    vendor.side_effect = ["theVendor"]
+    llm_response_cache.current.side_effect = [response_cache]
+    llm_response_cache.key.side_effect = ["theKey1"]
+    response_cache.get.side_effect = [
+        HttpResponse(code=200, response="cached:\nline1", tokens=TokenCounts(prompt=0, generated=0)),
+    ]
+    hedged_requests.side_effect = []
+    extract_json_from.side_effect = [JsonExtract(has_error=False, error="", content=["line1"])]
+    repair_json.side_effect = []
+    result = tested.chat(["theSchema"])
+    expected = JsonExtract(has_error=False, error="", content=["line1"])
+    assert result == expected
+    assert tested.expected_schemas == ["theSchema"]
+
+    calls = [call()]
+    assert vendor.mock_calls == calls
+    calls = [call.current(), call.key("theVendor", "theModel", 0.0, prompts, [], ["theSchema"])]
+    assert llm_response_cache.mock_calls == calls
+    calls = [call.get("theKey1")]
+    assert response_cache.mock_calls == calls
+    assert hedged_requests.mock_calls == []
+    calls = [call("cached:\nline1", ["theSchema"])]
+    assert extract_json_from.mock_calls == calls
+    calls = [
+        call.log("-- CHAT BEGINS --"),
+        call.add_cache_lookup(True),
+        call.add_consumption(TokenCounts(prompt=0, generated=0)),
+        call.add_json_outcome("valid"),
+        call.log("result->>"),
+        call.log('[\n  "line1"\n]'),
+        call.log("<<-"),
+        call.log("--- CHAT ENDS - 1 attempts - 3229ms ---"),
+        call.store_so_far(),
+    ]
+    assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 1,
+                "tokens": {"prompt": 0, "generated": 0},
+                "error": False,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # cache miss, the valid response only is stored
+    tested.prompts = [p for p in prompts]
+    mock_time.side_effect = times[2:4]
+    vendor.side_effect = ["theVendor", "theVendor"]
+    llm_response_cache.current.side_effect = [response_cache]
+    llm_response_cache.key.side_effect = ["theKey1", "theKey2"]
+    response_cache.get.side_effect = [None, None]
+    hedged_requests.side_effect = [
+        HttpResponse(code=200, response="response1", tokens=TokenCounts(prompt=71, generated=51)),
+        HttpResponse(code=200, response="response2:\nline2", tokens=TokenCounts(prompt=83, generated=47)),
+    ]
+    extract_json_from.side_effect = [
+        JsonExtract(has_error=True, error="some error1", content=[]),
+        JsonExtract(has_error=False, error="", content=["line2"]),
+    ]
+    repair_json.side_effect = [("retried", JsonExtract(has_error=True, error="some error1", content=[]))]
+    result = tested.chat(["theSchema"])
+    expected = JsonExtract(has_error=False, error="", content=["line2"])
+    assert result == expected
+
+    calls = [call(), call()]
+    assert vendor.mock_calls == calls
+    calls = [
+        call.current(),
+        call.key("theVendor", "theModel", 0.0, tested.prompts, [], ["theSchema"]),
+        call.key("theVendor", "theModel", 0.0, tested.prompts, [], ["theSchema"]),
+    ]
+    assert llm_response_cache.mock_calls == calls
+    calls = [
+        call.get("theKey1"),
+        call.get("theKey2"),
+        call.set(
+            "theKey2",
+            HttpResponse(code=200, response="response2:\nline2", tokens=TokenCounts(prompt=83, generated=47)),
+        ),
+    ]
+    assert response_cache.mock_calls == calls
+    calls = [call(3, ["theSchema"]), call(3, ["theSchema"])]
+    assert hedged_requests.mock_calls == calls
+    calls = [call("response1", ["theSchema"]), call("response2:\nline2", ["theSchema"])]
+    assert extract_json_from.mock_calls == calls
+    calls = [call("response1", ["theSchema"], JsonExtract(has_error=True, error="some error1", content=[]))]
+    assert repair_json.mock_calls == calls
+    calls = [
+        call.log("-- CHAT BEGINS --"),
+        call.add_cache_lookup(False),
+        call.add_consumption(TokenCounts(prompt=71, generated=51)),
+        call.add_json_outcome("retried"),
+        call.add_cache_lookup(False),
+        call.add_consumption(TokenCounts(prompt=83, generated=47)),
+        call.add_json_outcome("valid"),
+        call.log("result->>"),
+        call.log('[\n  "line2"\n]'),
+        call.log("<<-"),
+        call.log("--- CHAT ENDS - 2 attempts - 5681ms ---"),
+        call.store_so_far(),
+    ]
+    assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 2,
+                "tokens": {"prompt": 154, "generated": 98},
+                "error": False,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # cache miss, the repaired response is stored
+    tested.prompts = [p for p in prompts]
+    mock_time.side_effect = times[0:2]
+    vendor.side_effect = ["theVendor"]
+    llm_response_cache.current.side_effect = [response_cache]
+    llm_response_cache.key.side_effect = ["theKey1"]
+    response_cache.get.side_effect = [None]
+    hedged_requests.side_effect = [
+        HttpResponse(code=200, response="response1", tokens=TokenCounts(prompt=71, generated=51)),
+    ]
+    extract_json_from.side_effect = [JsonExtract(has_error=True, error="some error1", content=[])]
+    repair_json.side_effect = [("repaired", JsonExtract(has_error=False, error="", content=[{"key": "value"}]))]
+    result = tested.chat(["theSchema"])
+    expected = JsonExtract(has_error=False, error="", content=[{"key": "value"}])
+    assert result == expected
+
+    calls = [
+        call.get("theKey1"),
+        call.set(
+            "theKey1",
+            HttpResponse(
+                code=200,
+                response='```json\n{\n "key": "value"\n}\n```',
+                tokens=TokenCounts(prompt=71, generated=51),
+            ),
+        ),
+    ]
+    assert response_cache.mock_calls == calls
+    calls = [call("response1", ["theSchema"], JsonExtract(has_error=True, error="some error1", content=[]))]
+    assert repair_json.mock_calls == calls
+    calls = [
+        call.log("-- CHAT BEGINS --"),
+        call.add_cache_lookup(False),
+        call.add_consumption(TokenCounts(prompt=71, generated=51)),
+        call.add_json_outcome("repaired"),
+        call.log("result->>"),
+        call.log('[\n  {\n    "key": "value"\n  }\n]'),
+        call.log("<<-"),
+        call.log("--- CHAT ENDS - 1 attempts - 3229ms ---"),
+        call.store_so_far(),
+    ]
+    assert memory_log.mock_calls == calls
+    calls = [
+        call.begin("theNoteUuid/05", "LlmBase.chat", "theStageSpan"),
+        call.begin().end(
+            {
+                "model": "theModel",
+                "label": "theLabel",
+                "attempts": 1,
+                "tokens": {"prompt": 71, "generated": 51},
+                "error": False,
+            }
+        ),
+    ]
+    assert tracer.mock_calls == calls
+    reset_mocks()
+
+    # not deterministic, the cache is not used
+    tested.prompts = [p for p in prompts]
+    tested.temperature = 0.7
+    mock_time.side_effect = times[0:2]
+    vendor.side_effect = []
+    llm_response_cache.current.side_effect = []
+    hedged_requests.side_effect = [
+        HttpResponse(code=200, response="response1", tokens=TokenCounts(prompt=71, generated=51)),
+    ]
+    extract_json_from.side_effect = [JsonExtract(has_error=False, error="", content=["line1"])]
+    repair_json.side_effect = []
+    result = tested.chat(["theSchema"])
+    expected = JsonExtract(has_error=False, error="", content=["line1"])
+    assert result == expected
+
+    assert vendor.mock_calls == []
+    assert llm_response_cache.mock_calls == []
+    assert response_cache.mock_calls == []
+    calls = [call(3, ["theSchema"])]
+    assert hedged_requests.mock_calls == calls
+    calls = [
+        call.log("-- CHAT BEGINS --"),
+        call.add_consumption(TokenCounts(prompt=71, generated=51)),
+        call.add_json_outcome("valid"),
+        call.log("result->>"),
+        call.log('[\n  "line1"\n]'),
+        call.log("<<-"),
+        call.log("--- CHAT ENDS - 1 attempts - 3229ms ---"),
+        call.store_so_far(),
+    ]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+
+@patch.object(LlmBase, "reask_items")
+def test_repair_json(reask_items):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        reask_items.reset_mock()
+        memory_log.reset_mock()
+
+    schema_object = {"type": "object", "required": ["key"]}
+    schema_array = {"type": "array", "minItems": 3, "maxItems": 3, "items": schema_object}
+    error = JsonExtract(has_error=True, error="theError", content=[])
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+
+    # not loadable
+    reask_items.side_effect = []
+    result = tested.repair_json("```json\nnot a json\n```", [schema_object], error)
+    assert result == ("retried", error)
+    assert reask_items.mock_calls == []
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+    # missing block
+    reask_items.side_effect = []
+    result = tested.repair_json('```json\n{"key": 1}\n```', [schema_object, schema_object], error)
+    assert result == ("retried", error)
+    assert reask_items.mock_calls == []
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+    # deterministic repair
+    reask_items.side_effect = []
+    content = '```json\n{"key": 1,}\n```\n```json\n[{"key": 1}, {"key": 2}, {"key": 3}, {"key": 4}]\n```'
+    result = tested.repair_json(content, [schema_object, schema_array], error)
+    expected = (
+        "repaired",
+        JsonExtract(has_error=False, error="", content=[{"key": 1}, [{"key": 1}, {"key": 2}, {"key": 3}]]),
+    )
+    assert result == expected
+    assert reask_items.mock_calls == []
+    calls = [call.log("JSON repaired")]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+    # invalid items re-asked
+    content = '```json\n[{"key": 1}, {"other": 2}]\n```'
+    reask_items.side_effect = [[{"key": 2}, {"key": 3}]]
+    result = tested.repair_json(content, [schema_array], error)
+    expected = ("re-asked", JsonExtract(has_error=False, error="", content=[[{"key": 1}, {"key": 2}, {"key": 3}]]))
+    assert result == expected
+    calls = [call(content, 0, schema_object, [(1, "'key' is a required property"), (2, "missing item")])]
+    assert reask_items.mock_calls == calls
+    calls = [call.log("JSON re-asked")]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+    # -- re-asked items still invalid
+    reask_items.side_effect = [[{"key": 2}, {"other": 3}]]
+    result = tested.repair_json(content, [schema_array], error)
+    assert result == ("retried", error)
+    calls = [call(content, 0, schema_object, [(1, "'key' is a required property"), (2, "missing item")])]
+    assert reask_items.mock_calls == calls
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+    # -- re-ask failed
+    reask_items.side_effect = [[]]
+    result = tested.repair_json(content, [schema_array], error)
+    assert result == ("retried", error)
+    calls = [call(content, 0, schema_object, [(1, "'key' is a required property"), (2, "missing item")])]
+    assert reask_items.mock_calls == calls
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+    # all items invalid
+    reask_items.side_effect = []
+    result = tested.repair_json('```json\n[{"other": 1}]\n```', [schema_array], error)
+    assert result == ("retried", error)
+    assert reask_items.mock_calls == []
+    assert memory_log.mock_calls == []
+    reset_mocks()
+
+
+@patch.object(LlmBase, "extract_json_from")
+@patch.object(LlmBase, "attempt_requests")
+def test_reask_items(attempt_requests, extract_json_from):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        attempt_requests.reset_mock()
+        extract_json_from.reset_mock()
+        memory_log.reset_mock()
+
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "minItems": 2,
+        "maxItems": 2,
+        "items": "theItemSchema",
+    }
+    invalid_items = [(1, "theProblem"), (2, "missing item")]
+    prompts = [
+        LlmTurn(role="system", text=["theSystemPrompt"]),
+        LlmTurn(role="user", text=["theUserPrompt"]),
+    ]
+    exp_prompts = prompts + [
+        LlmTurn(role="model", text=["line1", "line2"]),
+        LlmTurn(
+            role="user",
+            text=[
+                "In your previous response, some items of the JSON #2 are incorrect or missing:",
+                "```text",
+                "item #2: theProblem\nitem #3: missing item",
+                "```",
+                "",
+                "Please, provide only these 2 items, corrected and in the same order, "
+                "as a JSON list enclosed within a JSON Markdown block.",
+                "The other items are kept as they are.",
+            ],
+        ),
+    ]
+    tested = LlmBase(memory_log, "apiKey", "theModel", False)
+
+    # the items are provided
+    tested.prompts = [p for p in prompts]
+    tested.expected_schemas = ["theSchema"]
+    attempt_requests.side_effect = [
+        HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=71, generated=51)),
+    ]
+    extract_json_from.side_effect = [JsonExtract(has_error=False, error="", content=[["item2", "item3"]])]
+    result = tested.reask_items("line1\nline2", 1, "theItemSchema", invalid_items)
+    assert result == ["item2", "item3"]
+    assert tested.prompts == exp_prompts
+    assert tested.expected_schemas == ["theSchema"]
+    calls = [call(3)]
+    assert attempt_requests.mock_calls == calls
+    calls = [call("theResponse", [schema])]
+    assert extract_json_from.mock_calls == calls
+    calls = [call.add_consumption(TokenCounts(prompt=71, generated=51))]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+    # the items are not valid
+    tested.prompts = [p for p in prompts]
+    attempt_requests.side_effect = [
+        HttpResponse(code=200, response="theResponse", tokens=TokenCounts(prompt=71, generated=51)),
+    ]
+    extract_json_from.side_effect = [JsonExtract(has_error=True, error="theError", content=[])]
+    result = tested.reask_items("line1\nline2", 1, "theItemSchema", invalid_items)
+    assert result == []
+    assert tested.prompts == prompts
+    calls = [call(3)]
+    assert attempt_requests.mock_calls == calls
+    calls = [call("theResponse", [schema])]
+    assert extract_json_from.mock_calls == calls
+    calls = [call.add_consumption(TokenCounts(prompt=71, generated=51))]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+    # http error
+    tested.prompts = [p for p in prompts]
+    attempt_requests.side_effect = [
+        HttpResponse(code=429, response="theError", tokens=TokenCounts(prompt=0, generated=0)),
+    ]
+    extract_json_from.side_effect = []
+    result = tested.reask_items("line1\nline2", 1, "theItemSchema", invalid_items)
+    assert result == []
+    assert tested.prompts == prompts
+    calls = [call(3)]
+    assert attempt_requests.mock_calls == calls
+    assert extract_json_from.mock_calls == []
+    assert memory_log.mock_calls == []
     reset_mocks()
 
 
@@ -483,6 +1485,7 @@ def test_store_llm_turns(discussion_store):
     memory_log.label = "theLabel"
     memory_log.s3_credentials = "theAwsS3"
     memory_log.identification = "theIdentification"
+    memory_log.cycle = 5
     instruction = Instruction(
         uuid="theUuid",
         index=7,
@@ -524,43 +1527,30 @@ def test_store_llm_turns(discussion_store):
     tested.prompts = prompts
     # -- with instruction
     tested.store_llm_turns(["line1", "line2"], instruction)
-    calls = [call.instance("theAwsS3", "theIdentification"), call.instance().store("theInstruction", 7, exp_turns)]
+    calls = [call.instance("theAwsS3", "theIdentification", 5), call.instance().store("theInstruction", 7, exp_turns)]
     assert discussion_store.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
     # -- with no instruction
     tested.store_llm_turns(["line1", "line2"], None)
-    calls = [call.instance("theAwsS3", "theIdentification"), call.instance().store("theLabel", -1, exp_turns)]
+    calls = [call.instance("theAwsS3", "theIdentification", 5), call.instance().store("theLabel", -1, exp_turns)]
     assert discussion_store.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
 
 
-def test_json_validator():
-    schema = {
-        "$schema": "http://json-schema.org/draft-07/schema#",
-        "type": "array",
-        "minItems": 1,
-        "items": {
-            "type": "object",
-            "properties": {"a": {"type": "integer", "minimum": 5}, "b": {"type": "string", "minLength": 2}},
-            "required": ["a", "b"],
-            "additionalProperties": False,
-        },
-    }
+@patch.object(SchemaRegistry, "validate")
+def test_json_validator(validate):
+    def reset_mocks():
+        validate.reset_mock()
 
-    tests = [
-        ([], "[] should be non-empty"),
-        ([{"a": 7}], "'b' is a required property, in path [0]"),
-        ([{"b": "xy"}], "'a' is a required property, in path [0]"),
-        ([{"a": 7, "b": ""}], "'' is too short, in path [0, 'b']"),
-        ([{"a": 3, "b": "xy"}], "3 is less than the minimum of 5, in path [0, 'a']"),
-        ([{"a": 7, "b": "xy"}], ""),
-    ]
     tested = LlmBase
-    for response, expected in tests:
-        result = tested.json_validator(response, schema)
-        assert result == expected, f"---> {response}"
+    validate.side_effect = ["theProblems"]
+    result = tested.json_validator(["theResponse"], {"type": "array"})
+    assert result == "theProblems"
+    calls = [call(["theResponse"], {"type": "array"})]
+    assert validate.mock_calls == calls
+    reset_mocks()
 
 
 @patch.object(LlmBase, "json_validator")
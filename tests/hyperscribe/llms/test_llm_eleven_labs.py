@@ -12,6 +12,13 @@ def test_support_speaker_identification():
     assert result is False
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmElevenLabs(memory_log, "elevenLabsKey", "theModel", False)
+    result = tested.vendor()
+    assert result == "ElevenLabs"
+
+
 def test_add_audio():
     memory_log = MagicMock()
     tested = LlmElevenLabs(memory_log, "elevenLabsKey", "theModel", False)
@@ -30,23 +37,23 @@ def test_add_audio():
     assert memory_log.mock_calls == []
 
 
-@patch("hyperscribe.llms.llm_eleven_labs.requests_post")
-def test_request(requests_post):
+@patch("hyperscribe.llms.llm_eleven_labs.HttpPool")
+def test_request(http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     # no audio
-    requests_post.side_effect = []
+    http_pool.post.side_effect = []
 
     tested = LlmElevenLabs(memory_log, "apiKey", "theModel", False)
     result = tested.request()
     expected = HttpResponse(code=422, response="no audio provided", tokens=TokenCounts(prompt=0, generated=0))
     assert result == expected
 
-    assert requests_post.mock_calls == []
+    assert http_pool.mock_calls == []
     reset_mocks()
 
     # error
@@ -62,7 +69,7 @@ def test_request(requests_post):
             "json": lambda self: content,
         },
     )()
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmElevenLabs(memory_log, "apiKey", "theModel", False)
     tested.add_audio(b"someBytes", "mp3")
@@ -75,17 +82,16 @@ def test_request(requests_post):
     assert result == expected
 
     calls = [
-        call(
+        call.post(
+            "ElevenLabs",
             "https://api.elevenlabs.io/v1/speech-to-text",
             headers={"xi-api-key": "apiKey"},
             params={},
             data={"model_id": "theModel", "diarize": True, "temperature": 0},
             files={"file": b"someBytes"},
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log("status code: 202"),
@@ -110,7 +116,7 @@ def test_request(requests_post):
         },
     )()
 
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmElevenLabs(memory_log, "apiKey", "theModel", False)
     tested.add_audio(b"someBytes", "mp3")
@@ -128,17 +134,16 @@ def test_request(requests_post):
     assert result == expected
 
     calls = [
-        call(
+        call.post(
+            "ElevenLabs",
             "https://api.elevenlabs.io/v1/speech-to-text",
             headers={"xi-api-key": "apiKey"},
             params={},
             data={"model_id": "theModel", "diarize": True, "temperature": 0},
             files={"file": b"someBytes"},
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log("status code: 200"),
@@ -177,7 +182,7 @@ def test_request(requests_post):
         },
     )()
 
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmElevenLabs(memory_log, "apiKey", "theModel", False)
     tested.add_audio(b"someBytes", "mp3")
@@ -199,17 +204,16 @@ def test_request(requests_post):
     assert result == expected
 
     calls = [
-        call(
+        call.post(
+            "ElevenLabs",
             "https://api.elevenlabs.io/v1/speech-to-text",
             headers={"xi-api-key": "apiKey"},
             params={},
             data={"model_id": "theModel", "diarize": True, "temperature": 0},
             files={"file": b"someBytes"},
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log("status code: 200"),
@@ -15,6 +15,13 @@ def test_support_speaker_identification():
     assert result is True
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmGoogle(memory_log, "googleKey", "theModel", False)
+    result = tested.vendor()
+    assert result == "Google"
+
+
 def test_add_audio():
     memory_log = MagicMock()
     tested = LlmGoogle(memory_log, "googleKey", "theModel", False)
@@ -100,18 +107,18 @@ def test_to_dict__no_prompts_with_audio_raises():
         _ = tested.to_dict([("audio/mp3", "uriAudio1")])
 
 
-@patch("hyperscribe.llms.llm_google.requests_post")
-def test_upload_audio(requests_post):
+@patch("hyperscribe.llms.llm_google.HttpPool")
+def test_upload_audio(http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     tested = LlmGoogle(memory_log, "googleKey", "theModel", False)
 
     # all good
-    requests_post.side_effect = [
+    http_pool.post.side_effect = [
         type("Response", (), {"status_code": 200, "headers": {"x-goog-upload-url": "theUploadUri"}})(),
         type("Response", (), {"status_code": 200, "text": json.dumps({"file": {"uri": "theFileUri"}})}),
     ]
@@ -119,7 +126,8 @@ def test_upload_audio(requests_post):
     expected = "theFileUri"
     assert result == expected
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/upload/v1beta/files?key=googleKey",
             headers={
                 "X-Goog-Upload-Protocol": "resumable",
@@ -129,24 +137,21 @@ def test_upload_audio(requests_post):
                 "Content-Type": "application/json",
             },
             data='{"file": {"display_name": "audio03"}}',
-            verify=True,
-            timeout=None,
         ),
-        call(
+        call.post(
+            "Google",
             "theUploadUri",
             headers={"Content-Length": "10", "X-Goog-Upload-Offset": "0", "X-Goog-Upload-Command": "upload, finalize"},
             params={},
             data=b"the audio1",
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
 
     # upload fails
-    requests_post.side_effect = [
+    http_pool.post.side_effect = [
         type("Response", (), {"status_code": 200, "headers": {"x-goog-upload-url": "theUploadUri"}})(),
         type("Response", (), {"status_code": 500, "text": json.dumps({"file": {"uri": "theFileUri"}})}),
     ]
@@ -154,7 +159,8 @@ def test_upload_audio(requests_post):
     expected = ""
     assert result == expected
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/upload/v1beta/files?key=googleKey",
             headers={
                 "X-Goog-Upload-Protocol": "resumable",
@@ -164,31 +170,29 @@ def test_upload_audio(requests_post):
                 "Content-Type": "application/json",
             },
             data='{"file": {"display_name": "audio03"}}',
-            verify=True,
-            timeout=None,
         ),
-        call(
+        call.post(
+            "Google",
             "theUploadUri",
             headers={"Content-Length": "10", "X-Goog-Upload-Offset": "0", "X-Goog-Upload-Command": "upload, finalize"},
             params={},
             data=b"the audio1",
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
 
     # initial call fails
-    requests_post.side_effect = [
+    http_pool.post.side_effect = [
         type("Response", (), {"status_code": 500, "headers": {"x-goog-upload-url": "theUploadUri"}})(),
     ]
     result = tested.upload_audio(b"the audio1", "mp3", "audio03")
     expected = ""
     assert result == expected
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/upload/v1beta/files?key=googleKey",
             headers={
                 "X-Goog-Upload-Protocol": "resumable",
@@ -198,25 +202,23 @@ def test_upload_audio(requests_post):
                 "Content-Type": "application/json",
             },
             data='{"file": {"display_name": "audio03"}}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
 
 
-@patch("hyperscribe.llms.llm_google.requests_post")
+@patch("hyperscribe.llms.llm_google.HttpPool")
 @patch.object(LlmGoogle, "to_dict")
 @patch.object(LlmGoogle, "upload_audio")
-def test_request(upload_audio, to_dict, requests_post):
+def test_request(upload_audio, to_dict, http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
         upload_audio.reset_mock()
         to_dict.reset_mock()
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     response = type(
@@ -245,7 +247,7 @@ def test_request(upload_audio, to_dict, requests_post):
     # error
     upload_audio.side_effect = ["uri1", "uri2", "uri3"]
     to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmGoogle(memory_log, "apiKey", "theModel", False)
     tested.add_audio(b"the audio1", "mp3")
@@ -275,16 +277,15 @@ def test_request(upload_audio, to_dict, requests_post):
     ]
     assert to_dict.mock_calls == calls
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/v1beta/theModel:generateContent?key=apiKey",
             headers={"Content-Type": "application/json"},
             params={},
             data='{"key": "valueX"}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log('{\n  "key": "valueY"\n}'),
@@ -305,7 +306,7 @@ def test_request(upload_audio, to_dict, requests_post):
     response.status_code = 200
     upload_audio.side_effect = ["uri1", "uri2"]
     to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmGoogle(memory_log, "apiKey", "theModel", False)
     tested.add_audio(b"the audio1", "mp3")
@@ -323,16 +324,15 @@ def test_request(upload_audio, to_dict, requests_post):
     calls = [call([("audio/mp3", "uri1"), ("audio/wav", "uri2")]), call([("audio/mp3", "uri1"), ("audio/wav", "uri2")])]
     assert to_dict.mock_calls == calls
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/v1beta/theModel:generateContent?key=apiKey",
             headers={"Content-Type": "application/json"},
             params={},
             data='{"key": "valueX"}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log('{\n  "key": "valueY"\n}'),
@@ -351,7 +351,7 @@ def test_request(upload_audio, to_dict, requests_post):
     # no audio
     upload_audio.side_effect = []
     to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
 
     tested = LlmGoogle(memory_log, "apiKey", "theModel", False)
     result = tested.request()
@@ -366,16 +366,15 @@ def test_request(upload_audio, to_dict, requests_post):
     calls = [call([]), call([])]
     assert to_dict.mock_calls == calls
     calls = [
-        call(
+        call.post(
+            "Google",
             "https://generativelanguage.googleapis.com/v1beta/theModel:generateContent?key=apiKey",
             headers={"Content-Type": "application/json"},
             params={},
             data='{"key": "valueX"}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     calls = [
         call.log("--- request begins:"),
         call.log('{\n  "key": "valueY"\n}'),
@@ -391,3 +390,116 @@ def test_request(upload_audio, to_dict, requests_post):
     ]
     assert memory_log.mock_calls == calls
     reset_mocks()
+
+
+def test_support_streaming():
+    memory_log = MagicMock()
+    tested = LlmGoogle(memory_log, "googleKey", "theModel", False)
+    result = tested.support_streaming()
+    assert result is True
+
+
+@patch.object(LlmGoogle, "stream_request")
+@patch.object(LlmGoogle, "to_dict")
+@patch.object(LlmGoogle, "upload_audio")
+def test_request__streaming(upload_audio, to_dict, stream_request):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        upload_audio.reset_mock()
+        to_dict.reset_mock()
+        stream_request.reset_mock()
+        memory_log.reset_mock()
+
+    upload_audio.side_effect = ["uri1"]
+    to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}]
+    stream_request.side_effect = ["theResponse"]
+
+    tested = LlmGoogle(memory_log, "apiKey", "theModel", False)
+    tested.add_audio(b"the audio1", "mp3")
+    tested.expected_schemas = ["theSchema"]
+    result = tested.request()
+    assert result == "theResponse"
+
+    calls = [call(b"the audio1", "audio/mp3", "audio00")]
+    assert upload_audio.mock_calls == calls
+    calls = [call([("audio/mp3", "uri1")]), call([("audio/mp3", "uri1")])]
+    assert to_dict.mock_calls == calls
+    calls = [
+        call(
+            "https://generativelanguage.googleapis.com/v1beta/theModel:streamGenerateContent?alt=sse&key=apiKey",
+            {"Content-Type": "application/json"},
+            '{"key": "valueX"}',
+            tested.stream_event,
+        ),
+    ]
+    assert stream_request.mock_calls == calls
+    calls = [
+        call.log("--- request begins:"),
+        call.log('{\n  "key": "valueY"\n}'),
+    ]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+
+def test_stream_event():
+    tested = LlmGoogle
+    tests = [
+        (
+            {
+                "candidates": [{"content": {"parts": [{"text": "some "}, {"text": "text"}]}}],
+                "usageMetadata": {"promptTokenCount": 173, "candidatesTokenCount": 12},
+            },
+            ("some text", TokenCounts(prompt=173, generated=12)),
+        ),
+        (
+            {
+                "candidates": [{"content": {"parts": [{"text": "more"}]}, "finishReason": "STOP"}],
+                "usageMetadata": {"promptTokenCount": 173, "candidatesTokenCount": 97, "thoughtsTokenCount": 31},
+            },
+            ("more", TokenCounts(prompt=173, generated=128)),
+        ),
+        ({"candidates": [{"content": {}}]}, ("", TokenCounts(prompt=0, generated=0))),
+    ]
+    for event, expected in tests:
+        result = tested.stream_event(event)
+        assert result == expected, f"---> {event}"
+
+
+def test_stream_ended():
+    tested = LlmGoogle
+    tests = [
+        ({"candidates": [{"content": {"parts": [{"text": "some"}]}}]}, False),
+        ({"candidates": [{"content": {"parts": [{"text": "more"}]}, "finishReason": "STOP"}]}, True),
+        ({"usageMetadata": {"promptTokenCount": 173}}, False),
+    ]
+    for event, expected in tests:
+        result = tested.stream_ended(event)
+        assert result is expected, f"---> {event}"
+
+
+def test_consume_stream():
+    memory_log = MagicMock()
+    response = MagicMock(status_code=200)
+    tested = LlmGoogle(memory_log, "apiKey", "theModel", False)
+    tested.expected_schemas = [{"type": "array"}]
+
+    # the generated tokens sent after the completion of the expected block are counted
+    events = [
+        {
+            "candidates": [{"content": {"parts": [{"text": "```json\n[1, 2]\n```"}]}}],
+            "usageMetadata": {"promptTokenCount": 1200, "candidatesTokenCount": 12},
+        },
+        {
+            "candidates": [{"content": {"parts": [{"text": "\nsome text"}]}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": 1200, "candidatesTokenCount": 300},
+        },
+    ]
+    response.iter_lines.side_effect = [[f"data: {json.dumps(event)}".encode() for event in events]]
+    result = tested.consume_stream(response, tested.stream_event)
+    expected = HttpResponse(
+        code=200,
+        response="```json\n[1, 2]\n```",
+        tokens=TokenCounts(prompt=1200, generated=300),
+    )
+    assert result == expected
@@ -13,6 +13,13 @@ def test_support_speaker_identification():
     assert result is True
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
+    result = tested.vendor()
+    assert result == "OpenAI"
+
+
 def test_add_audio():
     memory_log = MagicMock()
     tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
@@ -97,12 +104,12 @@ def test_to_dict():
     assert memory_log.mock_calls == []
 
 
-@patch("hyperscribe.llms.llm_openai.requests_post")
-def test_request(requests_post):
+@patch("hyperscribe.llms.llm_openai.HttpPool")
+def test_request(http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     response = type(
@@ -149,7 +156,8 @@ def test_request(requests_post):
         tokens=TokenCounts(prompt=178, generated=53),
     )
     calls_request_post = [
-        call(
+        call.post(
+            "OpenAI",
             "https://us.api.openai.com/v1/chat/completions",
             headers={
                 "Content-Type": "application/json",
@@ -158,14 +166,12 @@ def test_request(requests_post):
             },
             params={},
             data='{"model": "theModel", "modalities": ["text"], "messages": [], "temperature": 0.0}',
-            verify=True,
-            timeout=None,
         ),
     ]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
     result = tested.request()
     assert result == expected
-    assert requests_post.mock_calls == calls_request_post
+    assert http_pool.mock_calls == calls_request_post
     calls = [
         call.log("--- request begins:"),
         call.log(
@@ -194,7 +200,7 @@ def test_request(requests_post):
 
     # error
     response.status_code = 500
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
     result = tested.request()
     exp_with_error = HttpResponse(
         code=500,
@@ -206,7 +212,7 @@ def test_request(requests_post):
         tokens=TokenCounts(prompt=0, generated=0),
     )
     assert result == exp_with_error
-    assert requests_post.mock_calls == calls_request_post
+    assert http_pool.mock_calls == calls_request_post
     calls = [
         call.log("--- request begins:"),
         call.log(
@@ -234,23 +240,24 @@ def test_request(requests_post):
     reset_mocks()
 
 
-@patch("hyperscribe.llms.llm_openai.requests_post")
-def test_audio_to_text(requests_post):
+@patch("hyperscribe.llms.llm_openai.HttpPool")
+def test_audio_to_text(http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
-    requests_post.return_value.status_code = 202
-    requests_post.return_value.text = "theResponse"
+    http_pool.post.return_value.status_code = 202
+    http_pool.post.return_value.text = "theResponse"
 
     tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
     result = tested.audio_to_text(b"abc")
     expected = HttpResponse(code=202, response="theResponse", tokens=TokenCounts(prompt=0, generated=0))
     assert result == expected
     calls = [
-        call(
+        call.post(
+            "OpenAI",
             "https://us.api.openai.com/v1/audio/transcriptions",
             headers={"Authorization": "Bearer openaiKey"},
             params={},
@@ -261,9 +268,108 @@ def test_audio_to_text(requests_post):
                 "response_format": "text",
             },
             files={"file": ("audio.mp3", b"abc", "application/octet-stream")},
-            verify=True,
         ),
     ]
-    assert requests_post.mock_calls == calls
+    assert http_pool.mock_calls == calls
     assert memory_log.mock_calls == []
     reset_mocks()
+
+
+def test_support_streaming():
+    memory_log = MagicMock()
+    tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
+    result = tested.support_streaming()
+    assert result is True
+
+
+@patch.object(LlmOpenai, "stream_request")
+@patch.object(LlmOpenai, "to_dict")
+def test_request__streaming(to_dict, stream_request):
+    memory_log = MagicMock()
+
+    def reset_mocks():
+        to_dict.reset_mock()
+        stream_request.reset_mock()
+        memory_log.reset_mock()
+
+    to_dict.side_effect = [{"key": "valueX"}, {"key": "valueY"}, {"key": "valueZ"}]
+    stream_request.side_effect = ["theResponse"]
+
+    tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
+    tested.expected_schemas = ["theSchema"]
+    result = tested.request()
+    assert result == "theResponse"
+
+    calls = [call(False), call(True), call(False)]
+    assert to_dict.mock_calls == calls
+    calls = [
+        call(
+            "https://us.api.openai.com/v1/chat/completions",
+            {
+                "Content-Type": "application/json",
+                "Authorization": "Bearer openaiKey",
+                "OpenAI-Beta": "assistants=v2",
+            },
+            '{"key": "valueZ", "stream": true, "stream_options": {"include_usage": true}}',
+            tested.stream_event,
+        ),
+    ]
+    assert stream_request.mock_calls == calls
+    calls = [
+        call.log("--- request begins:"),
+        call.log('{\n  "key": "valueY"\n}'),
+    ]
+    assert memory_log.mock_calls == calls
+    reset_mocks()
+
+
+def test_stream_event():
+    tested = LlmOpenai
+    tests = [
+        ({"choices": [{"delta": {"role": "assistant", "content": ""}}]}, ("", TokenCounts(prompt=0, generated=0))),
+        ({"choices": [{"delta": {"content": "some text"}}]}, ("some text", TokenCounts(prompt=0, generated=0))),
+        ({"choices": [{"delta": {}, "finish_reason": "stop"}]}, ("", TokenCounts(prompt=0, generated=0))),
+        (
+            {"choices": [], "usage": {"prompt_tokens": 178, "completion_tokens": 53}},
+            ("", TokenCounts(prompt=178, generated=53)),
+        ),
+    ]
+    for event, expected in tests:
+        result = tested.stream_event(event)
+        assert result == expected, f"---> {event}"
+
+
+def test_stream_ended():
+    tested = LlmOpenai
+    tests = [
+        ({"choices": [{"delta": {"content": "some text"}}]}, False),
+        ({"choices": [{"delta": {}, "finish_reason": "stop"}], "usage": None}, False),
+        ({"choices": [], "usage": {"prompt_tokens": 178, "completion_tokens": 53}}, True),
+    ]
+    for event, expected in tests:
+        result = tested.stream_ended(event)
+        assert result is expected, f"---> {event}"
+
+
+def test_consume_stream():
+    memory_log = MagicMock()
+    response = MagicMock(status_code=200)
+    tested = LlmOpenai(memory_log, "openaiKey", "theModel", False)
+    tested.expected_schemas = [{"type": "array"}]
+
+    # the usage sent after the completion of the expected block is counted
+    events = [
+        {"choices": [{"delta": {"role": "assistant", "content": ""}}]},
+        {"choices": [{"delta": {"content": "```json\n[1, 2]\n```"}}]},
+        {"choices": [{"delta": {"content": "\nsome text"}}]},
+        {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+        {"choices": [], "usage": {"prompt_tokens": 1200, "completion_tokens": 300}},
+    ]
+    response.iter_lines.side_effect = [[f"data: {json.dumps(event)}".encode() for event in events] + [b"data: [DONE]"]]
+    result = tested.consume_stream(response, tested.stream_event)
+    expected = HttpResponse(
+        code=200,
+        response="```json\n[1, 2]\n```",
+        tokens=TokenCounts(prompt=1200, generated=300),
+    )
+    assert result == expected
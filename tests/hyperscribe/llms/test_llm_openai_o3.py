@@ -19,3 +19,10 @@ def test_to_dict_removes_modalities():
     result_no_modalities = llm.to_dict(for_log=True)
     assert result_no_modalities == {"other": "value"}
     assert "modalities" not in result_no_modalities
+
+
+def test_support_streaming():
+    mock_log = MagicMock(spec=MemoryLog)
+    tested = LlmOpenaiO3(memory_log=mock_log, api_key="sk-test", with_audit=True, temperature=0.5)
+    result = tested.support_streaming()
+    assert result is False
@@ -13,6 +13,13 @@ def test_support_speaker_identification():
     assert result is False
 
 
+def test_vendor():
+    memory_log = MagicMock()
+    tested = LlmOpenaiResponses(memory_log, "openaiKey", "theModel", False)
+    result = tested.vendor()
+    assert result == "OpenAI"
+
+
 def test_to_dict():
     memory_log = MagicMock()
     #
@@ -112,12 +119,12 @@ def test_to_dict():
     assert memory_log.mock_calls == []
 
 
-@patch("hyperscribe.llms.llm_openai_responses.requests_post")
-def test_request(requests_post):
+@patch("hyperscribe.llms.llm_openai_responses.HttpPool")
+def test_request(http_pool):
     memory_log = MagicMock()
 
     def reset_mocks():
-        requests_post.reset_mock()
+        http_pool.reset_mock()
         memory_log.reset_mock()
 
     response = type(
@@ -170,7 +177,8 @@ def test_request(requests_post):
         tokens=TokenCounts(prompt=178, generated=93),
     )
     calls_request_post = [
-        call(
+        call.post(
+            "OpenAI",
             "https://us.api.openai.com/v1/responses",
             headers={
                 "Content-Type": "application/json",
@@ -186,15 +194,13 @@ def test_request(requests_post):
                     "temperature": 0.0,
                 }
             ),
-            verify=True,
-            timeout=None,
         ),
     ]
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
     result = tested.request()
 
     assert result == expected
-    assert requests_post.mock_calls == calls_request_post
+    assert http_pool.mock_calls == calls_request_post
     calls = [
         call.log("--- request begins:"),
         call.log(
@@ -226,7 +232,7 @@ def test_request(requests_post):
 
     # error
     response.status_code = 500
-    requests_post.side_effect = [response]
+    http_pool.post.side_effect = [response]
     result = tested.request()
     exp_with_error = HttpResponse(
         code=500,
@@ -243,7 +249,7 @@ def test_request(requests_post):
         tokens=TokenCounts(prompt=0, generated=0),
     )
     assert result == exp_with_error
-    assert requests_post.mock_calls == calls_request_post
+    assert http_pool.mock_calls == calls_request_post
     calls = [
         call.log("--- request begins:"),
         call.log(
@@ -75,8 +75,145 @@ def test_content_type_text() -> None:
     assert result == expected
 
 
+@patch("hyperscribe.structures.cycle_data.WebmPrefix")
+def test_coalesce(webm_prefix) -> None:
+    def reset_mocks():
+        webm_prefix.reset_mock()
+
+    lines = [
+        Line(speaker="theSpeaker0", text="theText0"),
+        Line(speaker="theSpeaker1", text="theText1"),
+        Line(speaker="theSpeaker0", text="theText2"),
+    ]
+    tested = CycleData
+    # single cycle
+    cycle = CycleData(audio=b"theAudio1", transcript=lines[:1], source=CycleDataSource.AUDIO)
+    result = tested.coalesce([cycle])
+    assert result == cycle
+    assert webm_prefix.mock_calls == []
+    reset_mocks()
+
+    # audio cycles
+    webm_prefix.remove_prefix.side_effect = [b"theAudio2", b"theAudio3"]
+    result = tested.coalesce(
+        [
+            CycleData(audio=b"theAudio1", transcript=[], source=CycleDataSource.AUDIO),
+            CycleData(audio=b"thePrefixedAudio2", transcript=[], source=CycleDataSource.AUDIO),
+            CycleData(audio=b"", transcript=[], source=CycleDataSource.AUDIO),
+            CycleData(audio=b"thePrefixedAudio3", transcript=[], source=CycleDataSource.AUDIO),
+        ]
+    )
+    expected = CycleData(audio=b"theAudio1theAudio2theAudio3", transcript=[], source=CycleDataSource.AUDIO)
+    assert result == expected
+    calls = [call.remove_prefix(b"thePrefixedAudio2"), call.remove_prefix(b"thePrefixedAudio3")]
+    assert webm_prefix.mock_calls == calls
+    reset_mocks()
+
+    # transcript cycles
+    result = tested.coalesce(
+        [
+            CycleData(audio=b"", transcript=lines[:2], source=CycleDataSource.TRANSCRIPT),
+            CycleData(audio=b"", transcript=lines[2:], source=CycleDataSource.TRANSCRIPT),
+        ]
+    )
+    expected = CycleData(audio=b"", transcript=lines, source=CycleDataSource.TRANSCRIPT)
+    assert result == expected
+    assert webm_prefix.mock_calls == []
+    reset_mocks()
+
+
+def test_from_content() -> None:
+    tested = CycleData
+    tests = [
+        (
+            "theTranscript".encode(),
+            "text/plain",
+            CycleData(
+                audio=b"",
+                transcript=[Line(speaker="Clinician", text="theTranscript", start=0.0, end=0.0)],
+                source=CycleDataSource.TRANSCRIPT,
+            ),
+        ),
+        (
+            b"theAudio",
+            "audio/webm",
+            CycleData(audio=b"theAudio", transcript=[], source=CycleDataSource.AUDIO),
+        ),
+    ]
+    for content, content_type, expected in tests:
+        result = tested.from_content(content, content_type)
+        assert result == expected, f"---> {content_type}"
+
+
+@patch("hyperscribe.structures.cycle_data.CycleHandOff")
+def test_hand_off(cycle_hand_off) -> None:
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    tested = CycleData
+    tested.hand_off(identification, 37, b"theAudio", "audio/webm")
+    calls = [call.put("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037", b"theAudio", "audio/webm")]
+    assert cycle_hand_off.mock_calls == calls
+
+
+@patch("hyperscribe.structures.cycle_data.Tracer")
+@patch("hyperscribe.structures.cycle_data.CycleHandOff")
+@patch.object(CycleData, "from_s3")
+def test_retrieve(from_s3, cycle_hand_off, tracer) -> None:
+    def reset_mocks():
+        from_s3.reset_mock()
+        cycle_hand_off.reset_mock()
+        tracer.reset_mock()
+
+    identification = IdentificationParameters(
+        patient_uuid="patientUuid",
+        note_uuid="noteUuid",
+        provider_uuid="providerUuid",
+        canvas_instance="canvasInstance",
+    )
+    aws_s3_credentials = AwsS3Credentials(
+        aws_key="theKey",
+        aws_secret="theSecret",
+        region="theRegion",
+        bucket="theBucket",
+    )
+    tested = CycleData
+
+    for parent in [None, "theParent"]:
+        # handed off by the same process
+        cycle_hand_off.take.side_effect = [(b"theAudio", "audio/webm")]
+        from_s3.side_effect = []
+        result = tested.retrieve(aws_s3_credentials, identification, 37, parent)
+        expected = CycleData(audio=b"theAudio", transcript=[], source=CycleDataSource.AUDIO)
+        assert result == expected
+        assert from_s3.mock_calls == []
+        calls = [call.take("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037")]
+        assert cycle_hand_off.mock_calls == calls
+        calls = [
+            call.begin("noteUuid", "CycleData.hand_off", parent),
+            call.begin().end({"cycle": 37, "bytes": 8}),
+        ]
+        assert tracer.mock_calls == calls
+        reset_mocks()
+
+        # stored in S3 only
+        cycle_hand_off.take.side_effect = [None]
+        from_s3.side_effect = ["theCycleData"]
+        result = tested.retrieve(aws_s3_credentials, identification, 37, parent)
+        assert result == "theCycleData"
+        calls = [call(aws_s3_credentials, identification, 37, parent)]
+        assert from_s3.mock_calls == calls
+        calls = [call.take("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037")]
+        assert cycle_hand_off.mock_calls == calls
+        assert tracer.mock_calls == []
+        reset_mocks()
+
+
 @pytest.mark.parametrize(
-    ("is_ready", "side_effects", "expected", "exp_sleep_calls", "exp_s3_calls"),
+    ("is_ready", "side_effects", "expected", "exp_sleep_calls", "exp_s3_calls", "exp_span"),
     [
         pytest.param(
             False,
@@ -84,6 +221,7 @@ def test_content_type_text() -> None:
             CycleData(audio=b"", transcript=[], source=CycleDataSource.TRANSCRIPT),
             [],
             [call.is_ready()],
+            {"cycle": 37, "attempts": 0, "bytes": 0},
             id="aws_s3_no_ready",
         ),
         pytest.param(
@@ -97,6 +235,7 @@ def test_content_type_text() -> None:
                 call.is_ready(),
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
             ],
+            {"cycle": 37, "attempts": 1, "bytes": 8},
             id="aws_s3_ready_no_error_audio",
         ),
         pytest.param(
@@ -114,6 +253,7 @@ def test_content_type_text() -> None:
                 call.is_ready(),
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
             ],
+            {"cycle": 37, "attempts": 1, "bytes": 7},
             id="aws_s3_ready_no_error_text",
         ),
         pytest.param(
@@ -135,6 +275,7 @@ def test_content_type_text() -> None:
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
             ],
+            {"cycle": 37, "attempts": 3, "bytes": 7},
             id="aws_s3_ready_2_errors_text",
         ),
         pytest.param(
@@ -152,20 +293,24 @@ def test_content_type_text() -> None:
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
                 call.access_s3_object("hyperscribe-canvasInstance/cycle_data/noteUuid/cycle_037"),
             ],
+            {"cycle": 37, "attempts": 3, "bytes": 0},
             id="aws_s3_ready_3_errors",
         ),
     ],
 )
+@patch("hyperscribe.structures.cycle_data.Tracer")
 @patch("hyperscribe.structures.cycle_data.sleep")
 @patch("hyperscribe.structures.cycle_data.AwsS3")
 def test_from_s3(
     aws_s3: MagicMock,
     sleep: MagicMock,
+    tracer: MagicMock,
     is_ready: bool,
     side_effects: list,
     expected: CycleData,
     exp_sleep_calls: list,
     exp_s3_calls: list,
+    exp_span: dict,
 ) -> None:
     identification = IdentificationParameters(
         patient_uuid="patientUuid",
@@ -192,3 +337,5 @@ def test_from_s3(
     assert aws_s3.mock_calls == calls
     assert sleep.mock_calls == exp_sleep_calls
     assert client_s3.mock_calls == exp_s3_calls
+    calls = [call.begin("noteUuid", "CycleData.from_s3", None), call.begin().end(exp_span)]
+    assert tracer.mock_calls == calls
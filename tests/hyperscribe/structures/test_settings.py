@@ -29,6 +29,9 @@ def test_class():
         "trial_staffers_policy": AccessPolicy,
         "cycle_transcript_overlap": int,
         "custom_prompts": list[CustomPrompt],
+        "hedged_model_specs": list[str],
+        "audio_interval_seconds": int,
+        "llm_response_cache": str,
     }
     assert is_namedtuple(tested, fields)
 
@@ -89,7 +92,7 @@ def test__from_dict_base(is_true, clamp_int):
     ]
     for rfv, audit, commands, staffers, progress, tuning in tests:
         is_true.side_effect = [rfv, audit, tuning, commands, staffers]
-        clamp_int.side_effect = [7, 11, 54]
+        clamp_int.side_effect = [7, 11, 54, 20]
         result = tested._from_dict_base(
             {
                 "VendorTextLLM": "textVendor",
@@ -108,6 +111,9 @@ def test__from_dict_base(is_true, clamp_int):
                 "CycleTranscriptOverlap": "57",
                 "MaxWorkers": "4",
                 "HierarchicalDetectionThreshold": "9",
+                "HedgedModelSpecs": "Complex, listed",
+                "AudioIntervalSeconds": "20",
+                "LlmResponseCache": " Memory ",
                 "CustomPrompts": '[{"command":"theCommand1","prompt":"thePrompt1","active":true},'
                 '{"command":"theCommand2","prompt":"thePrompt2","active":false},'
                 '{"command":"theCommand3","prompt":"thePrompt3"}]',
@@ -134,6 +140,9 @@ def test__from_dict_base(is_true, clamp_int):
             staffers_policy=AccessPolicy(policy=staffers, items=["32", "47"]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=54,
+            hedged_model_specs=["complex", "listed"],
+            audio_interval_seconds=20,
+            llm_response_cache="memory",
         )
         assert result == expected
         calls = [call("rfv"), call("audit"), call("tuning"), call("commands"), call("staffers")]
@@ -142,6 +151,7 @@ def test__from_dict_base(is_true, clamp_int):
             call("4", 1, 10, 3),
             call("9", 0, 999, 5),
             call("57", 5, 250, 100),
+            call("20", 0, 3600, 0),
         ]
         assert clamp_int.mock_calls == calls
         reset_mocks()
@@ -154,7 +164,7 @@ def test__from_dict_base(is_true, clamp_int):
     overlap_tests = [("0", 5), ("1", 5), ("5", 5), ("6", 6), ("249", 249), ("250", 250), ("251", 250), ("251", 250)]
     for overlap, exp_overlap in overlap_tests:
         is_true.side_effect = [False, False, False, False, False]
-        clamp_int.side_effect = [6, 7, exp_overlap]
+        clamp_int.side_effect = [6, 7, exp_overlap, 0]
         result = tested._from_dict_base(
             {
                 "VendorTextLLM": "textVendor",
@@ -191,6 +201,7 @@ def test__from_dict_base(is_true, clamp_int):
             call(None, 1, 10, 3),
             call(None, 0, 999, 5),
             call(overlap, 5, 250, 100),
+            call(None, 0, 3600, 0),
         ]
         assert clamp_int.mock_calls == calls
         reset_mocks()
@@ -262,6 +273,7 @@ def test_llm_audio_model():
             staffers_policy=AccessPolicy(policy=True, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=54,
+            hedged_model_specs=["complex", "listed"],
         )
         result = tested.llm_audio_model()
         assert result == expected, f"---> {vendor}"
@@ -297,6 +309,7 @@ def test_llm_text_model():
             staffers_policy=AccessPolicy(policy=True, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=54,
+            hedged_model_specs=["complex", "listed"],
         )
         for size in ModelSpec:
             result = tested.llm_text_model(size)
@@ -319,6 +332,7 @@ def test_llm_text_model():
             staffers_policy=AccessPolicy(policy=True, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=54,
+            hedged_model_specs=["complex", "listed"],
         )
         result = tested.llm_text_model(ModelSpec.COMPLEX)
         assert result == "modelX"
@@ -328,6 +342,37 @@ def test_llm_text_model():
         assert result == "modelX modelY modelZ"
 
 
+def test_is_hedged():
+    tests = [
+        ([], ModelSpec.SIMPLER, False),
+        ([], ModelSpec.COMPLEX, False),
+        (["complex"], ModelSpec.SIMPLER, False),
+        (["complex"], ModelSpec.COMPLEX, True),
+        (["complex", "simpler"], ModelSpec.SIMPLER, True),
+    ]
+    for hedged_model_specs, model_spec, expected in tests:
+        tested = Settings(
+            llm_text=VendorKey(vendor="textVendor", api_key="textKey"),
+            llm_audio=VendorKey(vendor="audioVendor", api_key="audioKey"),
+            structured_rfv=False,
+            audit_llm=False,
+            reasoning_llm=False,
+            custom_prompts=[],
+            is_tuning=False,
+            api_signing_key="theApiSigningKey",
+            max_workers=3,
+            hierarchical_detection_threshold=5,
+            send_progress=False,
+            commands_policy=AccessPolicy(policy=False, items=[]),
+            staffers_policy=AccessPolicy(policy=False, items=[]),
+            trial_staffers_policy=AccessPolicy(policy=True, items=[]),
+            cycle_transcript_overlap=37,
+            hedged_model_specs=hedged_model_specs,
+        )
+        result = tested.is_hedged(model_spec)
+        assert result is expected, f"---> {hedged_model_specs} {model_spec}"
+
+
 @patch.object(Settings, "llm_text_model")
 def test_llm_text_temperature(llm_text_model):
     def reset_mocks():
@@ -358,6 +403,7 @@ def test_llm_text_temperature(llm_text_model):
             staffers_policy=AccessPolicy(policy=True, items=[]),
             trial_staffers_policy=AccessPolicy(policy=True, items=[]),
             cycle_transcript_overlap=54,
+            hedged_model_specs=["complex", "listed"],
         )
         result = tested.llm_text_temperature()
         assert result == expected, f"---> {model}"
@@ -0,0 +1,85 @@
+from hyperscribe.structures.trace_span import TraceSpan
+from tests.helper import is_namedtuple
+
+
+def test_class():
+    tested = TraceSpan
+    fields = {
+        "span_id": str,
+        "parent_id": str,
+        "name": str,
+        "start": float,
+        "duration": float,
+        "attributes": dict,
+    }
+    assert is_namedtuple(tested, fields)
+
+
+def test_load_from_json():
+    tested = TraceSpan
+    # empty list
+    result = tested.load_from_json([])
+    assert result == []
+    #
+    result = tested.load_from_json(
+        [
+            {
+                "id": "span1",
+                "parent": "",
+                "name": "cycle",
+                "start": 1733405746123,
+                "duration": 5230,
+                "attributes": {"cycles": [3]},
+            },
+            {
+                "id": "span2",
+                "parent": "span1",
+                "name": "detect_instructions",
+                "start": 1733405747000,
+                "duration": 1500,
+                "attributes": None,
+            },
+            {"id": "span3"},
+        ],
+    )
+    expected = [
+        TraceSpan(
+            span_id="span1",
+            parent_id="",
+            name="cycle",
+            start=1733405746.123,
+            duration=5.23,
+            attributes={"cycles": [3]},
+        ),
+        TraceSpan(
+            span_id="span2",
+            parent_id="span1",
+            name="detect_instructions",
+            start=1733405747.0,
+            duration=1.5,
+            attributes={},
+        ),
+        TraceSpan(span_id="span3", parent_id="", name="", start=0.0, duration=0.0, attributes={}),
+    ]
+    assert result == expected
+
+
+def test_to_json():
+    tested = TraceSpan(
+        span_id="span2",
+        parent_id="span1",
+        name="detect_instructions",
+        start=1733405747.0123,
+        duration=1.5008,
+        attributes={"vendor": "theVendor"},
+    )
+    result = tested.to_json()
+    expected = {
+        "id": "span2",
+        "parent": "span1",
+        "name": "detect_instructions",
+        "start": 1733405747012,
+        "duration": 1500,
+        "attributes": {"vendor": "theVendor"},
+    }
+    assert result == expected
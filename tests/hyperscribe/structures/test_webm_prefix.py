@@ -16,6 +16,27 @@ def test_add_prefix(decoded_prefix):
     assert decoded_prefix.mock_calls == calls
 
 
+@patch.object(WebmPrefix, "decoded_prefix")
+def test_remove_prefix(decoded_prefix):
+    def reset_mocks():
+        decoded_prefix.reset_mock()
+
+    tested = WebmPrefix
+    tests = [
+        (b"thePrefixSomeContent", b"SomeContent"),
+        (b"SomeContent", b"SomeContent"),
+        (b"SomeContentthePrefix", b"SomeContentthePrefix"),
+    ]
+    for content, expected in tests:
+        decoded_prefix.side_effect = [b"thePrefix"]
+        result = tested.remove_prefix(content)
+        assert result == expected
+
+        calls = [call()]
+        assert decoded_prefix.mock_calls == calls
+        reset_mocks()
+
+
 def test_decoded_prefix():
     tested = WebmPrefix
     result = tested.decoded_prefix()
@@ -1,4 +1,5 @@
 from argparse import Namespace
+from pathlib import Path
 from unittest.mock import patch, call, MagicMock
 
 from scripts.case_runner import CaseRunner
@@ -37,12 +38,20 @@ def test_parameters(argument_parser):
             default=0,
             help="The ID of the experiment_resul table record where to store the results",
         ),
+        call().add_argument(
+            "--llm_cache_folder",
+            type=str,
+            default="",
+            help="The folder where to cache the LLM responses across runs, no cache if not provided",
+        ),
         call().parse_args(),
     ]
     assert argument_parser.mock_calls == calls
     reset_mocks()
 
 
+@patch("scripts.case_runner.LlmResponseCacheDisk")
+@patch("scripts.case_runner.LlmResponseCache")
 @patch("scripts.case_runner.MemoryLog")
 @patch("scripts.case_runner.AudioInterpreter")
 @patch("scripts.case_runner.HelperEvaluation")
@@ -64,6 +73,8 @@ def test_run(
     helper,
     audio_interpreter,
     memory_log,
+    llm_response_cache,
+    llm_response_cache_disk,
     capsys,
 ):
     mock_chatter = MagicMock()
@@ -80,6 +91,8 @@ def test_run(
         helper.reset_mock()
         audio_interpreter.reset_mock()
         memory_log.reset_mock()
+        llm_response_cache.reset_mock()
+        llm_response_cache_disk.reset_mock()
         mock_chatter.reset_mock()
         mock_auditor.reset_mock()
 
@@ -101,7 +114,7 @@ def test_run(
 
     # case does not exist
     already_generated.side_effect = [False]
-    parameters.side_effect = [Namespace(case="theCase", cycles=3, experiment_result_id=17)]
+    parameters.side_effect = [Namespace(case="theCase", cycles=3, experiment_result_id=17, llm_cache_folder="")]
     prepare_cycles.side_effect = []
     load_from_json.return_value.staged_commands_as_instructions.side_effect = []
     schema_key2instruction.side_effect = []
@@ -133,6 +146,8 @@ def test_run(
     assert helper.mock_calls == []
     assert audio_interpreter.mock_calls == []
     assert memory_log.mock_calls == []
+    assert llm_response_cache.mock_calls == []
+    assert llm_response_cache_disk.mock_calls == []
     assert mock_chatter.mock_calls == []
     assert mock_auditor.mock_calls == []
     reset_mocks()
@@ -140,7 +155,10 @@ def test_run(
     # case exists
     already_generated.side_effect = [True]
     prepare_cycles.side_effect = [{"cycle_001": lines[0:3], "cycle_002": lines[3:5], "cycle_003": lines[5:]}]
-    parameters.side_effect = [Namespace(case="theCase", cycles=3, experiment_result_id=17)]
+    parameters.side_effect = [
+        Namespace(case="theCase", cycles=3, experiment_result_id=17, llm_cache_folder="/theCacheFolder"),
+    ]
+    llm_response_cache_disk.side_effect = ["theDiskCache"]
     load_from_json.return_value.staged_commands_as_instructions.side_effect = [["theCommandAsInstructions"]]
     schema_key2instruction.side_effect = ["theSchemaKey2Instructions"]
     transcript2commands.side_effect = [
@@ -191,6 +209,10 @@ def test_run(
     assert audio_interpreter.mock_calls == calls
     calls = [call.token_counts("theNoteUuid")]
     assert memory_log.mock_calls == calls
+    calls = [call.use("theDiskCache")]
+    assert llm_response_cache.mock_calls == calls
+    calls = [call(Path("/theCacheFolder"), 5000)]
+    assert llm_response_cache_disk.mock_calls == calls
     assert mock_chatter.mock_calls == []
     calls = [
         call.full_transcript(),
@@ -207,7 +229,7 @@ def test_run(
     # errors
     error = RuntimeError("There was an error")
     already_generated.side_effect = [True]
-    parameters.side_effect = [Namespace(case="theCase", cycles=3, experiment_result_id=11)]
+    parameters.side_effect = [Namespace(case="theCase", cycles=3, experiment_result_id=11, llm_cache_folder="")]
     prepare_cycles.side_effect = [{"cycle_001": lines[0:3], "cycle_002": lines[3:5], "cycle_003": lines[5:]}]
     load_from_json.return_value.staged_commands_as_instructions.side_effect = [["theCommandAsInstructions"]]
     schema_key2instruction.side_effect = ["theSchemaKey2Instructions"]
@@ -251,6 +273,8 @@ def test_run(
     assert audio_interpreter.mock_calls == calls
     calls = [call.token_counts("theNoteUuid")]
     assert memory_log.mock_calls == calls
+    assert llm_response_cache.mock_calls == []
+    assert llm_response_cache_disk.mock_calls == []
     assert mock_chatter.mock_calls == []
     calls = [
         call.full_transcript(),
@@ -0,0 +1,74 @@
+import sqlite3
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch, call
+
+from scripts.lab_test_index_builder import LabTestIndexBuilder
+
+
+@patch("scripts.lab_test_index_builder.ArgumentParser")
+def test_parameters(argument_parser):
+    def reset_mocks():
+        argument_parser.reset_mock()
+
+    tested = LabTestIndexBuilder
+
+    argument_parser.return_value.parse_args.side_effect = ["parse_args called"]
+    result = tested.parameters()
+    assert result == "parse_args called"
+
+    directory = Path(__file__).parent.parent.parent / "hyperscribe" / "libraries"
+    calls = [
+        call(description="Build the full-text table of the generic lab tests used by the evaluations"),
+        call().add_argument(
+            "--database",
+            type=Path,
+            default=directory / "generic_lab_tests.db",
+            help="SQLite database with the generic_lab_test table",
+        ),
+        call().parse_args(),
+    ]
+    assert argument_parser.mock_calls == calls
+    reset_mocks()
+
+
+def test_build(tmp_path):
+    tested = LabTestIndexBuilder
+    database = tmp_path / "lab_tests.db"
+    with sqlite3.connect(database) as conn:
+        conn.execute(
+            "CREATE TABLE `generic_lab_test` (`dbid` INTEGER PRIMARY KEY, `order_code` TEXT, `order_name` TEXT, "
+            "`keywords` TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO `generic_lab_test` VALUES (?, ?, ?, ?)",
+            [
+                (7, "code1", "GLUCOSE, PLEURAL FLUID", "82945 GLUCOSE, PLEURAL FLUID"),
+                (9, "code2", "HEMOGLOBIN A1C", "83036 HbA1c HEMOGLOBIN A1C"),
+            ],
+        )
+    conn.close()
+
+    # the table is rebuilt each time
+    for _ in range(2):
+        result = tested.build(database)
+        assert result == 2
+
+    with sqlite3.connect(database) as conn:
+        sql = "SELECT `rowid`, `order_code`, `order_name` FROM `generic_lab_test_fts` WHERE `keywords` LIKE ?"
+        assert conn.execute(sql, ("%glucose%",)).fetchall() == [(7, "code1", "GLUCOSE, PLEURAL FLUID")]
+        assert conn.execute(sql, ("%hba1%",)).fetchall() == [(9, "code2", "HEMOGLOBIN A1C")]
+        assert conn.execute(sql, ("%a1%",)).fetchall() == [(9, "code2", "HEMOGLOBIN A1C")]
+    conn.close()
+
+
+@patch.object(LabTestIndexBuilder, "build")
+@patch.object(LabTestIndexBuilder, "parameters")
+def test_run(parameters, build, capsys):
+    tested = LabTestIndexBuilder
+
+    parameters.side_effect = [Namespace(database=Path("/some/lab_tests.db"))]
+    build.side_effect = [5495]
+    tested.run()
+    assert capsys.readouterr().out == "indexed lab tests: 5495\n"
+    assert build.mock_calls == [call(Path("/some/lab_tests.db"))]
@@ -98,7 +98,7 @@ def test_run(parameters, helper, aws_s3, capsys):
         parameters.side_effect = [Namespace(customer="theCustomer")]
         helper.aws_s3_credentials.side_effect = ["theCredentials"]
         aws_s3.return_value.list_s3_objects.side_effect = [feedbacks]
-        aws_s3.return_value.access_s3_object.side_effect = accesses
+        aws_s3.return_value.get_many.side_effect = [accesses]
 
         tested.run()
         exp_out = CaptureResult(expected_out, err="")
@@ -113,14 +113,16 @@ def test_run(parameters, helper, aws_s3, capsys):
             call().list_s3_objects("hyperscribe-theCustomer/feedback/"),
         ]
         if accesses:
-            calls.extend(
-                [
-                    call().access_s3_object("hyperscribe-theCustomer/feedback/note123abc/20250901-072207"),
-                    call().access_s3_object("hyperscribe-theCustomer/feedback/note123abc/20250902-050532"),
-                    call().access_s3_object("hyperscribe-theCustomer/feedback/note123abc/20250902-070707"),
-                    call().access_s3_object("hyperscribe-theCustomer/feedback/note123xyz/20250901-072209"),
-                    call().access_s3_object("hyperscribe-theCustomer/feedback/note123xyz/20250902-111111"),
-                ]
+            calls.append(
+                call().get_many(
+                    [
+                        "hyperscribe-theCustomer/feedback/note123abc/20250901-072207",
+                        "hyperscribe-theCustomer/feedback/note123abc/20250902-050532",
+                        "hyperscribe-theCustomer/feedback/note123abc/20250902-070707",
+                        "hyperscribe-theCustomer/feedback/note123xyz/20250901-072209",
+                        "hyperscribe-theCustomer/feedback/note123xyz/20250902-111111",
+                    ]
+                ),
             )
         assert aws_s3.mock_calls == calls
         reset_mocks()
@@ -0,0 +1,143 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch, call, MagicMock
+
+from hyperscribe.libraries.json_schema import JsonSchema
+from hyperscribe.libraries.schema_registry import SchemaRegistry
+from scripts.schema_registry_benchmark import SchemaRegistryBenchmark
+
+
+@patch("scripts.schema_registry_benchmark.ArgumentParser")
+def test_parameters(argument_parser):
+    def reset_mocks():
+        argument_parser.reset_mock()
+
+    tested = SchemaRegistryBenchmark
+
+    argument_parser.return_value.parse_args.side_effect = ["parse_args called"]
+    result = tested.parameters()
+    assert result == "parse_args called"
+
+    calls = [
+        call(description="Per-call cost of the JSON validation, without and with the registry"),
+        call().add_argument(
+            "--cases",
+            type=Path,
+            default=Path(__file__).parent.parent.parent / "evaluations/cases",
+            help="Folder of the cases providing the transcripts",
+        ),
+        call().add_argument("--repeat", type=int, default=20, help="Number of passes over the transcripts"),
+        call().parse_args(),
+    ]
+    assert argument_parser.mock_calls == calls
+    reset_mocks()
+
+
+def test_payloads(tmp_path):
+    tested = SchemaRegistryBenchmark
+    (tmp_path / "case2").mkdir()
+    (tmp_path / "case1").mkdir()
+    (tmp_path / "case2" / "transcript.json").write_text(json.dumps([{"speaker": "B", "text": "2"}]))
+    (tmp_path / "case1" / "transcript.json").write_text(json.dumps([{"speaker": "A", "text": "1"}]))
+    (tmp_path / "case1" / "note.json").write_text(json.dumps({"key": "value"}))
+
+    result = tested.payloads(tmp_path)
+    expected = [[{"speaker": "A", "text": "1"}], [{"speaker": "B", "text": "2"}]]
+    assert result == expected
+
+
+def test_validate_before():
+    tested = SchemaRegistryBenchmark
+    schema = JsonSchema.get(["voice_turns"])[0]
+    tests = [
+        ([{"speaker": "A", "text": "1"}], ""),
+        ([{"speaker": "A"}], "'text' is a required property"),
+        ([], "[] should be non-empty"),
+    ]
+    for content, expected in tests:
+        result = tested.validate_before(content, schema)
+        assert result == expected, f"---> {content}"
+
+
+@patch("scripts.schema_registry_benchmark.perf_counter")
+def test_measure(perf_counter):
+    validate = MagicMock()
+    schema = MagicMock()
+
+    def reset_mocks():
+        perf_counter.reset_mock()
+        validate.reset_mock()
+        schema.reset_mock()
+
+    tested = SchemaRegistryBenchmark
+
+    perf_counter.side_effect = [10.0, 10.012]
+    schema.side_effect = ["schema1", "schema2", "schema3", "schema4"]
+    result = tested.measure(validate, ["payload1", "payload2"], schema, 3, 2)
+    assert round(result, 3) == 1000.0
+
+    calls = [call(), call()]
+    assert perf_counter.mock_calls == calls
+    calls = [call(), call(), call(), call()]
+    assert schema.mock_calls == calls
+    calls = [
+        call("payload1", "schema1"),
+        call("payload1", "schema1"),
+        call("payload1", "schema1"),
+        call("payload2", "schema2"),
+        call("payload2", "schema2"),
+        call("payload2", "schema2"),
+        call("payload1", "schema3"),
+        call("payload1", "schema3"),
+        call("payload1", "schema3"),
+        call("payload2", "schema4"),
+        call("payload2", "schema4"),
+        call("payload2", "schema4"),
+    ]
+    assert validate.mock_calls == calls
+    reset_mocks()
+
+
+@patch.object(SchemaRegistryBenchmark, "measure")
+@patch.object(SchemaRegistryBenchmark, "payloads")
+@patch.object(SchemaRegistryBenchmark, "parameters")
+def test_run(parameters, payloads, measure, capsys):
+    def reset_mocks():
+        parameters.reset_mock()
+        payloads.reset_mock()
+        measure.reset_mock()
+
+    tested = SchemaRegistryBenchmark
+
+    parameters.side_effect = [Namespace(cases=Path("/some/folder"), repeat=7)]
+    payloads.side_effect = [["payload1", "payload2"]]
+    measure.side_effect = [173.04, 166.51, 189.0, 208.12, 197.94, 197.21]
+    tested.run()
+
+    exp_out = "\n".join(
+        [
+            "transcripts: 2, passes: 7",
+            "| scenario                                 |  before (us) |   after (us) |",
+            "| static schema                            |        173.0 |        166.5 |",
+            "| dynamic schema                           |        189.0 |        208.1 |",
+            "| dynamic schema, streamed and extracted   |        197.9 |        197.2 |",
+            "",
+        ],
+    )
+    assert capsys.readouterr().out == exp_out
+
+    calls = [call()]
+    assert parameters.mock_calls == calls
+    calls = [call(Path("/some/folder"))]
+    assert payloads.mock_calls == calls
+    assert len(measure.mock_calls) == 6
+    schema = JsonSchema.get(["voice_turns"])[0]
+    validators = [tested.validate_before, SchemaRegistry.validate] * 3
+    for (_, args, _), validator, validations in zip(measure.mock_calls, validators, [1, 1, 1, 1, 2, 2]):
+        assert args[0] == validator
+        assert args[1] == ["payload1", "payload2"]
+        assert args[2]() == schema
+        assert args[3] == validations
+        assert args[4] == 7
+    reset_mocks()
@@ -0,0 +1,216 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+from unittest.mock import patch, call, MagicMock
+
+from hyperscribe.structures.trace_span import TraceSpan
+from scripts.trace_viewer import TraceViewer
+
+DOCUMENT = {
+    "note": "theNoteUuid",
+    "cycle": 3,
+    "spans": [
+        {"id": "s2", "parent": "s1", "name": "detect_instructions", "start": 1500, "duration": 2000, "attributes": {}},
+        {"id": "s3", "parent": "s2", "name": "LlmBase.chat", "start": 1600, "duration": 1800, "attributes": {"a": 1}},
+        {"id": "s4", "parent": "s1", "name": "LlmBase.chat", "start": 3000, "duration": 1000, "attributes": {}},
+        {"id": "s5", "parent": "s0", "name": "AwsS3.upload", "start": 900, "duration": 200, "attributes": {}},
+        {"id": "s1", "parent": "", "name": "cycle", "start": 1000, "duration": 4000, "attributes": {"cycles": [3]}},
+    ],
+}
+
+
+@patch("scripts.trace_viewer.ArgumentParser")
+def test_parameters(argument_parser):
+    def reset_mocks():
+        argument_parser.reset_mock()
+
+    tested = TraceViewer
+
+    argument_parser.return_value.parse_args.side_effect = ["parse_args called"]
+    result = tested.parameters()
+    assert result == "parse_args called"
+
+    calls = [
+        call(description="Display the spans of a cycle trace, as stored in AWS S3"),
+        call().add_argument(
+            "trace",
+            type=str,
+            help="Local file or AWS S3 key (hyperscribe-{customer}/traces/{day}/{note}/{cycle}.json) of the trace",
+        ),
+        call().add_argument(
+            "--chrome",
+            type=Path,
+            default=None,
+            help="File to write the trace in the Chrome Trace Event format (chrome://tracing, ui.perfetto.dev)",
+        ),
+        call().parse_args(),
+    ]
+    assert argument_parser.mock_calls == calls
+    reset_mocks()
+
+
+@patch("scripts.trace_viewer.AwsS3")
+@patch("scripts.trace_viewer.HelperEvaluation")
+def test_load(helper, aws_s3, tmp_path):
+    def reset_mocks():
+        helper.reset_mock()
+        aws_s3.reset_mock()
+
+    tested = TraceViewer
+
+    # local file
+    file = tmp_path / "07.json"
+    file.write_text(json.dumps(DOCUMENT))
+    result = tested.load(file.as_posix())
+    assert result == DOCUMENT
+    assert helper.mock_calls == []
+    assert aws_s3.mock_calls == []
+    reset_mocks()
+
+    # AWS S3 key
+    tests = [
+        (MagicMock(status_code=200, content=json.dumps(DOCUMENT).encode("utf-8")), DOCUMENT),
+        (MagicMock(status_code=404), {}),
+    ]
+    for response, expected in tests:
+        helper.aws_s3_credentials.side_effect = ["theCredentials"]
+        aws_s3.return_value.access_s3_object.side_effect = [response]
+        result = tested.load("hyperscribe-theCustomer/traces/2025-12-05/theNoteUuid/03.json")
+        assert result == expected
+
+        calls = [call.aws_s3_credentials()]
+        assert helper.mock_calls == calls
+        calls = [
+            call("theCredentials"),
+            call().access_s3_object("hyperscribe-theCustomer/traces/2025-12-05/theNoteUuid/03.json"),
+        ]
+        assert aws_s3.mock_calls == calls
+        reset_mocks()
+
+
+def test_tree():
+    tested = TraceViewer
+    result = tested.tree(TraceSpan.load_from_json(DOCUMENT["spans"]))
+    expected = [
+        "AwsS3.upload                                           0ms     200ms",
+        'cycle                                                100ms    4000ms {"cycles": [3]}',
+        "  detect_instructions                                600ms    2000ms",
+        '    LlmBase.chat                                     700ms    1800ms {"a": 1}',
+        "  LlmBase.chat                                      2100ms    1000ms",
+    ]
+    assert result == expected
+    # no span
+    assert tested.tree([]) == []
+
+
+def test_lanes():
+    tested = TraceViewer
+    spans = [
+        TraceSpan("s1", "", "cycle", 1.0, 4.0, {}),
+        TraceSpan("s2", "s1", "first", 1.5, 2.0, {}),
+        TraceSpan("s3", "s1", "concurrent", 2.0, 2.0, {}),  # overlaps the first without being nested
+        TraceSpan("s4", "s1", "nested", 2.5, 1.0, {}),
+        TraceSpan("s5", "s1", "after", 4.0, 0.5, {}),
+        TraceSpan("s6", "", "outside", 6.0, 0.5, {}),
+    ]
+    result = tested.lanes(spans)
+    expected = [0, 0, 1, 0, 0, 0]
+    assert result == expected
+
+
+def test_chrome_events():
+    tested = TraceViewer
+    result = tested.chrome_events(DOCUMENT)
+    expected = [
+        {
+            "name": "detect_instructions",
+            "cat": "hyperscribe",
+            "ph": "X",
+            "ts": 1500000,
+            "dur": 2000000,
+            "pid": 3,
+            "tid": 1,
+            "args": {},
+        },
+        {
+            "name": "LlmBase.chat",
+            "cat": "hyperscribe",
+            "ph": "X",
+            "ts": 1600000,
+            "dur": 1800000,
+            "pid": 3,
+            "tid": 1,
+            "args": {"a": 1},
+        },
+        {
+            "name": "LlmBase.chat",
+            "cat": "hyperscribe",
+            "ph": "X",
+            "ts": 3000000,
+            "dur": 1000000,
+            "pid": 3,
+            "tid": 0,
+            "args": {},
+        },
+        {
+            "name": "AwsS3.upload",
+            "cat": "hyperscribe",
+            "ph": "X",
+            "ts": 900000,
+            "dur": 200000,
+            "pid": 3,
+            "tid": 0,
+            "args": {},
+        },
+        {
+            "name": "cycle",
+            "cat": "hyperscribe",
+            "ph": "X",
+            "ts": 1000000,
+            "dur": 4000000,
+            "pid": 3,
+            "tid": 1,
+            "args": {"cycles": [3]},
+        },
+    ]
+    assert result == expected
+
+
+@patch.object(TraceViewer, "load")
+@patch.object(TraceViewer, "parameters")
+def test_run(parameters, load, capsys, tmp_path):
+    def reset_mocks():
+        parameters.reset_mock()
+        load.reset_mock()
+
+    tested = TraceViewer
+
+    # trace not found
+    parameters.side_effect = [Namespace(trace="theTrace", chrome=None)]
+    load.side_effect = [{}]
+    tested.run()
+    assert capsys.readouterr().out == "trace not found: theTrace\n"
+    calls = [call("theTrace")]
+    assert load.mock_calls == calls
+    reset_mocks()
+
+    # trace found
+    for chrome in [None, tmp_path / "chrome.json"]:
+        parameters.side_effect = [Namespace(trace="theTrace", chrome=chrome)]
+        load.side_effect = [DOCUMENT]
+        tested.run()
+        exp_out = [
+            "note: theNoteUuid, cycle: 3",
+            "AwsS3.upload                                           0ms     200ms",
+            'cycle                                                100ms    4000ms {"cycles": [3]}',
+            "  detect_instructions                                600ms    2000ms",
+            '    LlmBase.chat                                     700ms    1800ms {"a": 1}',
+            "  LlmBase.chat                                      2100ms    1000ms",
+        ]
+        if chrome:
+            exp_out.append(f"Chrome trace: {chrome}")
+            assert json.loads(chrome.read_text()) == {"traceEvents": tested.chrome_events(DOCUMENT)}
+        assert capsys.readouterr().out == "\n".join(exp_out) + "\n"
+        calls = [call("theTrace")]
+        assert load.mock_calls == calls
+        reset_mocks()